@@ -0,0 +1,134 @@
+"""DTO benchmark: the v1.1.2 per-row DTO path (two iterrows() passes,
+json.dumps for the POST body, json.dumps(indent=2) for the dump, FastAPI
+validating and re-encoding include_dtos) against dtos.PredictionDtos —
+columnar build, one encoding reused by all three. No database needed.
+
+    python benchmarks/bench_dtos.py --contests 1000 50000 --repeat 5
+
+Both paths build from the same synthetic predictions (a quarter of the
+slate unpriced); their DTOs are checked equal before timing. "encoder"
+says whether orjson is installed (api.encode_dtos falls back to the
+stdlib without it).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from fastapi.encoders import jsonable_encoder
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from metricbot import MODEL_VERSION, api  # noqa: E402
+from metricbot.dtos import PICKTYPE_ATS, PICKTYPE_STRAIGHT_UP, build_prediction_dtos  # noqa: E402
+from metricbot.model import is_priced  # noqa: E402
+from metricbot.service import RunWeekResponse, _response_with_dtos  # noqa: E402
+
+
+def _predictions(contests: int, rng) -> pd.DataFrame:
+    spread = rng.normal(scale=7, size=contests).round(1)
+    spread[rng.random(contests) < 0.25] = np.nan
+    return pd.DataFrame({
+        "ContestId": [f"{i:08x}-0000-4000-8000-000000000000" for i in range(contests)],
+        "HomeFranchiseSeasonId": [f"{i:08x}-1111-4000-8000-000000000000" for i in range(contests)],
+        "WinProbability": rng.uniform(0.01, 0.99, contests),
+        "HomeCoverProbability": rng.uniform(0.01, 0.99, contests),
+        "Spread": spread,
+        "ModelVersion": MODEL_VERSION,
+        "ModelPath": "residual",
+    })
+
+
+def _legacy_dtos(predictions: pd.DataFrame) -> list[dict]:
+    records: list[dict] = []
+    for _, row in predictions.iterrows():
+        records.append({"ContestId": row["ContestId"],
+                        "WinnerFranchiseSeasonId": row["HomeFranchiseSeasonId"],
+                        "WinProbability": round(float(row["WinProbability"]), 4),
+                        "PredictionType": PICKTYPE_STRAIGHT_UP,
+                        "ModelVersion": row["ModelVersion"]})
+    for _, row in predictions[is_priced(predictions)].iterrows():
+        records.append({"ContestId": row["ContestId"],
+                        "WinnerFranchiseSeasonId": row["HomeFranchiseSeasonId"],
+                        "WinProbability": round(float(row["HomeCoverProbability"]), 4),
+                        "PredictionType": PICKTYPE_ATS,
+                        "ModelVersion": row["ModelVersion"]})
+    return records
+
+
+def _response(contests: int, dtos: list[dict] | None = None) -> RunWeekResponse:
+    return RunWeekResponse(model_version=MODEL_VERSION, sport="FootballNcaa", season_year=2025,
+                           week=6, prior_season_tail=0, training_rows=0, contests=contests,
+                           mae=0.0, residual_std=0.0, published=False, elapsed_seconds=0.0,
+                           dtos=dtos)
+
+
+def _legacy_path(predictions: pd.DataFrame) -> dict[str, float]:
+    laps, started = {}, time.perf_counter()
+    dtos = _legacy_dtos(predictions)
+    laps["build"] = time.perf_counter() - started
+    started = time.perf_counter()
+    json.dumps(dtos).encode("utf-8")
+    laps["post"] = time.perf_counter() - started
+    started = time.perf_counter()
+    json.dumps(dtos, indent=2).encode("utf-8")
+    laps["dump"] = time.perf_counter() - started
+    started = time.perf_counter()
+    # What FastAPI does with a returned response model.
+    json.dumps(jsonable_encoder(_response(len(predictions), dtos))).encode("utf-8")
+    laps["response"] = time.perf_counter() - started
+    return laps
+
+
+def _columnar_path(predictions: pd.DataFrame) -> dict[str, float]:
+    laps, started = {}, time.perf_counter()
+    dtos = build_prediction_dtos(predictions)
+    laps["build"] = time.perf_counter() - started
+    started = time.perf_counter()
+    dtos.encoded
+    laps["post"] = time.perf_counter() - started
+    started = time.perf_counter()
+    dtos.encoded
+    laps["dump"] = time.perf_counter() - started
+    started = time.perf_counter()
+    _response_with_dtos(_response(len(predictions)), dtos)
+    laps["response"] = time.perf_counter() - started
+    return laps
+
+
+def _median_laps(path, predictions: pd.DataFrame, repeat: int) -> dict[str, float]:
+    runs = [path(predictions) for _ in range(repeat)]
+    return {lap: statistics.median(run[lap] for run in runs) for lap in runs[0]}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--contests", type=int, nargs="+", default=[1_000, 50_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(2026)
+    print(f"encoder: {'orjson' if api.orjson is not None else 'json (stdlib)'}")
+    print(f"{'contests':>9}  {'path':<9}{'build s':>9}{'post s':>9}{'dump s':>9}"
+          f"{'resp s':>9}{'total s':>9}{'speedup':>9}")
+    for contests in args.contests:
+        predictions = _predictions(contests, rng)
+        assert list(build_prediction_dtos(predictions)) == _legacy_dtos(predictions)
+        before = _median_laps(_legacy_path, predictions, args.repeat)
+        after = _median_laps(_columnar_path, predictions, args.repeat)
+        for name, laps in (("per-row", before), ("columnar", after)):
+            speedup = f"{sum(before.values()) / sum(laps.values()):>8.1f}x" if laps is after else ""
+            print(f"{contests:>9}  {name:<9}{laps['build']:>9.4f}{laps['post']:>9.4f}"
+                  f"{laps['dump']:>9.4f}{laps['response']:>9.4f}{sum(laps.values()):>9.4f}{speedup}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Extraction backend benchmark: psql (--csv + read_csv) vs psycopg.
+
+Runs the as-of training extraction — the multi-season corpus — once per
+backend per repeat, each in a FRESH interpreter so peak RSS is the
+backend's own high-water mark and not the other's leftovers. Reads the
+normal METRICBOT_* configuration (env or _metricbot.env).
+
+    python benchmarks/bench_extract.py --sport FootballNcaa --season-year 2025 --week 15 --repeat 3
+
+Peak RSS comes from resource.getrusage, so this runs on Linux/macOS (the
+K3s pods and CI agents), not Windows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+CHILD = """
+import dataclasses, json, resource, sys, time
+from metricbot import extract
+from metricbot.config import Config
+config = dataclasses.replace(Config.load(sys.argv[1]), extract_backend=sys.argv[2])
+started = time.perf_counter()
+frame = extract.extract_asof_training(config, int(sys.argv[3]), int(sys.argv[4]))
+seconds = time.perf_counter() - started
+scale = 1 if sys.platform == "darwin" else 1024  # ru_maxrss: bytes on macOS, KiB on Linux
+print(json.dumps({"rows": len(frame), "seconds": seconds,
+                  "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20,
+                  "frame_mb": frame.memory_usage(deep=True).sum() / 2**20}))
+"""
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sport", default="FootballNcaa")
+    parser.add_argument("--season-year", type=int, required=True)
+    parser.add_argument("--week", type=int, required=True)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--backends", default="psql,psycopg")
+    args = parser.parse_args()
+
+    print(f"{'backend':<10}{'rows':>9}{'median s':>11}{'peak RSS MB':>14}{'frame MB':>11}")
+    for backend in args.backends.split(","):
+        runs = []
+        for _ in range(args.repeat):
+            out = subprocess.run(
+                [sys.executable, "-c", CHILD, args.sport, backend,
+                 str(args.season_year), str(args.week)],
+                cwd=ROOT, capture_output=True, text=True, check=True)
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        print(f"{backend:<10}{runs[0]['rows']:>9}"
+              f"{statistics.median(r['seconds'] for r in runs):>11.2f}"
+              f"{max(r['peak_rss_mb'] for r in runs):>14.1f}"
+              f"{runs[0]['frame_mb']:>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
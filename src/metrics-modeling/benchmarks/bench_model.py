@@ -0,0 +1,101 @@
+"""Model benchmark: one predict_market_prior run and one in-process
+season sweep on a synthetic 10-season corpus — no database needed.
+
+    python benchmarks/bench_model.py --seasons 10 --games 80 --repeat 5
+
+Peak memory is tracemalloc's high-water mark over the call (NumPy and
+pandas buffers included), measured on a separate run from the timings
+because tracing slows allocation-heavy code.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from metricbot.model import FEATURE_COLS, predict_market_prior  # noqa: E402
+from metricbot.pipeline import backtest_season_frames  # noqa: E402
+
+WEEKS = 15
+
+
+def _games(season: int, week: int, rows: int, completed: bool, rng) -> pd.DataFrame:
+    data = {col: rng.normal(loc=28 if "Pts" in col or "Margin" in col else 0.4,
+                            scale=6 if "Pts" in col or "Margin" in col else 0.05, size=rows)
+            for col in FEATURE_COLS}
+    window_nulls = rng.random(rows) < 0.1
+    for col in FEATURE_COLS:
+        if "Margin" in col:
+            data[col][window_nulls] = np.nan
+    data["ContestId"] = [f"{season}-{week}-{i}" for i in range(rows)]
+    data["SeasonYear"] = season
+    data["WeekNumber"] = week
+    data["HomeFranchiseSeasonId"] = [f"h{i}" for i in range(rows)]
+    data["AwayFranchiseSeasonId"] = [f"a{i}" for i in range(rows)]
+    spread = rng.normal(scale=7, size=rows).round(1)
+    spread[rng.random(rows) < 0.25] = np.nan
+    data["Spread"] = spread
+    data["FbsParticipant"] = np.where(rng.random(rows) < 0.85, "t", "f")
+    if completed:
+        home = rng.integers(0, 50, rows).astype(float)
+        away = rng.integers(0, 50, rows).astype(float)
+        data["HomeScore"], data["AwayScore"] = home, away
+        data["Winner"] = ["HOME" if h > a else "AWAY" if a > h else "TIE" for h, a in zip(home, away)]
+    else:
+        data["HomeScore"] = data["AwayScore"] = np.full(rows, np.nan)
+        data["Winner"] = [None] * rows
+    return pd.DataFrame(data)
+
+
+def _measure(call, repeat: int) -> tuple[float, float]:
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        seconds.append(time.perf_counter() - started)
+    tracemalloc.start()
+    call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(seconds), peak / 2**20
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--games", type=int, default=80, help="games per week")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(2026)
+    last = 2015 + args.seasons
+    training = pd.concat([_games(season, week, args.games, True, rng)
+                          for season in range(2016, last + 1) for week in range(1, WEEKS + 1)
+                          if season < last or week < 10], ignore_index=True)
+    slates = {week: _games(last, week, args.games, False, rng) for week in range(4, 10)}
+    scores = pd.DataFrame({"ContestId": [], "WeekNumber": [], "HomeScore": [], "AwayScore": []})
+
+    print(f"corpus: {len(training)} rows x {len(FEATURE_COLS)} features, "
+          f"{training.memory_usage(deep=True).sum() / 2**20:.1f} MB")
+    print(f"{'step':<28}{'median s':>10}{'peak MB':>10}")
+    week_training = training[(training["SeasonYear"] < last) | (training["WeekNumber"] < 9)]
+    for name, call in (
+            ("predict_market_prior", lambda: predict_market_prior(week_training, slates[9], True)),
+            ("season sweep (6 weeks)", lambda: backtest_season_frames(
+                training, slates, scores, last, fbs_scope=True, workers=1))):
+        seconds, peak = _measure(call, args.repeat)
+        print(f"{name:<28}{seconds:>10.3f}{peak:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""Parse benchmark: psql --csv text of the as-of training corpus into a
+frame, inferred (plain read_csv) vs the extraction schema (schema.py) —
+plus PreparedCorpus.of on the result, where the inferred frame still has
+to re-parse FbsParticipant. Synthetic corpus, no database needed.
+
+    python benchmarks/bench_parse.py --seasons 10 --games 850 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from metricbot.extract import ASOF_TRAINING_SQL  # noqa: E402
+from metricbot.model import PreparedCorpus  # noqa: E402
+from metricbot.schema import schema_for  # noqa: E402
+
+TEAMS = 260     # FBS + FCS franchise seasons per season
+
+
+def _corpus_csv(seasons: int, games: int, rng) -> str:
+    schema = schema_for(ASOF_TRAINING_SQL)
+    rows = seasons * games
+    season_year = np.repeat(np.arange(2025 - seasons, 2025), games)
+    # One franchise-season id pool per season, as in the database.
+    pools = {year: np.array([str(uuid.UUID(int=int(v))) for v in rng.integers(0, 2**63, TEAMS)])
+             for year in np.unique(season_year)}
+    data = {}
+    for name, kind in schema.columns.items():
+        if kind == "key":
+            data[name] = [str(uuid.UUID(int=int(v))) for v in rng.integers(0, 2**63, rows)]
+        elif kind == "ref":
+            data[name] = np.concatenate([pools[year][rng.integers(0, TEAMS, games)]
+                                         for year in np.unique(season_year)])
+        elif kind == "feature":
+            # psql prints numeric at full precision.
+            data[name] = np.round(rng.normal(loc=0.4, scale=0.1, size=rows), 12)
+    data["SeasonYear"] = season_year
+    data["WeekNumber"] = np.tile(np.repeat(np.arange(1, 16), games // 15 + 1)[:games], seasons)
+    data["HomeScore"] = rng.integers(0, 60, rows)
+    data["AwayScore"] = rng.integers(0, 60, rows)
+    data["Winner"] = np.where(data["HomeScore"] > data["AwayScore"], "HOME",
+                              np.where(data["AwayScore"] > data["HomeScore"], "AWAY", "TIE"))
+    spread = rng.normal(scale=7, size=rows).round(1)
+    spread[rng.random(rows) < 0.25] = np.nan
+    data["Spread"] = spread
+    data["FbsParticipant"] = np.where(rng.random(rows) < 0.85, "t", "f")
+    return pd.DataFrame(data)[list(schema.columns)].to_csv(index=False)
+
+
+def _median_seconds(call, repeat: int) -> float:
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        seconds.append(time.perf_counter() - started)
+    return statistics.median(seconds)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seasons", type=int, default=10)
+    parser.add_argument("--games", type=int, default=850, help="games per season")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    text = _corpus_csv(args.seasons, args.games, np.random.default_rng(2026))
+    schema = schema_for(ASOF_TRAINING_SQL)
+    print(f"corpus: {args.seasons * args.games} rows, {len(text) / 2**20:.1f} MB of CSV")
+    print(f"{'parse':<18}{'read s':>9}{'prepare s':>11}{'frame MB':>10}")
+    for name, parse in (("inferred", lambda: pd.read_csv(io.StringIO(text))),
+                        ("schema float64", lambda: schema.parse_csv(text, "float64")),
+                        ("schema float32", lambda: schema.parse_csv(text, "float32"))):
+        frame = parse()
+        read = _median_seconds(parse, args.repeat)
+        prepare = _median_seconds(lambda: PreparedCorpus.of(frame), args.repeat)
+        print(f"{name:<18}{read:>9.3f}{prepare:>11.3f}"
+              f"{frame.memory_usage(deep=True).sum() / 2**20:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
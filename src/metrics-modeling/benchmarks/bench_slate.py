@@ -0,0 +1,109 @@
+"""Slate scoring benchmark: the v1.1.2 column-by-column pandas scoring
+(norm.sf per column, .loc writes for the priced rows) against
+model.score_slate plus one DataFrame.assign — no database needed.
+
+    python benchmarks/bench_slate.py --rows 1000 10000 100000 --repeat 7
+
+Both paths score the same synthetic slate from the same fitted margins
+and corrections, so the timings isolate the scoring and frame assembly;
+the two outputs are checked equal bit for bit before timing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from metricbot import MODEL_VERSION  # noqa: E402
+from metricbot.model import FEATURE_COLS, score_slate  # noqa: E402
+
+SU_STD, CORRECTION_STD = 15.5, 16.25
+
+
+def _slate(rows: int, rng) -> tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+    frame = pd.DataFrame({col: rng.normal(size=rows) for col in FEATURE_COLS})
+    frame.insert(0, "ContestId", [f"c{i}" for i in range(rows)])
+    spread = rng.normal(scale=7, size=rows).round(1)
+    spread[rng.random(rows) < 0.25] = np.nan
+    frame["Spread"] = spread
+    su_margin = rng.normal(scale=14, size=rows)
+    correction = rng.normal(scale=3, size=int((~np.isnan(spread)).sum()))
+    return frame, su_margin, correction
+
+
+def _pandas_path(slate: pd.DataFrame, su_margin: np.ndarray, corr: np.ndarray) -> pd.DataFrame:
+    predictions = slate.copy()
+    predictions["PredictedMargin"] = su_margin
+    predictions["WinProbability"] = norm.sf(0, loc=predictions["PredictedMargin"], scale=SU_STD)
+    predictions["WinProbability"] = predictions["WinProbability"].clip(0.01, 0.99)
+    predictions["PredictedLabel"] = (predictions["WinProbability"] > 0.5).astype(int)
+    predictions["ModelVersion"] = MODEL_VERSION
+    predictions["ResidualStd"] = SU_STD
+    margin_vs_spread = predictions["PredictedMargin"] + predictions["Spread"]
+    predictions["HomeCoverProbability"] = norm.sf(
+        0, loc=margin_vs_spread, scale=SU_STD).clip(0.01, 0.99)
+    predictions["AwayCoverProbability"] = norm.sf(
+        0, loc=-margin_vs_spread, scale=SU_STD).clip(0.01, 0.99)
+    predictions["AtsPredictedLabel"] = (
+        predictions["HomeCoverProbability"] > predictions["AwayCoverProbability"]).astype(int)
+    predictions["ModelPath"] = "fallback"
+
+    priced = predictions["Spread"].notna()
+    margin = -predictions.loc[priced, "Spread"].to_numpy() + corr
+    predictions.loc[priced, "PredictedMargin"] = margin
+    predictions.loc[priced, "WinProbability"] = norm.sf(
+        0, loc=margin, scale=CORRECTION_STD).clip(0.01, 0.99)
+    predictions.loc[priced, "HomeCoverProbability"] = norm.sf(
+        0, loc=corr, scale=CORRECTION_STD).clip(0.01, 0.99)
+    predictions.loc[priced, "AwayCoverProbability"] = norm.sf(
+        0, loc=-corr, scale=CORRECTION_STD).clip(0.01, 0.99)
+    predictions.loc[priced, "AtsPredictedLabel"] = (
+        predictions.loc[priced, "HomeCoverProbability"]
+        > predictions.loc[priced, "AwayCoverProbability"]).astype(int)
+    predictions.loc[priced, "ModelPath"] = "residual"
+    return predictions
+
+
+def _kernel_path(slate: pd.DataFrame, su_margin: np.ndarray, corr: np.ndarray) -> pd.DataFrame:
+    spread = slate["Spread"].to_numpy(dtype=np.float64)
+    return slate.assign(**score_slate(su_margin, spread, SU_STD, corr, CORRECTION_STD))
+
+
+def _median_seconds(call, repeat: int) -> float:
+    seconds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        seconds.append(time.perf_counter() - started)
+    return statistics.median(seconds)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(2026)
+    print(f"{'rows':>8}{'pandas s':>12}{'kernel s':>12}{'speedup':>10}")
+    for rows in args.rows:
+        slate, su_margin, corr = _slate(rows, rng)
+        pd.testing.assert_frame_equal(_kernel_path(slate, su_margin, corr),
+                                      _pandas_path(slate, su_margin, corr), check_exact=True)
+        before = _median_seconds(lambda: _pandas_path(slate, su_margin, corr), args.repeat)
+        after = _median_seconds(lambda: _kernel_path(slate, su_margin, corr), args.repeat)
+        print(f"{rows:>8}{before:>12.4f}{after:>12.4f}{before / after:>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+"""As-of engine benchmark: a season sweep's inputs — the training corpus
+cut off at the last week plus every week's slate — from the as-of
+queries (METRICBOT_ASOF_ENGINE=sql: the training query and the
+season-slates query) against one team-game extraction and windows.py
+(python). Reads the normal METRICBOT_* configuration (env or
+_metricbot.env).
+
+    python benchmarks/bench_windows.py --sport FootballNcaa --season-year 2025 --weeks 2-14 --prior-tail 5 --repeat 3
+
+"query s" is time spent in Postgres and parsing; "window s" is the
+NumPy side (python only). The two engines' frames are checked equal
+(averages to 1e-12 relative) before timing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from metricbot import extract  # noqa: E402
+from metricbot.__main__ import parse_weeks  # noqa: E402
+from metricbot.config import Config  # noqa: E402
+
+
+def _sql(config: Config, season_year: int, weeks: list[int], tail: int) -> tuple[dict, dict]:
+    started = time.perf_counter()
+    training = extract.extract_asof_training(config, season_year, weeks[-1])
+    slates = extract.extract_asof_season_slates(config, season_year, weeks, tail)
+    return {"query": time.perf_counter() - started, "window": 0.0}, {"training": training, **slates}
+
+
+def _python(config: Config, season_year: int, weeks: list[int], tail: int) -> tuple[dict, dict]:
+    started = time.perf_counter()
+    games = extract.extract_team_games(config, season_year)
+    queried = time.perf_counter()
+    training = games.asof_training(season_year, weeks[-1])
+    slates = games.asof_season_slates(season_year, weeks, tail)
+    return ({"query": queried - started, "window": time.perf_counter() - queried},
+            {"training": training, **slates})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sport", default="FootballNcaa")
+    parser.add_argument("--season-year", type=int, required=True)
+    parser.add_argument("--weeks", type=parse_weeks, required=True)
+    parser.add_argument("--prior-tail", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    config = Config.load(args.sport)
+    engines = {"sql": _sql, "python": _python}
+    frames = {name: run(dataclasses.replace(config, asof_engine=name), args.season_year,
+                        args.weeks, args.prior_tail)[1]
+              for name, run in engines.items()}
+    for key, expected in frames["sql"].items():
+        order = ["ContestId"]
+        pd.testing.assert_frame_equal(
+            frames["python"][key].sort_values(order).reset_index(drop=True),
+            expected.sort_values(order).reset_index(drop=True), check_exact=False, rtol=1e-12)
+
+    print(f"{'engine':<8}{'training':>10}{'slates':>8}{'query s':>10}{'window s':>10}{'total s':>10}")
+    for name, run in engines.items():
+        laps = [run(dataclasses.replace(config, asof_engine=name), args.season_year,
+                    args.weeks, args.prior_tail)[0] for _ in range(args.repeat)]
+        query = statistics.median(lap["query"] for lap in laps)
+        window = statistics.median(lap["window"] for lap in laps)
+        print(f"{name:<8}{len(frames[name]['training']):>10}{len(frames[name]) - 1:>8}"
+              f"{query:>10.3f}{window:>10.3f}{query + window:>10.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
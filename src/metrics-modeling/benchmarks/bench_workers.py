@@ -0,0 +1,154 @@
+"""Service worker benchmark: memory per worker and throughput at 1, 2
+and 4 uvicorn workers, with the warm corpus private to each worker or
+mapped from a shared directory (metricbot/shared.py).
+
+    python benchmarks/bench_workers.py --season-year 2025 --week 6 --workers 1 2 4 --requests 40
+
+Each configuration starts `uvicorn metricbot.service:app` with
+WEB_CONCURRENCY=N and METRICBOT_WARM_CORPUS_MB set (and
+METRICBOT_SHARED_CORPUS_DIR, for "shared"), waits for /ready, sends --requests explicit-week /run-week
+calls (never published) --workers at a time, then reads every worker's
+memory from /proc/<pid>/smaps_rollup:
+
+    RSS   pages the worker has touched, shared ones included — it does
+          NOT drop with sharing; summing it over workers over-counts
+    PSS   each shared page split between the processes mapping it —
+          sums to the pod's real use
+    USS   the worker's private pages — what one more worker costs
+
+Reads the normal METRICBOT_* configuration (env or _metricbot.env).
+Linux only (/proc).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _get(url: str) -> int:
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as ex:
+        return ex.code
+    except OSError:
+        return 0
+
+
+def _post(url: str, body: dict) -> float:
+    request = urllib.request.Request(url, data=json.dumps(body).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"})
+    started = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=600) as response:
+        response.read()
+    return time.perf_counter() - started
+
+
+def _wait_ready(base: str, workers: int, timeout: float = 300) -> None:
+    # /ready reaches one worker per request: wait until a run of answers
+    # long enough to have hit every worker says ready.
+    deadline, streak = time.monotonic() + timeout, 0
+    while streak < 4 * workers:
+        if time.monotonic() > deadline:
+            raise SystemExit(f"service not ready after {timeout:.0f}s")
+        streak = streak + 1 if _get(f"{base}/ready") == 200 else 0
+        time.sleep(0.1)
+
+
+def _workers(parent: int) -> list[int]:
+    """uvicorn's worker processes under `parent` (the supervisor) — or
+    `parent` itself, which serves alone with --workers 1. Their psql
+    sessions are children too; they are not counted."""
+    children = Path(f"/proc/{parent}/task/{parent}/children").read_text().split()
+    spawned = [pid for pid in map(int, children)
+               if b"spawn_main" in Path(f"/proc/{pid}/cmdline").read_bytes()]
+    return spawned or [parent]
+
+
+def _memory_mb(pid: int) -> dict[str, float]:
+    fields = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0]) / 1024
+    return {"rss": fields["Rss"], "pss": fields["Pss"],
+            "uss": fields["Private_Clean"] + fields["Private_Dirty"]}
+
+
+def _measure(args: argparse.Namespace, workers: int, shared_dir: Path | None) -> dict:
+    # WEB_CONCURRENCY, as the image sets it: the service reads it too.
+    env = {**os.environ, "METRICBOT_WARM_CORPUS_MB": str(args.warm_mb),
+           "WEB_CONCURRENCY": str(workers)}
+    env.pop("METRICBOT_SHARED_CORPUS_DIR", None)
+    if shared_dir is not None:
+        env["METRICBOT_SHARED_CORPUS_DIR"] = str(shared_dir)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "metricbot.service:app", "--host", "127.0.0.1",
+         "--port", str(args.port), "--log-level", "warning"],
+        cwd=ROOT, env=env)
+    base = f"http://127.0.0.1:{args.port}"
+    try:
+        _wait_ready(base, workers)
+        body = {"sport": args.sport, "season_year": args.season_year, "week": args.week,
+                "prior_season_tail": args.prior_season_tail, "dry_run": True}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            latencies = list(pool.map(lambda _: _post(f"{base}/run-week", body),
+                                      range(args.requests)))
+        elapsed = time.perf_counter() - started
+        memory = [_memory_mb(pid) for pid in _workers(server.pid)]
+    finally:
+        server.terminate()
+        server.wait(30)
+    return {"rps": args.requests / elapsed, "p50": statistics.median(latencies),
+            "rss": statistics.mean(m["rss"] for m in memory),
+            "pss": statistics.mean(m["pss"] for m in memory),
+            "uss": statistics.mean(m["uss"] for m in memory),
+            "total_pss": sum(m["pss"] for m in memory)}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sport", default="FootballNcaa")
+    parser.add_argument("--season-year", type=int, required=True)
+    parser.add_argument("--week", type=int, required=True)
+    parser.add_argument("--prior-season-tail", type=int, default=0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--requests", type=int, default=40)
+    parser.add_argument("--warm-mb", type=int, default=1024)
+    parser.add_argument("--modes", default="private,shared")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    shm = Path("/dev/shm") if Path("/dev/shm").is_dir() else None
+    print(f"{'mode':<9}{'workers':>8}{'req/s':>8}{'p50 s':>8}"
+          f"{'RSS MB':>9}{'PSS MB':>9}{'USS MB':>9}{'pod PSS MB':>12}   (memory per worker)")
+    for mode in args.modes.split(","):
+        for workers in args.workers:
+            shared_dir = Path(tempfile.mkdtemp(prefix="metricbot-bench-", dir=shm)) \
+                if mode == "shared" else None
+            try:
+                row = _measure(args, workers, shared_dir)
+            finally:
+                if shared_dir is not None:
+                    shutil.rmtree(shared_dir, ignore_errors=True)
+            print(f"{mode:<9}{workers:>8}{row['rps']:>8.2f}{row['p50']:>8.2f}"
+                  f"{row['rss']:>9.1f}{row['pss']:>9.1f}{row['uss']:>9.1f}{row['total_pss']:>12.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
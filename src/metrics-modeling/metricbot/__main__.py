@@ -1,13 +1,48 @@
-"""CLI entry point: python -m metricbot run-week [options]"""
+"""CLI entry point: python -m metricbot run-week [options]
+
+Argument parsing imports nothing numerical: pipeline.py (pandas, scipy,
+sklearn — most of a run's start-up) and cache.py load inside the command
+that needs them, so --help and a mistyped flag answer at once.
+"""
 
 from __future__ import annotations
 
 import argparse
 import logging
 import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
 
 from .config import normalize_sport
-from .pipeline import run_backtest, run_week
+
+if TYPE_CHECKING:
+    from .pipeline import BacktestResult, RunResult, SeasonBacktestResult
+
+
+def parse_weeks(value: str) -> list[int]:
+    """'4-14' (inclusive range), '4,6,8', or a mix: '2,4-6'."""
+    weeks: set[int] = set()
+    try:
+        for part in value.split(","):
+            part = part.strip()
+            if "-" in part:
+                first, _, last = part.partition("-")
+                weeks.update(range(int(first), int(last) + 1))
+            elif part:
+                weeks.add(int(part))
+    except ValueError as ex:
+        raise argparse.ArgumentTypeError(
+            f"Invalid week list '{value}' — use e.g. 4-14 or 2,4-6.") from ex
+    if not weeks or min(weeks) < 1:
+        raise argparse.ArgumentTypeError(f"Invalid week list '{value}' — weeks start at 1.")
+    return sorted(weeks)
+
+
+def print_profile(result: RunResult | BacktestResult | SeasonBacktestResult) -> None:
+    """The --profile table: one row per stage, critical path starred."""
+    print()
+    print(f"STAGES ({result.elapsed_seconds:.1f}s wall)")
+    print(result.timeline.format())
 
 
 def main(argv: list[str] | None = None) -> int:
@@ -48,10 +83,23 @@ def main(argv: list[str] | None = None) -> int:
         "--publish", action="store_true",
         help="Allow an explicit --season-year/--week run to POST predictions "
              "(default: explicit-week runs never post; live runs post normally).")
+    run.add_argument(
+        "--full-publish", action="store_true",
+        help="POST every DTO, not only the contests that changed since the last "
+             "publish of this week (the publish ledger, METRICBOT_PUBLISH_LEDGER_DIR).")
+    run.add_argument(
+        "--force", action="store_true",
+        help="Run even if nothing the run reads changed since the last publish "
+             "of this week (the freshness check; --full-publish implies it).")
     run.add_argument(
         "--legacy-extraction", action="store_true",
         help="Use the original prototype SQL (live FranchiseSeasonMetric joins, "
              "leaky training) — parity comparison only.")
+    run.add_argument(
+        "--profile", action="store_true",
+        help="Print a per-stage table (seconds, rows in/out, psql MB, tracemalloc "
+             "peak MB) and the critical path. Stages run one at a time under "
+             "tracemalloc, so the run is slower.")
     run.add_argument(
         "--verbose", action="store_true", help="Debug-level logging.")
 
@@ -72,9 +120,84 @@ def main(argv: list[str] | None = None) -> int:
     backtest.add_argument(
         "--dump-intermediate", action="store_true",
         help="Write the prediction artifacts to ./data alongside the grade.")
+    backtest.add_argument(
+        "--profile", action="store_true",
+        help="Print the per-stage table under the grade (see run-week --profile).")
     backtest.add_argument(
         "--verbose", action="store_true", help="Debug-level logging.")
 
+    season = subparsers.add_parser(
+        "backtest-season",
+        help="Backtest and grade a range of weeks from ONE extraction, fits "
+             "fanned out across processes. Never publishes.")
+    season.add_argument(
+        "--sport", type=normalize_sport, default="FootballNcaa",
+        metavar="{FootballNcaa,FootballNfl}",
+        help="Platform Sport enum name (case-insensitive).")
+    season.add_argument("--season-year", type=int, required=True)
+    season.add_argument(
+        "--weeks", type=parse_weeks, required=True, metavar="4-14",
+        help="Weeks to sweep: an inclusive range (4-14), a list (4,6,8), or both.")
+    season.add_argument(
+        "--prior-season-tail", type=int, default=0, metavar="N",
+        help="Same top-up semantics as backtest, applied to every week.")
+    season.add_argument(
+        "--workers", type=int, default=None, metavar="N",
+        help="Worker processes for the per-week fits (default: one per week, "
+             "capped at the CPU count; 1 = in-process).")
+    season.add_argument(
+        "--dump-intermediate", action="store_true",
+        help="Write each week's prediction artifacts to ./data.")
+    season.add_argument(
+        "--profile", action="store_true",
+        help="Print the per-stage table under the rollup (see run-week --profile; "
+             "worker processes' allocations are not traced).")
+    season.add_argument(
+        "--verbose", action="store_true", help="Debug-level logging.")
+
+    cache = subparsers.add_parser(
+        "cache",
+        help="Maintain the on-disk corpus cache (METRICBOT_CACHE_DIR).")
+    cache_commands = cache.add_subparsers(dest="cache_command", required=True)
+    verify = cache_commands.add_parser(
+        "verify",
+        help="Re-check every cached season against the database's watermark "
+             "(games, metric rows, max ComputedUtc). Exits 1 if any partition "
+             "is not fresh.")
+    verify.add_argument(
+        "--sport", type=normalize_sport, default="FootballNcaa",
+        metavar="{FootballNcaa,FootballNfl}",
+        help="Platform Sport enum name (case-insensitive).")
+    verify.add_argument(
+        "--evict", action="store_true",
+        help="Delete partitions that are not fresh; the next run re-extracts them.")
+    verify.add_argument(
+        "--verbose", action="store_true", help="Debug-level logging.")
+
+    explain = subparsers.add_parser(
+        "explain",
+        help="EXPLAIN (ANALYZE, BUFFERS) every extraction query for a week and "
+             "write the JSON plans — to track plan regressions.")
+    explain.add_argument(
+        "--sport", type=normalize_sport, default="FootballNcaa",
+        metavar="{FootballNcaa,FootballNfl}",
+        help="Platform Sport enum name (case-insensitive).")
+    explain.add_argument("--season-year", type=int, required=True)
+    explain.add_argument("--week", type=int, required=True)
+    explain.add_argument(
+        "--prior-season-tail", type=int, default=0, metavar="N",
+        help="The tail the slate queries are explained with.")
+    explain.add_argument(
+        "--variant", choices=("spec", "ranked", "both"), default="both",
+        help="Which SQL to explain: the spec files, their ranked twins "
+             "(METRICBOT_SQL_VARIANT=ranked), or both side by side. Default: both.")
+    explain.add_argument(
+        "--out", type=Path, default=None, metavar="DIR",
+        help="Where the JSON plans go, as DIR/<variant>/<file>.json. Default: ./data/plans "
+             "beside the --dump-intermediate artifacts.")
+    explain.add_argument(
+        "--verbose", action="store_true", help="Debug-level logging.")
+
     args = parser.parse_args(argv)
 
     logging.basicConfig(
@@ -83,6 +206,7 @@ def main(argv: list[str] | None = None) -> int:
     )
 
     if args.command == "backtest":
+        from .pipeline import run_backtest
         try:
             result = run_backtest(
                 sport=args.sport,
@@ -90,17 +214,75 @@ def main(argv: list[str] | None = None) -> int:
                 week=args.week,
                 prior_tail=args.prior_season_tail,
                 dump_intermediate=args.dump_intermediate,
+                profile=args.profile,
             )
             print()
             print(result.format())
+            if args.profile:
+                print_profile(result)
             return 0
         except Exception as ex:  # noqa: BLE001 — CLI boundary
             logging.getLogger("metricbot").exception("Backtest failed: %s", ex)
             return 1
 
+    if args.command == "backtest-season":
+        from .pipeline import run_backtest_season
+        try:
+            result = run_backtest_season(
+                sport=args.sport,
+                season_year=args.season_year,
+                weeks=args.weeks,
+                prior_tail=args.prior_season_tail,
+                dump_intermediate=args.dump_intermediate,
+                workers=args.workers,
+                profile=args.profile,
+            )
+            print()
+            print(result.format())
+            if args.profile:
+                print_profile(result)
+            return 0
+        except Exception as ex:  # noqa: BLE001 — CLI boundary
+            logging.getLogger("metricbot").exception("Season backtest failed: %s", ex)
+            return 1
+
+    if args.command == "cache":
+        from .cache import verify_cache
+        try:
+            checks = verify_cache(sport=args.sport, evict=args.evict)
+        except Exception as ex:  # noqa: BLE001 — CLI boundary
+            logging.getLogger("metricbot").exception("Cache verify failed: %s", ex)
+            return 1
+        print()
+        for check in checks:
+            print(f"{check.season_year}  {check.status:<10}  {check.detail}")
+        if not checks:
+            print("No cached partitions.")
+        return 0 if all(check.status == "fresh" for check in checks) else 1
+
+    if args.command == "explain":
+        from .config import Config
+        from .explain import PlanSummary, explain_queries
+        variants = ("spec", "ranked") if args.variant == "both" else (args.variant,)
+        try:
+            summaries = explain_queries(Config.load(args.sport), args.season_year, args.week,
+                                        args.prior_season_tail, variants, args.out)
+        except Exception as ex:  # noqa: BLE001 — CLI boundary
+            logging.getLogger("metricbot").exception("Explain failed: %s", ex)
+            return 1
+        print()
+        print(PlanSummary.HEADER)
+        for summary in summaries:
+            print(summary.format())
+        written = [summary.plan_path for summary in summaries if summary.plan_path is not None]
+        if written:
+            print(f"\nPlans written under {written[0].parent.parent}")
+        return 1 if any(summary.error for summary in summaries) else 0
+
     if args.command == "run-week":
+        from .pipeline import run_week
         try:
-            return run_week(
+            result = run_week(
                 sport=args.sport,
                 dry_run=args.dry_run,
                 dump_intermediate=args.dump_intermediate,
@@ -108,8 +290,19 @@ def main(argv: list[str] | None = None) -> int:
                 week=args.week,
                 prior_tail=args.prior_season_tail,
                 publish=args.publish,
+                full_publish=args.full_publish,
+                force=args.force,
                 legacy_extraction=args.legacy_extraction,
+                return_result=args.profile,
+                profile=args.profile,
             )
+            if not args.profile:
+                return result
+            if result.timeline is None:     # skipped as unchanged: no stage ran
+                print(f"\nSKIPPED: {result.freshness.reason}")
+            else:
+                print_profile(result)
+            return 0
         except Exception as ex:  # noqa: BLE001 — CLI boundary: fail loudly, exit nonzero
             # .exception() so the traceback lands too: this is the only
             # diagnostic artifact for a scheduled weekly run.
@@ -1,32 +1,109 @@
 """POST predictions to the API — replaces the manual Postman step.
 
-Stdlib urllib on purpose: the venv has no HTTP client and this is one
-JSON POST. The endpoint is the existing admin ingestion route,
+Stdlib only on purpose: the venv has no HTTP client and this is a few
+JSON POSTs. The endpoint is the existing admin ingestion route,
 authenticated with the admin token header (AdminApiToken filter).
+
+The ingestion handler REPLACES the user's predictions for every contest
+in a request (delete, then insert). That makes a repeated request safe,
+and it is why a slate is split only between contests: a chunk carrying
+a contest's ATS prediction without its SU one would delete the SU one
+posted by the chunk before it. So post_predictions:
+
+- packs whole contests into chunks of at most
+  METRICBOT_PUBLISH_CHUNK_DTOS DTOs (a normal week is one chunk);
+- sends them in order over ONE keep-alive connection;
+- retries a chunk on a timeout, a dropped connection, 408/429 or any
+  5xx, with full-jitter exponential backoff (Retry-After honoured, up
+  to the cap) — never on another 4xx, which a retry cannot fix;
+- marks every chunk with an Idempotency-Key: a hash of the run's DTOs
+  plus the chunk's position, identical across retries and across
+  re-runs that would publish the same predictions. ADVISORY ONLY: the
+  ingestion route does not read it, so it deduplicates nothing — a
+  retry is safe because of the replace semantics above, not the key.
+  It is sent (and logged in the PublishReport) so a request in the
+  API's access logs can be matched to the run that sent it;
+- gzip-encodes the bodies with METRICBOT_PUBLISH_GZIP=true — off by
+  default, and to stay off until the API enables request
+  decompression: today it would reject or misread the bodies.
+
+Bodies are compact JSON from encode_dtos: orjson when installed
+(requirements-service.txt), else the stdlib with the same separators —
+the same bytes either way. A single-chunk publish sends the encoding the
+DTOs were built with (dtos.PredictionDtos) rather than re-encoding it.
+
+A chunk that exhausts its attempts fails the publish with the chunks
+already accepted named in the PublishError; publishing again re-sends
+them all, which the replace semantics absorb.
 """
 
 from __future__ import annotations
 
+import gzip
+import hashlib
+import http.client
 import json
 import logging
-import urllib.error
+import random
+import time
 import urllib.parse
-import urllib.request
+from dataclasses import dataclass
 
 from .config import Config
 
+try:
+    import orjson
+except ImportError:     # optional: encode_dtos falls back to the stdlib
+    orjson = None
+
 logger = logging.getLogger("metricbot.api")
 
-# urlopen honours file:/ftp: too — a misconfigured base URL would then
-# silently change the destination instead of failing. Restrict it.
+# A misconfigured base URL (file:, ftp:, a typo) must fail the publish,
+# not be coerced into some other destination. Restrict it.
 ALLOWED_SCHEMES = ("https", "http")
 
+PUBLISH_ATTEMPTS = 4
+# Full jitter: retry n sleeps uniform(0, min(CAP, BASE * 2**(n-1))).
+BACKOFF_BASE_SECONDS = 1.0
+BACKOFF_CAP_SECONDS = 20.0
+# Besides every 5xx.
+RETRY_STATUSES = (408, 429)
+
+# Seams for the tests.
+_sleep = time.sleep
+_jitter = random.uniform
+
 
 class PublishError(RuntimeError):
     pass
 
 
-def post_predictions(config: Config, dtos: list[dict], timeout_seconds: int = 60) -> str:
+@dataclass(frozen=True)
+class ChunkReport:
+    index: int                  # 1-based
+    contests: int
+    dtos: int
+    body_bytes: int             # as sent (compressed with gzip on)
+    attempts: int
+    seconds: float              # first send to acceptance, backoff included
+    status: int
+
+
+@dataclass(frozen=True)
+class PublishReport:
+    idempotency_key: str        # the run's; chunk n sends "<key>-<n>of<total>"
+    gzip: bool
+    chunks: tuple[ChunkReport, ...]
+
+    def __str__(self) -> str:
+        return (f"{sum(c.dtos for c in self.chunks)} DTOs in {len(self.chunks)} chunk(s), "
+                f"{sum(c.body_bytes for c in self.chunks)} bytes"
+                f"{' gzip' if self.gzip else ''}, "
+                f"{sum(c.attempts for c in self.chunks) - len(self.chunks)} retr(ies), "
+                f"{sum(c.seconds for c in self.chunks):.2f}s (key {self.idempotency_key})")
+
+
+def post_predictions(config: Config, dtos: list[dict], timeout_seconds: int = 60) -> PublishReport:
     url = f"{config.api_base_url}/admin/ai-predictions/{config.metricbot_user_id}"
 
     parsed = urllib.parse.urlparse(url)
@@ -43,22 +120,105 @@ def post_predictions(config: Config, dtos: list[dict], timeout_seconds: int = 60
             "in-cluster service DNS, wrong for any public endpoint.",
             parsed.hostname)
 
-    request = urllib.request.Request(
-        url,
-        data=json.dumps(dtos).encode("utf-8"),
-        headers={
-            "Content-Type": "application/json",
-            "X-Admin-Token": config.admin_token,
-        },
-        method="POST",
-    )
+    payload = getattr(dtos, "encoded", None) or encode_dtos(dtos)
+    run_key = hashlib.sha256(config.metricbot_user_id.encode("utf-8") + b"\0" + payload) \
+        .hexdigest()[:32]
+    chunks = chunk_by_contest(dtos, config.publish_chunk_dtos)
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else "")
+
+    connection_type = (http.client.HTTPSConnection if parsed.scheme == "https"
+                       else http.client.HTTPConnection)
+    connection = connection_type(parsed.hostname, parsed.port, timeout=timeout_seconds)
+    reports: list[ChunkReport] = []
+    try:
+        for index, chunk in enumerate(chunks, start=1):
+            body = payload if len(chunks) == 1 else encode_dtos(chunk)
+            headers = {
+                "Content-Type": "application/json",
+                "X-Admin-Token": config.admin_token,
+                # Advisory: the API ignores it (see the module docstring).
+                "Idempotency-Key": f"{run_key}-{index}of{len(chunks)}",
+            }
+            if config.publish_gzip:
+                body = gzip.compress(body)
+                headers["Content-Encoding"] = "gzip"
+            try:
+                report = _send(connection, path, body, headers, index,
+                               len({dto["ContestId"] for dto in chunk}), len(chunk))
+            except PublishError as ex:
+                accepted = f"chunks 1-{index - 1} of {len(chunks)} were accepted" if index > 1 \
+                    else "nothing was accepted"
+                raise PublishError(f"{ex} ({url}; {accepted})") from ex
+            logger.info("Published chunk %d/%d: %d DTOs (%d contests), %d bytes, "
+                        "%d attempt(s), %.2fs", index, len(chunks), report.dtos, report.contests,
+                        report.body_bytes, report.attempts, report.seconds)
+            reports.append(report)
+    finally:
+        connection.close()
+    return PublishReport(idempotency_key=run_key, gzip=config.publish_gzip, chunks=tuple(reports))
+
+
+def encode_dtos(dtos: list[dict]) -> bytes:
+    """The DTOs as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(dtos)
+    # orjson's output: no spaces, no \u escapes (ids are str or UUID).
+    return json.dumps(dtos, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+
+
+def chunk_by_contest(dtos: list[dict], max_dtos: int) -> list[list[dict]]:
+    """`dtos` in order, split into chunks of at most `max_dtos` without
+    splitting a contest (one contest over the limit is a chunk alone)."""
+    contests: dict[str, list[dict]] = {}
+    for dto in dtos:
+        contests.setdefault(dto["ContestId"], []).append(dto)
+    chunks: list[list[dict]] = []
+    for contest in contests.values():
+        if chunks and len(chunks[-1]) + len(contest) <= max_dtos:
+            chunks[-1].extend(contest)
+        else:
+            chunks.append(list(contest))
+    return chunks
+
+
+def _send(connection: http.client.HTTPConnection, path: str, body: bytes, headers: dict,
+          index: int, contests: int, dtos: int) -> ChunkReport:
+    started = time.perf_counter()
+    attempt = 0
+    while True:
+        attempt += 1
+        retry_after = None
+        try:
+            connection.request("POST", path, body=body, headers=headers)
+            response = connection.getresponse()
+            detail = response.read().decode("utf-8", errors="replace")
+        except (OSError, http.client.HTTPException) as ex:
+            # Timeout, refused or dropped connection: the next request
+            # reconnects.
+            connection.close()
+            failure = f"could not complete chunk {index}: {type(ex).__name__}: {ex}"
+        else:
+            if response.status < 400:
+                return ChunkReport(index=index, contests=contests, dtos=dtos,
+                                   body_bytes=len(body), attempts=attempt,
+                                   seconds=time.perf_counter() - started, status=response.status)
+            failure = f"API returned {response.status} for chunk {index}: {detail[:1000]}"
+            if response.status < 500 and response.status not in RETRY_STATUSES:
+                raise PublishError(failure)
+            retry_after = _retry_after(response.getheader("Retry-After"))
+        if attempt == PUBLISH_ATTEMPTS:
+            raise PublishError(f"{failure} — gave up after {attempt} attempts")
+        delay = _jitter(0, min(BACKOFF_CAP_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, BACKOFF_CAP_SECONDS))
+        logger.warning("%s; retrying in %.1fs (attempt %d of %d)", failure, delay, attempt + 1,
+                       PUBLISH_ATTEMPTS)
+        _sleep(delay)
+
 
+def _retry_after(value: str | None) -> float | None:
+    # The seconds form only; an HTTP-date falls back to the backoff.
     try:
-        with urllib.request.urlopen(request, timeout=timeout_seconds) as response:
-            body = response.read().decode("utf-8", errors="replace")
-            return f"{response.status}: {body[:500]}"
-    except urllib.error.HTTPError as ex:
-        detail = ex.read().decode("utf-8", errors="replace")[:1000]
-        raise PublishError(f"API returned {ex.code} for {url}: {detail}") from ex
-    except urllib.error.URLError as ex:
-        raise PublishError(f"Could not reach {url}: {ex.reason}") from ex
+        return max(0.0, float(value)) if value is not None else None
+    except ValueError:
+        return None
@@ -0,0 +1,383 @@
+"""On-disk corpus cache: closed seasons' as-of training rows as Parquet.
+
+Every run's as-of training extraction re-reads every historical season,
+yet a finished season's rows never change — CompetitionMetric rows are
+immutable once computed and the entering-game windows only look inside
+their own season. So with METRICBOT_CACHE_DIR set, the training corpus
+is assembled season by season (competition_metrics_asof_season.sql):
+seasons before the target one come from
+
+    <cache_dir>/<database>/season=<year>/<fingerprint>.parquet
+
+and only the open season's weeks are queried. The fingerprint hashes the
+season SQL the run resolves (extract.sql_file_for) and MODEL_VERSION,
+so editing the query or bumping the model strands old partitions
+instead of serving them.
+
+Each partition's sidecar JSON records the season's watermark at write
+time (corpus_season_watermarks.sql: games, metric rows, max
+ComputedUtc). Every assembly re-reads the watermarks — one cheap
+aggregate query — and re-extracts a season whose watermark moved, so a
+recompute or a late correction is picked up on the next run.
+`metricbot cache verify` runs the same comparison on demand.
+
+With METRICBOT_WARM_CORPUS_MB set, closed seasons are also held in
+memory (WarmCorpus, one per database) in front of the Parquet files —
+or instead of them, without a cache directory — under the same
+watermark check. The service preloads it at startup (preload_closed_seasons),
+so a run reads the watermarks, the open season's weeks and its slate and
+nothing else. The memory is bounded: past the budget the oldest seasons
+are dropped, and come from disk or the database as before. With
+METRICBOT_SHARED_CORPUS_DIR also set, the warm seasons are views of
+files every worker process maps (shared.py), not per-process copies.
+
+pyarrow is an OPTIONAL dependency (requirements-cache.txt); Config.load
+refuses METRICBOT_CACHE_DIR without it. The warm corpus needs nothing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from . import MODEL_VERSION
+from .config import Config, normalize_sport
+from .extract import (ASOF_SEASON_SQL, WATERMARKS_SQL, ExtractionError, _run_query,
+                      current_query_log, sql_file_for)
+from .schema import schema_for
+
+logger = logging.getLogger("metricbot.cache")
+
+# The watermark columns a partition must still match to be served.
+WATERMARK_FIELDS = ("Games", "MetricRows", "MaxComputedUtc")
+
+
+def fingerprint(config: Config) -> str:
+    """Identity of what a partition holds: the season SQL `config` runs
+    (its SQL variant's file) plus the model version, and the feature
+    dtype when it is not the float64 default (a float32 partition cannot
+    be widened back to the exact values). Anything that changes the rows
+    changes one of them."""
+    digest = hashlib.sha256(sql_file_for(config, ASOF_SEASON_SQL).read_bytes())
+    digest.update(MODEL_VERSION.encode("utf-8"))
+    if config.feature_dtype != "float64":
+        digest.update(config.feature_dtype.encode("utf-8"))
+    if config.sql_variant != "spec":
+        digest.update(f"|sql_variant={config.sql_variant}".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def season_watermarks(config: Config) -> dict[int, dict]:
+    """SeasonYear -> {Games, MetricRows, MaxComputedUtc} from the database."""
+    frame = _run_query(config, WATERMARKS_SQL, allow_empty=True)
+    return {int(row["SeasonYear"]): {"Games": int(row["Games"]),
+                                     "MetricRows": int(row["MetricRows"]),
+                                     "MaxComputedUtc": str(row["MaxComputedUtc"])}
+            for row in frame.to_dict("records")}
+
+
+@dataclass(frozen=True)
+class PartitionCheck:
+    """One partition's verdict from verify(): "fresh", "stale" (watermark
+    moved), "superseded" (written by other SQL or model version) or
+    "orphaned" (the season has no training games any more)."""
+    season_year: int
+    path: Path
+    status: str
+    detail: str
+
+
+class CorpusCache:
+    """The cache directory for one database (= one sport)."""
+
+    def __init__(self, config: Config):
+        if config.cache_dir is None:
+            raise ValueError("CorpusCache needs Config.cache_dir (METRICBOT_CACHE_DIR).")
+        self.root = config.cache_dir / config.pg_database
+        self.fingerprint = fingerprint(config)
+
+    def partition_path(self, season_year: int) -> Path:
+        return self.root / f"season={season_year}" / f"{self.fingerprint}.parquet"
+
+    def read(self, season_year: int, watermark: dict) -> tuple[pd.DataFrame, dict] | None:
+        """The cached season and its metadata, or None if it is missing or
+        its watermark no longer matches the database's."""
+        path = self.partition_path(season_year)
+        meta = _read_meta(path)
+        if meta is None or not path.is_file():
+            return None
+        if any(meta["watermark"].get(field) != watermark[field] for field in WATERMARK_FIELDS):
+            return None
+        return pd.read_parquet(path), meta
+
+    def write(self, season_year: int, frame: pd.DataFrame, watermark: dict, payload_bytes: int) -> None:
+        path = self.partition_path(season_year)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "season_year": season_year,
+            "fingerprint": self.fingerprint,
+            "model_version": MODEL_VERSION,
+            "sql_file": ASOF_SEASON_SQL.name,
+            "rows": len(frame),
+            "payload_bytes": payload_bytes,
+            "watermark": {field: watermark[field] for field in WATERMARK_FIELDS},
+            "written_utc": datetime.now(timezone.utc).isoformat(),
+        }
+        # Write-then-rename, data before sidecar: a concurrent reader (a
+        # second service worker) sees the old partition or the whole new
+        # one, never a torn file.
+        for target, write in ((path, lambda tmp: frame.to_parquet(tmp, index=False)),
+                              (path.with_suffix(".json"),
+                               lambda tmp: tmp.write_text(json.dumps(meta, indent=2), encoding="utf-8"))):
+            tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            write(tmp)
+            os.replace(tmp, target)
+
+    def verify(self, watermarks: dict[int, dict]) -> list[PartitionCheck]:
+        checks = []
+        for path in sorted(self.root.glob("season=*/*.parquet")):
+            season_year = int(path.parent.name.partition("=")[2])
+            meta = _read_meta(path)
+            if meta is None:
+                checks.append(PartitionCheck(season_year, path, "stale", "sidecar missing or unreadable"))
+            elif path.stem != self.fingerprint:
+                checks.append(PartitionCheck(
+                    season_year, path, "superseded",
+                    f"written for {meta.get('model_version')} / {meta.get('sql_file')} ({path.stem})"))
+            elif season_year not in watermarks:
+                checks.append(PartitionCheck(season_year, path, "orphaned",
+                                             "no completed training games in the database"))
+            else:
+                moved = [f"{field} {meta['watermark'].get(field)} -> {watermarks[season_year][field]}"
+                         for field in WATERMARK_FIELDS
+                         if meta["watermark"].get(field) != watermarks[season_year][field]]
+                checks.append(PartitionCheck(
+                    season_year, path, "stale" if moved else "fresh",
+                    "; ".join(moved) if moved else f"{meta['rows']} rows"))
+        return checks
+
+    def evict(self, check: PartitionCheck) -> None:
+        check.path.unlink(missing_ok=True)
+        check.path.with_suffix(".json").unlink(missing_ok=True)
+        if not any(check.path.parent.iterdir()):
+            shutil.rmtree(check.path.parent, ignore_errors=True)
+
+
+class WarmCorpus:
+    """Closed seasons' frames in memory for one database, each with the
+    watermark it was read at. At most `max_bytes` (frame memory, deep,
+    mapped columns included): adding past it drops the oldest seasons
+    first — the recent ones are the last to go stale and the cheapest to
+    lose last."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.state = "cold"     # cold | warming | warm
+        self._seasons: dict[int, tuple[pd.DataFrame, dict, int, int]] = {}
+        self._dropped: set[int] = set()
+        self._lock = threading.Lock()
+
+    def get(self, season_year: int, watermark: dict) -> pd.DataFrame | None:
+        with self._lock:
+            held = self._seasons.get(season_year)
+        if held is None or any(held[1].get(field) != watermark[field] for field in WATERMARK_FIELDS):
+            return None
+        return held[0]
+
+    def put(self, season_year: int, frame: pd.DataFrame, watermark: dict,
+            mapped_bytes: int = 0) -> None:
+        """`mapped_bytes`: how much of the frame is shared mapped files
+        (shared.py) rather than this process's own memory."""
+        size = int(frame.memory_usage(deep=True).sum())
+        with self._lock:
+            self._seasons.pop(season_year, None)
+            while self._seasons and self.nbytes + size > self.max_bytes:
+                oldest = min(self._seasons)
+                if oldest > season_year:
+                    break
+                del self._seasons[oldest]
+                self._dropped.add(oldest)
+            if self.nbytes + size > self.max_bytes:
+                self._dropped.add(season_year)
+                return
+            self._seasons[season_year] = (frame, {f: watermark[f] for f in WATERMARK_FIELDS}, size,
+                                          mapped_bytes)
+            self._dropped.discard(season_year)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(held[2] for held in self._seasons.values())
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {"state": self.state, "seasons": sorted(self._seasons), "bytes": self.nbytes,
+                    "mapped_bytes": sum(held[3] for held in self._seasons.values()),
+                    "budget_bytes": self.max_bytes, "over_budget": sorted(self._dropped)}
+
+
+_WARM: dict[Config, WarmCorpus] = {}
+_WARM_LOCK = threading.Lock()
+
+
+def warm_corpus(config: Config) -> WarmCorpus | None:
+    """The database's warm corpus, created on first use; None unless
+    Config.warm_corpus_mb is set."""
+    if config.warm_corpus_mb <= 0:
+        return None
+    with _WARM_LOCK:
+        if config not in _WARM:
+            _WARM[config] = WarmCorpus(config.warm_corpus_mb * 2**20)
+        return _WARM[config]
+
+
+def warm_corpora() -> dict[str, dict]:
+    """Database -> WarmCorpus.summary(), for health checks and metrics."""
+    with _WARM_LOCK:
+        corpora = {config.pg_database: warm for config, warm in _WARM.items()}
+    return {database: warm.summary() for database, warm in corpora.items()}
+
+
+def preload_closed_seasons(config: Config) -> None:
+    """Load every closed season (all but the newest in the database)
+    into the warm corpus — from Parquet where cached, else extracted.
+    Marks it warm when done; cold again if the load fails (runs then
+    warm it as they go)."""
+    warm = warm_corpus(config)
+    if warm is None:
+        return
+    warm.state = "warming"
+    try:
+        watermarks = season_watermarks(config)
+        if watermarks:
+            _closed_seasons(config, watermarks, max(watermarks))
+    except BaseException:
+        warm.state = "cold"
+        raise
+    warm.state = "warm"
+    summary = warm.summary()
+    logger.info("warm corpus %s: %d season(s), %.1f MB of %.0f MB", config.pg_database,
+                len(summary["seasons"]), summary["bytes"] / 2**20, summary["budget_bytes"] / 2**20)
+
+
+def _closed_seasons(config: Config, watermarks: dict[int, dict],
+                    season_year: int) -> list[pd.DataFrame]:
+    """The seasons before `season_year`, each from memory, then the
+    shared directory, then disk, then the database; refreshes whichever
+    layers missed."""
+    cache = CorpusCache(config) if config.cache_dir is not None else None
+    warm = warm_corpus(config)
+    shared = None
+    if config.shared_corpus_dir is not None:
+        from .shared import SharedCorpus  # shared.py builds on this module
+        shared = SharedCorpus(config)
+    frames = []
+    held = attached = hits = misses = bytes_saved = 0
+    for year in sorted(y for y in watermarks if y < season_year):
+        if watermarks[year]["MetricRows"] == 0:
+            continue
+        frame = warm.get(year, watermarks[year]) if warm is not None else None
+        if frame is not None:
+            held += 1
+            frames.append(frame)
+            continue
+        mapped = shared.attach(year, watermarks[year]) if shared is not None else None
+        if mapped is not None:
+            attached += 1
+        else:
+            cached = cache.read(year, watermarks[year]) if cache is not None else None
+            if cached is not None:
+                frame, meta = cached
+                hits += 1
+                bytes_saved += meta["payload_bytes"]
+            else:
+                misses += 1
+                frame = _run_query(config, ASOF_SEASON_SQL, {"season_year": year, "week": 0},
+                                   allow_empty=True)
+                if cache is not None:
+                    payload_bytes = int(frame.memory_usage(deep=True).sum())
+                    cache.write(year, frame, watermarks[year], payload_bytes)
+            if shared is not None and not frame.empty:
+                mapped = _share(shared, year, frame, watermarks[year])
+        if mapped is not None:
+            frame = mapped[0]
+        if warm is not None:
+            warm.put(year, frame, watermarks[year], mapped[1] if mapped is not None else 0)
+        frames.append(frame)
+
+    logger.info("corpus cache %s: %d in memory, %d mapped, %d hit(s), %d miss(es), "
+                "%d bytes not re-extracted",
+                config.pg_database, held, attached, hits, misses, bytes_saved)
+    if (log := current_query_log()) is not None:
+        log.cache_hits += held + attached + hits
+        log.cache_misses += misses
+    return frames
+
+
+def _share(shared, season_year: int, frame: pd.DataFrame,
+           watermark: dict) -> tuple[pd.DataFrame, int] | None:
+    # Best effort, like a cache write: a full tmpfs leaves this process
+    # holding its own copy, not a failed run.
+    try:
+        shared.publish(season_year, frame, watermark)
+        return shared.attach(season_year, watermark)
+    except (OSError, ValueError) as ex:
+        logger.warning("could not share season %d of %s: %s", season_year,
+                       shared.root.name, ex)
+        return None
+
+
+def _read_meta(path: Path) -> dict | None:
+    try:
+        return json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def cached_asof_training(config: Config, season_year: int, week: int) -> pd.DataFrame:
+    """extract_asof_training through the cache: closed seasons from the
+    warm corpus or Parquet (re-extracted on a miss or a moved
+    watermark), the open season's weeks < `week` from the database.
+    Same rows and columns as the one-query extraction, in the same
+    season/week order."""
+    frames = _closed_seasons(config, season_watermarks(config), season_year)
+    if week > 1:
+        frames.append(_run_query(config, ASOF_SEASON_SQL,
+                                 {"season_year": season_year, "week": week},
+                                 allow_empty=True))
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        raise ExtractionError(
+            f"{ASOF_SEASON_SQL.name} returned zero rows — is the season week window open "
+            f"and are metrics generated for {config.pg_database}?")
+    # Re-typed after the concat: categories differ per season, so
+    # concatenated ref/label columns fall back to object — and partitions
+    # written before the extraction schema come back untyped.
+    return schema_for(ASOF_SEASON_SQL).apply(pd.concat(frames, ignore_index=True),
+                                             config.feature_dtype)
+
+
+def verify_cache(sport: str, evict: bool = False) -> list[PartitionCheck]:
+    """`metricbot cache verify`: check every partition for the sport
+    against the database's current watermarks; with evict=True delete
+    every partition that is not fresh (the next run re-extracts)."""
+    config = Config.load(normalize_sport(sport))
+    if config.cache_dir is None:
+        raise SystemExit("METRICBOT_CACHE_DIR is not set — there is no corpus cache to verify.")
+    cache = CorpusCache(config)
+    checks = cache.verify(season_watermarks(config))
+    for check in checks:
+        if check.status != "fresh":
+            logger.warning("season %d partition %s: %s", check.season_year, check.status, check.detail)
+            if evict:
+                cache.evict(check)
+    return checks
@@ -14,6 +14,7 @@ Kubernetes secrets.
 
 from __future__ import annotations
 
+import importlib.util
 import os
 from dataclasses import dataclass
 from pathlib import Path
@@ -49,6 +50,23 @@ def normalize_sport(value: str) -> str:
             + ", ".join(SUPPORTED_SPORTS))
     return match
 
+# Extraction backends (extract.py). psql is the default and the only one
+# the base requirements support; "psycopg" needs requirements-driver.txt.
+EXTRACT_BACKENDS = ("psql", "psycopg")
+
+# Extracted feature column dtypes (schema.py). float64 is exact; float32
+# halves the training corpus in memory at float32 feature precision.
+FEATURE_DTYPES = ("float64", "float32")
+
+# How the as-of frames' windows are computed: "sql" by the as-of
+# queries, "python" from one team-game extraction (windows.py).
+ASOF_ENGINES = ("sql", "python")
+
+# Which extraction SQL runs: "spec" (./sql, the prototype's files) or
+# "ranked" (./sql/ranked — same rows, odds pre-ranked once; files
+# without a ranked twin run the spec file).
+SQL_VARIANTS = ("spec", "ranked")
+
 # The synthetic MetricBot user the API attributes predictions to
 # (IsSynthetic = true; see design doc, Decision 6).
 DEFAULT_METRICBOT_USER_ID = "b210d677-19c3-4f26-ac4b-b2cc7ad58c44"
@@ -95,6 +113,49 @@ class Config:
     # residual model trains on the FBS∩priced subset (NCAAFB); False =
     # every game (NFL). Defaulted so test fixtures stay terse.
     fbs_scope: bool = True
+    # METRICBOT_EXTRACT_BACKEND: "psql" (default — shells out, no driver)
+    # or "psycopg" (streams typed columns over a server-side cursor).
+    extract_backend: str = "psql"
+    # METRICBOT_CACHE_DIR: root of the on-disk corpus cache (cache.py) —
+    # closed seasons' training rows as Parquet. None = every run
+    # extracts the full corpus, as before.
+    cache_dir: Path | None = None
+    # METRICBOT_RESULT_CACHE_DIR: where settled backtest results persist
+    # as JSON (results.py), so a restarted service starts warm. None =
+    # memory only. Needs no pyarrow.
+    result_cache_dir: Path | None = None
+    # METRICBOT_FEATURE_DTYPE: "float64" (default) or "float32" — the
+    # dtype extraction gives the feature columns (schema.py).
+    feature_dtype: str = "float64"
+    # METRICBOT_WARM_CORPUS_MB: > 0 = keep this sport's closed seasons in
+    # memory, up to this many MB, across runs (cache.WarmCorpus; the
+    # service preloads it). 0 = off.
+    warm_corpus_mb: int = 0
+    # METRICBOT_SHARED_CORPUS_DIR: with the warm corpus, publish its
+    # seasons here as memory-mapped columns that every worker process
+    # maps read-only (shared.py). None = each process holds its own.
+    shared_corpus_dir: Path | None = None
+    # METRICBOT_PUBLISH_CHUNK_DTOS: most DTOs per publish request; a
+    # contest's DTOs are never split (api.py). METRICBOT_PUBLISH_GZIP:
+    # gzip the request bodies — only once the API decompresses them.
+    publish_chunk_dtos: int = 500
+    publish_gzip: bool = False
+    # METRICBOT_PUBLISH_LEDGER_DIR: where each week's last published DTO
+    # hashes (ledger.py) and run watermarks (freshness.py) are kept, so
+    # a re-run posts only changed contests and an unchanged one stops.
+    # Opt-in: it must be storage every writer to the API shares and that
+    # outlives the pod — a per-replica or ephemeral directory skips
+    # contests another replica changed since. Unset or "off" (None here)
+    # publishes every row of every run.
+    publish_ledger_dir: Path | None = None
+    # METRICBOT_ASOF_ENGINE: "sql" (default — the as-of queries compute
+    # the windows) or "python" (one team-game extraction per run; the
+    # windows are computed in NumPy by windows.py, bypassing the corpus
+    # cache).
+    asof_engine: str = "sql"
+    # METRICBOT_SQL_VARIANT: "spec" (default) or "ranked" — the corpus
+    # queries' ranked twins in sql/ranked (extract.sql_file_for).
+    sql_variant: str = "spec"
 
     @staticmethod
     def load(sport: str) -> "Config":
@@ -110,6 +171,7 @@ class Config:
                     f"variable or in _metricbot.env beside your secrets file")
             return value
 
+        warm_corpus_mb = _warm_corpus_mb(get("METRICBOT_WARM_CORPUS_MB", "0"))
         return Config(
             pg_host=get("METRICBOT_PG_HOST"),
             pg_user=get("METRICBOT_PG_USER"),
@@ -120,4 +182,118 @@ class Config:
             api_base_url=get("METRICBOT_API_BASE_URL").rstrip("/"),
             admin_token=get("METRICBOT_ADMIN_TOKEN"),
             metricbot_user_id=get("METRICBOT_USER_ID", DEFAULT_METRICBOT_USER_ID),
+            extract_backend=_extract_backend(get("METRICBOT_EXTRACT_BACKEND", "psql")),
+            cache_dir=_cache_dir(get("METRICBOT_CACHE_DIR", "")),
+            result_cache_dir=_result_cache_dir(get("METRICBOT_RESULT_CACHE_DIR", "")),
+            feature_dtype=_feature_dtype(get("METRICBOT_FEATURE_DTYPE", "float64")),
+            warm_corpus_mb=warm_corpus_mb,
+            shared_corpus_dir=_shared_corpus_dir(get("METRICBOT_SHARED_CORPUS_DIR", ""),
+                                                 warm_corpus_mb),
+            publish_chunk_dtos=_publish_chunk_dtos(get("METRICBOT_PUBLISH_CHUNK_DTOS", "500")),
+            publish_gzip=_publish_gzip(get("METRICBOT_PUBLISH_GZIP", "false")),
+            publish_ledger_dir=_publish_ledger_dir(get("METRICBOT_PUBLISH_LEDGER_DIR", "")),
+            asof_engine=_asof_engine(get("METRICBOT_ASOF_ENGINE", "sql"), warm_corpus_mb),
+            sql_variant=_sql_variant(get("METRICBOT_SQL_VARIANT", "spec")),
         )
+
+
+def _extract_backend(value: str) -> str:
+    backend = value.strip().lower()
+    if backend not in EXTRACT_BACKENDS:
+        raise SystemExit(
+            f"Unknown METRICBOT_EXTRACT_BACKEND '{value}'. Expected one of: "
+            + ", ".join(EXTRACT_BACKENDS))
+    return backend
+
+
+def _feature_dtype(value: str) -> str:
+    dtype = value.strip().lower()
+    if dtype not in FEATURE_DTYPES:
+        raise SystemExit(
+            f"Unknown METRICBOT_FEATURE_DTYPE '{value}'. Expected one of: "
+            + ", ".join(FEATURE_DTYPES))
+    return dtype
+
+
+def _asof_engine(value: str, warm_corpus_mb: int) -> str:
+    engine = value.strip().lower()
+    if engine not in ASOF_ENGINES:
+        raise SystemExit(
+            f"Unknown METRICBOT_ASOF_ENGINE '{value}'. Expected one of: " + ", ".join(ASOF_ENGINES))
+    # The warm corpus holds the SQL's training rows; the Python engine
+    # rebuilds the corpus from team games every run and would never read it.
+    if engine == "python" and warm_corpus_mb > 0:
+        raise SystemExit(
+            "METRICBOT_ASOF_ENGINE=python computes the corpus from team games and never reads "
+            "the warm corpus — unset METRICBOT_WARM_CORPUS_MB, or use the sql engine.")
+    return engine
+
+
+def _sql_variant(value: str) -> str:
+    variant = value.strip().lower()
+    if variant not in SQL_VARIANTS:
+        raise SystemExit(
+            f"Unknown METRICBOT_SQL_VARIANT '{value}'. Expected one of: " + ", ".join(SQL_VARIANTS))
+    return variant
+
+
+def _warm_corpus_mb(value: str) -> int:
+    try:
+        megabytes = int(value.strip())
+    except ValueError:
+        megabytes = -1
+    if megabytes < 0:
+        raise SystemExit(
+            f"METRICBOT_WARM_CORPUS_MB must be a whole number of megabytes (0 = off); got '{value}'.")
+    return megabytes
+
+
+def _publish_chunk_dtos(value: str) -> int:
+    try:
+        dtos = int(value.strip())
+    except ValueError:
+        dtos = 0
+    if dtos < 1:
+        raise SystemExit(f"METRICBOT_PUBLISH_CHUNK_DTOS must be a positive whole number; got '{value}'.")
+    return dtos
+
+
+def _publish_gzip(value: str) -> bool:
+    flag = value.strip().lower()
+    if flag not in ("true", "false", "1", "0"):
+        raise SystemExit(f"METRICBOT_PUBLISH_GZIP must be true or false; got '{value}'.")
+    return flag in ("true", "1")
+
+
+def _publish_ledger_dir(value: str) -> Path | None:
+    if value.strip().lower() in ("", "off"):
+        return None
+    return Path(value.strip()).expanduser()
+
+
+def _shared_corpus_dir(value: str, warm_corpus_mb: int) -> Path | None:
+    if not value.strip():
+        return None
+    if warm_corpus_mb <= 0:
+        raise SystemExit(
+            "METRICBOT_SHARED_CORPUS_DIR backs the warm corpus — set METRICBOT_WARM_CORPUS_MB "
+            "too, or unset it.")
+    return Path(value.strip()).expanduser()
+
+
+def _cache_dir(value: str) -> Path | None:
+    if not value.strip():
+        return None
+    # Checked here, not on first use: a misconfigured cache should stop
+    # the run before extraction, not after it.
+    if importlib.util.find_spec("pyarrow") is None:
+        raise SystemExit(
+            "METRICBOT_CACHE_DIR is set but pyarrow is not installed — "
+            "pip install -r requirements-cache.txt, or unset it.")
+    return Path(value.strip()).expanduser()
+
+
+def _result_cache_dir(value: str) -> Path | None:
+    if not value.strip():
+        return None
+    return Path(value.strip()).expanduser()
@@ -0,0 +1,146 @@
+"""Driver-backed extraction: psycopg server-side cursors straight into
+typed columns (METRICBOT_EXTRACT_BACKEND=psycopg).
+
+The psql path buffers the whole --csv stdout as one string and re-parses
+it, so a large corpus exists as text, as the string, and as the frame at
+once — and every number round-trips through decimal text. Here rows
+arrive in binary over a named (server-side) cursor, FETCH_ROWS at a
+time, and each chunk is converted column-by-column into NumPy arrays
+before the next is fetched.
+
+The resulting frame is deliberately dtype-identical to what
+pd.read_csv makes of psql's output — int columns with nulls become
+float64, booleans are object columns (True/False rather than psql's
+'t'/'f' text), all-null columns are float64 NaN — and extract.py then
+casts it with the SQL file's schema (schema.py), exactly as it does a
+parsed one, so the rest of the pipeline cannot tell the backends apart. Values match
+psql's to the last bit except where read_csv's fast float parser lands
+one ulp off the correctly rounded value of a long numeric literal.
+
+psycopg is an OPTIONAL dependency (requirements-driver.txt); importing
+this module without it is fine, running a query is not.
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .config import Config
+from .extract import PSQL_TIMEOUT_SECONDS, ExtractionError, ExtractionTimeout
+
+# Rows per round trip. Large enough that per-fetch overhead vanishes,
+# small enough that one chunk of Python row tuples stays a few MB.
+FETCH_ROWS = 5000
+
+# Postgres type OIDs we convert natively; anything else arrives as text.
+_BOOL_OID = 16
+_INT_OIDS = {20, 21, 23}            # int8, int2, int4
+_FLOAT_OIDS = {700, 701, 1700}      # float4, float8, numeric
+
+# psql-style :name variables — but not the ::type casts that follow them.
+_VARIABLE = re.compile(r"(?<![:\w]):([A-Za-z_]\w*)")
+
+
+def bind_variables(sql: str, variables: dict[str, int] | None) -> str:
+    """Substitute psql -v variables the way psql does (textually). Values
+    are int()-coerced exactly like the psql path, so nothing
+    user-shaped reaches the server; an unknown name is an error, as in
+    psql with ON_ERROR_STOP."""
+    values = {name: int(value) for name, value in (variables or {}).items()}
+
+    def substitute(match: re.Match) -> str:
+        name = match.group(1)
+        if name not in values:
+            raise ExtractionError(f"SQL references :{name} but no value was supplied.")
+        return str(values[name])
+
+    # Comment text may mention :names (usage lines); strip comments first
+    # so only live SQL is bound. No string literal in ./sql contains "--".
+    live = "\n".join(line.split("--", 1)[0] for line in sql.splitlines())
+    return _VARIABLE.sub(substitute, live).strip().rstrip(";")
+
+
+def _import_psycopg():
+    try:
+        import psycopg
+        from psycopg.types.numeric import NumericBinaryLoader
+    except ImportError as ex:
+        raise ExtractionError(
+            "METRICBOT_EXTRACT_BACKEND=psycopg but psycopg is not installed — "
+            "pip install -r requirements-driver.txt, or unset it to use psql.") from ex
+
+    class FloatNumericLoader(NumericBinaryLoader):
+        # numeric -> float at load time: the model is float64 end to
+        # end, so a Decimal column would only be converted again later.
+        def load(self, data):
+            return float(super().load(data))
+
+    return psycopg, FloatNumericLoader
+
+
+def _convert_chunk(oid: int, values: tuple) -> np.ndarray:
+    if oid in _FLOAT_OIDS or oid in _INT_OIDS:
+        return np.fromiter((np.nan if v is None else v for v in values),
+                           dtype=np.float64, count=len(values))
+    if oid == _BOOL_OID:
+        return np.array([np.nan if v is None else bool(v) for v in values], dtype=object)
+    # Text arrives as bytes when the server encoding is SQL_ASCII.
+    return np.array([np.nan if v is None
+                     else v.decode("utf-8") if isinstance(v, bytes) else str(v)
+                     for v in values], dtype=object)
+
+
+def _finish_column(oid: int, chunks: list[np.ndarray]) -> np.ndarray:
+    if not chunks:
+        return np.array([], dtype=object)
+    column = np.concatenate(chunks)
+    if oid in _INT_OIDS and not np.isnan(column).any():
+        return column.astype(np.int64)
+    if column.dtype == object and pd.isna(column).all():
+        # read_csv reads an all-empty column as float64 NaN.
+        return np.full(len(column), np.nan)
+    return column
+
+
+def run_query(config: Config,
+              sql_file: Path,
+              variables: dict[str, int] | None = None) -> tuple[pd.DataFrame, int]:
+    """Execute one SQL file over a server-side cursor; returns the frame
+    and its decoded payload size in bytes."""
+    psycopg, float_numeric_loader = _import_psycopg()
+    sql = bind_variables(sql_file.read_text(encoding="utf-8"), variables)
+
+    try:
+        with psycopg.connect(
+                host=config.pg_host,
+                port=config.pg_port,
+                user=config.pg_user,
+                password=config.pg_password,
+                dbname=config.pg_database,
+                connect_timeout=30,
+                # Same ceiling as the psql subprocess timeout, enforced
+                # server-side so a stuck query is cancelled, not orphaned.
+                options=f"-c statement_timeout={PSQL_TIMEOUT_SECONDS * 1000}") as conn:
+            conn.adapters.register_loader("numeric", float_numeric_loader)
+            with conn.cursor(name="metricbot_extract", binary=True) as cursor:
+                cursor.execute(sql)
+                names = [column.name for column in cursor.description]
+                oids = [column.type_code for column in cursor.description]
+                chunks: list[list[np.ndarray]] = [[] for _ in names]
+                while rows := cursor.fetchmany(FETCH_ROWS):
+                    for i, values in enumerate(zip(*rows)):
+                        chunks[i].append(_convert_chunk(oids[i], values))
+    except psycopg.errors.QueryCanceled as ex:
+        raise ExtractionTimeout(
+            f"Query exceeded {PSQL_TIMEOUT_SECONDS}s running {sql_file.name} — "
+            f"database unreachable or query stuck.") from ex
+    except psycopg.Error as ex:
+        raise ExtractionError(f"psycopg failed for {sql_file.name}: {ex}") from ex
+
+    frame = pd.DataFrame({name: _finish_column(oid, column_chunks)
+                          for name, oid, column_chunks in zip(names, oids, chunks)})
+    return frame, int(frame.memory_usage(deep=True).sum())
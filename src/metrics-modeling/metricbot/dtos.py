@@ -3,40 +3,61 @@
 Both prediction types are expressed HOME-team-relative (WinnerFranchiseSeasonId
 is always the home team; the probability is the home team's) for
 consistency with the deetsMeter UI's rendering convention.
+
+The records are built column-wise — one pass over each column's values,
+no iterrows() — and JSON-encoded once (PredictionDtos.encoded): the POST
+body, the --dump-intermediate file and the service's include_dtos
+response all reuse those bytes.
 """
 
 from __future__ import annotations
 
+from functools import cached_property
+
+import numpy as np
 import pandas as pd
 
+from .api import encode_dtos
 from .model import is_priced
 
 PICKTYPE_STRAIGHT_UP = 1
 PICKTYPE_ATS = 2
 
 
-def build_prediction_dtos(predictions: pd.DataFrame) -> list[dict]:
+class PredictionDtos(list):
+    """The DTOs, plus their compact JSON encoding, made on first use and
+    kept. Read-only by convention: the bytes do not follow a mutation."""
+
+    @cached_property
+    def encoded(self) -> bytes:
+        return encode_dtos(self)
+
+
+def build_prediction_dtos(predictions: pd.DataFrame) -> PredictionDtos:
     """SU for every contest; ATS only for priced contests (is_priced —
     the v1.1 canonical predicate). Unpriced rows previously produced
     ATS DTOs with NaN probabilities — no line, no pick."""
-    records: list[dict] = []
-
-    for _, row in predictions.iterrows():
-        records.append({
-            "ContestId": row["ContestId"],
-            "WinnerFranchiseSeasonId": row["HomeFranchiseSeasonId"],
-            "WinProbability": round(float(row["WinProbability"]), 4),
-            "PredictionType": PICKTYPE_STRAIGHT_UP,
-            "ModelVersion": row["ModelVersion"],
-        })
-
-    for _, row in predictions[is_priced(predictions)].iterrows():
-        records.append({
-            "ContestId": row["ContestId"],
-            "WinnerFranchiseSeasonId": row["HomeFranchiseSeasonId"],
-            "WinProbability": round(float(row["HomeCoverProbability"]), 4),
-            "PredictionType": PICKTYPE_ATS,
-            "ModelVersion": row["ModelVersion"],
-        })
-
-    return records
+    contests = predictions["ContestId"].to_numpy(dtype=object)
+    homes = predictions["HomeFranchiseSeasonId"].to_numpy(dtype=object)
+    versions = predictions["ModelVersion"].to_numpy(dtype=object)
+    priced = is_priced(predictions).to_numpy()
+
+    records = _records(contests, homes, predictions["WinProbability"].to_numpy(dtype=np.float64),
+                       PICKTYPE_STRAIGHT_UP, versions)
+    records += _records(contests[priced], homes[priced],
+                        predictions["HomeCoverProbability"].to_numpy(dtype=np.float64)[priced],
+                        PICKTYPE_ATS, versions[priced])
+    return PredictionDtos(records)
+
+
+def _records(contests: np.ndarray, homes: np.ndarray, probabilities: np.ndarray,
+             prediction_type: int, versions: np.ndarray) -> list[dict]:
+    # Python's round() on Python floats, as the per-row builder did —
+    # np.round can differ from it in the last place.
+    return [{"ContestId": contest,
+             "WinnerFranchiseSeasonId": home,
+             "WinProbability": round(probability, 4),
+             "PredictionType": prediction_type,
+             "ModelVersion": version}
+            for contest, home, probability, version
+            in zip(contests.tolist(), homes.tolist(), probabilities.tolist(), versions.tolist())]
@@ -0,0 +1,221 @@
+"""Incremental training engine: as-of fits from per-week sufficient
+statistics instead of a full refit.
+
+Both v1.1 regressions are ordinary least squares, and an as-of corpus is
+a union of whole weeks — week w+1's corpus is week w's plus one week of
+games. So each (SeasonYear, WeekNumber) is reduced ONCE to its moments
+(n, means, centered XᵀX, Xᵀy, yᵀy) for each target, and the fit for any
+cutoff is a prefix sum of blocks plus one p×p solve: a season sweep or
+an experiment grid costs O(blocks × p²) after a single pass over the
+rows, not O(weeks × n × p²).
+
+The moments are kept CENTERED and combined with the pairwise update of
+Chan, Golub & LeVeque — raw Σxxᵀ minus n·x̄x̄ᵀ cancels catastrophically on
+features like PtsScoredAvg. The solve is a Cholesky on the
+correlation-scaled system; a system too ill-conditioned for that to be
+accurate falls back to least squares on the moments, which is the same
+minimum-norm solution sklearn's LinearRegression (lstsq on centered
+data) returns. Coefficients, intercept and residual std match sklearn
+to ~1e-10 on the production feature set (tests assert 1e-8).
+"""
+
+from __future__ import annotations
+
+import bisect
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import scipy.linalg
+
+from .model import FEATURE_COLS, PreparedCorpus
+
+# Past this condition number of the scaled system, Cholesky's error
+# (~cond × eps) could reach the 1e-8 parity budget; use lstsq instead.
+MAX_CHOLESKY_CONDITION = 1e6
+
+
+@dataclass(frozen=True)
+class LinearFit:
+    """An OLS fit: what model.py needs from sklearn's LinearRegression."""
+    coef: np.ndarray
+    intercept: float
+    residual_std: float     # in-sample, ddof=0 — np.std of the training residuals
+    rows: int
+
+    def predict(self, x: pd.DataFrame | np.ndarray) -> np.ndarray:
+        return np.asarray(x, dtype=np.float64) @ self.coef + self.intercept
+
+
+@dataclass(frozen=True)
+class Moments:
+    """Sufficient statistics of one block of (x, y) rows, centered."""
+    n: int
+    mean_x: np.ndarray
+    mean_y: float
+    cxx: np.ndarray     # Σ (x - x̄)(x - x̄)ᵀ
+    cxy: np.ndarray     # Σ (x - x̄)(y - ȳ)
+    cyy: float          # Σ (y - ȳ)²
+
+    @staticmethod
+    def empty(p: int) -> "Moments":
+        return Moments(0, np.zeros(p), 0.0, np.zeros((p, p)), np.zeros(p), 0.0)
+
+    @staticmethod
+    def of(x: np.ndarray, y: np.ndarray) -> "Moments":
+        if len(y) == 0:
+            return Moments.empty(x.shape[1])
+        mean_x = x.mean(axis=0)
+        mean_y = float(y.mean())
+        xc = x - mean_x
+        yc = y - mean_y
+        return Moments(len(y), mean_x, mean_y, xc.T @ xc, xc.T @ yc, float(yc @ yc))
+
+    def __add__(self, other: "Moments") -> "Moments":
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            return other
+        n = self.n + other.n
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+        return Moments(
+            n=n,
+            mean_x=self.mean_x + dx * (other.n / n),
+            mean_y=self.mean_y + dy * (other.n / n),
+            cxx=self.cxx + other.cxx + weight * np.outer(dx, dx),
+            cxy=self.cxy + other.cxy + weight * dx * dy,
+            cyy=self.cyy + other.cyy + weight * dy * dy,
+        )
+
+    def solve(self) -> LinearFit:
+        """The OLS fit these moments determine (with intercept)."""
+        if self.n == 0:
+            raise ValueError("Cannot fit an empty block.")
+        scale = np.sqrt(np.diag(self.cxx))
+        # Constant columns center to zero; lstsq's minimum-norm solution
+        # gives them a zero coefficient, and so do we.
+        live = scale > 0
+        coef = np.zeros(len(scale))
+        if live.any():
+            s = scale[live]
+            scaled = self.cxx[np.ix_(live, live)] / np.outer(s, s)
+            rhs = self.cxy[live] / s
+            if np.linalg.cond(scaled) < MAX_CHOLESKY_CONDITION:
+                coef[live] = scipy.linalg.cho_solve(
+                    scipy.linalg.cho_factor(scaled), rhs) / s
+            else:
+                coef[live] = scipy.linalg.lstsq(self.cxx[np.ix_(live, live)], self.cxy[live])[0]
+        sse = max(self.cyy - 2 * coef @ self.cxy + coef @ self.cxx @ coef, 0.0)
+        return LinearFit(
+            coef=coef,
+            intercept=float(self.mean_y - self.mean_x @ coef),
+            residual_std=float(np.sqrt(sse / self.n)),
+            rows=self.n,
+        )
+
+
+def walk_forward_residuals(x: np.ndarray, y: np.ndarray, starts: list[int]) -> list[np.ndarray]:
+    """Forward-only out-of-sample residuals over chronological blocks.
+
+    starts are the first row of each block (ascending, from 0); the last
+    block runs to the end. Every block after the first is predicted by
+    the OLS fit on ALL rows before it, skipping blocks whose preceding
+    rows are underdetermined (<= feature count). The prefix fits come
+    from running moment sums — each block is scanned once, to add it to
+    the sum and to score it — so an extra fold costs one p×p solve, not
+    a refit over every earlier row."""
+    bounds = list(starts[1:]) + [len(y)]
+    running = Moments.of(x[:bounds[0]], y[:bounds[0]])
+    residuals = []
+    for begin, end in zip(bounds, bounds[1:]):
+        if running.n > x.shape[1]:
+            residuals.append(y[begin:end] - running.solve().predict(x[begin:end]))
+        running = running + Moments.of(x[begin:end], y[begin:end])
+    return residuals
+
+
+def fold_starts(rows: int, folds: int) -> list[int]:
+    """Equal row-count blocks (the remainder joins the last) — the
+    v1.1.1 walk-forward layout."""
+    size = rows // folds
+    return [size * i for i in range(folds)]
+
+
+def week_fold_starts(season_year: np.ndarray, week_number: np.ndarray) -> list[int]:
+    """One block per (SeasonYear, WeekNumber) of chronologically sorted
+    rows: each week is predicted by everything before it, the way the
+    deployed model meets it."""
+    if len(season_year) == 0:
+        return [0]
+    changes = np.flatnonzero((season_year[1:] != season_year[:-1])
+                             | (week_number[1:] != week_number[:-1])) + 1
+    return [0] + changes.tolist()
+
+
+@dataclass(frozen=True)
+class AsofFits:
+    """Both v1.1 regressions for one as-of cutoff; a fit is None when its
+    corpus is empty (model.py's row-count guards report that case)."""
+    margin: LinearFit | None
+    residual: LinearFit | None
+
+
+def _week_blocks(corpus: PreparedCorpus,
+                 rows: np.ndarray,
+                 target: np.ndarray) -> dict[tuple[int, int], Moments]:
+    # Rows are chronological, so each week is one contiguous run.
+    x, y = corpus.features[rows], target[rows]
+    seasons, weeks = corpus.season_year[rows], corpus.week_number[rows]
+    starts = week_fold_starts(seasons, weeks)
+    return {(int(seasons[begin]), int(weeks[begin])): Moments.of(x[begin:end], y[begin:end])
+            for begin, end in zip(starts, starts[1:] + [len(rows)]) if end > begin}
+
+
+class TrainingEngine:
+    """Per-week moment blocks of one training extraction, for both the
+    pure-margin target (decided games) and the residual target (decided
+    ∩ priced, FBS-carved when fbs_scope). fits(season, week) answers any
+    cutoff the extraction covers — the same corpus asof_training_slice
+    would cut — from cumulative prefix sums.
+
+    Build cost is one pass over the rows; each fit is one p×p solve per
+    target. Picklable, so a process pool can share one built engine.
+    """
+
+    def __init__(self, training: pd.DataFrame | PreparedCorpus, fbs_scope: bool):
+        corpus = training if isinstance(training, PreparedCorpus) else PreparedCorpus.of(training)
+        if corpus.season_year is None:
+            raise ValueError("TrainingEngine needs SeasonYear and WeekNumber columns.")
+        self._margin = self._prefix(_week_blocks(corpus, corpus.decided_rows(), corpus.margin))
+        self._residual = self._prefix(
+            _week_blocks(corpus, corpus.residual_rows(fbs_scope), corpus.residual))
+
+    @staticmethod
+    def _prefix(blocks: dict[tuple[int, int], Moments]) -> tuple[list[tuple[int, int]], list[Moments]]:
+        # Chronological running totals: prefix[i] = every block up to and
+        # including keys[i]. Summed once, in order — deterministic.
+        keys = sorted(blocks)
+        totals, running = [], Moments.empty(len(FEATURE_COLS))
+        for key in keys:
+            running = running + blocks[key]
+            totals.append(running)
+        return keys, totals
+
+    @staticmethod
+    def _before(prefix: tuple[list[tuple[int, int]], list[Moments]],
+                season_year: int, week: int) -> Moments:
+        keys, totals = prefix
+        # Lexicographic (season, week) < cutoff == prior seasons whole
+        # plus the target season's earlier weeks: the as-of rule.
+        count = bisect.bisect_left(keys, (season_year, week))
+        return totals[count - 1] if count else Moments.empty(len(FEATURE_COLS))
+
+    def fits(self, season_year: int, week: int) -> AsofFits:
+        margin = self._before(self._margin, season_year, week)
+        residual = self._before(self._residual, season_year, week)
+        return AsofFits(
+            margin=margin.solve() if margin.n else None,
+            residual=residual.solve() if residual.n else None,
+        )
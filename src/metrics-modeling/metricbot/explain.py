@@ -0,0 +1,154 @@
+"""`metricbot explain`: EXPLAIN (ANALYZE, BUFFERS) for every extraction
+query, so plan regressions show up as numbers rather than as a slow
+Tuesday night.
+
+Each file runs under psql exactly as extraction runs it — same -v
+variables, same database — prefixed with EXPLAIN (ANALYZE, BUFFERS,
+FORMAT JSON) in a read-only transaction. The JSON plans are written per
+variant (spec, and ranked where ./sql/ranked has a twin) for diffing
+between runs; the summary is what a reviewer compares: execution and
+planning time, rows, and shared buffers hit/read plus temp blocks
+written (a sort or hash spilling past work_mem). A query that fails is
+reported in its row and the rest still run.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+from . import extract
+from .config import Config
+
+logger = logging.getLogger("metricbot.explain")
+
+# Beside --dump-intermediate's artifacts (pipeline.DATA_DIR).
+DEFAULT_PLAN_DIR = Path(__file__).resolve().parent.parent / "data" / "plans"
+
+
+@dataclass(frozen=True)
+class PlanSummary:
+    sql_file: str
+    variant: str
+    execution_ms: float
+    planning_ms: float
+    rows: int
+    shared_hit_blocks: int
+    shared_read_blocks: int
+    temp_written_blocks: int
+    plan_path: Path | None
+    error: str = ""
+
+    HEADER = (f"{'file':<44}{'variant':<8}{'exec ms':>10}{'plan ms':>9}{'rows':>9}"
+              f"{'hit blks':>11}{'read blks':>11}{'temp blks':>11}")
+
+    def format(self) -> str:
+        if self.error:
+            return f"{self.sql_file:<44}{self.variant:<8}  FAILED: {self.error}"
+        return (f"{self.sql_file:<44}{self.variant:<8}{self.execution_ms:>10.1f}"
+                f"{self.planning_ms:>9.1f}{self.rows:>9}{self.shared_hit_blocks:>11}"
+                f"{self.shared_read_blocks:>11}{self.temp_written_blocks:>11}")
+
+
+def query_variables(season_year: int, week: int, prior_tail: int,
+                    fbs_scope: bool) -> dict[Path, dict[str, int]]:
+    """Every extraction query and the -v variables a run would give it
+    for (season_year, week). The cache's season query explains the
+    closed season before, as the corpus cache extracts it."""
+    fbs = 1 if fbs_scope else 0
+    return {
+        extract.TRAINING_SQL: {},
+        extract.CURRENT_WEEK_SQL: {},
+        extract.DETECT_WEEK_SQL: {},
+        extract.ASOF_TRAINING_SQL: {"season_year": season_year, "week": week},
+        extract.ASOF_WEEK_SQL: {"season_year": season_year, "week": week,
+                                "prior_tail": prior_tail, "fbs_scope": fbs},
+        extract.ASOF_SEASON_SLATES_SQL: {"season_year": season_year, "week_mask": 1 << week,
+                                         "prior_tail": prior_tail, "fbs_scope": fbs},
+        extract.ASOF_SEASON_SQL: {"season_year": season_year - 1, "week": 0},
+        extract.TEAM_GAMES_SQL: {"season_year": season_year},
+        extract.GRADING_SCORES_SQL: {"season_year": season_year, "week": week},
+        extract.GRADING_SCORES_SEASON_SQL: {"season_year": season_year},
+        extract.WATERMARKS_SQL: {},
+        extract.RUN_WATERMARK_SQL: {"season_year": season_year, "week": week},
+    }
+
+
+def explain_queries(config: Config, season_year: int, week: int, prior_tail: int,
+                    variants: tuple[str, ...],
+                    out_dir: Path | None = None) -> list[PlanSummary]:
+    """Capture every query's plan under each of `variants`, writing the
+    JSON plans to out_dir/<variant>/<file>.json (DEFAULT_PLAN_DIR when
+    None). A variant only explains the files it changes: "ranked" skips
+    those without a ranked twin."""
+    out_dir = out_dir or DEFAULT_PLAN_DIR
+    summaries = []
+    for sql_file, variables in query_variables(season_year, week, prior_tail,
+                                               config.fbs_scope).items():
+        for variant in variants:
+            resolved = extract.sql_file_for(dataclasses.replace(config, sql_variant=variant),
+                                            sql_file)
+            if variant != "spec" and resolved == sql_file:
+                continue
+            try:
+                plan = _explain(config, resolved, variables)
+            except extract.ExtractionError as ex:
+                logger.error("%s (%s): %s", sql_file.name, variant, ex)
+                summaries.append(PlanSummary(sql_file.name, variant, 0.0, 0.0, 0, 0, 0, 0, None,
+                                             error=_error_line(str(ex))))
+                continue
+            plan_path = out_dir / variant / f"{sql_file.stem}.json"
+            plan_path.parent.mkdir(parents=True, exist_ok=True)
+            plan_path.write_text(json.dumps(plan, indent=2), encoding="utf-8")
+            summaries.append(_summary(sql_file.name, variant, plan, plan_path))
+            logger.info("%s (%s): %.1f ms", sql_file.name, variant, summaries[-1].execution_ms)
+    return summaries
+
+
+def _explain(config: Config, sql_file: Path, variables: dict[str, int]) -> dict:
+    """One EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) of `sql_file` — the
+    query really runs, so inside a read-only transaction."""
+    args = [arg for arg in extract._psql_args(config) if arg != "--csv"]
+    args += ["-X", "-q", "-A", "-t", "-v", "ON_ERROR_STOP=1", "-f", "-"]
+    for name, value in variables.items():
+        args += ["-v", f"{name}={int(value)}"]  # int() — nothing user-shaped reaches psql
+    env = extract._psql_env(config)
+    env["PGOPTIONS"] = (env.get("PGOPTIONS", "") + " -c default_transaction_read_only=on").strip()
+    script = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)\n" + sql_file.read_text(encoding="utf-8")
+    try:
+        result = subprocess.run(args, input=script, env=env, capture_output=True, text=True,
+                                encoding="utf-8", timeout=extract.PSQL_TIMEOUT_SECONDS,
+                                check=False)
+    except subprocess.TimeoutExpired as ex:
+        raise extract.ExtractionTimeout(
+            f"psql exceeded {extract.PSQL_TIMEOUT_SECONDS}s explaining {sql_file.name}.") from ex
+    if result.returncode != 0:
+        raise extract.ExtractionError(
+            f"psql failed explaining {sql_file.name} (exit {result.returncode}):\n"
+            f"{result.stderr.strip()}")
+    return json.loads(result.stdout)[0]
+
+
+def _error_line(message: str) -> str:
+    # psql's stderr ends with the LINE/caret context; the row wants the ERROR.
+    lines = [line.strip() for line in message.splitlines() if line.strip()]
+    return next((line for line in lines if "ERROR:" in line), lines[-1] if lines else message)
+
+
+def _summary(sql_file: str, variant: str, plan: dict, plan_path: Path) -> PlanSummary:
+    root = plan["Plan"]
+    return PlanSummary(
+        sql_file=sql_file,
+        variant=variant,
+        execution_ms=float(plan["Execution Time"]),
+        planning_ms=float(plan["Planning Time"]),
+        rows=int(root["Actual Rows"]),
+        shared_hit_blocks=int(root.get("Shared Hit Blocks", 0)),
+        shared_read_blocks=int(root.get("Shared Read Blocks", 0)),
+        temp_written_blocks=int(root.get("Temp Written Blocks", 0)),
+        plan_path=plan_path,
+    )
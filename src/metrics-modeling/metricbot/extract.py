@@ -3,25 +3,45 @@
 Deliberately shells out to psql rather than adding a Postgres driver:
 the operator box already has psql (the PowerShell flow required it), the
 venv stays unchanged, and the Phase B container just installs
-postgresql-client. Swap for psycopg later if a driver earns its way in.
+postgresql-client. A psycopg backend (driver.py) is available behind
+METRICBOT_EXTRACT_BACKEND=psycopg for large corpora; psql stays the
+default and the reference for parity.
 
 The SQL files in ./sql are UNCHANGED from the prototype — they are the
 spec. competition_metrics_current_week.sql self-detects the current week
 via its own CTE, so no week parameter exists anywhere in extraction.
+METRICBOT_SQL_VARIANT=ranked swaps in ./sql/ranked's twins of the corpus
+queries: the same rows, planned for a multi-season corpus.
 """
 
 from __future__ import annotations
 
 import io
+import logging
 import os
+import queue
 import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from pathlib import Path
-
-import pandas as pd
+from typing import TYPE_CHECKING, Iterator
 
 from .config import Config
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .schema import FrameSchema
+    from .windows import TeamGames
+
+logger = logging.getLogger("metricbot.extract")
+
 SQL_DIR = Path(__file__).resolve().parent.parent / "sql"
+RANKED_SQL_DIR = SQL_DIR / "ranked"
 
 # A blocked connection or runaway query must not pin a service worker
 # forever. Full-corpus training extraction runs in seconds; 10 minutes is
@@ -32,41 +52,149 @@ TRAINING_SQL = SQL_DIR / "competition_metrics_training.sql"
 CURRENT_WEEK_SQL = SQL_DIR / "competition_metrics_current_week.sql"
 ASOF_TRAINING_SQL = SQL_DIR / "competition_metrics_asof_training.sql"
 ASOF_WEEK_SQL = SQL_DIR / "competition_metrics_asof_week.sql"
+ASOF_SEASON_SLATES_SQL = SQL_DIR / "competition_metrics_asof_season_slates.sql"
+# The Python entering-window engine's (windows.py).
+TEAM_GAMES_SQL = SQL_DIR / "asof_team_games.sql"
 DETECT_WEEK_SQL = SQL_DIR / "detect_current_season_week.sql"
 GRADING_SCORES_SQL = SQL_DIR / "grading_scores.sql"
+GRADING_SCORES_SEASON_SQL = SQL_DIR / "grading_scores_season.sql"
+# The corpus cache's (cache.py).
+ASOF_SEASON_SQL = SQL_DIR / "competition_metrics_asof_season.sql"
+WATERMARKS_SQL = SQL_DIR / "corpus_season_watermarks.sql"
+# Run-week's freshness check's (freshness.py).
+RUN_WATERMARK_SQL = SQL_DIR / "run_week_watermark.sql"
 
 
 class ExtractionError(RuntimeError):
     pass
 
 
-def _run_psql(config: Config,
-              sql_file: Path,
-              variables: dict[str, int] | None = None,
-              allow_empty: bool = False) -> pd.DataFrame:
+class ExtractionTimeout(ExtractionError):
+    """A query ran past PSQL_TIMEOUT_SECONDS."""
+
+
+@dataclass(frozen=True)
+class QueryStats:
+    """Per-query telemetry, logged for every extraction. payload_bytes is
+    what the backend handed to pandas: CSV text for psql, decoded column
+    memory for the driver."""
+    sql_file: str
+    backend: str
+    rows: int
+    payload_bytes: int
+    seconds: float
+
+
+def _run_query(config: Config,
+               sql_file: Path,
+               variables: dict[str, int] | None = None,
+               allow_empty: bool = False) -> pd.DataFrame:
+    """Run one SQL file on the configured backend; same frame either way."""
+    sql_file = sql_file_for(config, sql_file)
     if not sql_file.is_file():
         raise ExtractionError(f"SQL file not found: {sql_file}")
 
-    env = os.environ.copy()
-    env["PGPASSWORD"] = config.pg_password
+    schema = _schema_for(sql_file)
+    started = time.perf_counter()
+    if config.extract_backend == "psycopg":
+        from .driver import run_query
+        frame, payload_bytes = run_query(config, sql_file, variables)
+        if schema is not None:
+            frame = schema.apply(frame, config.feature_dtype)
+    elif (session := _SESSIONS.get(config)) is not None:
+        frame, payload_bytes = session.query(sql_file, variables)
+    else:
+        frame, payload_bytes = _run_psql(config, sql_file, variables)
+    stats = QueryStats(
+        sql_file=sql_file.name,
+        backend=config.extract_backend,
+        rows=len(frame),
+        payload_bytes=payload_bytes,
+        seconds=time.perf_counter() - started,
+    )
+    logger.info("%s via %s: %d rows, %d bytes in %.2fs",
+                stats.sql_file, stats.backend, stats.rows, stats.payload_bytes, stats.seconds)
+    if (log := current_query_log()) is not None:
+        log.queries.append(stats)
+
+    if frame.empty and not allow_empty:
+        raise ExtractionError(
+            f"{sql_file.name} returned zero rows — is the season week window open "
+            f"and are metrics generated for {config.pg_database}?")
+    if schema is not None:
+        schema.validate(frame)
+    return frame
+
+
+def sql_file_for(config: Config, sql_file: Path) -> Path:
+    """The file a query runs: its ranked twin under
+    METRICBOT_SQL_VARIANT=ranked when ./sql/ranked has one, else the
+    spec file. Both return the same rows (tests/test_ranked_sql.py); the
+    corpus and result caches still key on the file that runs, so an edit
+    to a twin strands what it extracted."""
+    if config.sql_variant == "ranked" and (RANKED_SQL_DIR / sql_file.name).is_file():
+        return RANKED_SQL_DIR / sql_file.name
+    return sql_file
+
+
+@dataclass
+class QueryLog:
+    """What one thread's extractions did inside recording_queries(): the
+    database queries it ran, and the corpus-cache partitions it read
+    (hits) or had to re-extract (misses)."""
+    queries: list[QueryStats] = field(default_factory=list)
+    cache_hits: int = 0
+    cache_misses: int = 0
 
-    args = [
+
+_RECORDING = threading.local()
+
+
+@contextmanager
+def recording_queries() -> Iterator[QueryLog]:
+    """Collect what every extraction this thread runs inside the block
+    did — how the stage profile attributes psql bytes, query time and
+    cache reads to the stage that issued them."""
+    previous = getattr(_RECORDING, "log", None)
+    _RECORDING.log = log = QueryLog()
+    try:
+        yield log
+    finally:
+        _RECORDING.log = previous
+
+
+def current_query_log() -> QueryLog | None:
+    return getattr(_RECORDING, "log", None)
+
+
+def _psql_args(config: Config) -> list[str]:
+    return [
         "psql",
         "-h", config.pg_host,
         "-p", config.pg_port,
         "-U", config.pg_user,
         "-d", config.pg_database,
-        "-f", str(sql_file),
         "--csv",
-        "-v", "ON_ERROR_STOP=1",
     ]
+
+
+def _psql_env(config: Config) -> dict[str, str]:
+    env = os.environ.copy()
+    env["PGPASSWORD"] = config.pg_password
+    return env
+
+
+def _run_psql(config: Config,
+              sql_file: Path,
+              variables: dict[str, int] | None = None) -> tuple[pd.DataFrame, int]:
+    args = _psql_args(config) + ["-f", str(sql_file), "-v", "ON_ERROR_STOP=1"]
     for name, value in (variables or {}).items():
         args += ["-v", f"{name}={int(value)}"]  # int() — nothing user-shaped reaches psql
 
     try:
         result = subprocess.run(
             args,
-            env=env,
+            env=_psql_env(config),
             capture_output=True,
             text=True,
             encoding="utf-8",
@@ -74,7 +202,7 @@ def _run_psql(config: Config,
             check=False,
         )
     except subprocess.TimeoutExpired as ex:
-        raise ExtractionError(
+        raise ExtractionTimeout(
             f"psql exceeded {PSQL_TIMEOUT_SECONDS}s running {sql_file.name} — "
             f"database unreachable or query stuck.") from ex
 
@@ -82,28 +210,263 @@ def _run_psql(config: Config,
         raise ExtractionError(
             f"psql failed for {sql_file.name} (exit {result.returncode}):\n{result.stderr.strip()}")
 
-    frame = pd.read_csv(io.StringIO(result.stdout))
-    if frame.empty and not allow_empty:
-        raise ExtractionError(
-            f"{sql_file.name} returned zero rows — is the season week window open "
-            f"and are metrics generated for {config.pg_database}?")
-    return frame
+    return _parse_csv(config, sql_file, result.stdout), len(result.stdout)
+
+
+def _schema_for(sql_file: Path) -> FrameSchema | None:
+    from .schema import schema_for  # schema.py imports ExtractionError from here
+    return schema_for(sql_file)
+
+
+def _parse_csv(config: Config, sql_file: Path, text: str) -> pd.DataFrame:
+    """psql --csv text -> frame, typed by the file's schema (schema.py)."""
+    schema = _schema_for(sql_file)
+    if schema is None:
+        import pandas as pd  # first extraction, not import: keeps CLI/service start light
+        return pd.read_csv(io.StringIO(text))
+    return schema.parse_csv(text, config.feature_dtype)
+
+
+class _SessionLost(Exception):
+    """The psql process exited (dropped connection, server restart)."""
+
+
+class PsqlSession:
+    """One long-lived psql process per Config, fed SQL files over stdin.
+
+    Each query is followed by an \\echo of a random marker plus psql's
+    ERROR/SQLSTATE variables, so the single --csv output stream splits
+    back into one result set per query and a failed statement is
+    reported without ending the session. Queries are serialized — one
+    process is one connection. Each file must hold ONE statement (every
+    file in ./sql does).
+
+    PSQL_TIMEOUT_SECONDS applies per statement: on expiry the process is
+    killed (there is no other way to stop psql mid-query) and the next
+    query starts a fresh one. A process that died between queries is
+    restarted and the query retried once — extraction is read-only.
+
+    connections > 1 lets that many queries run at once (the pipeline's
+    concurrent extraction stages): a query arriving while every process
+    is busy starts another psql, up to the limit, and later queries
+    take whichever process is idle.
+    """
+
+    def __init__(self, config: Config, connections: int = 1):
+        self.config = config
+        self.connections = connections
+        self._lock = threading.Lock()
+        self._process: subprocess.Popen | None = None
+        self._lines: queue.Queue[str | None] = queue.Queue()
+        self._stderr: deque[str] = deque(maxlen=20)
+        self._bound: set[str] = set()
+        self._spares: list[PsqlSession] = []
+        self._spares_lock = threading.Lock()
+
+    def query(self, sql_file: Path, variables: dict[str, int] | None = None) -> tuple[pd.DataFrame, int]:
+        session = self._acquire()
+        try:
+            return session._query_locked(sql_file, variables)
+        finally:
+            session._lock.release()
+
+    def _acquire(self) -> PsqlSession:
+        # An idle process if there is one, else a new one while under the
+        # limit, else wait for this one. Returns with the chosen lock held.
+        with self._spares_lock:
+            for session in [self, *self._spares]:
+                if session._lock.acquire(blocking=False):
+                    return session
+            if len(self._spares) + 1 < self.connections:
+                spare = PsqlSession(self.config)
+                spare._lock.acquire()
+                self._spares.append(spare)
+                return spare
+        self._lock.acquire()
+        return self
+
+    def _query_locked(self, sql_file: Path, variables: dict[str, int] | None) -> tuple[pd.DataFrame, int]:
+        try:
+            return self._query_once(sql_file, variables)
+        except _SessionLost:
+            logger.warning("psql session for %s was lost; reconnecting", self.config.pg_database)
+            self._stop()
+        try:
+            return self._query_once(sql_file, variables)
+        except _SessionLost as ex:
+            self._stop()
+            raise ExtractionError(
+                f"psql session for {self.config.pg_database} exited running "
+                f"{sql_file.name}:\n{ex}") from ex
+
+    def close(self) -> None:
+        with self._spares_lock:
+            sessions, self._spares = [self, *self._spares], []
+        for session in sessions:
+            with session._lock:
+                session._stop()
+
+    def _start(self) -> None:
+        self._process = subprocess.Popen(
+            _psql_args(self.config) + ["-X", "-q"],
+            env=_psql_env(self.config),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding="utf-8",
+        )
+        # Fresh queue per process: a killed process's late output must
+        # never be read as the next query's result.
+        self._lines = queue.Queue()
+        self._stderr.clear()
+        self._bound = set()
+        threading.Thread(target=_pump, args=(self._process.stdout, self._lines.put, True),
+                         daemon=True).start()
+        threading.Thread(target=_pump, args=(self._process.stderr, self._stderr.append, False),
+                         daemon=True).start()
+
+    def _stop(self) -> None:
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self._process.kill()
+                self._process.wait()
+        self._process = None
+
+    def _query_once(self, sql_file: Path, variables: dict[str, int] | None) -> tuple[pd.DataFrame, int]:
+        if self._process is None or self._process.poll() is not None:
+            self._start()
+
+        values = {name: int(value) for name, value in (variables or {}).items()}
+        marker = f"__metricbot_{uuid.uuid4().hex}__"
+        sql = sql_file.read_text(encoding="utf-8").strip()
+        script = (
+            # Stale variables from an earlier query must not satisfy this
+            # one's references — the one-shot path would fail instead.
+            [f"\\unset {name}" for name in sorted(self._bound - values.keys())]
+            + [f"\\set {name} {value}" for name, value in values.items()]
+            + [sql if sql.endswith(";") else sql + ";",
+               f"\\echo {marker} :ERROR :SQLSTATE",
+               "\\echo :LAST_ERROR_MESSAGE"])
+        try:
+            self._process.stdin.write("\n".join(script) + "\n")
+            self._process.stdin.flush()
+        except OSError as ex:
+            raise _SessionLost("\n".join(self._stderr)) from ex
+        self._bound = set(values)
+
+        deadline = time.monotonic() + PSQL_TIMEOUT_SECONDS
+        lines: list[str] = []
+        while not (line := self._next_line(deadline, sql_file)).startswith(marker):
+            lines.append(line)
+        _, error, sqlstate = line.split()
+        message = self._next_line(deadline, sql_file).strip()
+
+        if error == "true":
+            raise ExtractionError(
+                f"psql failed for {sql_file.name} (SQLSTATE {sqlstate}): {message}")
+        text = "".join(lines)
+        return _parse_csv(self.config, sql_file, text), len(text)
+
+    def _next_line(self, deadline: float, sql_file: Path) -> str:
+        try:
+            line = self._lines.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            self._process.kill()
+            self._stop()
+            raise ExtractionTimeout(
+                f"psql exceeded {PSQL_TIMEOUT_SECONDS}s running {sql_file.name} — "
+                f"database unreachable or query stuck.") from None
+        if line is None:
+            raise _SessionLost("\n".join(self._stderr))
+        return line
+
+
+def _pump(stream, sink, signal_eof: bool) -> None:
+    # Reader thread: keeps the pipe drained so psql never blocks on a
+    # full buffer; None tells the waiting query the process is gone.
+    for line in stream:
+        sink(line)
+    if signal_eof:
+        sink(None)
+
+
+# Sessions currently routing psql extractions, by Config (frozen, hashable).
+_SESSIONS: dict[Config, PsqlSession] = {}
+_SESSIONS_LOCK = threading.Lock()
+_KEEP_SESSIONS = False
+
+
+@contextmanager
+def extraction_session(config: Config, connections: int = 1) -> Iterator[PsqlSession | None]:
+    """Route every psql extraction for `config` inside the block through
+    ONE psql process (up to `connections` of them for concurrent
+    queries). Reuses a session that is already open (the service's
+    long-lived ones), raising its connection limit if needed; closes a
+    session it opened unless keep_sessions() is on. A no-op for the
+    psycopg backend."""
+    if config.extract_backend != "psql":
+        yield None
+        return
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(config)
+        owned = session is None
+        if owned:
+            session = _SESSIONS[config] = PsqlSession(config, connections)
+        else:
+            session.connections = max(session.connections, connections)
+    try:
+        yield session
+    finally:
+        if owned and not _KEEP_SESSIONS:
+            with _SESSIONS_LOCK:
+                _SESSIONS.pop(config, None)
+            session.close()
+
+
+def keep_sessions() -> None:
+    """Service mode: sessions outlive the block that opened them — one
+    psql process per sport across requests, until close_sessions()."""
+    global _KEEP_SESSIONS
+    _KEEP_SESSIONS = True
+
+
+def close_sessions() -> None:
+    with _SESSIONS_LOCK:
+        sessions = list(_SESSIONS.values())
+        _SESSIONS.clear()
+    for session in sessions:
+        session.close()
 
 
 def extract_training(config: Config) -> pd.DataFrame:
     """Completed games with scores/winner + both teams' season metrics."""
-    return _run_psql(config, TRAINING_SQL)
+    return _run_query(config, TRAINING_SQL)
 
 
 def extract_current_week(config: Config) -> pd.DataFrame:
     """The current week's unplayed slate (self-detected by the SQL)."""
-    return _run_psql(config, CURRENT_WEEK_SQL)
+    return _run_query(config, CURRENT_WEEK_SQL)
 
 
 def extract_asof_training(config: Config, season_year: int, week: int) -> pd.DataFrame:
     """Option-B as-of training set: strictly before (season, week); the 12
-    Pts/Margin columns are ENTERING-GAME windows, not live season rows."""
-    return _run_psql(config, ASOF_TRAINING_SQL,
+    Pts/Margin columns are ENTERING-GAME windows, not live season rows.
+    With Config.cache_dir or warm_corpus_mb set, closed seasons come from
+    the corpus cache (cache.py) — same frame, only the open season is
+    queried. With METRICBOT_ASOF_ENGINE=python the windows are computed
+    from a team-game extraction instead (windows.py)."""
+    if config.asof_engine == "python":
+        return extract_team_games(config, season_year).asof_training(season_year, week)
+    if config.cache_dir is not None or config.warm_corpus_mb > 0:
+        from .cache import cached_asof_training
+        return cached_asof_training(config, season_year, week)
+    return _run_query(config, ASOF_TRAINING_SQL,
                      {"season_year": season_year, "week": week})
 
 
@@ -113,26 +476,78 @@ def extract_asof_week(config: Config, season_year: int, week: int, prior_tail: i
     recent prior-season (regular/post) games. The slate honors the
     sport's product scope (v1.1): FBS-participant games only for
     NCAAFB, every game for the NFL."""
-    return _run_psql(config, ASOF_WEEK_SQL,
+    if config.asof_engine == "python":
+        return extract_team_games(config, season_year).asof_week(season_year, week, prior_tail)
+    return _run_query(config, ASOF_WEEK_SQL,
                      {"season_year": season_year, "week": week, "prior_tail": prior_tail,
                       "fbs_scope": 1 if config.fbs_scope else 0})
 
 
+def extract_asof_season_slates(config: Config, season_year: int, weeks: list[int],
+                               prior_tail: int) -> dict[int, pd.DataFrame]:
+    """extract_asof_week for every week in `weeks`, from one query: each
+    team's games are aggregated once, cumulatively, instead of once per
+    week swept. Each week's frame equals extract_asof_week's for it."""
+    weeks = sorted(set(weeks))
+    if not weeks or weeks[0] < 1 or weeks[-1] > 62:
+        raise ExtractionError(f"Season slates need weeks between 1 and 62; got {weeks}.")
+    if config.asof_engine == "python":
+        return extract_team_games(config, season_year).asof_season_slates(season_year, weeks,
+                                                                         prior_tail)
+    # psql variables are integers (nothing user-shaped reaches the
+    # server): the weeks travel as a bitmask.
+    frame = _run_query(config, ASOF_SEASON_SLATES_SQL,
+                       {"season_year": season_year, "week_mask": sum(1 << week for week in weeks),
+                        "prior_tail": prior_tail, "fbs_scope": 1 if config.fbs_scope else 0})
+    slates = {}
+    for week in weeks:
+        slate = frame[frame["WeekNumber"] == week].reset_index(drop=True)
+        if slate.empty:
+            raise ExtractionError(
+                f"{ASOF_SEASON_SLATES_SQL.name} returned no slate for {season_year} week {week} — "
+                f"are metrics generated for {config.pg_database}?")
+        # The season's categories, trimmed to the week's: a slate
+        # compares (and concatenates) like a per-week extraction.
+        for name in slate.columns:
+            if slate[name].dtype == "category":
+                slate[name] = slate[name].cat.remove_unused_categories()
+        slates[week] = slate
+    return slates
+
+
+def extract_team_games(config: Config, season_year: int) -> TeamGames:
+    """One narrow row per (team, contest) for every season up to
+    season_year, as TeamGames: the as-of training corpus and any of the
+    season's slates, computed in NumPy (windows.py) instead of by a
+    query each. How METRICBOT_ASOF_ENGINE=python runs extract once."""
+    from .windows import TeamGames
+    return TeamGames(_run_query(config, TEAM_GAMES_SQL, {"season_year": season_year}), config)
+
+
 def extract_final_scores(config: Config, season_year: int, week: int) -> pd.DataFrame:
     """Final scores for grading: the (season, week) slate's FINALIZED
     games — ContestId, HomeScore, AwayScore. Empty is a legitimate
     result (backtesting a week nothing has finished in), and grade_week
     turns it into an all-ungradeable report rather than an error."""
-    return _run_psql(config, GRADING_SCORES_SQL,
+    return _run_query(config, GRADING_SCORES_SQL,
                      {"season_year": season_year, "week": week},
                      allow_empty=True)
 
 
+def extract_season_final_scores(config: Config, season_year: int) -> pd.DataFrame:
+    """Every finalized game of the season — ContestId, WeekNumber,
+    HomeScore, AwayScore — for season sweeps, which slice each week's
+    ground truth in memory. Empty is legitimate, as for a single week."""
+    return _run_query(config, GRADING_SCORES_SEASON_SQL,
+                     {"season_year": season_year},
+                     allow_empty=True)
+
+
 def detect_current_season_week(config: Config) -> tuple[int, int]:
     """Resolve NOW to (season_year, week) for live runs — the current open
     week window, or the next upcoming non-preseason week."""
     try:
-        frame = _run_psql(config, DETECT_WEEK_SQL)
+        frame = _run_query(config, DETECT_WEEK_SQL)
     except ExtractionError as ex:
         raise ExtractionError(
             "Could not resolve the current season week — no open or upcoming "
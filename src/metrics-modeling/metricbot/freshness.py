@@ -0,0 +1,174 @@
+"""Run freshness — whether a publishing run-week would change anything.
+
+Hangfire triggers /run-week several times a week, and most triggers land
+when no game finalized, no metric was recomputed and no line moved. A
+publishing run first reads its week's watermark (run_week_watermark.sql:
+counts, newest timestamps and digests of everything the run reads —
+games, metrics, lines and who quoted them, the teams' group membership,
+the slate — in one aggregate query) and compares it with the watermark
+recorded behind the sport's last successful publish, in one JSON file per
+
+    <ledger_dir>/<database>/last-run-<target>.json
+
+beside the publish ledger (ledger.py), under the same publish target.
+When that publish was for the same season, week, prior-season tail,
+model version and run fingerprint (run_fingerprint: the SQL files the
+run executes, the package's code and the settings that change its
+rows) and the watermark is unchanged, the run would rebuild the same
+predictions: it stops there, reporting the last publish's numbers.
+Otherwise it runs in full, and the reason names what moved — the fit
+reads the whole corpus, so any moved input reruns every stage, and the
+publish ledger then sends only the contests whose predictions changed.
+
+The record is replaced after a successful publish only, with the
+watermark read BEFORE extraction: a change that lands mid-run moves the
+next run's watermark, and that run goes ahead. A missing or unreadable
+record runs. A forced run (--force, --full-publish) reads the watermark
+for its record but never skips. The check needs
+METRICBOT_PUBLISH_LEDGER_DIR; without it every run runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from . import MODEL_VERSION, __version__
+from .config import Config
+from .extract import (ASOF_SEASON_SQL, ASOF_TRAINING_SQL, ASOF_WEEK_SQL, DETECT_WEEK_SQL,
+                      RUN_WATERMARK_SQL, TEAM_GAMES_SQL, _run_query, sql_file_for)
+from .ledger import publish_target
+
+logger = logging.getLogger("metricbot.freshness")
+
+# The watermark columns, in the query's order; the counts are integers,
+# the rest UTC text or md5 digests ("" when there is nothing to take
+# the newest of).
+WATERMARK_FIELDS = ("Games", "FinalGames", "MaxFinalizedUtc", "MetricRows", "MaxComputedUtc",
+                    "OddsRows", "MaxOddsUtc", "OddsDigest", "GroupDigest", "SlateGames",
+                    "SlateDigest")
+_COUNT_FIELDS = frozenset({"Games", "FinalGames", "MetricRows", "OddsRows", "SlateGames"})
+
+# The queries a publishing run-week executes, whichever as-of engine and
+# cache settings pick among them.
+RUN_SQL = (DETECT_WEEK_SQL, RUN_WATERMARK_SQL, ASOF_TRAINING_SQL, ASOF_SEASON_SQL, ASOF_WEEK_SQL,
+           TEAM_GAMES_SQL)
+PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+@dataclass(frozen=True)
+class Freshness:
+    skipped: bool
+    # Why the run stopped, or why it went ahead.
+    reason: str
+    # What the run reads, as of the check — recorded after its publish.
+    watermark: dict
+    # The last publish's record (season_year, week, prior_tail,
+    # model_version, fingerprint, watermark, published_utc, summary);
+    # None if none.
+    last_run: dict | None = None
+
+
+def run_watermark(config: Config, season_year: int, week: int) -> dict:
+    """The watermark of a run for (season_year, week)."""
+    row = _run_query(config, RUN_WATERMARK_SQL,
+                     {"season_year": season_year, "week": week}).iloc[0]
+    return {field: int(row[field]) if field in _COUNT_FIELDS
+            else row[field] if isinstance(row[field], str) else ""
+            for field in WATERMARK_FIELDS}
+
+
+def run_fingerprint(config: Config) -> str:
+    """What turns the same inputs into the same predictions: the SQL
+    files the run executes (its SQL variant's), the package's source and
+    version, and the settings that change its rows. An edit to any of
+    them reruns a week the watermark alone would skip."""
+    digest = hashlib.sha256(f"{MODEL_VERSION}|{__version__}|{config.feature_dtype}"
+                            f"|fbs_scope={config.fbs_scope}|asof_engine={config.asof_engine}"
+                            f"|sql_variant={config.sql_variant}".encode("utf-8"))
+    for sql_file in RUN_SQL:
+        digest.update(sql_file_for(config, sql_file).read_bytes())
+    hash_package(digest)
+    return digest.hexdigest()[:16]
+
+
+def hash_package(digest) -> None:
+    """Feed the package's source files into `digest` — an engine or
+    model edit without a MODEL_VERSION bump still changes it."""
+    for source in sorted(PACKAGE_DIR.glob("*.py")):
+        digest.update(source.name.encode("utf-8") + b"\0" + source.read_bytes())
+
+
+class RunRecord:
+    """The record of one sport's last successful publish to this
+    publish target."""
+
+    def __init__(self, config: Config):
+        if config.publish_ledger_dir is None:
+            raise ValueError("RunRecord needs Config.publish_ledger_dir (METRICBOT_PUBLISH_LEDGER_DIR).")
+        self.path = (config.publish_ledger_dir / config.pg_database
+                     / f"last-run-{publish_target(config)}.json")
+        self.fingerprint = run_fingerprint(config)
+
+    def check(self, season_year: int, week: int, prior_tail: int, watermark: dict,
+              force: bool = False) -> Freshness:
+        last = self._load()
+        moved = _moved(last, season_year, week, prior_tail, self.fingerprint, watermark)
+        if moved:
+            return Freshness(skipped=False, reason=moved, watermark=watermark, last_run=last)
+        unchanged = f"nothing changed since the publish at {last['published_utc']}"
+        return Freshness(skipped=not force, reason=f"forced; {unchanged}" if force else unchanged,
+                         watermark=watermark, last_run=last)
+
+    def record(self, season_year: int, week: int, prior_tail: int, watermark: dict,
+               summary: dict) -> None:
+        """A publish for (season_year, week) went through with the
+        inputs `watermark` describes. Write-then-rename."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({
+            "season_year": season_year,
+            "week": week,
+            "prior_tail": prior_tail,
+            "model_version": MODEL_VERSION,
+            "fingerprint": self.fingerprint,
+            "watermark": watermark,
+            "published_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "summary": summary,
+        }, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _load(self) -> dict | None:
+        try:
+            last = json.loads(self.path.read_text(encoding="utf-8"))
+            if not isinstance(last.get("watermark"), dict) or "summary" not in last:
+                raise ValueError("not a run record")
+            return last
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, AttributeError) as ex:
+            logger.warning("Ignoring unreadable run record %s (%s) — running.", self.path, ex)
+            return None
+
+
+def _moved(last: dict | None, season_year: int, week: int, prior_tail: int, fingerprint: str,
+           watermark: dict) -> str:
+    """What differs between the last publish and this run; "" if nothing."""
+    if last is None:
+        return "no publish recorded"
+    run = {"season_year": season_year, "week": week, "prior_tail": prior_tail,
+           "model_version": MODEL_VERSION}
+    if any(last.get(key) != value for key, value in run.items()):
+        return (f"the last publish was {last.get('season_year')} wk{last.get('week')} "
+                f"(tail {last.get('prior_tail')}, {last.get('model_version')})")
+    if last.get("fingerprint") != fingerprint:
+        return (f"the code, SQL or settings changed since the last publish "
+                f"(fingerprint {last.get('fingerprint')} -> {fingerprint})")
+    moved = [f"{field} {last['watermark'].get(field)!r} -> {watermark[field]!r}"
+             for field in WATERMARK_FIELDS if last["watermark"].get(field) != watermark[field]]
+    return f"moved since the last publish: {'; '.join(moved)}" if moved else ""
@@ -0,0 +1,157 @@
+"""In-process job queue for the service's asynchronous endpoints.
+
+A cold as-of run (full training extraction, walk-forward fits) can hold
+an HTTP connection for minutes. POST /jobs/* submits the same run here
+and returns a job id at once; GET /jobs/{id} reads its status, the
+stages started and finished so far (stages.reporting_stages) and, once
+done, the response the synchronous endpoint would have returned.
+
+Bounded both ways: at most `workers` runs execute at a time and at most
+`queue_limit` are queued or running — a submit beyond that is refused
+(JobQueueFull) rather than piling up behind the psql timeout. Finished
+jobs are kept for `retention` more completions, oldest evicted first;
+queued and running jobs are never evicted. Everything lives in this
+process, so a restart forgets every job (the caller re-submits).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from .stages import StageTiming, reporting_stages
+
+logger = logging.getLogger("metricbot.jobs")
+
+JOB_WORKERS = 2
+JOB_QUEUE_LIMIT = 16
+JOB_RETENTION = 200
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class JobStage:
+    name: str
+    status: str             # running | done | failed
+    seconds: float | None = None
+
+
+@dataclass(frozen=True)
+class Job:
+    """A snapshot of one job; the store replaces it on every change."""
+    id: str
+    kind: str               # run-week | backtest
+    sport: str
+    submitted_utc: str
+    status: str = "queued"  # queued | running | succeeded | failed
+    started_utc: str | None = None
+    finished_utc: str | None = None
+    stages: tuple[JobStage, ...] = ()
+    result: Any = None
+    # On failure: the message and the status code the synchronous
+    # endpoint would have answered with (400 config/validation, 500).
+    error: str | None = None
+    error_status: int | None = None
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class JobStore:
+    def __init__(self, workers: int = JOB_WORKERS, queue_limit: int = JOB_QUEUE_LIMIT,
+                 retention: int = JOB_RETENTION):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.retention = retention
+        self._jobs: dict[str, Job] = {}
+        self._finished: OrderedDict[str, None] = OrderedDict()   # completion order
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    def submit(self, kind: str, sport: str, run: Callable[[], Any]) -> Job:
+        """Queue `run` (returns the job's result; raises SystemExit or
+        any exception to fail it). Raises JobQueueFull at the limit."""
+        with self._lock:
+            active = len(self._jobs) - len(self._finished)
+            if active >= self.queue_limit:
+                raise JobQueueFull(
+                    f"{active} jobs already queued or running (limit {self.queue_limit}).")
+            job = Job(id=uuid.uuid4().hex, kind=kind, sport=sport, submitted_utc=_utc_now())
+            self._jobs[job.id] = job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="metricbot-job")
+            self._executor.submit(self._execute, job.id, run)
+        logger.info("job %s queued: %s %s", job.id, kind, sport)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def close(self) -> None:
+        """Fail the queued jobs and release the workers; running jobs
+        finish in the background. A later submit starts afresh."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            for job in [job for job in self._jobs.values() if job.status == "queued"]:
+                self._finish(job, status="failed", error_status=503,
+                             error="The service shut down before the job started.")
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _on_stage(self, job_id: str, name: str, timing: StageTiming | None) -> None:
+        with self._lock:
+            job = self._jobs[job_id]
+            if timing is None:
+                stages = job.stages + (JobStage(name, "running"),)
+            else:
+                done = JobStage(name, "done", round(timing.seconds, 4))
+                stages = tuple(done if stage.name == name else stage for stage in job.stages)
+            self._jobs[job_id] = replace(job, stages=stages)
+
+    def _finish(self, job: Job, **outcome: Any) -> None:
+        # Under the lock.
+        self._jobs[job.id] = replace(job, finished_utc=_utc_now(), **outcome)
+        self._finished[job.id] = None
+        while len(self._finished) > self.retention:
+            evicted, _ = self._finished.popitem(last=False)
+            del self._jobs[evicted]
+
+    def _execute(self, job_id: str, run: Callable[[], Any]) -> None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != "queued":
+                return      # failed by close() while it waited
+            self._jobs[job_id] = replace(job, status="running", started_utc=_utc_now())
+        started = time.perf_counter()
+        outcome: dict[str, Any]
+        try:
+            with reporting_stages(lambda name, timing: self._on_stage(job_id, name, timing)):
+                outcome = {"status": "succeeded", "result": run()}
+        except SystemExit as ex:  # config/validation failures raise SystemExit
+            outcome = {"status": "failed", "error": str(ex), "error_status": 400}
+        except Exception as ex:  # noqa: BLE001 — job boundary, as the service's
+            logger.exception("job %s failed", job_id)
+            outcome = {"status": "failed", "error": f"{type(ex).__name__}: {ex}",
+                       "error_status": 500}
+        with self._lock:
+            job = self._jobs[job_id]
+            # A graph reports every stage that completes, and waits for
+            # the running ones before raising: a stage still "running"
+            # once the run is over is one that raised.
+            stages = tuple(replace(stage, status="failed") if stage.status == "running" else stage
+                           for stage in job.stages)
+            self._finish(job, stages=stages, **outcome)
+        logger.info("job %s %s in %.2fs", job_id, outcome["status"], time.perf_counter() - started)
@@ -0,0 +1,131 @@
+"""Publish ledger — what was last published for a week, so a re-run
+posts only what moved.
+
+Mid-week re-runs (a line move, a late metric fill) rebuild every DTO,
+and most come out identical to four decimal places. After a successful
+publish the ledger records a content hash per (ContestId,
+PredictionType), in one JSON file per
+
+    <ledger_dir>/<database>/<season>-wk<week>-<model version>-<target>.json
+
+where <target> hashes the API base URL and the bot's user id — a
+ledger written against staging says nothing about production.
+
+The next run diffs its DTOs against it. The ingestion route replaces a
+contest's predictions wholesale (api.py), so the unit sent is the
+contest, not the row: a contest with any changed or new row is sent
+with ALL its current DTOs, and a contest that lost a row (an ATS pick
+whose line was pulled) is sent so the API drops it. A contest whose
+rows are all unchanged is skipped. Contests that left the slate are
+left alone, on the API and in the ledger.
+
+A missing or unreadable ledger diffs everything as new — the full
+publish runs did before. A failed publish leaves the ledger as it was.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass
+
+from . import MODEL_VERSION
+from .config import Config
+
+logger = logging.getLogger("metricbot.ledger")
+
+
+@dataclass(frozen=True)
+class PublishDiff:
+    # Rows of the run, by what the ledger says about them.
+    unchanged: int
+    changed: int
+    new: int
+    # Rows the ledger holds for contests still on the slate that the
+    # run no longer produces.
+    removed: int
+    # What goes to the API: every DTO of a contest with a changed, new
+    # or removed row, in the run's order.
+    dtos: tuple[dict, ...]
+
+    @property
+    def contests(self) -> int:
+        return len({dto["ContestId"] for dto in self.dtos})
+
+    def __str__(self) -> str:
+        return (f"{self.unchanged} unchanged, {self.changed} changed, {self.new} new, "
+                f"{self.removed} removed row(s); {len(self.dtos)} DTOs in "
+                f"{self.contests} contest(s) to send")
+
+
+class PublishLedger:
+    """The ledger file for one sport's (season, week) under this model
+    version and publish target."""
+
+    def __init__(self, config: Config, season_year: int, week: int):
+        if config.publish_ledger_dir is None:
+            raise ValueError("PublishLedger needs Config.publish_ledger_dir (METRICBOT_PUBLISH_LEDGER_DIR).")
+        self.path = (config.publish_ledger_dir / config.pg_database
+                     / f"{season_year}-wk{week}-{MODEL_VERSION}-{publish_target(config)}.json")
+
+    def diff(self, dtos: list[dict]) -> PublishDiff:
+        recorded = self._load()
+        current = {_row_key(dto): row_hash(dto) for dto in dtos}
+        changed = sum(1 for key, digest in current.items()
+                      if key in recorded and recorded[key] != digest)
+        new = sum(1 for key in current if key not in recorded)
+        on_slate = {_contest(key) for key in current}
+        removed = [key for key in recorded if key not in current and _contest(key) in on_slate]
+
+        send = {_contest(key) for key, digest in current.items() if recorded.get(key) != digest}
+        send.update(_contest(key) for key in removed)
+        return PublishDiff(unchanged=len(current) - changed - new, changed=changed, new=new,
+                           removed=len(removed),
+                           dtos=tuple(dto for dto in dtos if str(dto["ContestId"]) in send))
+
+    def record(self, dtos: list[dict]) -> None:
+        """The API now holds `dtos` for their contests: replace those
+        contests' rows, keep the rest. Write-then-rename."""
+        current = {_row_key(dto): row_hash(dto) for dto in dtos}
+        on_slate = {_contest(key) for key in current}
+        rows = {key: digest for key, digest in self._load().items()
+                if _contest(key) not in on_slate}
+        rows.update(current)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"model_version": MODEL_VERSION, "rows": rows}, sort_keys=True),
+                       encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _load(self) -> dict[str, str]:
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))["rows"]
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            logger.warning("Ignoring unreadable publish ledger %s (%s) — publishing every row.",
+                           self.path, ex)
+            return {}
+
+
+def publish_target(config: Config) -> str:
+    """Where a publish lands: the API base URL and the bot's user id."""
+    return hashlib.sha256(f"{config.api_base_url}\0{config.metricbot_user_id}"
+                          .encode("utf-8")).hexdigest()[:12]
+
+
+def row_hash(dto: dict) -> str:
+    # Probabilities are already rounded to 4 dp (dtos.py), so equal here
+    # means equal to the deetsMeter UI.
+    return hashlib.sha256(json.dumps(dto, sort_keys=True, default=str).encode("utf-8")) \
+        .hexdigest()[:16]
+
+
+def _row_key(dto: dict) -> str:
+    return f"{dto['ContestId']}|{dto['PredictionType']}"
+
+
+def _contest(row_key: str) -> str:
+    return row_key.rpartition("|")[0]
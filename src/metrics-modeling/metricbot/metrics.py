@@ -0,0 +1,265 @@
+"""Prometheus metrics for the HTTP service (GET /metrics).
+
+The families are prometheus_client metrics on the service's own
+registry, behind a thin wrapper that fills in the labels every series
+carries — `sport` and `model_version` — ahead of each family's own.
+The client's `_created` series are disabled: one more series per label
+set for a timestamp nothing here graphs.
+
+Nothing here runs inside the pipeline. The service records each request
+once it finishes, from what the run already reports: the result's row
+counts and its stage timeline (stages.py — per-stage seconds, the
+per-query QueryStats, cache hits). A scrape only formats the current
+values, so a 15s scrape interval costs microseconds and never waits on
+a run.
+
+Several uvicorn workers (WEB_CONCURRENCY > 1) are one pod to Prometheus
+through prometheus_client's multiprocess mode: with
+PROMETHEUS_MULTIPROC_DIR set (the image sets it and empties it at
+start), every worker writes its values to files there and a scrape, on
+whichever worker answers it, reads all of them — counters and
+histograms summed, each gauge as its family's `multiprocess_mode` says.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Iterator
+
+import prometheus_client
+from prometheus_client import CollectorRegistry, generate_latest, multiprocess
+
+from . import MODEL_VERSION
+from .api import PublishError, PublishReport
+from .extract import ExtractionError, ExtractionTimeout
+from .stages import StageTimeline
+
+# Request latency: runs take seconds; a season sweep can take minutes.
+REQUEST_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+# Stage and query latency: milliseconds (predict, DTOs) up to the
+# PSQL_TIMEOUT_SECONDS ceiling.
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 600)
+
+CONTENT_TYPE = prometheus_client.CONTENT_TYPE_LATEST
+
+prometheus_client.disable_created_metrics()
+
+# Read by prometheus_client when it is imported, as here.
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR") or None
+if MULTIPROC_DIR is not None:
+    os.makedirs(MULTIPROC_DIR, exist_ok=True)
+
+# The service's families only — not the client's default process and
+# platform collectors. In multiprocess mode, this process's values only.
+REGISTRY = CollectorRegistry()
+
+
+def _exposition_registry() -> CollectorRegistry:
+    """What a scrape reads: REGISTRY, or every worker's files."""
+    if MULTIPROC_DIR is None:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=MULTIPROC_DIR)
+    return registry
+
+
+class _Family:
+    _metric_type: type
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...],
+                 registry: CollectorRegistry = REGISTRY, **kwargs):
+        self.name = name
+        self.labels = ("sport", "model_version") + labels
+        self._registry = registry
+        self._metric = self._metric_type(name, help_text, self.labels, registry=registry,
+                                         **kwargs)
+
+    def _values(self, sport: str, labels: tuple[str, ...]) -> tuple[str, ...]:
+        if len(labels) != len(self.labels) - 2:
+            raise ValueError(f"{self.name} takes labels {self.labels[2:]}; got {labels}")
+        return (sport, MODEL_VERSION) + tuple(str(value) for value in labels)
+
+    def _child(self, sport: str, labels: tuple[str, ...]):
+        return self._metric.labels(*self._values(sport, labels))
+
+    def value(self, sport: str, *labels: str) -> float:
+        """The series' current value as a scrape sees it (every worker's,
+        in multiprocess mode); 0 if it has not been recorded."""
+        values = dict(zip(self.labels, self._values(sport, labels)))
+        registry = self._registry if self._registry is not REGISTRY else _exposition_registry()
+        return registry.get_sample_value(self.name, values) or 0
+
+
+class Counter(_Family):
+    _metric_type = prometheus_client.Counter
+
+    def inc(self, sport: str, *labels: str, amount: float = 1) -> None:
+        self._child(sport, labels).inc(amount)
+
+
+class Gauge(_Family):
+    """`multiprocess_mode`: how the workers' values combine — "livesum"
+    for a count across them, "mostrecent" for the last value any of them
+    set, "livemax" for the largest a running worker holds."""
+    _metric_type = prometheus_client.Gauge
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...],
+                 multiprocess_mode: str, registry: CollectorRegistry = REGISTRY):
+        super().__init__(name, help_text, labels, registry, multiprocess_mode=multiprocess_mode)
+
+    def set(self, sport: str, *labels: str, value: float) -> None:
+        self._child(sport, labels).set(value)
+
+    def inc(self, sport: str, *labels: str, amount: float = 1) -> None:
+        self._child(sport, labels).inc(amount)
+
+
+class Histogram(_Family):
+    _metric_type = prometheus_client.Histogram
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...],
+                 buckets: tuple[float, ...], registry: CollectorRegistry = REGISTRY):
+        super().__init__(name, help_text, labels, registry, buckets=buckets)
+
+    def observe(self, sport: str, *labels: str, value: float) -> None:
+        self._child(sport, labels).observe(value)
+
+
+REQUEST_SECONDS = Histogram(
+    "metricbot_request_seconds", "Wall time of a service request.",
+    ("endpoint", "outcome"), REQUEST_BUCKETS)
+STAGE_SECONDS = Histogram(
+    "metricbot_stage_seconds", "Wall time of a pipeline stage (stages.py).",
+    ("stage",), STAGE_BUCKETS)
+EXTRACT_SECONDS = Histogram(
+    "metricbot_extract_seconds", "Wall time of one extraction query, by SQL file.",
+    ("sql_file",), STAGE_BUCKETS)
+TRAINING_ROWS = Gauge(
+    "metricbot_training_rows", "Pure-model training corpus of the last run.", ("endpoint",),
+    "mostrecent")
+RESIDUAL_ROWS = Gauge(
+    "metricbot_residual_rows",
+    "Correction-model training corpus of the last run (0 = fallback-only).", ("endpoint",),
+    "mostrecent")
+SLATE_CONTESTS = Gauge(
+    "metricbot_slate_contests", "Contests on the last run's slate.", ("endpoint",), "mostrecent")
+IN_FLIGHT = Gauge(
+    "metricbot_runs_in_flight", "Requests currently running.", ("endpoint",), "livesum")
+CACHE_HIT_RATIO = Gauge(
+    "metricbot_cache_hit_ratio",
+    "Corpus-cache partitions read from disk / partitions needed, since start.", (), "mostrecent")
+CACHE_PARTITIONS = Counter(
+    "metricbot_cache_partitions_total", "Corpus-cache partition reads by result.", ("result",))
+PSQL_FAILURES = Counter(
+    "metricbot_psql_failures_total", "Requests failed by an extraction error (not a timeout).", ())
+PSQL_TIMEOUTS = Counter(
+    "metricbot_psql_timeouts_total", "Requests failed by an extraction timeout.", ())
+PUBLISH_ERRORS = Counter(
+    "metricbot_publish_errors_total", "Requests failed posting predictions to the API.", ())
+PUBLISH_CHUNK_SECONDS = Histogram(
+    "metricbot_publish_chunk_seconds",
+    "Wall time of one accepted publish chunk, retries and backoff included (api.py).",
+    (), STAGE_BUCKETS)
+PUBLISH_RETRIES = Counter(
+    "metricbot_publish_retries_total", "Publish requests re-sent after a retryable failure.", ())
+BACKTEST_CACHE = Counter(
+    "metricbot_backtest_cache_total",
+    "Backtests by how the result was found: hit, disk, coalesced or miss (results.py).",
+    ("result",))
+RUN_FRESHNESS = Counter(
+    "metricbot_run_freshness_total",
+    "Publishing runs by the freshness check's decision: skipped (unchanged) or ran "
+    "(freshness.py).", ("decision",))
+# Per worker, each holds its own warm corpus: the fullest one's.
+WARM_CORPUS_BYTES = Gauge(
+    "metricbot_warm_corpus_bytes",
+    "Memory held by the warm corpus (closed seasons kept in memory, cache.py).", (), "livemax")
+WARM_CORPUS_SEASONS = Gauge(
+    "metricbot_warm_corpus_seasons", "Closed seasons held by the warm corpus.", (), "livemax")
+WARM_CORPUS_MAPPED_BYTES = Gauge(
+    "metricbot_warm_corpus_mapped_bytes",
+    "Of metricbot_warm_corpus_bytes, the part mapped from the shared directory (shared.py).", (),
+    "livemax")
+
+FAMILIES = (REQUEST_SECONDS, STAGE_SECONDS, EXTRACT_SECONDS, TRAINING_ROWS, RESIDUAL_ROWS,
+            SLATE_CONTESTS, IN_FLIGHT, CACHE_HIT_RATIO, CACHE_PARTITIONS, PSQL_FAILURES,
+            PSQL_TIMEOUTS, PUBLISH_ERRORS, PUBLISH_CHUNK_SECONDS, PUBLISH_RETRIES,
+            BACKTEST_CACHE, RUN_FRESHNESS, WARM_CORPUS_BYTES, WARM_CORPUS_SEASONS,
+            WARM_CORPUS_MAPPED_BYTES)
+
+# A season sweep's per-week slate stages ("slate wk4") share one series.
+_WEEK_SUFFIX = re.compile(r" wk\d+$")
+
+
+def render() -> str:
+    return generate_latest(_exposition_registry()).decode("utf-8")
+
+
+def retire_process() -> None:
+    """At a worker's shutdown: drop its live gauges (in-flight, warm
+    corpus) from the multiprocess files. Its counters stay counted."""
+    if MULTIPROC_DIR is not None:
+        multiprocess.mark_process_dead(os.getpid(), MULTIPROC_DIR)
+
+
+@contextmanager
+def tracking(endpoint: str, sport: str) -> Iterator[None]:
+    """Around one request: the in-flight gauge, the latency histogram
+    (outcome ok/error) and the failure counters."""
+    IN_FLIGHT.inc(sport, endpoint)
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    except BaseException as ex:
+        record_failure(sport, ex)
+        raise
+    finally:
+        IN_FLIGHT.inc(sport, endpoint, amount=-1)
+        REQUEST_SECONDS.observe(sport, endpoint, outcome, value=time.perf_counter() - started)
+
+
+def record_failure(sport: str, ex: BaseException) -> None:
+    if isinstance(ex, ExtractionTimeout):
+        PSQL_TIMEOUTS.inc(sport)
+    elif isinstance(ex, ExtractionError):
+        PSQL_FAILURES.inc(sport)
+    elif isinstance(ex, PublishError):
+        PUBLISH_ERRORS.inc(sport)
+
+
+def record_publish(sport: str, report: PublishReport) -> None:
+    for chunk in report.chunks:
+        PUBLISH_CHUNK_SECONDS.observe(sport, value=chunk.seconds)
+        PUBLISH_RETRIES.inc(sport, amount=chunk.attempts - 1)
+
+
+def record_run(endpoint: str, sport: str, training_rows: int, residual_rows: int,
+               contests: int | None, timeline: StageTimeline | None) -> None:
+    """A finished run's corpus sizes and stage profile."""
+    TRAINING_ROWS.set(sport, endpoint, value=training_rows)
+    RESIDUAL_ROWS.set(sport, endpoint, value=residual_rows)
+    if timeline is None:
+        return
+    if contests is None:
+        slates = [stage.rows_out or 0 for stage in timeline.stages
+                  if _WEEK_SUFFIX.sub("", stage.name) == "slate"]
+        contests = sum(slates) if slates else None
+    if contests is not None:
+        SLATE_CONTESTS.set(sport, endpoint, value=contests)
+    hits = misses = 0
+    for stage in timeline.stages:
+        STAGE_SECONDS.observe(sport, _WEEK_SUFFIX.sub("", stage.name), value=stage.seconds)
+        for query in stage.query_stats:
+            EXTRACT_SECONDS.observe(sport, query.sql_file, value=query.seconds)
+        hits += stage.cache_hits
+        misses += stage.cache_misses
+    if hits or misses:
+        CACHE_PARTITIONS.inc(sport, "hit", amount=hits)
+        CACHE_PARTITIONS.inc(sport, "miss", amount=misses)
+        read = CACHE_PARTITIONS.value(sport, "hit")
+        CACHE_HIT_RATIO.set(sport, value=read / (read + CACHE_PARTITIONS.value(sport, "miss")))
@@ -10,15 +10,20 @@ training input is identical either way.
 
 from __future__ import annotations
 
+import dataclasses
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
-from scipy.stats import norm
+from scipy.special import ndtr
 from sklearn.linear_model import LinearRegression
 
 from . import MODEL_VERSION
 
+if TYPE_CHECKING:
+    from .engine import AsofFits, LinearFit
+
 # The 58 features (was 64) from predict_straightup.py — order preserved.
 # Removed per the metrics formula audit
 # (docs/audit/competition-metrics-formula-audit.md):
@@ -62,6 +67,107 @@ def is_priced(frame: pd.DataFrame) -> pd.Series:
     return frame["Spread"].notna()
 
 
+def feature_matrix(frame: pd.DataFrame) -> np.ndarray:
+    """FEATURE_COLS as one C-contiguous float64 array with NaN -> 0 — the
+    prototype's `[FEATURE_COLS].fillna(0)`, done once per frame."""
+    x = np.ascontiguousarray(frame[FEATURE_COLS].to_numpy(dtype=np.float64))
+    x[np.isnan(x)] = 0.0
+    return x
+
+
+@dataclass(frozen=True)
+class PreparedCorpus:
+    """A training extraction prepared ONCE for both v1.1 regressions:
+    the feature matrix, the row masks that carve the two corpora, and
+    both targets, as plain arrays. The model paths index into it
+    instead of re-filtering, copying and fillna-ing DataFrames.
+
+    Rows are in chronological order — a stable sort on (SeasonYear,
+    WeekNumber), which the extraction SQL already delivers, so normally
+    the identity. The walk-forward estimate depends on that order, and
+    it makes every as-of cutoff a prefix: asof() slices views, not
+    copies. Frames without those columns keep their row order.
+    """
+    features: np.ndarray            # (rows, len(FEATURE_COLS)) float64, NaN -> 0
+    decided: np.ndarray             # Winner in {HOME, AWAY}
+    priced: np.ndarray              # is_priced: has a Spread
+    fbs: np.ndarray                 # FBS participant; all True without the column
+    margin: np.ndarray              # HomeScore - AwayScore
+    residual: np.ndarray            # margin - (-Spread): actual vs the market
+    season_year: np.ndarray | None
+    week_number: np.ndarray | None
+
+    @staticmethod
+    def of(training: pd.DataFrame) -> "PreparedCorpus":
+        season_year = week_number = None
+        order = slice(None)
+        if {"SeasonYear", "WeekNumber"}.issubset(training.columns):
+            season_year = training["SeasonYear"].to_numpy(dtype=np.int64)
+            week_number = training["WeekNumber"].to_numpy(dtype=np.int64)
+            order = np.argsort(_cutoff_key(season_year, week_number), kind="stable")
+            season_year, week_number = season_year[order], week_number[order]
+
+        features = feature_matrix(training)[order]
+        margin = (training["HomeScore"] - training["AwayScore"]).to_numpy(
+            dtype=np.float64, na_value=np.nan)[order]
+        spread = training["Spread"].to_numpy(dtype=np.float64)[order]
+        if "FbsParticipant" in training.columns:
+            fbs = _fbs_participant(training["FbsParticipant"])[order]
+        else:
+            fbs = np.ones(len(training), dtype=bool)
+        return PreparedCorpus(
+            features=np.ascontiguousarray(features),
+            decided=training["Winner"].isin(["HOME", "AWAY"]).to_numpy()[order],
+            priced=~np.isnan(spread),
+            fbs=fbs,
+            margin=margin,
+            residual=margin + spread,
+            season_year=season_year,
+            week_number=week_number,
+        )
+
+    def __len__(self) -> int:
+        return len(self.decided)
+
+    def asof(self, season_year: int, week: int) -> "PreparedCorpus":
+        """The rows strictly before (season_year, week) — prior seasons
+        whole plus the target season's earlier weeks — as prefix views."""
+        if self.season_year is None:
+            raise ValueError("An as-of cutoff needs SeasonYear and WeekNumber columns.")
+        end = int(np.searchsorted(_cutoff_key(self.season_year, self.week_number),
+                                  _cutoff_key(season_year, week)))
+        return PreparedCorpus(
+            *(None if value is None else value[:end]
+              for value in (self.features, self.decided, self.priced, self.fbs,
+                            self.margin, self.residual, self.season_year, self.week_number)))
+
+    def decided_rows(self) -> np.ndarray:
+        """The pure-margin model's corpus: games with a decided winner (the
+        prototype's combine-step filter; ties and unplayed rows drop)."""
+        return np.flatnonzero(self.decided)
+
+    def residual_rows(self, fbs_scope: bool) -> np.ndarray:
+        """The correction model's corpus: decided ∩ priced (∩ FBS
+        participant when fbs_scope), chronological."""
+        mask = self.decided & self.priced
+        if fbs_scope:
+            mask &= self.fbs
+        return np.flatnonzero(mask)
+
+
+def _fbs_participant(column: pd.Series) -> np.ndarray:
+    # Extraction types the flag (schema.py); frames built by hand may
+    # still carry psql's 't'/'f' text.
+    if column.dtype == bool or isinstance(column.dtype, pd.BooleanDtype):
+        return column.fillna(False).to_numpy(dtype=bool)
+    return column.astype(str).str.lower().isin(["t", "true", "1"]).to_numpy()
+
+
+def _cutoff_key(season_year, week_number):
+    # (season, week) as one orderable integer; weeks never reach 1000.
+    return season_year * 1000 + week_number
+
+
 @dataclass
 class SuResult:
     predictions: pd.DataFrame  # ContestId, Home/AwayFranchiseSeasonId, PredictedMargin, WinProbability, ...
@@ -70,74 +176,148 @@ class SuResult:
     training_rows: int
 
 
-def predict_straight_up(training: pd.DataFrame, current_week: pd.DataFrame) -> SuResult:
+def predict_straight_up(training: pd.DataFrame | PreparedCorpus,
+                        current_week: pd.DataFrame,
+                        fit: LinearFit | None = None) -> SuResult:
     """LinearRegression on point margin (home − away); win probability is
-    the normal-tail P(margin > 0) using the residual std."""
-    train = training[training["Winner"].isin(["HOME", "AWAY"])].copy()
-    train["Margin"] = train["HomeScore"] - train["AwayScore"]
+    the normal-tail P(margin > 0) using the residual std.
+
+    fit: the same regression precomputed by engine.TrainingEngine for
+    exactly these training rows — used instead of refitting (sweeps)."""
+    corpus = training if isinstance(training, PreparedCorpus) else PreparedCorpus.of(training)
+    return _predict_straight_up(corpus, current_week, feature_matrix(current_week), fit)
+
+
+def _predict_straight_up(corpus: PreparedCorpus,
+                         current_week: pd.DataFrame,
+                         x_predict: np.ndarray,
+                         fit: LinearFit | None) -> SuResult:
+    model, residual_std, mae, training_rows = _fit_straight_up(corpus, fit)
+    columns = score_slate(model.predict(x_predict), _slate_spread(current_week), residual_std)
+    return SuResult(
+        predictions=current_week.assign(**{name: columns[name] for name in SU_COLUMNS}),
+        mae=mae,
+        residual_std=residual_std,
+        training_rows=training_rows,
+    )
+
+
+def _fit_straight_up(corpus: PreparedCorpus,
+                     fit: LinearFit | None) -> tuple[LinearRegression | LinearFit, float, float, int]:
+    """The pure-margin regression: (model, residual std, in-sample MAE,
+    training rows)."""
+    rows = corpus.decided_rows()
 
     # Degenerate inputs would produce confident-looking nonsense: an
     # underdetermined fit (more features than games) interpolates its
     # training data exactly, driving residual_std to 0 — and a 0 scale is
     # not a valid normal distribution, so every probability would come
     # back as 0 or 1 and clipping would merely disguise it.
-    if len(train) == 0:
+    if len(rows) == 0:
         raise ModelError(
             "No completed games with a decided winner in the training window — "
             "nothing to train on. For early-season runs, use --prior-season-tail.")
-    if len(train) <= len(FEATURE_COLS):
+    if len(rows) <= len(FEATURE_COLS):
         raise ModelError(
-            f"Training window has {len(train)} decided games for {len(FEATURE_COLS)} "
+            f"Training window has {len(rows)} decided games for {len(FEATURE_COLS)} "
             f"features — underdetermined. Widen the window or use --prior-season-tail.")
 
-    x_train = train[FEATURE_COLS].fillna(0)
-    y_train = train["Margin"]
-
-    model = LinearRegression()
-    model.fit(x_train, y_train)
-
-    residuals = y_train - model.predict(x_train)
-    residual_std = float(np.std(residuals))
+    x_train = corpus.features[rows]
+    y_train = corpus.margin[rows]
+
+    if fit is None:
+        model = LinearRegression()
+        model.fit(x_train, y_train)
+        residuals = y_train - model.predict(x_train)
+        residual_std = float(np.std(residuals))
+    else:
+        if fit.rows != len(rows):
+            raise ValueError(f"Precomputed fit covers {fit.rows} rows; training has {len(rows)}.")
+        model = fit
+        residuals = y_train - model.predict(x_train)
+        residual_std = fit.residual_std
     mae = float(np.mean(np.abs(residuals)))
 
     if not np.isfinite(residual_std) or residual_std <= 0:
         raise ModelError(
             f"Residual standard deviation is {residual_std} — the fit is degenerate, "
             f"so win probabilities would be meaningless.")
-
-    predictions = current_week.copy()
-    x_predict = predictions[FEATURE_COLS].fillna(0)
-    predictions["PredictedMargin"] = model.predict(x_predict)
-    predictions["WinProbability"] = norm.sf(
-        0, loc=predictions["PredictedMargin"], scale=residual_std)
-    predictions["WinProbability"] = predictions["WinProbability"].clip(0.01, 0.99)
-    predictions["PredictedLabel"] = (predictions["WinProbability"] > 0.5).astype(int)
-    predictions["ModelVersion"] = MODEL_VERSION
-    predictions["ResidualStd"] = residual_std
-
-    return SuResult(
-        predictions=predictions,
-        mae=mae,
-        residual_std=residual_std,
-        training_rows=len(train),
-    )
+    return model, residual_std, mae, len(rows)
 
 
 def predict_ats(su: SuResult) -> pd.DataFrame:
     """P(home covers) = P(margin + spread > 0) under the same residual
     distribution. Spread is home-relative (negative = home favored)."""
-    predictions = su.predictions.copy()
-
-    margin_vs_spread = predictions["PredictedMargin"] + predictions["Spread"]
-    predictions["HomeCoverProbability"] = norm.sf(
-        0, loc=margin_vs_spread, scale=su.residual_std).clip(0.01, 0.99)
-    predictions["AwayCoverProbability"] = norm.sf(
-        0, loc=-margin_vs_spread, scale=su.residual_std).clip(0.01, 0.99)
-    predictions["AtsPredictedLabel"] = (
-        predictions["HomeCoverProbability"] > predictions["AwayCoverProbability"]
-    ).astype(int)
-
-    return predictions
+    columns = score_slate(su.predictions["PredictedMargin"].to_numpy(dtype=np.float64),
+                          _slate_spread(su.predictions), su.residual_std)
+    return su.predictions.assign(**{name: columns[name] for name in ATS_COLUMNS})
+
+
+# The columns score_slate produces, in the order they land on the slate.
+SU_COLUMNS = ("PredictedMargin", "WinProbability", "PredictedLabel", "ModelVersion", "ResidualStd")
+ATS_COLUMNS = ("HomeCoverProbability", "AwayCoverProbability", "AtsPredictedLabel")
+
+
+def score_slate(su_margin: np.ndarray,
+                spread: np.ndarray,
+                su_std: float,
+                correction: np.ndarray | None = None,
+                correction_std: float | None = None) -> dict[str, np.ndarray | str | float]:
+    """Every prediction column for one slate, from plain arrays.
+
+    su_margin is the pure model's margin per slate row, spread the
+    home-relative line (NaN = unpriced), su_std its residual std. With
+    correction (the correction model's output for the PRICED rows, in
+    slate order) and correction_std, priced rows take the v1.1 residual
+    path; otherwise every row is "fallback". P(X > 0) for X ~ N(m, s) is
+    ndtr(m / s) — the same float norm.sf(0, loc=m, scale=s) returns,
+    without its per-call argument handling — and the frame is assembled
+    once by the caller instead of column-by-column .loc writes.
+
+    PredictedLabel stays the pure model's call on every row: the
+    residual path overrides margin and probabilities only.
+    """
+    su_margin = np.asarray(su_margin, dtype=np.float64)
+    spread = np.asarray(spread, dtype=np.float64)
+
+    su_win = np.clip(ndtr(su_margin / su_std), 0.01, 0.99)
+    margin_vs_spread = su_margin + spread
+    home_cover = np.clip(ndtr(margin_vs_spread / su_std), 0.01, 0.99)
+    away_cover = np.clip(ndtr(-margin_vs_spread / su_std), 0.01, 0.99)
+    margin, win = su_margin, su_win
+    path = np.full(len(su_margin), "fallback", dtype=object)
+
+    if correction is not None:
+        priced = ~np.isnan(spread)
+        margin, win = su_margin.copy(), su_win.copy()
+        # Margin: the market's opinion plus our measured disagreement.
+        margin[priced] = -spread[priced] + correction
+        win[priced] = np.clip(ndtr(margin[priced] / correction_std), 0.01, 0.99)
+        # Cover: margin + Spread = correction — the cover probability IS
+        # the disagreement. A correction near zero yields ~50% at low
+        # confidence, the truthful ATS output.
+        home_cover[priced] = np.clip(ndtr(correction / correction_std), 0.01, 0.99)
+        away_cover[priced] = np.clip(ndtr(-correction / correction_std), 0.01, 0.99)
+        path[priced] = "residual"
+
+    return {
+        "PredictedMargin": margin,
+        "WinProbability": win,
+        "PredictedLabel": (su_win > 0.5).astype(int),
+        "ModelVersion": MODEL_VERSION,
+        "ResidualStd": su_std,
+        "HomeCoverProbability": home_cover,
+        "AwayCoverProbability": away_cover,
+        "AtsPredictedLabel": (home_cover > away_cover).astype(int),
+        "ModelPath": path,
+    }
+
+
+def _slate_spread(frame: pd.DataFrame) -> np.ndarray:
+    # A slate without a Spread column is wholly unpriced (SU-only input).
+    if "Spread" not in frame.columns:
+        return np.full(len(frame), np.nan)
+    return frame["Spread"].to_numpy(dtype=np.float64)
 
 
 # Fewer decided rows than this and the residual model is skipped in
@@ -157,9 +337,29 @@ class V11Result:
     residual_model_std: float | None  # correction-model residual std (None if skipped)
 
 
-def predict_market_prior(training: pd.DataFrame,
+@dataclass(frozen=True)
+class MarketPriorFit:
+    """Both v1.1 regressions trained, before any slate is seen — the
+    half of predict_market_prior that needs only the training corpus,
+    so the pipeline can fit while the slate query is still running.
+
+    fit_market_regressions leaves residual_model_std unset (None with a
+    correction) and keeps the correction's training rows;
+    validate_market_prior fills it in and drops them."""
+    model: LinearRegression | LinearFit     # pure-margin model
+    su_std: float
+    mae: float
+    training_rows: int
+    correction: LinearRegression | LinearFit | None  # None = fallback-only
+    residual_rows: int
+    residual_model_std: float | None
+    residual_corpus: tuple[np.ndarray, np.ndarray] | None = dataclasses.field(default=None, repr=False)
+
+
+def predict_market_prior(training: pd.DataFrame | PreparedCorpus,
                          current_week: pd.DataFrame,
-                         fbs_scope: bool) -> V11Result:
+                         fbs_scope: bool,
+                         fits: AsofFits | None = None) -> V11Result:
     """v1.1: for priced games, predicted_margin = -Spread + correction,
     where the correction model is trained to predict the RESIDUAL vs
     the line. Unpriced games use the v1.0 pure-stats model and emit SU
@@ -167,52 +367,62 @@ def predict_market_prior(training: pd.DataFrame,
 
     fbs_scope=True (NCAAFB) trains the correction on the FBS∩priced
     intersection per the design; False (NFL) trains on all priced games.
+
+    training may arrive already prepared (sweeps prepare the corpus once
+    and hand each week an as-of view); fits: both regressions
+    precomputed by engine.TrainingEngine for this training set — skips
+    the two full-corpus fits.
     """
-    # The pure model always fits: it serves unpriced slate rows and is
-    # the whole-slate fallback when the residual corpus is too thin.
-    su = predict_straight_up(training, current_week)
-    predictions = predict_ats(su)
-    predictions["ModelPath"] = "fallback"
-
-    decided = training[training["Winner"].isin(["HOME", "AWAY"])].copy()
-    residual_corpus = decided[is_priced(decided)]
-    if fbs_scope and "FbsParticipant" in residual_corpus.columns:
-        # psql CSV delivers booleans as 't'/'f' strings.
-        fbs = residual_corpus["FbsParticipant"].astype(str).str.lower().isin(["t", "true", "1"])
-        residual_corpus = residual_corpus[fbs]
-
-    if len(residual_corpus) < MIN_RESIDUAL_ROWS:
-        # Not enough priced history (early-2022 backtests): honest
-        # fallback for everything rather than a fragile fit.
-        return V11Result(
-            predictions=predictions,
-            training_rows=su.training_rows,
-            residual_rows=0,
-            mae=su.mae,
-            residual_std=su.residual_std,
-            residual_model_std=None,
-        )
+    return score_market_prior(fit_market_prior(training, fbs_scope, fits), current_week)
+
 
-    residual_corpus = residual_corpus.copy()
+def fit_market_prior(training: pd.DataFrame | PreparedCorpus,
+                     fbs_scope: bool,
+                     fits: AsofFits | None = None) -> MarketPriorFit:
+    """The training half of predict_market_prior (same arguments)."""
+    return validate_market_prior(fit_market_regressions(training, fbs_scope, fits))
 
-    # The walk-forward error estimate below depends on chronological
-    # order. The extraction SQL orders by (SeasonYear, WeekNumber);
-    # enforce it here too so the contract doesn't rest on SQL ordering
-    # surviving the pandas round-trip. Stable sort preserves within-week
-    # extraction order.
-    if {"SeasonYear", "WeekNumber"}.issubset(residual_corpus.columns):
-        residual_corpus = residual_corpus.sort_values(
-            ["SeasonYear", "WeekNumber"], kind="stable")
 
-    # r = actual_margin - market_prediction = margin - (-Spread)
-    residual_corpus["Residual"] = (
-        residual_corpus["HomeScore"] - residual_corpus["AwayScore"]
-        + residual_corpus["Spread"])
+def fit_market_regressions(training: pd.DataFrame | PreparedCorpus,
+                           fbs_scope: bool,
+                           fits: AsofFits | None = None) -> MarketPriorFit:
+    """Both regressions, without the correction model's walk-forward
+    error estimate (validate_market_prior)."""
+    corpus = training if isinstance(training, PreparedCorpus) else PreparedCorpus.of(training)
+
+    # The pure model always fits: it serves unpriced slate rows and is
+    # the whole-slate fallback when the residual corpus is too thin.
+    model, su_std, mae, training_rows = _fit_straight_up(corpus, fits.margin if fits else None)
+
+    rows = corpus.residual_rows(fbs_scope)
 
-    x_train = residual_corpus[FEATURE_COLS].fillna(0)
-    y_train = residual_corpus["Residual"]
-    correction = LinearRegression()
-    correction.fit(x_train, y_train)
+    if len(rows) < MIN_RESIDUAL_ROWS:
+        # Not enough priced history (early-2022 backtests): honest
+        # fallback for everything rather than a fragile fit.
+        return MarketPriorFit(model=model, su_std=su_std, mae=mae, training_rows=training_rows,
+                              correction=None, residual_rows=0, residual_model_std=None)
+
+    x_train = corpus.features[rows]
+    y_train = corpus.residual[rows]
+    if fits is None:
+        correction = LinearRegression()
+        correction.fit(x_train, y_train)
+    else:
+        if fits.residual is None or fits.residual.rows != len(rows):
+            raise ValueError("Precomputed residual fit does not cover this training set.")
+        correction = fits.residual
+
+    return MarketPriorFit(model=model, su_std=su_std, mae=mae, training_rows=training_rows,
+                          correction=correction, residual_rows=len(rows),
+                          residual_model_std=None, residual_corpus=(x_train, y_train))
+
+
+def validate_market_prior(fit: MarketPriorFit) -> MarketPriorFit:
+    """The correction model's probability scale: its walk-forward
+    residual std over the rows it was trained on."""
+    if fit.residual_corpus is None:
+        return fit
+    x_train, y_train = fit.residual_corpus
 
     # v1.1.1: the probability scale must be the HONEST out-of-sample
     # error, not the in-sample fit std — overfit shrinks the latter well
@@ -231,62 +441,57 @@ def predict_market_prior(training: pd.DataFrame,
         raise ModelError(
             f"Correction-model residual std is {residual_model_std} — degenerate fit.")
 
-    priced_mask = is_priced(predictions)
-    if priced_mask.any():
-        priced = predictions[priced_mask]
-        corr = correction.predict(priced[FEATURE_COLS].fillna(0))
+    return dataclasses.replace(fit, residual_model_std=residual_model_std, residual_corpus=None)
 
-        # Margin: the market's opinion plus our measured disagreement.
-        margin = -priced["Spread"].to_numpy() + corr
-        predictions.loc[priced_mask, "PredictedMargin"] = margin
-        predictions.loc[priced_mask, "WinProbability"] = norm.sf(
-            0, loc=margin, scale=residual_model_std).clip(0.01, 0.99)
 
-        # Cover: margin + Spread = correction — the cover probability IS
-        # the disagreement. A correction near zero yields ~50% at low
-        # confidence, the truthful ATS output.
-        predictions.loc[priced_mask, "HomeCoverProbability"] = norm.sf(
-            0, loc=corr, scale=residual_model_std).clip(0.01, 0.99)
-        predictions.loc[priced_mask, "AwayCoverProbability"] = norm.sf(
-            0, loc=-corr, scale=residual_model_std).clip(0.01, 0.99)
-        predictions.loc[priced_mask, "AtsPredictedLabel"] = (
-            predictions.loc[priced_mask, "HomeCoverProbability"]
-            > predictions.loc[priced_mask, "AwayCoverProbability"]).astype(int)
-        predictions.loc[priced_mask, "ModelPath"] = "residual"
+def score_market_prior(fit: MarketPriorFit, current_week: pd.DataFrame) -> V11Result:
+    """The slate half of predict_market_prior: score current_week with
+    an already-trained (and validated) fit."""
+    if fit.residual_corpus is not None:
+        raise ValueError("Market-prior fit has not been validated (validate_market_prior).")
+    x_slate = feature_matrix(current_week)
+    su_margin = fit.model.predict(x_slate)
+    spread = _slate_spread(current_week)
+
+    if fit.correction is None:
+        columns = score_slate(su_margin, spread, fit.su_std)
+    else:
+        priced = ~np.isnan(spread)
+        corr = fit.correction.predict(x_slate[priced]) if priced.any() else np.empty(0)
+        columns = score_slate(su_margin, spread, fit.su_std, corr, fit.residual_model_std)
 
     return V11Result(
-        predictions=predictions,
-        training_rows=su.training_rows,
-        residual_rows=len(residual_corpus),
-        mae=su.mae,
-        residual_std=su.residual_std,
-        residual_model_std=residual_model_std,
+        predictions=current_week.assign(**columns),
+        training_rows=fit.training_rows,
+        residual_rows=fit.residual_rows,
+        mae=fit.mae,
+        residual_std=fit.su_std,
+        residual_model_std=fit.residual_model_std,
     )
 
 
 WALK_FORWARD_FOLDS = 5
 
 
-def _walk_forward_residual_std(x_train: pd.DataFrame, y_train: pd.Series) -> float:
+def _walk_forward_residual_std(x_train: np.ndarray | pd.DataFrame,
+                               y_train: np.ndarray | pd.Series,
+                               folds: int = WALK_FORWARD_FOLDS,
+                               starts: list[int] | None = None) -> float:
     """Forward-only out-of-sample residual std: split chronologically into
-    WALK_FORWARD_FOLDS blocks; each block (after the first) is predicted
-    by a model trained on ALL preceding rows. Blocks whose preceding
-    training slice is underdetermined (<= feature count) are skipped —
-    at MIN_RESIDUAL_ROWS the later folds always qualify."""
+    `folds` blocks (or blocks beginning at `starts`, e.g.
+    engine.week_fold_starts for one block per week); each block (after
+    the first) is predicted by a model trained on ALL preceding rows.
+    Blocks whose preceding training slice is underdetermined (<= feature
+    count) are skipped — at MIN_RESIDUAL_ROWS the later folds always
+    qualify. The prefix fits are built incrementally (engine.py), equal
+    to a LinearRegression refit per fold."""
+    from .engine import fold_starts, walk_forward_residuals
+
     n = len(x_train)
-    fold = n // WALK_FORWARD_FOLDS
-    x_values = x_train.to_numpy()
-    y_values = y_train.to_numpy()
-
-    residuals: list[np.ndarray] = []
-    for i in range(1, WALK_FORWARD_FOLDS):
-        train_end = fold * i
-        test_end = fold * (i + 1) if i < WALK_FORWARD_FOLDS - 1 else n
-        if train_end <= len(FEATURE_COLS):
-            continue
-        model = LinearRegression().fit(x_values[:train_end], y_values[:train_end])
-        residuals.append(
-            y_values[train_end:test_end] - model.predict(x_values[train_end:test_end]))
+    if starts is None:
+        starts = fold_starts(n, folds)
+    residuals = walk_forward_residuals(
+        np.asarray(x_train, dtype=np.float64), np.asarray(y_train, dtype=np.float64), starts)
 
     if not residuals:
         raise ModelError(
@@ -1,34 +1,49 @@
 """The run-week orchestration: extract → train → predict SU → predict ATS
-→ build DTOs → POST. State stays in memory on the happy path;
---dump-intermediate writes the same CSV/JSON artifacts the prototype
-produced, for debugging parity.
+→ build DTOs → POST, run as a stage graph (stages.py) so independent
+extractions overlap and the fit starts when its corpus lands. State
+stays in memory on the happy path; --dump-intermediate writes the same
+CSV/JSON artifacts the prototype produced, for debugging parity.
 """
 
 from __future__ import annotations
 
-import json
 import logging
+import multiprocessing
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Hashable, Iterator
 
 import pandas as pd
 
 from . import MODEL_VERSION
-from .api import post_predictions
+from .api import PublishReport, post_predictions
 from .config import Config, normalize_sport
-from .dtos import build_prediction_dtos
-from .extract import (detect_current_season_week, extract_asof_training,
-                      extract_asof_week, extract_current_week,
-                      extract_final_scores, extract_training)
+from .dtos import PredictionDtos, build_prediction_dtos
+from .engine import AsofFits, TrainingEngine
+from .extract import (detect_current_season_week, extract_asof_season_slates,
+                      extract_asof_training, extract_asof_week, extract_current_week,
+                      extract_final_scores, extract_season_final_scores,
+                      extract_team_games, extract_training, extraction_session)
+from .freshness import Freshness, RunRecord, run_watermark
 from .grading import GradeReport, format_report, grade_week
-from .model import predict_market_prior
+from .ledger import PublishDiff, PublishLedger
+from .model import (MarketPriorFit, PreparedCorpus, V11Result, fit_market_regressions,
+                    predict_market_prior, score_market_prior, validate_market_prior)
+from .stages import StageGraph, StageTimeline
 
 logger = logging.getLogger("metricbot")
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
+# Stage threads, and psql processes per extraction session: one per
+# independent extraction (training, slate, scores).
+STAGE_WORKERS = 3
+
 
 @dataclass
 class RunResult:
@@ -36,12 +51,27 @@ class RunResult:
     season_year: int | None
     week: int
     training_rows: int
+    residual_rows: int          # correction-model corpus (0 = fallback-only)
     contests: int
     mae: float
     residual_std: float
     published: bool
     elapsed_seconds: float
-    dtos: list[dict]
+    dtos: PredictionDtos
+    # Per-stage profile (start/end, rows, psql bytes, memory peak with
+    # profile=True) and the critical path.
+    timeline: StageTimeline | None = None
+    # Per-chunk acceptance, attempts and latency; None when not published
+    # (or when nothing changed since the last publish).
+    publish: PublishReport | None = None
+    # Unchanged/changed/new/removed rows against the publish ledger;
+    # None when not published or without a ledger.
+    publish_diff: PublishDiff | None = None
+    # The freshness check (freshness.py) and its reason. When skipped,
+    # nothing was extracted or posted: the numbers above are the last
+    # publish's and dtos is empty. None when not checked — runs that do
+    # not publish, legacy extraction, or no ledger.
+    freshness: Freshness | None = None
 
 
 def run_week(sport: str,
@@ -52,7 +82,10 @@ def run_week(sport: str,
              prior_tail: int = 0,
              publish: bool = False,
              legacy_extraction: bool = False,
-             return_result: bool = False) -> int | RunResult:
+             return_result: bool = False,
+             profile: bool = False,
+             full_publish: bool = False,
+             force: bool = False) -> int | RunResult:
     started = datetime.now(timezone.utc)
     sport = normalize_sport(sport)
     config = Config.load(sport)
@@ -65,93 +98,204 @@ def run_week(sport: str,
     # --publish is explicit — a backtest must not overwrite live
     # deetsMeter predictions. Live (auto-detected) runs publish normally.
     effective_dry_run = dry_run or (explicit_week and not publish)
-
-    # Live runs resolve NOW -> (season, week) and use the SAME as-of
-    # extraction as experiments: entering-week features (identical to the
-    # live aggregates mid-season, and the only thing that works in weeks
-    # 1-2 when FranchiseSeasonMetric is empty), leak-free training, and
-    # prior-season tail support. The legacy extraction remains available
-    # behind --legacy-extraction for parity comparison only.
-    if not explicit_week and not legacy_extraction:
-        season_year, week = detect_current_season_week(config)
-
-    mode = ("legacy-live" if legacy_extraction
-            else f"{'as-of' if explicit_week else 'live'} {season_year} wk{week} (tail={prior_tail})")
-    logger.info("MetricBot %s run-week starting. Sport: %s, Database: %s, Mode: %s, DryRun: %s",
-                MODEL_VERSION, sport, config.pg_database, mode, effective_dry_run)
-
-    # ── Extract ──────────────────────────────────────────────────────
+    # Publishing runs first check whether anything they read changed
+    # since the last publish (freshness.py); legacy runs have no week to
+    # key the record by.
+    record = (RunRecord(config) if not effective_dry_run and not legacy_extraction
+              and config.publish_ledger_dir is not None else None)
+    freshness: Freshness | None = None
+    checked_asof: tuple[int, int] | None = None
+
+    # The run is a stage graph (stages.py): detect → {training, slate}
+    # → fit → predict → DTOs → dump/publish. The two extractions run side
+    # by side — on their own psql processes of one session (or the
+    # service's long-lived session for this sport) — and the fit starts
+    # as soon as the training corpus lands.
+    def detect() -> tuple[int | None, int | None]:
+        if checked_asof is not None:  # resolved for the freshness check
+            return checked_asof
+        # Live runs resolve NOW -> (season, week) and use the SAME as-of
+        # extraction as experiments: entering-week features (identical to
+        # the live aggregates mid-season, and the only thing that works in
+        # weeks 1-2 when FranchiseSeasonMetric is empty), leak-free
+        # training, and prior-season tail support. The legacy extraction
+        # remains available behind --legacy-extraction for parity
+        # comparison only.
+        resolved = (season_year, week)
+        if not explicit_week and not legacy_extraction:
+            resolved = detect_current_season_week(config)
+        mode = ("legacy-live" if legacy_extraction
+                else f"{'as-of' if explicit_week else 'live'} {resolved[0]} wk{resolved[1]} (tail={prior_tail})")
+        logger.info("MetricBot %s run-week starting. Sport: %s, Database: %s, Mode: %s, DryRun: %s",
+                    MODEL_VERSION, sport, config.pg_database, mode, effective_dry_run)
+        return resolved
+
+    def slate_week(current_week: pd.DataFrame, asof: tuple[int | None, int | None]) -> int:
+        if legacy_extraction:
+            from .extract import detect_week_number
+            return detect_week_number(current_week)
+        return asof[1]
+
+    def predict(fit: MarketPriorFit, current_week: pd.DataFrame,
+                asof: tuple[int | None, int | None], training: pd.DataFrame) -> V11Result:
+        logger.info("Extracted %d training rows; %d contests for week %d",
+                    len(training), len(current_week), slate_week(current_week, asof))
+        result = score_market_prior(fit, current_week)
+        # v1.1: market-prior residual + pure-stats fallback.
+        logger.info(
+            "v1.1 model: %d pure-corpus games (MAE %.2f, std %.2f); residual corpus %d "
+            "(correction std %s); slate paths: %s",
+            result.training_rows, result.mae, result.residual_std, result.residual_rows,
+            f"{result.residual_model_std:.2f}" if result.residual_model_std else "n/a — fallback-only",
+            result.predictions["ModelPath"].value_counts().to_dict())
+        return result
+
+    def dtos_for(result: V11Result) -> PredictionDtos:
+        dtos = build_prediction_dtos(result.predictions)
+        logger.info("Built %d prediction DTOs (%d SU + %d ATS — ATS for priced games only)",
+                    len(dtos), len(result.predictions), len(dtos) - len(result.predictions))
+        return dtos
+
+    def dump(training: pd.DataFrame, current_week: pd.DataFrame, result: V11Result,
+             dtos: PredictionDtos, asof: tuple[int | None, int | None]) -> None:
+        week_number = slate_week(current_week, asof)
+        label = (f"{sport}_legacy_week_{week_number}" if legacy_extraction
+                 else f"{sport}_{'asof' if explicit_week else 'live'}_{asof[0]}_wk{week_number}_tail{prior_tail}")
+        _dump(training, current_week, result.predictions, dtos, label)
+
+    def publish(dtos: PredictionDtos, asof: tuple[int | None, int | None]
+                ) -> tuple[PublishDiff | None, PublishReport | None]:
+        # Legacy runs have no (season, week) to key a ledger by.
+        ledger = (PublishLedger(config, *asof)
+                  if config.publish_ledger_dir is not None and asof[0] is not None else None)
+        diff = ledger.diff(dtos) if ledger is not None else None
+        if diff is not None:
+            logger.info("Against the last publish for %d wk%d: %s%s", asof[0], asof[1], diff,
+                        f" (full publish: sending all {len(dtos)})" if full_publish else "")
+        # The whole slate goes out as built, with its encoding.
+        to_send = (dtos if full_publish or diff is None or len(diff.dtos) == len(dtos)
+                   else list(diff.dtos))
+        report = None
+        if to_send:
+            report = post_predictions(config, to_send)
+            logger.info("Published predictions: %s", report)
+        else:
+            logger.info("Nothing changed since the last publish — skipping POST.")
+        if ledger is not None:
+            ledger.record(to_send)
+        return diff, report
+
+    graph = StageGraph()
+    graph.add("detect", detect)
     if legacy_extraction:
-        from .extract import detect_week_number
-        training = extract_training(config)
-        current_week = extract_current_week(config)
-        week_number = detect_week_number(current_week)
+        graph.add("training", lambda _asof: extract_training(config), after=("detect",))
+        graph.add("slate", lambda _asof: extract_current_week(config), after=("detect",))
+    elif config.asof_engine == "python":
+        # One team-game extraction; both frames are computed from it.
+        graph.add("team games", lambda asof: extract_team_games(config, asof[0]), after=("detect",))
+        graph.add("training", lambda games, asof: games.asof_training(*asof),
+                  after=("team games", "detect"))
+        graph.add("slate", lambda games, asof: games.asof_week(*asof, prior_tail),
+                  after=("team games", "detect"))
     else:
-        training = extract_asof_training(config, season_year, week)
-        current_week = extract_asof_week(config, season_year, week, prior_tail)
-        week_number = week
-    logger.info("Extracted %d training rows; %d contests for week %d",
-                len(training), len(current_week), week_number)
-
-    # ── Model (v1.1: market-prior residual + pure-stats fallback) ────
-    result = predict_market_prior(training, current_week, config.fbs_scope)
-    predictions = result.predictions
-    logger.info(
-        "v1.1 model: %d pure-corpus games (MAE %.2f, std %.2f); residual corpus %d "
-        "(correction std %s); slate paths: %s",
-        result.training_rows, result.mae, result.residual_std, result.residual_rows,
-        f"{result.residual_model_std:.2f}" if result.residual_model_std else "n/a — fallback-only",
-        predictions["ModelPath"].value_counts().to_dict())
-
-    # ── DTOs ─────────────────────────────────────────────────────────
-    dtos = build_prediction_dtos(predictions)
-    logger.info("Built %d prediction DTOs (%d SU + %d ATS — ATS for priced games only)",
-                len(dtos), len(predictions), len(dtos) - len(predictions))
-
+        graph.add("training", lambda asof: extract_asof_training(config, *asof), after=("detect",))
+        graph.add("slate", lambda asof: extract_asof_week(config, *asof, prior_tail), after=("detect",))
+    graph.add("fit", lambda training: fit_market_regressions(training, config.fbs_scope),
+              after=("training",))
+    graph.add("validate", validate_market_prior, after=("fit",))
+    graph.add("predict", predict, after=("validate", "slate", "detect", "training"))
+    graph.add("dtos", dtos_for, after=("predict",))
     if dump_intermediate:
-        label = (f"{sport}_legacy_week_{week_number}" if legacy_extraction
-                 else f"{sport}_{'asof' if explicit_week else 'live'}_{season_year}_wk{week_number}_tail{prior_tail}")
-        _dump(training, current_week, predictions, dtos, label)
+        graph.add("dump", dump, after=("training", "slate", "predict", "dtos", "detect"))
+    if not effective_dry_run:
+        graph.add("publish", publish, after=("dtos", "detect"))
+
+    with extraction_session(config, connections=STAGE_WORKERS):
+        if record is not None:
+            checked_asof = detect()
+            freshness = record.check(*checked_asof, prior_tail, run_watermark(config, *checked_asof),
+                                     force=force or full_publish)
+            logger.info("Freshness: %s — %s", "skipping the run" if freshness.skipped else "running",
+                        freshness.reason)
+            if freshness.skipped:
+                return _skipped_run(freshness, started) if return_result else 0
+        results, timeline = graph.run(STAGE_WORKERS, trace_memory=profile)
+
+    season_year, _ = results["detect"]
+    week_number = slate_week(results["slate"], results["detect"])
+    result, dtos, predictions = results["predict"], results["dtos"], results["predict"].predictions
+    publish_diff, publish_report = results.get("publish", (None, None))
+    if record is not None:
+        # The publish went through: the next run compares against the
+        # watermark read before this one extracted anything.
+        record.record(*checked_asof, prior_tail, freshness.watermark, {
+            "training_rows": int(result.training_rows), "residual_rows": int(result.residual_rows),
+            "contests": len(predictions), "mae": float(result.mae),
+            "residual_std": float(result.residual_std)})
 
-    # ── Publish ──────────────────────────────────────────────────────
     if effective_dry_run:
         reason = "DRY RUN" if dry_run else "EXPLICIT-WEEK RUN (pass --publish to override)"
         logger.info("%s — skipping POST. %d DTOs ready for %s/admin/ai-predictions/%s",
                     reason, len(dtos), config.api_base_url, config.metricbot_user_id)
-    else:
-        response = post_predictions(config, dtos)
-        logger.info("Published predictions. API response: %s", response)
 
     elapsed = (datetime.now(timezone.utc) - started).total_seconds()
-    logger.info("MetricBot run-week complete in %.1fs. Sport: %s, Week: %d, Contests: %d",
-                elapsed, sport, week_number, len(predictions))
+    logger.info("MetricBot run-week complete in %.1fs. Sport: %s, Week: %d, Contests: %d; "
+                "critical path: %s", elapsed, sport, week_number, len(predictions),
+                " → ".join(timeline.critical_path))
 
     if return_result:
         return RunResult(
             season_year=season_year,
             week=week_number,
             training_rows=result.training_rows,
+            residual_rows=result.residual_rows,
             contests=len(predictions),
             mae=result.mae,
             residual_std=result.residual_std,
             published=not effective_dry_run,
             elapsed_seconds=elapsed,
             dtos=dtos,
+            timeline=timeline,
+            publish=publish_report,
+            publish_diff=publish_diff,
+            freshness=freshness,
         )
     return 0
 
 
+def _skipped_run(freshness: Freshness, started: datetime) -> RunResult:
+    last = freshness.last_run
+    summary = last["summary"]
+    return RunResult(
+        season_year=last["season_year"],
+        week=last["week"],
+        training_rows=summary["training_rows"],
+        residual_rows=summary["residual_rows"],
+        contests=summary["contests"],
+        mae=summary["mae"],
+        residual_std=summary["residual_std"],
+        published=False,
+        elapsed_seconds=(datetime.now(timezone.utc) - started).total_seconds(),
+        dtos=PredictionDtos(),
+        freshness=freshness,
+    )
+
+
 def run_backtest(sport: str,
                  season_year: int,
                  week: int,
                  prior_tail: int = 0,
-                 dump_intermediate: bool = False) -> "BacktestResult":
+                 dump_intermediate: bool = False,
+                 profile: bool = False) -> "BacktestResult":
     """Predict a historical week as-of, then grade against final scores.
 
     Never publishes — a backtest exists to be scored, not to overwrite
     live deetsMeter data. The prediction path is EXACTLY run_week's
     as-of mode (same extraction, same model); grading is a second
     extraction (final scores) plus pure-pandas scoring.
+
+    profile=True adds each stage's tracemalloc peak to the timeline (the
+    stages then run one at a time — see stages.py).
     """
     started = datetime.now(timezone.utc)
     sport = normalize_sport(sport)
@@ -160,26 +304,48 @@ def run_backtest(sport: str,
     logger.info("MetricBot %s backtest starting. Sport: %s, %d wk%d (tail=%d)",
                 MODEL_VERSION, sport, season_year, week, prior_tail)
 
-    training = extract_asof_training(config, season_year, week)
-    current_week = extract_asof_week(config, season_year, week, prior_tail)
-    logger.info("Extracted %d training rows; %d contests for week %d",
-                len(training), len(current_week), week)
+    def predict(fit: MarketPriorFit, current_week: pd.DataFrame, training: pd.DataFrame) -> V11Result:
+        logger.info("Extracted %d training rows; %d contests for week %d",
+                    len(training), len(current_week), week)
+        return score_market_prior(fit, current_week)
 
-    result = predict_market_prior(training, current_week, config.fbs_scope)
-    predictions = result.predictions
-
-    scores = extract_final_scores(config, season_year, week)
-    report = grade_week(predictions, scores)
-
-    if dump_intermediate:
+    def dump(training: pd.DataFrame, current_week: pd.DataFrame, result: V11Result,
+             dtos: PredictionDtos) -> None:
         label = f"{sport}_backtest_{season_year}_wk{week}_tail{prior_tail}"
-        _dump(training, current_week, predictions,
-              build_prediction_dtos(predictions), label)
+        _dump(training, current_week, result.predictions, dtos, label)
+
+    # Same stage graph as run_week, with the final-scores query as a
+    # third concurrent extraction and grading in place of publishing.
+    graph = StageGraph()
+    if config.asof_engine == "python":
+        graph.add("team games", lambda: extract_team_games(config, season_year))
+        graph.add("training", lambda games: games.asof_training(season_year, week),
+                  after=("team games",))
+        graph.add("slate", lambda games: games.asof_week(season_year, week, prior_tail),
+                  after=("team games",))
+    else:
+        graph.add("training", lambda: extract_asof_training(config, season_year, week))
+        graph.add("slate", lambda: extract_asof_week(config, season_year, week, prior_tail))
+    graph.add("scores", lambda: extract_final_scores(config, season_year, week))
+    graph.add("fit", lambda training: fit_market_regressions(training, config.fbs_scope),
+              after=("training",))
+    graph.add("validate", validate_market_prior, after=("fit",))
+    graph.add("predict", predict, after=("validate", "slate", "training"))
+    graph.add("grade", lambda result, scores: grade_week(result.predictions, scores),
+              after=("predict", "scores"))
+    if dump_intermediate:
+        graph.add("dtos", lambda result: build_prediction_dtos(result.predictions), after=("predict",))
+        graph.add("dump", dump, after=("training", "slate", "predict", "dtos"))
+
+    with extraction_session(config, connections=STAGE_WORKERS):
+        results, timeline = graph.run(STAGE_WORKERS, trace_memory=profile)
+    result, report = results["predict"], results["grade"]
 
     elapsed = (datetime.now(timezone.utc) - started).total_seconds()
-    logger.info("Backtest complete in %.1fs. SU %s, ATS %s, model MAE %s vs market %s",
-                elapsed, report.su.get("accuracy"), report.ats.get("accuracy"),
-                report.margin.get("model_mae"), report.margin.get("market_mae"))
+    logger.info("Backtest complete in %.1fs. SU %s, ATS %s, model MAE %s vs market %s; "
+                "critical path: %s", elapsed, report.su.get("accuracy"), report.ats.get("accuracy"),
+                report.margin.get("model_mae"), report.margin.get("market_mae"),
+                " → ".join(timeline.critical_path))
 
     return BacktestResult(
         sport=sport,
@@ -187,10 +353,12 @@ def run_backtest(sport: str,
         week=week,
         prior_season_tail=prior_tail,
         training_rows=result.training_rows,
+        residual_rows=result.residual_rows,
         in_sample_mae=result.mae,
         residual_std=result.residual_std,
         report=report,
         elapsed_seconds=elapsed,
+        timeline=timeline,
     )
 
 
@@ -201,10 +369,14 @@ class BacktestResult:
     week: int
     prior_season_tail: int
     training_rows: int
+    residual_rows: int
     in_sample_mae: float
     residual_std: float
     report: GradeReport
     elapsed_seconds: float
+    # Per-stage profile + critical path; None for the weeks of a season
+    # sweep, which share one extraction.
+    timeline: StageTimeline | None = None
 
     def format(self) -> str:
         header = (f"BACKTEST {self.sport} {self.season_year} week {self.week} "
@@ -212,10 +384,294 @@ class BacktestResult:
         return format_report(self.report, header)
 
 
+@dataclass
+class SeasonBacktestResult:
+    """A season sweep: one BacktestResult per week, graded exactly as N
+    separate run_backtest calls would be, plus the season rollup (every
+    week's predictions graded together)."""
+    sport: str
+    season_year: int
+    prior_season_tail: int
+    weeks: list[BacktestResult]
+    rollup: GradeReport
+    elapsed_seconds: float
+    timeline: StageTimeline | None = None
+
+    def format(self) -> str:
+        lines = [f"BACKTEST SEASON {self.sport} {self.season_year} weeks "
+                 f"{self.weeks[0].week}-{self.weeks[-1].week} "
+                 f"(tail={self.prior_season_tail}) — {MODEL_VERSION}", ""]
+        for wk in self.weeks:
+            su, ats, margin = wk.report.su, wk.report.ats, wk.report.margin
+            lines.append(
+                f"  wk{wk.week:>3}  {wk.report.graded:>4} graded"
+                + (f"  SU {su['correct']}/{su['decided']} ({su['accuracy']:.1%})"
+                   if su.get("accuracy") is not None else "  SU n/a")
+                + (f"  ATS {ats['correct']}/{ats['decided']} ({ats['accuracy']:.1%})"
+                   if ats.get("accuracy") is not None else "  ATS n/a")
+                + (f"  MAE {margin['model_mae']:.2f}" if margin else ""))
+        lines.append("")
+        lines.append(format_report(self.rollup, "SEASON ROLLUP"))
+        return "\n".join(lines)
+
+
+def asof_training_slice(training: pd.DataFrame, season_year: int, week: int) -> pd.DataFrame:
+    """The rows of a wider as-of training extraction that fall strictly
+    before (season_year, week) — the in-memory equivalent of running
+    competition_metrics_asof_training.sql with that cutoff. Exact
+    because every row's entering-game windows only look at EARLIER
+    kickoffs, which a later cutoff never changes."""
+    before = ((training["SeasonYear"] < season_year)
+              | ((training["SeasonYear"] == season_year) & (training["WeekNumber"] < week)))
+    return training[before].reset_index(drop=True)
+
+
+def _backtest_week_frames(training: pd.DataFrame | PreparedCorpus,
+                          current_week: pd.DataFrame,
+                          scores: pd.DataFrame,
+                          fbs_scope: bool,
+                          fits: AsofFits | None = None) -> tuple[V11Result, GradeReport, float]:
+    """Predict + grade one week from already-extracted frames. Module-level
+    so ProcessPoolExecutor can pickle it (workers are spawned)."""
+    started = time.perf_counter()
+    result = predict_market_prior(training, current_week, fbs_scope, fits)
+    report = grade_week(result.predictions, scores)
+    return result, report, time.perf_counter() - started
+
+
+def backtest_season_frames(training: pd.DataFrame,
+                           slates: dict[int, pd.DataFrame],
+                           scores: pd.DataFrame,
+                           season_year: int,
+                           fbs_scope: bool,
+                           workers: int = 1) -> dict[int, tuple[V11Result, GradeReport, float]]:
+    """Backtest every week in `slates` from one season-wide extraction.
+
+    training: as-of training extracted with a cutoff at (or after) the
+    last swept week; each week trains on the rows before its cutoff.
+    scores: season-wide final scores carrying WeekNumber.
+    The corpus is prepared once (PreparedCorpus — each week trains on an
+    as-of prefix view of it) and both regressions come from ONE
+    TrainingEngine over it (per-week sufficient statistics, one small
+    solve per week) instead of a refit per week. workers > 1 fans the
+    weeks out across a process pool — the rest of each week is
+    CPU-bound and independent; results are keyed by week either way.
+    """
+    jobs = _backtest_jobs(training, {week: (week, slate) for week, slate in slates.items()},
+                          scores, season_year, fbs_scope)
+    return dict(_run_backtest_jobs(jobs, workers))
+
+
+def _backtest_jobs(training: pd.DataFrame,
+                   slates: dict[Hashable, tuple[int, pd.DataFrame]],
+                   scores: pd.DataFrame,
+                   season_year: int,
+                   fbs_scope: bool) -> dict[Hashable, tuple]:
+    """_backtest_week_frames arguments per slate (keyed by the caller:
+    week, or (week, tail) for a grid). The corpus is prepared once and
+    each week's fits solved once, however many slates share the week."""
+    corpus = PreparedCorpus.of(training)
+    engine = TrainingEngine(corpus, fbs_scope)
+    per_week = {}
+    jobs = {}
+    for key, (week, current_week) in slates.items():
+        if week not in per_week:
+            week_scores = scores.loc[scores["WeekNumber"] == week,
+                                     ["ContestId", "HomeScore", "AwayScore"]].reset_index(drop=True)
+            per_week[week] = (corpus.asof(season_year, week), week_scores,
+                              engine.fits(season_year, week))
+        week_training, week_scores, fits = per_week[week]
+        jobs[key] = (week_training, current_week, week_scores, fbs_scope, fits)
+    return jobs
+
+
+def _run_backtest_jobs(jobs: dict[Hashable, tuple],
+                       workers: int) -> Iterator[tuple[Hashable, tuple[V11Result, GradeReport, float]]]:
+    """(key, outcome) per job, in completion order; across a process
+    pool when workers > 1. Workers are spawned, never forked: the
+    service starts sweeps from its thread pool, and a fork taken while
+    another thread holds a lock (logging, the extraction session, BLAS)
+    hands the child that lock held forever."""
+    if workers <= 1 or len(jobs) <= 1:
+        for key, args in jobs.items():
+            yield key, _backtest_week_frames(*args)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)),
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = {pool.submit(_backtest_week_frames, *args): key for key, args in jobs.items()}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def run_backtest_season(sport: str,
+                        season_year: int,
+                        weeks: list[int],
+                        prior_tail: int = 0,
+                        dump_intermediate: bool = False,
+                        workers: int | None = None,
+                        profile: bool = False) -> SeasonBacktestResult:
+    """Sweep-and-grade a season: the per-week results match N separate
+    run_backtest calls, but the multi-season training corpus is extracted
+    ONCE (cutoff at the last week, sliced per week in memory) and final
+    scores come from one season-wide query, as do the slates
+    (extract_asof_season_slates: every week's entering-week features
+    from one cumulative pass). Never publishes."""
+    started = datetime.now(timezone.utc)
+    sport = normalize_sport(sport)
+    config = Config.load(sport)
+    weeks = sorted(set(weeks))
+    if not weeks:
+        raise SystemExit("At least one week is required for a season backtest.")
+    if workers is None:
+        workers = min(len(weeks), os.cpu_count() or 1)
+
+    logger.info("MetricBot %s season backtest starting. Sport: %s, %d weeks %s (tail=%d, workers=%d)",
+                MODEL_VERSION, sport, season_year, weeks, prior_tail, workers)
+
+    def sweep(training: pd.DataFrame, scores: pd.DataFrame, slates: dict[int, pd.DataFrame]):
+        logger.info("Extracted %d training rows (cutoff wk%d); %d slate contests; %d final scores",
+                    len(training), weeks[-1], sum(len(s) for s in slates.values()), len(scores))
+        return slates, backtest_season_frames(training, slates, scores, season_year,
+                                              config.fbs_scope, workers)
+
+    # The three extractions are independent: the corpus, the season's
+    # scores and every week's slate (one cumulative query) run at once.
+    # The Python engine computes the corpus and the slates from one
+    # team-game extraction (windows.py) instead.
+    graph = StageGraph()
+    if config.asof_engine == "python":
+        graph.add("team games", lambda: extract_team_games(config, season_year))
+        graph.add("training", lambda games: games.asof_training(season_year, weeks[-1]),
+                  after=("team games",))
+        graph.add("slate", lambda games: games.asof_season_slates(season_year, weeks, prior_tail),
+                  after=("team games",))
+    else:
+        graph.add("training", lambda: extract_asof_training(config, season_year, weeks[-1]))
+        graph.add("slate", lambda: extract_asof_season_slates(config, season_year, weeks, prior_tail))
+    graph.add("scores", lambda: extract_season_final_scores(config, season_year))
+    graph.add("sweep", sweep, after=("training", "scores", "slate"))
+
+    with extraction_session(config, connections=STAGE_WORKERS):
+        results, timeline = graph.run(STAGE_WORKERS, trace_memory=profile)
+    training, scores = results["training"], results["scores"]
+    slates, outcomes = results["sweep"]
+
+    week_results: list[BacktestResult] = []
+    for week in weeks:
+        result, report, week_elapsed = outcomes[week]
+        if dump_intermediate:
+            label = f"{sport}_backtest_{season_year}_wk{week}_tail{prior_tail}"
+            _dump(asof_training_slice(training, season_year, week), slates[week],
+                  result.predictions, build_prediction_dtos(result.predictions), label)
+        week_results.append(BacktestResult(
+            sport=sport,
+            season_year=season_year,
+            week=week,
+            prior_season_tail=prior_tail,
+            training_rows=result.training_rows,
+            residual_rows=result.residual_rows,
+            in_sample_mae=result.mae,
+            residual_std=result.residual_std,
+            report=report,
+            elapsed_seconds=week_elapsed,
+        ))
+
+    # ContestIds are unique across weeks, so the whole season grades as
+    # one slate — a real rollup (calibration included), not an average
+    # of weekly ratios. Scores for weeks outside the sweep never match a
+    # prediction (grade_week left-joins from predictions).
+    rollup = grade_week(
+        pd.concat([outcomes[week][0].predictions for week in weeks], ignore_index=True),
+        scores[["ContestId", "HomeScore", "AwayScore"]])
+
+    elapsed = (datetime.now(timezone.utc) - started).total_seconds()
+    logger.info("Season backtest complete in %.1fs. SU %s, ATS %s over %d graded games",
+                elapsed, rollup.su.get("accuracy"), rollup.ats.get("accuracy"), rollup.graded)
+
+    return SeasonBacktestResult(
+        sport=sport,
+        season_year=season_year,
+        prior_season_tail=prior_tail,
+        weeks=week_results,
+        rollup=rollup,
+        elapsed_seconds=elapsed,
+        timeline=timeline,
+    )
+
+
+def iter_backtest_grid(sport: str,
+                       season_year: int,
+                       items: list[tuple[int, int]],
+                       workers: int | None = None) -> Iterator[BacktestResult]:
+    """Backtest a grid of (week, prior_season_tail) pairs, yielding each
+    BacktestResult as soon as it is graded — in completion order, not
+    grid order. Each result matches run_backtest for its pair.
+
+    What the pairs share is extracted once: the training corpus (the
+    tail only shapes slates) cut off at the last week, and the season's
+    final scores; the slates are one season-slates query per tail, all
+    of them run STAGE_WORKERS at a time (with the Python engine, the
+    corpus and every tail's slates come from one team-game extraction).
+    Each week's fits are solved once for every tail. Never publishes."""
+    sport = normalize_sport(sport)
+    config = Config.load(sport)
+    items = sorted(set(items))
+    if not items:
+        raise SystemExit("At least one (week, prior_season_tail) pair is required.")
+    weeks = sorted({week for week, _ in items})
+    if workers is None:
+        workers = min(len(items), os.cpu_count() or 1)
+
+    logger.info("MetricBot %s backtest grid starting. Sport: %s %d, %d pairs over weeks %s (workers=%d)",
+                MODEL_VERSION, sport, season_year, len(items), weeks, workers)
+
+    tails = sorted({tail for _, tail in items})
+    graph = StageGraph()
+    python_engine = config.asof_engine == "python"
+    if python_engine:
+        graph.add("team games", lambda: extract_team_games(config, season_year))
+        graph.add("training", lambda games: games.asof_training(season_year, weeks[-1]),
+                  after=("team games",))
+    else:
+        graph.add("training", lambda: extract_asof_training(config, season_year, weeks[-1]))
+    graph.add("scores", lambda: extract_season_final_scores(config, season_year))
+    for tail in tails:
+        tail_weeks = [week for week, item_tail in items if item_tail == tail]
+        if python_engine:
+            graph.add(f"slate tail{tail}",
+                      lambda games, tail=tail, tail_weeks=tail_weeks:
+                      games.asof_season_slates(season_year, tail_weeks, tail),
+                      after=("team games",))
+        else:
+            graph.add(f"slate tail{tail}",
+                      lambda tail=tail, tail_weeks=tail_weeks:
+                      extract_asof_season_slates(config, season_year, tail_weeks, tail))
+    with extraction_session(config, connections=STAGE_WORKERS):
+        results, _ = graph.run(STAGE_WORKERS)
+
+    jobs = _backtest_jobs(results["training"],
+                          {(week, tail): (week, results[f"slate tail{tail}"][week])
+                           for week, tail in items},
+                          results["scores"], season_year, config.fbs_scope)
+    for (week, tail), (result, report, elapsed) in _run_backtest_jobs(jobs, workers):
+        yield BacktestResult(
+            sport=sport,
+            season_year=season_year,
+            week=week,
+            prior_season_tail=tail,
+            training_rows=result.training_rows,
+            residual_rows=result.residual_rows,
+            in_sample_mae=result.mae,
+            residual_std=result.residual_std,
+            report=report,
+            elapsed_seconds=elapsed,
+        )
+
+
 def _dump(training: pd.DataFrame,
           current_week: pd.DataFrame,
           predictions: pd.DataFrame,
-          dtos: list[dict],
+          dtos: PredictionDtos,
           stamp: str) -> None:
     """Write the prototype-equivalent artifacts for debugging."""
     # Stamp is built from CLI/HTTP inputs — allow only filename-safe
@@ -227,7 +683,8 @@ def _dump(training: pd.DataFrame,
     training.to_csv(DATA_DIR / f"training_{stamp}.csv", index=False)
     current_week.to_csv(DATA_DIR / f"current_{stamp}.csv", index=False)
     predictions.to_csv(DATA_DIR / f"predictions_{stamp}.csv", index=False)
-    (DATA_DIR / f"contest_predictions_{stamp}.json").write_text(
-        json.dumps(dtos, indent=2), encoding="utf-8")
+    # The POST body's bytes (compact — pipe through `python -m json.tool`
+    # to read them).
+    (DATA_DIR / f"contest_predictions_{stamp}.json").write_bytes(dtos.encoded)
 
     logger.info("Intermediate artifacts written to %s (*_%s.*)", DATA_DIR, stamp)
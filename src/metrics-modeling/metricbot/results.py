@@ -0,0 +1,239 @@
+"""Backtest result cache: single-flight plus LRU, optionally on disk.
+
+A historical week's backtest is a pure function of its database, week,
+prior-season tail, the data it reads, the SQL that extracts it and the
+code that fits it — yet dashboards re-request the same weeks all day.
+The service routes /backtest through BacktestCache.get_or_compute:
+
+- a request whose result is in memory is answered from it ("hit");
+- with METRICBOT_RESULT_CACHE_DIR set, a result persisted by an
+  earlier process is read from
+
+      <result_cache_dir>/<database>/<fingerprint>/<season>-wk<week>-tail<tail>.json
+
+  ("disk");
+- concurrent requests for a week already being computed wait for that
+  computation instead of starting their own ("coalesced");
+- anything else computes ("miss"). Failures are never cached — every
+  waiter gets the exception, and the next request tries again.
+
+Only a settled week is kept: one whose every prediction was graded. A
+week with games still to finish is computed on every request, since its
+grade changes as they do. Each key carries the week's run watermark
+(freshness.run_watermark — the games, metrics, lines and groups the run
+reads), read on every request, so a finalized game, a recompute or a
+moved line keys a new result instead of serving the old one; a file on
+disk records the watermark it was computed at and is ignored once that
+moved.
+
+The memory cache holds `capacity` results, least recently used evicted
+first. The fingerprint hashes the backtest's SQL files as the run
+resolves them (the SQL variant's twins), the package's source,
+MODEL_VERSION and the settings that change its rows (feature dtype, FBS
+scope, as-of engine, SQL variant), so a query, engine or model edit
+strands every old entry instead of serving it.
+
+/backtest/batch computes its misses together (pipeline.iter_backtest_grid),
+so it uses lookup() and store() around that instead of coalescing.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from . import MODEL_VERSION, __version__
+from .config import Config
+from .extract import (ASOF_SEASON_SQL, ASOF_TRAINING_SQL, ASOF_WEEK_SQL, GRADING_SCORES_SQL,
+                      TEAM_GAMES_SQL, sql_file_for)
+from .freshness import hash_package
+
+logger = logging.getLogger("metricbot.results")
+
+BACKTEST_CACHE_SIZE = 256
+
+# Everything a backtest reads (the season SQL only with the corpus cache
+# on, but it assembles the same rows either way).
+BACKTEST_SQL = (ASOF_TRAINING_SQL, ASOF_SEASON_SQL, ASOF_WEEK_SQL, GRADING_SCORES_SQL)
+
+
+def result_fingerprint(config: Config) -> str:
+    digest = hashlib.sha256(f"{MODEL_VERSION}|{__version__}".encode("utf-8"))
+    for sql_file in BACKTEST_SQL:
+        digest.update(sql_file_for(config, sql_file).read_bytes())
+    digest.update(f"{config.feature_dtype}|fbs_scope={config.fbs_scope}".encode("utf-8"))
+    if config.sql_variant != "spec":
+        digest.update(f"|sql_variant={config.sql_variant}".encode("utf-8"))
+    if config.asof_engine != "sql":
+        # Its averages can differ from the SQL's in the last place.
+        digest.update(f"|asof_engine={config.asof_engine}".encode("utf-8"))
+        digest.update(sql_file_for(config, TEAM_GAMES_SQL).read_bytes())
+    hash_package(digest)
+    return digest.hexdigest()[:16]
+
+
+def settled(result: dict) -> bool:
+    """Whether a backtest result may be kept: every prediction graded."""
+    return result["grade"]["ungradeable"] == 0
+
+
+@dataclass(frozen=True)
+class BacktestKey:
+    database: str           # host:port/database — one sport's data
+    season_year: int
+    week: int
+    prior_tail: int
+    fingerprint: str
+    watermark: str          # digest of the week's run watermark
+
+    @staticmethod
+    def of(config: Config, season_year: int, week: int, prior_tail: int,
+           watermark: dict) -> "BacktestKey":
+        """`watermark`: freshness.run_watermark(config, season_year, week)."""
+        digest = hashlib.sha256(json.dumps(watermark, sort_keys=True).encode("utf-8"))
+        return BacktestKey(f"{config.pg_host}:{config.pg_port}/{config.pg_database}",
+                           season_year, week, prior_tail, result_fingerprint(config),
+                           digest.hexdigest()[:16])
+
+
+def result_path(config: Config, key: BacktestKey) -> Path | None:
+    """Where `key` persists; None without METRICBOT_RESULT_CACHE_DIR."""
+    if config.result_cache_dir is None:
+        return None
+    return (config.result_cache_dir / config.pg_database / key.fingerprint
+            / f"{key.season_year}-wk{key.week}-tail{key.prior_tail}.json")
+
+
+class _Flight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: dict | None = None
+        self.error: BaseException | None = None
+
+
+class BacktestCache:
+    """Results are JSON-able dicts (the service's BacktestResponse); only
+    settled() ones are kept."""
+
+    def __init__(self, capacity: int = BACKTEST_CACHE_SIZE):
+        self.capacity = capacity
+        self._results: OrderedDict[BacktestKey, dict] = OrderedDict()
+        self._flights: dict[BacktestKey, _Flight] = {}
+        self._lock = threading.Lock()
+        self.counts = {"hit": 0, "disk": 0, "coalesced": 0, "miss": 0}
+
+    def get_or_compute(self, key: BacktestKey, compute: Callable[[], dict],
+                       path: Path | None = None) -> tuple[dict, str]:
+        """The result for `key` and how it was found: "hit", "disk",
+        "coalesced" or "miss". `path` persists it (result_path)."""
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._count(self._results[key], "hit")
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        if not leader:
+            flight.done.wait()
+            with self._lock:
+                self.counts["coalesced"] += 1
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, "coalesced"
+
+        outcome = "miss"
+        try:
+            result = _read(path, key) if path is not None else None
+            if result is None:
+                result = compute()
+                if path is not None and settled(result):
+                    _write(path, key, result)
+            else:
+                outcome = "disk"
+            flight.result = result
+        except BaseException as ex:
+            flight.error = ex
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+                if flight.error is None and settled(flight.result):
+                    self._remember(key, flight.result)
+            flight.done.set()
+        with self._lock:
+            return self._count(result, outcome)
+
+    def lookup(self, key: BacktestKey, path: Path | None = None) -> tuple[dict, str] | None:
+        """The result for `key` from memory ("hit") or `path` ("disk");
+        None (uncounted) if neither has it."""
+        with self._lock:
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._count(self._results[key], "hit")
+        result = _read(path, key) if path is not None else None
+        if result is None:
+            return None
+        with self._lock:
+            self._remember(key, result)
+            return self._count(result, "disk")
+
+    def store(self, key: BacktestKey, result: dict, path: Path | None = None) -> None:
+        """Record a result computed outside get_or_compute (a "miss")."""
+        if path is not None and settled(result):
+            _write(path, key, result)
+        with self._lock:
+            if settled(result):
+                self._remember(key, result)
+            self._count(result, "miss")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+    def _remember(self, key: BacktestKey, result: dict) -> None:
+        # Under the lock.
+        self._results[key] = result
+        self._results.move_to_end(key)
+        while len(self._results) > self.capacity:
+            self._results.popitem(last=False)
+
+    def _count(self, result: dict, outcome: str) -> tuple[dict, str]:
+        # Under the lock.
+        self.counts[outcome] += 1
+        return result, outcome
+
+
+def _read(path: Path, key: BacktestKey) -> dict | None:
+    """The result at `path` if it was computed at `key`'s watermark."""
+    try:
+        stored = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as ex:
+        logger.warning("ignoring unreadable cached backtest %s: %s", path, ex)
+        return None
+    if not isinstance(stored, dict) or stored.get("watermark") != key.watermark:
+        return None
+    return stored.get("result")
+
+
+def _write(path: Path, key: BacktestKey, result: dict) -> None:
+    # Write-then-rename, as the corpus cache: a concurrent reader sees
+    # the whole file or none. A failed write only costs the next process
+    # a recompute, so it never fails the request.
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps({"watermark": key.watermark, "result": result}),
+                       encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError as ex:
+        logger.warning("could not persist backtest %s: %s", path, ex)
@@ -0,0 +1,204 @@
+"""Extraction schemas: the column contract of every SQL file in ./sql.
+
+Left to inference, read_csv turns each GUID into a Python string per
+cell, FbsParticipant into 't'/'f' text the model must re-parse, and any
+int column with a NULL into float64. Here each file declares its columns
+by kind, and the kind fixes the dtype at parse time:
+
+    key      unique per row (ContestId) — plain str; categories would
+             only add a codes array to the same strings
+    ref      repeated GUID reference (FranchiseSeasonIds) — category
+    label    small text vocabulary (Winner) — category
+    flag     Postgres boolean — nullable boolean, parsed from t/f
+    count    never NULL (SeasonYear, WeekNumber) — int16
+    total    never NULL, unbounded (row counts) — int64
+    score    nullable integer — Int16
+    feature  FEATURE_COLS and the other CompetitionMetric columns —
+             float64, or float32 with METRICBOT_FEATURE_DTYPE=float32
+    real     float64 whatever the feature dtype (Spread: the market line
+             enters the margin arithmetic directly)
+    text     free text — str
+
+A result whose columns differ from its declaration is an
+ExtractionError naming the drift, and every feature-bearing file must
+select all of FEATURE_COLS — a renamed or dropped metric fails the
+extraction instead of silently zero-filling a model input.
+
+float32 features halve the corpus; the model still computes in float64
+(model.feature_matrix), so the only change is the features' rounding to
+float32 precision. The default stays float64 — bit-identical to the
+inferred frames.
+"""
+
+from __future__ import annotations
+
+import functools
+import io
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from .extract import ExtractionError
+
+_DTYPES = {
+    "key": object,
+    "ref": "category",
+    "label": "category",
+    "flag": "boolean",
+    "count": "int16",
+    "total": "int64",
+    "score": "Int16",
+    "real": "float64",
+    "text": object,
+}
+
+# What read_csv parses before apply() compacts: GUIDs and labels as text,
+# nullable scores as float64 NaN, booleans as psql's t/f text.
+_PARSE_DTYPES = {"ref": object, "label": object, "flag": object, "score": "float64"}
+
+_FLAG_VALUES = {"t": True, "f": False, True: True, False: False}
+
+# CompetitionMetric columns the SQL still selects but the model dropped
+# (model.FEATURE_COLS comment) — typed like features, never fed to it.
+_RETIRED_METRICS = ("TurnoverMarginPerDrive",)
+_LEGACY_RETIRED_METRICS = ("NetPunt", "TurnoverMarginPerDrive", "PenaltyYardsPerPlay")
+
+
+@dataclass(frozen=True)
+class FrameSchema:
+    """One SQL file's result columns, name -> kind. Order is the
+    query's business; the set of names is the contract."""
+    sql_file: str
+    columns: dict[str, str]
+
+    def dtypes(self, feature_dtype: str = "float64") -> dict[str, object]:
+        return {name: feature_dtype if kind == "feature" else _DTYPES[kind]
+                for name, kind in self.columns.items()}
+
+    def parse_csv(self, text: str, feature_dtype: str = "float64") -> pd.DataFrame:
+        """psql --csv output into the declared dtypes. Columns are
+        checked by the caller (validate), after its empty-result check.
+
+        read_csv parses the primitive dtypes directly; the compact ones
+        are cast afterwards, by the same code as a driver frame — its
+        own categorical parse is slower than casting the parsed column,
+        and orders categories by first sight per parser chunk."""
+        parse = {name: feature_dtype if kind == "feature" else _PARSE_DTYPES.get(kind, _DTYPES[kind])
+                 for name, kind in self.columns.items()}
+        try:
+            return self.apply(pd.read_csv(io.StringIO(text), dtype=parse), feature_dtype)
+        except (ValueError, TypeError) as ex:
+            raise ExtractionError(f"{self.sql_file} returned values its schema rejects: {ex}") from ex
+
+    def apply(self, frame: pd.DataFrame, feature_dtype: str = "float64") -> pd.DataFrame:
+        """Cast an already-decoded frame (parsed text, driver rows, a
+        cached partition, a concatenation) to the declared dtypes; a
+        no-op per column that already has it. Undeclared columns pass
+        through — validate() is the column check."""
+        dtypes = self.dtypes(feature_dtype)
+        # Shallow: only the recast columns are new arrays; the caller's
+        # frame is untouched and the float block is never copied.
+        typed = frame.copy(deep=False)
+        for name in frame.columns:
+            column = original = frame[name]
+            dtype = dtypes.get(name, column.dtype)
+            if self.columns.get(name) == "flag" and column.dtype == object:
+                # psql's 't'/'f' text, the driver's True/False, or a
+                # concatenation mixing them (a pre-schema cached partition).
+                column = column.map(_FLAG_VALUES, na_action="ignore")
+            if column.dtype != dtype:
+                column = _categorize(column) if dtype == "category" else column.astype(dtype)
+            if column is not original:
+                typed[name] = column
+        return typed
+
+    def validate(self, frame: pd.DataFrame) -> None:
+        missing = [name for name in self.columns if name not in frame.columns]
+        unexpected = [name for name in frame.columns if name not in self.columns]
+        if missing or unexpected:
+            raise ExtractionError(
+                f"{self.sql_file} columns do not match its schema — "
+                f"missing: {missing or 'none'}; unexpected: {unexpected or 'none'}.")
+
+
+def _categorize(column: pd.Series) -> pd.Series:
+    # Sorted categories — whichever path built the frame (one query, a
+    # per-season concatenation, the driver) the dtype comes out equal.
+    # An all-NULL column (float64 NaN from the driver) gets text-typed
+    # empty categories, as a parsed one does.
+    if column.dtype != object:
+        column = column.astype(object)
+    return column.astype("category")
+
+
+def _slate_columns(extra_ids: tuple[tuple[str, str], ...], retired: tuple[str, ...],
+                   trailing: tuple[tuple[str, str], ...]) -> dict[str, str]:
+    # Every training/slate query shares one shape: ids, the home team's
+    # metrics, the away team's, then scores, Winner and the line.
+    from .model import FEATURE_COLS  # model.py pulls in sklearn; extraction must not
+
+    columns = {"ContestId": "key", "CompetitionId": "key", **dict(extra_ids),
+               "HomeTeamFranchiseSeasonId": "ref", "AwayTeamFranchiseSeasonId": "ref"}
+    for side in ("Home", "Away"):
+        columns[f"{side}FranchiseSeasonId"] = "ref"
+        columns.update((name, "feature") for name in FEATURE_COLS if name.startswith(side))
+        columns.update((f"{side}{metric}", "feature") for metric in retired)
+    columns.update({"HomeScore": "score", "AwayScore": "score", "Winner": "label",
+                    "Spread": "real", **dict(trailing)})
+    return columns
+
+
+def _team_game_columns() -> dict[str, str]:
+    # One row per (team, contest) for windows.py. ContestId repeats once
+    # per team but stays a plain str key: the pairing joins on it. The
+    # metrics are float64 whatever the feature dtype — they are averaged
+    # before the as-of frame is cast.
+    from .windows import WINDOW_METRICS
+
+    return {"ContestId": "key", "CompetitionId": "key", "SeasonYear": "count",
+            "WeekNumber": "count", "StartEpochUs": "total", "FranchiseSeasonId": "ref",
+            "FranchiseId": "ref", "FranchiseSeasonYear": "count", "IsHome": "flag",
+            "Fbs": "flag", "OwnScore": "score", "OppScore": "score", "HasMetric": "flag",
+            **{name: "real" for name in WINDOW_METRICS}, "Spread": "real"}
+
+
+@functools.cache
+def _schemas() -> dict[str, FrameSchema]:
+    asof_training = _slate_columns((("SeasonYear", "count"), ("WeekNumber", "count")),
+                                   _RETIRED_METRICS, (("FbsParticipant", "flag"),))
+    schemas = [
+        FrameSchema("competition_metrics_asof_training.sql", asof_training),
+        FrameSchema("competition_metrics_asof_season.sql", asof_training),
+        FrameSchema("competition_metrics_asof_week.sql",
+                    _slate_columns((("WeekNumber", "count"),), _RETIRED_METRICS, ())),
+        FrameSchema("competition_metrics_asof_season_slates.sql",
+                    _slate_columns((("WeekNumber", "count"),), _RETIRED_METRICS, ())),
+        FrameSchema("competition_metrics_training.sql",
+                    _slate_columns((("WeekNumber", "count"),), _LEGACY_RETIRED_METRICS, ())),
+        FrameSchema("competition_metrics_current_week.sql",
+                    _slate_columns((("WeekNumber", "count"),), _LEGACY_RETIRED_METRICS, ())),
+        FrameSchema("asof_team_games.sql", _team_game_columns()),
+        FrameSchema("detect_current_season_week.sql",
+                    {"SeasonYear": "count", "WeekNumber": "count"}),
+        FrameSchema("grading_scores.sql",
+                    {"ContestId": "key", "HomeScore": "score", "AwayScore": "score"}),
+        FrameSchema("grading_scores_season.sql",
+                    {"ContestId": "key", "WeekNumber": "count",
+                     "HomeScore": "score", "AwayScore": "score"}),
+        FrameSchema("corpus_season_watermarks.sql",
+                    {"SeasonYear": "count", "Games": "total", "MetricRows": "total",
+                     "MaxComputedUtc": "text"}),
+        FrameSchema("run_week_watermark.sql",
+                    {"Games": "total", "FinalGames": "total", "MaxFinalizedUtc": "text",
+                     "MetricRows": "total", "MaxComputedUtc": "text", "OddsRows": "total",
+                     "MaxOddsUtc": "text", "OddsDigest": "text", "GroupDigest": "text",
+                     "SlateGames": "total", "SlateDigest": "text"}),
+    ]
+    return {schema.sql_file: schema for schema in schemas}
+
+
+def schema_for(sql_file: Path) -> FrameSchema | None:
+    """The declared schema of a file in ./sql; None for any other file
+    (ad-hoc queries keep read_csv's inference)."""
+    return _schemas().get(sql_file.name)
@@ -5,32 +5,149 @@ INTERNAL service (no public ingress, same posture as Producer/Provider).
 The API's Hangfire owns scheduling and manual triggering, so this service
 stays a thin, stateless executor:
 
-    POST /run-week   → run the pipeline, return DTOs + run metadata
-    GET  /health     → liveness/readiness
+    POST /run-week          → run the pipeline, return DTOs + run metadata
+    POST /backtest          → grade one historical week
+    POST /backtest-season   → grade a range of weeks from one extraction
+    POST /backtest/batch    → grade a weeks × tails grid, streamed as NDJSON
+    POST /jobs/run-week     → queue a /run-week; returns a job id (202)
+    POST /jobs/backtest     → queue a /backtest; returns a job id (202)
+    GET  /jobs/{id}         → job status, stage progress, final response
+    GET  /health            → liveness, plus each sport's warm-corpus state
+    GET  /ready             → 503 while a warm corpus is still loading
+    GET  /metrics           → Prometheus exposition (metrics.py)
 
-Runs are seconds, so /run-week is synchronous and returns its results on
-the wire — which also keeps experiment artifacts out of an ephemeral
-container's filesystem.
+A warm run takes seconds, so /run-week is synchronous and returns its
+results on the wire — which also keeps experiment artifacts out of an
+ephemeral container's filesystem. A cold one (full as-of extraction up
+to the psql timeout) can take minutes: the /jobs endpoints run the same
+thing on a bounded in-process queue (jobs.py) and the caller polls.
+
+Importing this module does not import the pipeline (pandas, scipy,
+sklearn): /health answers as soon as uvicorn is up, and a background
+thread started at startup loads the pipeline before the first run
+needs it.
+
+With METRICBOT_WARM_CORPUS_MB set, startup also loads each sport's
+closed seasons into memory (cache.preload_closed_seasons) so no request
+re-reads them; /ready holds traffic off until that is done.
+
+Behind several workers (WEB_CONCURRENCY > 1) /metrics aggregates every
+worker (metrics.py), but the job store is one worker's memory — a poll
+would reach the worker holding its job only by chance — so the /jobs
+endpoints are not registered there.
 """
 
 from __future__ import annotations
 
+import dataclasses
+import importlib
+import json
 import logging
-
-from typing import Literal
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Iterator, Literal
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
 
-from . import MODEL_VERSION
-from .pipeline import BacktestResult, RunResult, run_backtest, run_week
+from . import MODEL_VERSION, metrics
+from .config import SUPPORTED_SPORTS, Config
+from .extract import close_sessions, keep_sessions
+from .freshness import run_watermark
+from .jobs import Job, JobQueueFull, JobStore
+from .results import BacktestCache, BacktestKey, result_path
+
+if TYPE_CHECKING:
+    from .dtos import PredictionDtos
+    from .ledger import PublishDiff
+    from .pipeline import BacktestResult, RunResult, SeasonBacktestResult
 
 logger = logging.getLogger("metricbot.service")
 
+jobs = JobStore()
+backtests = BacktestCache()
+
+
+def _worker_count() -> int:
+    # uvicorn's own default for --workers; unparseable is uvicorn's error.
+    try:
+        return max(int(os.environ.get("WEB_CONCURRENCY", "1")), 1)
+    except ValueError:
+        return 1
+
+
+# The /jobs endpoints, on single-worker pods only (see the module docstring).
+JOBS_ENABLED = _worker_count() == 1
+
+# Sport -> Config of the sports preloading a warm corpus (set at startup).
+warm_sports: dict[str, Config] = {}
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # One psql process per sport, opened by the first request and reused
+    # by every later one (reconnects itself if the connection drops);
+    # closed on shutdown, after queued jobs are failed.
+    keep_sessions()
+    # Ready now; the pipeline's imports load behind /health (the first
+    # request imports it itself if it gets there first).
+    threading.Thread(target=importlib.import_module, args=(".pipeline", __package__),
+                     name="metricbot-warm-imports", daemon=True).start()
+    _start_warm_corpora()
+    if not JOBS_ENABLED:
+        logger.warning("WEB_CONCURRENCY=%d: the /jobs endpoints are off — each worker would "
+                       "hold its own jobs", _worker_count())
+    yield
+    jobs.close()
+    close_sessions()
+    metrics.retire_process()
+
+
+def _start_warm_corpora() -> None:
+    # A sport that isn't configured here (no METRICBOT_PG_* yet) just
+    # isn't warmed; its requests fail with the same 400 as before.
+    for sport in SUPPORTED_SPORTS:
+        try:
+            config = Config.load(sport)
+        except SystemExit as ex:
+            logger.info("no warm corpus for %s: %s", sport, ex)
+            continue
+        if config.warm_corpus_mb <= 0:
+            continue
+        from .cache import warm_corpus
+        warm_corpus(config).state = "warming"
+        warm_sports[sport] = config
+        threading.Thread(target=_preload, args=(config,), name=f"metricbot-warm-{sport}",
+                         daemon=True).start()
+
+
+def _preload(config: Config) -> None:
+    from .cache import preload_closed_seasons
+    try:
+        preload_closed_seasons(config)
+    except Exception:
+        logger.exception("warm corpus %s failed to load; runs will fill it", config.pg_database)
+    # Now, not only when this worker answers a scrape: behind several
+    # workers, a scrape may never reach it.
+    _record_warm_corpora()
+
+
+def _warm_summaries() -> dict[str, dict]:
+    """Sport -> cache.WarmCorpus.summary(); empty (and the cache module,
+    with pandas, left unimported) unless warm mode is on."""
+    if not warm_sports:
+        return {}
+    from .cache import warm_corpus
+    return {sport: warm_corpus(config).summary() for sport, config in warm_sports.items()}
+
+
 app = FastAPI(
     title="MetricBot",
     version=MODEL_VERSION,
     description="deetsMeter prediction pipeline (internal service).",
+    lifespan=lifespan,
 )
 
 
@@ -50,11 +167,21 @@ class RunWeekRequest(BaseModel):
     # publish unless dry_run is true. Same guard as the CLI.
     publish: bool = False
     dry_run: bool = False
+    # Publish every DTO instead of only the contests that changed since
+    # this week's last publish (ledger.py).
+    full_publish: bool = False
+    # Run even if nothing the run reads changed since this week's last
+    # publish (freshness.py); full_publish implies it.
+    force: bool = False
 
     # Return the prediction DTOs in the response body (experiments want
     # them; the weekly job doesn't need the payload back).
     include_dtos: bool = False
 
+    # Add each stage's tracemalloc peak to `stages` (runs the stages one
+    # at a time — slower; for diagnosing a slow or memory-hungry run).
+    profile: bool = False
+
 
 class RunWeekResponse(BaseModel):
     model_version: str
@@ -70,22 +197,69 @@ class RunWeekResponse(BaseModel):
     residual_std: float
     published: bool
     elapsed_seconds: float
+    # Per stage: start/end seconds, rows in/out, psql rows/bytes, and the
+    # tracemalloc peak when profiled; plus the critical path (stages.py).
+    stages: dict | None = None
     dtos: list[dict] | None = None
+    # The run's idempotency key and each chunk's DTOs, bytes, attempts
+    # and seconds (api.py); None when not published.
+    publish: dict | None = None
+    # Unchanged/changed/new/removed rows against the publish ledger and
+    # the DTOs that went out; None when not published or without one.
+    publish_diff: dict | None = None
+    # {"skipped", "reason", "watermark"} from the freshness check; when
+    # skipped, the numbers above are the last publish's. None when the
+    # run does not publish.
+    freshness: dict | None = None
 
 
 @app.get("/health")
-def health() -> dict[str, str]:
-    return {"status": "healthy", "modelVersion": MODEL_VERSION}
+def health() -> dict:
+    body: dict = {"status": "healthy", "modelVersion": MODEL_VERSION}
+    if summaries := _warm_summaries():
+        body["warmCorpus"] = summaries
+    return body
 
 
-@app.post("/run-week", response_model=RunWeekResponse)
-def post_run_week(request: RunWeekRequest) -> RunWeekResponse:
+@app.get("/ready")
+def ready() -> JSONResponse:
+    # Cold (no warm mode, or a failed preload) is ready: requests extract
+    # as they always did. Only a load in progress holds traffic off.
+    states = {sport: summary["state"] for sport, summary in _warm_summaries().items()}
+    warming = any(state == "warming" for state in states.values())
+    return JSONResponse({"ready": not warming, "warmCorpus": states},
+                        status_code=503 if warming else 200)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    _record_warm_corpora()
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+def _record_warm_corpora() -> None:
+    for sport, summary in _warm_summaries().items():
+        metrics.WARM_CORPUS_BYTES.set(sport, value=summary["bytes"])
+        metrics.WARM_CORPUS_SEASONS.set(sport, value=len(summary["seasons"]))
+        metrics.WARM_CORPUS_MAPPED_BYTES.set(sport, value=summary["mapped_bytes"])
+
+
+def _validate_run_week(request: RunWeekRequest) -> None:
     if (request.season_year is None) != (request.week is None):
         raise HTTPException(
             status_code=400,
             detail="season_year and week must be provided together (or both omitted for a live run).")
 
-    try:
+
+def _run_week(request: RunWeekRequest, endpoint: str) -> RunWeekResponse:
+    """Raises SystemExit for config/validation failures and anything
+    else for a failed run; the callers map them to 400/500."""
+    return _run_week_response(request, _execute_run_week(request, endpoint), request.include_dtos)
+
+
+def _execute_run_week(request: RunWeekRequest, endpoint: str) -> RunResult:
+    from .pipeline import run_week
+    with metrics.tracking(endpoint, request.sport):
         result: RunResult = run_week(
             sport=request.sport,
             dry_run=request.dry_run,
@@ -94,14 +268,22 @@ def post_run_week(request: RunWeekRequest) -> RunWeekResponse:
             week=request.week,
             prior_tail=request.prior_season_tail,
             publish=request.publish,
+            full_publish=request.full_publish,
+            force=request.force,
             return_result=True,
+            profile=request.profile,
         )
-    except SystemExit as ex:  # config/validation failures raise SystemExit
-        raise HTTPException(status_code=400, detail=str(ex)) from ex
-    except Exception as ex:  # noqa: BLE001 — service boundary
-        logger.exception("run-week failed")
-        raise HTTPException(status_code=500, detail=f"{type(ex).__name__}: {ex}") from ex
+    metrics.record_run(endpoint, request.sport, result.training_rows, result.residual_rows,
+                       result.contests, result.timeline)
+    if result.publish is not None:
+        metrics.record_publish(request.sport, result.publish)
+    if result.freshness is not None:
+        metrics.RUN_FRESHNESS.inc(request.sport, "skipped" if result.freshness.skipped else "ran")
+    return result
+
 
+def _run_week_response(request: RunWeekRequest, result: RunResult,
+                       include_dtos: bool) -> RunWeekResponse:
     return RunWeekResponse(
         model_version=MODEL_VERSION,
         sport=request.sport,
@@ -114,15 +296,51 @@ def post_run_week(request: RunWeekRequest) -> RunWeekResponse:
         residual_std=result.residual_std,
         published=result.published,
         elapsed_seconds=result.elapsed_seconds,
-        dtos=result.dtos if request.include_dtos else None,
+        stages=result.timeline.to_dict() if result.timeline else None,
+        dtos=result.dtos if include_dtos else None,
+        publish=dataclasses.asdict(result.publish) if result.publish else None,
+        publish_diff=_diff_summary(result.publish_diff),
+        freshness=({"skipped": result.freshness.skipped, "reason": result.freshness.reason,
+                    "watermark": result.freshness.watermark} if result.freshness else None),
     )
 
 
+def _diff_summary(diff: PublishDiff | None) -> dict | None:
+    if diff is None:
+        return None
+    return {"unchanged": diff.unchanged, "changed": diff.changed, "new": diff.new,
+            "removed": diff.removed, "contests": diff.contests, "dtos": len(diff.dtos)}
+
+
+def _response_with_dtos(response: RunWeekResponse, dtos: PredictionDtos) -> Response:
+    # The DTOs' own encoding spliced in as the last field: a full slate
+    # is most of the body, and FastAPI would otherwise validate and
+    # re-encode it dict by dict.
+    body = response.model_dump_json(exclude={"dtos"}).encode("utf-8")
+    return Response(body[:-1] + b',"dtos":' + dtos.encoded + b"}",
+                    media_type="application/json")
+
+
+@app.post("/run-week", response_model=RunWeekResponse)
+def post_run_week(request: RunWeekRequest) -> RunWeekResponse | Response:
+    _validate_run_week(request)
+    try:
+        result = _execute_run_week(request, "/run-week")
+        response = _run_week_response(request, result, include_dtos=False)
+        return _response_with_dtos(response, result.dtos) if request.include_dtos else response
+    except SystemExit as ex:  # config/validation failures raise SystemExit
+        raise HTTPException(status_code=400, detail=str(ex)) from ex
+    except Exception as ex:  # noqa: BLE001 — service boundary
+        logger.exception("run-week failed")
+        raise HTTPException(status_code=500, detail=f"{type(ex).__name__}: {ex}") from ex
+
+
 class BacktestRequest(BaseModel):
     sport: Literal["FootballNcaa", "FootballNfl"] = "FootballNcaa"
     season_year: int = Field(ge=1990, le=2100)
     week: int = Field(ge=1, le=25)
     prior_season_tail: int = Field(default=0, ge=0, le=25)
+    profile: bool = False   # as RunWeekRequest.profile
 
 
 class BacktestResponse(BaseModel):
@@ -137,6 +355,57 @@ class BacktestResponse(BaseModel):
     elapsed_seconds: float
     # grade_week's report: su / ats / margin / calibration sections.
     grade: dict
+    # Per-stage timeline; None for the weeks of a season sweep.
+    stages: dict | None = None
+    # Served from the backtest cache (results.py) or another request's
+    # identical computation; elapsed_seconds and stages are that run's.
+    cached: bool = False
+
+
+def _backtest_response(result: BacktestResult) -> BacktestResponse:
+    return BacktestResponse(
+        model_version=MODEL_VERSION,
+        sport=result.sport,
+        season_year=result.season_year,
+        week=result.week,
+        prior_season_tail=result.prior_season_tail,
+        training_rows=result.training_rows,
+        in_sample_mae=result.in_sample_mae,
+        residual_std=result.residual_std,
+        elapsed_seconds=result.elapsed_seconds,
+        grade=result.report.to_dict(),
+        stages=result.timeline.to_dict() if result.timeline else None,
+    )
+
+
+def _run_backtest(request: BacktestRequest, endpoint: str) -> BacktestResponse:
+    """Through the backtest cache, except profiled runs — a profile is a
+    fresh measurement."""
+    with metrics.tracking(endpoint, request.sport):
+        if request.profile:
+            return _compute_backtest(request, endpoint)
+        config = Config.load(request.sport)
+        key = BacktestKey.of(config, request.season_year, request.week, request.prior_season_tail,
+                             run_watermark(config, request.season_year, request.week))
+        payload, found = backtests.get_or_compute(
+            key, lambda: _compute_backtest(request, endpoint).model_dump(mode="json"),
+            result_path(config, key))
+    metrics.BACKTEST_CACHE.inc(request.sport, found)
+    return BacktestResponse(**{**payload, "cached": found != "miss"})
+
+
+def _compute_backtest(request: BacktestRequest, endpoint: str) -> BacktestResponse:
+    from .pipeline import run_backtest
+    result: BacktestResult = run_backtest(
+        sport=request.sport,
+        season_year=request.season_year,
+        week=request.week,
+        prior_tail=request.prior_season_tail,
+        profile=request.profile,
+    )
+    metrics.record_run(endpoint, request.sport, result.training_rows, result.residual_rows,
+                       None, result.timeline)
+    return _backtest_response(result)
 
 
 @app.post("/backtest", response_model=BacktestResponse)
@@ -145,27 +414,220 @@ def post_backtest(request: BacktestRequest) -> BacktestResponse:
     Never publishes — backtests exist to be scored, not to overwrite
     live deetsMeter data."""
     try:
-        result: BacktestResult = run_backtest(
-            sport=request.sport,
-            season_year=request.season_year,
-            week=request.week,
-            prior_tail=request.prior_season_tail,
-        )
+        return _run_backtest(request, "/backtest")
     except SystemExit as ex:
         raise HTTPException(status_code=400, detail=str(ex)) from ex
     except Exception as ex:  # noqa: BLE001 — service boundary
         logger.exception("backtest failed")
         raise HTTPException(status_code=500, detail=f"{type(ex).__name__}: {ex}") from ex
 
-    return BacktestResponse(
+
+class BacktestBatchRequest(BaseModel):
+    sport: Literal["FootballNcaa", "FootballNfl"] = "FootballNcaa"
+    season_year: int = Field(ge=1990, le=2100)
+    # Every (week, tail) pair of the grid is backtested.
+    weeks: list[int] = Field(min_length=1, max_length=25)
+    prior_season_tails: list[int] = Field(default=[0], min_length=1, max_length=8)
+    # None = one worker process per pair, capped at the CPU count.
+    workers: int | None = Field(default=None, ge=1, le=32)
+
+
+@app.post("/backtest/batch")
+def post_backtest_batch(request: BacktestBatchRequest) -> StreamingResponse:
+    """Backtest every (week, tail) pair of the grid, streaming one
+    BacktestResponse per line (NDJSON) as each is graded: cached pairs
+    first (results.py), then the rest in completion order — computed
+    together from ONE training extraction and one scores query
+    (pipeline.iter_backtest_grid). Each line matches POST /backtest for
+    its pair. Never publishes.
+
+    A failure before the first line is an HTTP 400/500 as usual; once
+    lines have gone out it ends the stream with an {"error", "error_status"}
+    line instead."""
+    if any(week < 1 or week > 25 for week in request.weeks) or \
+            any(tail < 0 or tail > 25 for tail in request.prior_season_tails):
+        raise HTTPException(status_code=400,
+                            detail="weeks must be between 1 and 25, tails between 0 and 25.")
+    lines = _backtest_batch_lines(request)
+    try:
+        first = next(lines, None)
+    except SystemExit as ex:
+        raise HTTPException(status_code=400, detail=str(ex)) from ex
+    except Exception as ex:  # noqa: BLE001 — service boundary
+        logger.exception("backtest batch failed")
+        raise HTTPException(status_code=500, detail=f"{type(ex).__name__}: {ex}") from ex
+
+    def stream() -> Iterator[str]:
+        if first is not None:
+            yield first
+        try:
+            yield from lines
+        except (SystemExit, Exception) as ex:  # noqa: BLE001 — the status line has gone out
+            logger.exception("backtest batch failed mid-stream")
+            status = 400 if isinstance(ex, SystemExit) else 500
+            detail = str(ex) if status == 400 else f"{type(ex).__name__}: {ex}"
+            yield json.dumps({"error": detail, "error_status": status}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+def _backtest_batch_lines(request: BacktestBatchRequest) -> Iterator[str]:
+    from .pipeline import iter_backtest_grid
+    with metrics.tracking("/backtest/batch", request.sport):
+        config = Config.load(request.sport)
+        pending = {}
+        for week in sorted(set(request.weeks)):
+            watermark = run_watermark(config, request.season_year, week)
+            for tail in sorted(set(request.prior_season_tails)):
+                key = BacktestKey.of(config, request.season_year, week, tail, watermark)
+                found = backtests.lookup(key, result_path(config, key))
+                if found is None:
+                    pending[week, tail] = key
+                    continue
+                metrics.BACKTEST_CACHE.inc(request.sport, found[1])
+                yield BacktestResponse(**{**found[0], "cached": True}).model_dump_json() + "\n"
+        if not pending:
+            return
+        for result in iter_backtest_grid(request.sport, request.season_year, list(pending),
+                                         request.workers):
+            response = _backtest_response(result)
+            key = pending[result.week, result.prior_season_tail]
+            backtests.store(key, response.model_dump(mode="json"), result_path(config, key))
+            metrics.BACKTEST_CACHE.inc(request.sport, "miss")
+            yield response.model_dump_json() + "\n"
+
+
+class BacktestSeasonRequest(BaseModel):
+    sport: Literal["FootballNcaa", "FootballNfl"] = "FootballNcaa"
+    season_year: int = Field(ge=1990, le=2100)
+    weeks: list[int] = Field(min_length=1, max_length=25)
+    prior_season_tail: int = Field(default=0, ge=0, le=25)
+    # None = one worker process per week, capped at the CPU count.
+    workers: int | None = Field(default=None, ge=1, le=32)
+
+
+class BacktestSeasonResponse(BaseModel):
+    model_version: str
+    sport: str
+    season_year: int
+    prior_season_tail: int
+    elapsed_seconds: float
+    weeks: list[BacktestResponse]
+    # grade_week over every swept week's predictions at once.
+    rollup: dict
+    stages: dict | None = None
+
+
+@app.post("/backtest-season", response_model=BacktestSeasonResponse)
+def post_backtest_season(request: BacktestSeasonRequest) -> BacktestSeasonResponse:
+    """Grade a range of historical weeks from ONE training extraction —
+    identical per-week grades to repeated /backtest calls. Never
+    publishes."""
+    if any(week < 1 or week > 25 for week in request.weeks):
+        raise HTTPException(status_code=400, detail="weeks must be between 1 and 25.")
+    from .pipeline import run_backtest_season
+    try:
+        with metrics.tracking("/backtest-season", request.sport):
+            result: SeasonBacktestResult = run_backtest_season(
+                sport=request.sport,
+                season_year=request.season_year,
+                weeks=request.weeks,
+                prior_tail=request.prior_season_tail,
+                workers=request.workers,
+            )
+    except SystemExit as ex:
+        raise HTTPException(status_code=400, detail=str(ex)) from ex
+    except Exception as ex:  # noqa: BLE001 — service boundary
+        logger.exception("backtest-season failed")
+        raise HTTPException(status_code=500, detail=f"{type(ex).__name__}: {ex}") from ex
+    last = result.weeks[-1]
+    metrics.record_run("/backtest-season", request.sport, last.training_rows, last.residual_rows,
+                       None, result.timeline)
+
+    return BacktestSeasonResponse(
         model_version=MODEL_VERSION,
         sport=result.sport,
         season_year=result.season_year,
-        week=result.week,
         prior_season_tail=result.prior_season_tail,
-        training_rows=result.training_rows,
-        in_sample_mae=result.in_sample_mae,
-        residual_std=result.residual_std,
         elapsed_seconds=result.elapsed_seconds,
-        grade=result.report.to_dict(),
+        weeks=[_backtest_response(week) for week in result.weeks],
+        rollup=result.rollup.to_dict(),
+        stages=result.timeline.to_dict() if result.timeline else None,
+    )
+
+
+class JobStageResponse(BaseModel):
+    name: str
+    status: Literal["running", "done", "failed"]
+    seconds: float | None = None
+
+
+class JobResponse(BaseModel):
+    id: str
+    kind: Literal["run-week", "backtest"]
+    sport: str
+    status: Literal["queued", "running", "succeeded", "failed"]
+    submitted_utc: str
+    started_utc: str | None = None
+    finished_utc: str | None = None
+    # Stages in start order as the run reports them (stages.py); a
+    # finished job's full profile is in result.stages.
+    stages: list[JobStageResponse] = []
+    # What the synchronous endpoint returns, once succeeded.
+    result: RunWeekResponse | BacktestResponse | None = None
+    # Once failed: the synchronous endpoint's detail and status code.
+    error: str | None = None
+    error_status: int | None = None
+
+
+def _job_response(job: Job) -> JobResponse:
+    return JobResponse(
+        id=job.id,
+        kind=job.kind,
+        sport=job.sport,
+        status=job.status,
+        submitted_utc=job.submitted_utc,
+        started_utc=job.started_utc,
+        finished_utc=job.finished_utc,
+        stages=[JobStageResponse(name=stage.name, status=stage.status, seconds=stage.seconds)
+                for stage in job.stages],
+        result=job.result,
+        error=job.error,
+        error_status=job.error_status,
     )
+
+
+def _submit(kind: str, sport: str, run) -> JobResponse:
+    try:
+        return _job_response(jobs.submit(kind, sport, run))
+    except JobQueueFull as ex:
+        raise HTTPException(status_code=503, detail=str(ex)) from ex
+
+
+def post_job_run_week(request: RunWeekRequest) -> JobResponse:
+    """Queue a /run-week; poll GET /jobs/{id} for its result."""
+    _validate_run_week(request)
+    return _submit("run-week", request.sport, lambda: _run_week(request, "/jobs/run-week"))
+
+
+def post_job_backtest(request: BacktestRequest) -> JobResponse:
+    """Queue a /backtest; poll GET /jobs/{id} for its result."""
+    return _submit("backtest", request.sport, lambda: _run_backtest(request, "/jobs/backtest"))
+
+
+def get_job(job_id: str) -> JobResponse:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No job {job_id} — never submitted, evicted after completion, "
+                   f"or submitted before a restart.")
+    return _job_response(job)
+
+
+if JOBS_ENABLED:
+    app.add_api_route("/jobs/run-week", post_job_run_week, methods=["POST"],
+                      response_model=JobResponse, status_code=202)
+    app.add_api_route("/jobs/backtest", post_job_backtest, methods=["POST"],
+                      response_model=JobResponse, status_code=202)
+    app.add_api_route("/jobs/{job_id}", get_job, methods=["GET"], response_model=JobResponse)
@@ -0,0 +1,187 @@
+"""Shared corpus: closed seasons as read-only memory-mapped columns.
+
+The warm corpus (cache.WarmCorpus) is per process, so `uvicorn
+--workers N` would hold N copies of the same closed seasons. With
+METRICBOT_SHARED_CORPUS_DIR set (a tmpfs such as /dev/shm, or any local
+directory), a closed season is published once as one .npy file per
+column array:
+
+    <shared_dir>/<database>/season=<year>/<fingerprint>-<watermark>/
+        meta.json    columns, dtypes, categories, the watermark
+        <n>.npy      the arrays, in meta's order
+
+and every worker's warm corpus holds frames whose columns are views of
+those files, mapped read-only (numpy.load(mmap_mode="r")). The pages
+are the kernel's page cache, shared by every process that maps them:
+each worker's RSS still counts what it touched, but its private memory
+(USS) and its share of the pod's (PSS) do not grow with the corpus.
+
+Only the GUID columns (ContestId, CompetitionId) are materialised per
+process — pandas holds text as Python objects. Numeric, categorical
+(codes; the categories are in meta.json) and nullable columns stay
+mapped.
+
+The mapping saves the resident copies between requests; a run still
+concatenates the seasons it reads into its own training corpus
+(cache.cached_asof_training), so each in-flight run holds a private
+copy of the corpus while it runs, as without a shared directory.
+
+A season's directory name carries its watermark, and a published
+directory is never written again: a moved watermark publishes a new
+directory beside it and marks the old one superseded. A superseded
+directory is removed by a publish at least SUPERSEDED_GRACE_SECONDS
+later — a worker that read the old watermark just before may still be
+about to map it. A worker already mapping old files keeps them
+(unlinked files live until unmapped), and one whose directory vanishes
+mid-attach gets None and extracts the season instead. Publishing is
+write-then-rename; two workers publishing the same season at once both
+succeed and attach to whichever landed first.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .cache import WATERMARK_FIELDS, fingerprint
+from .config import Config
+
+logger = logging.getLogger("metricbot.shared")
+
+# How long a superseded season directory outlives the publish that
+# replaced it — far longer than a run takes from reading its watermarks
+# to mapping its seasons.
+SUPERSEDED_GRACE_SECONDS = 600
+_SUPERSEDED = "superseded"
+
+
+class SharedCorpus:
+    """The shared directory for one database (= one sport)."""
+
+    def __init__(self, config: Config):
+        if config.shared_corpus_dir is None:
+            raise ValueError("SharedCorpus needs Config.shared_corpus_dir (METRICBOT_SHARED_CORPUS_DIR).")
+        self.root = config.shared_corpus_dir / config.pg_database
+        self.fingerprint = fingerprint(config)
+
+    def season_dir(self, season_year: int, watermark: dict) -> Path:
+        stamp = hashlib.sha256(json.dumps([watermark[field] for field in WATERMARK_FIELDS])
+                               .encode("utf-8")).hexdigest()[:12]
+        return self.root / f"season={season_year}" / f"{self.fingerprint}-{stamp}"
+
+    def attach(self, season_year: int, watermark: dict) -> tuple[pd.DataFrame, int] | None:
+        """The published season as a frame over mapped files, and the
+        bytes it maps; None if it is not published at this watermark, or
+        cannot be mapped (the caller extracts the season instead)."""
+        directory = self.season_dir(season_year, watermark)
+        try:
+            meta = json.loads((directory / "meta.json").read_text(encoding="utf-8"))
+            # Plain ndarray views of the maps: the frame looks like any other.
+            arrays = [np.load(directory / f"{n}.npy", mmap_mode="r").view(np.ndarray)
+                      for n in range(meta["arrays"])]
+            columns, mapped_bytes = {}, 0
+            for name, column in meta["columns"].items():
+                columns[name], mapped = _decode(column, arrays)
+                mapped_bytes += mapped
+        except FileNotFoundError:
+            return None     # not published, or pruned while this worker mapped it
+        except (OSError, ValueError, KeyError, TypeError) as ex:
+            logger.warning("Ignoring unreadable shared season %s (%s) — extracting it.",
+                           directory, ex)
+            return None
+        return pd.DataFrame(columns, copy=False), mapped_bytes
+
+    def publish(self, season_year: int, frame: pd.DataFrame, watermark: dict) -> None:
+        """Write the season unless it is already published; mark the
+        season's directories for other watermarks or fingerprints
+        superseded, and prune those superseded past the grace period."""
+        directory = self.season_dir(season_year, watermark)
+        if not (directory / "meta.json").is_file():
+            tmp = directory.with_name(f".{directory.name}.{os.getpid()}.tmp")
+            shutil.rmtree(tmp, ignore_errors=True)
+            tmp.mkdir(parents=True)
+            arrays: list[np.ndarray] = []
+            meta = {"season_year": season_year, "rows": len(frame),
+                    "watermark": {field: watermark[field] for field in WATERMARK_FIELDS},
+                    "columns": {name: _encode(frame[name], arrays) for name in frame.columns},
+                    "arrays": len(arrays)}
+            for n, array in enumerate(arrays):
+                np.save(tmp / f"{n}.npy", array, allow_pickle=False)
+            (tmp / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+            try:
+                os.rename(tmp, directory)
+            except OSError:
+                # Another worker published it first; theirs is the same.
+                shutil.rmtree(tmp, ignore_errors=True)
+        (directory / _SUPERSEDED).unlink(missing_ok=True)
+        self._prune(directory)
+
+    def _prune(self, current: Path) -> None:
+        now = time.time()
+        for stale in self.root.glob("season=*/*"):
+            if stale == current or stale.name.startswith("."):
+                continue
+            marker = stale / _SUPERSEDED
+            try:
+                if now - marker.stat().st_mtime >= SUPERSEDED_GRACE_SECONDS:
+                    shutil.rmtree(stale, ignore_errors=True)
+            except FileNotFoundError:
+                if stale.parent == current.parent:
+                    try:
+                        marker.touch()
+                    except OSError:
+                        pass    # pruned by another worker meanwhile
+
+
+def _encode(column: pd.Series, arrays: list[np.ndarray]) -> dict:
+    """How `column` is stored; its arrays are appended to `arrays`."""
+    def add(array: np.ndarray) -> int:
+        arrays.append(np.ascontiguousarray(array))
+        return len(arrays) - 1
+
+    dtype = column.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return {"kind": "category", "codes": add(column.cat.codes.to_numpy()),
+                "categories": [str(value) for value in dtype.categories]}
+    if isinstance(column.array, (pd.arrays.IntegerArray, pd.arrays.FloatingArray,
+                                 pd.arrays.BooleanArray)):
+        mask = column.isna().to_numpy()
+        data = column.array.to_numpy(dtype=dtype.numpy_dtype, na_value=dtype.numpy_dtype.type(0))
+        return {"kind": "masked", "dtype": str(dtype), "data": add(data), "mask": add(mask)}
+    if dtype == object:
+        mask = column.isna().to_numpy()
+        # UTF-8 bytes: a quarter of numpy's fixed-width unicode.
+        text = column.where(~mask, "").to_numpy(dtype=str)
+        return {"kind": "text", "values": add(np.char.encode(text, "utf-8")), "mask": add(mask)}
+    if dtype.kind in "biuf":
+        return {"kind": "numpy", "values": add(column.to_numpy())}
+    raise ValueError(f"column {column.name} has a dtype the shared corpus cannot map: {dtype}")
+
+
+def _decode(column: dict, arrays: list[np.ndarray]) -> tuple[object, int]:
+    """The column over the mapped arrays, and the mapped bytes it keeps."""
+    kind = column["kind"]
+    if kind == "category":
+        codes = arrays[column["codes"]]
+        return (pd.Categorical.from_codes(codes, categories=pd.Index(column["categories"],
+                                                                     dtype=object)),
+                codes.nbytes)
+    if kind == "masked":
+        data, mask = arrays[column["data"]], arrays[column["mask"]]
+        array_type = pd.api.types.pandas_dtype(column["dtype"]).construct_array_type()
+        return array_type(data, mask, copy=False), data.nbytes + mask.nbytes
+    if kind == "text":
+        # Python strings: materialised per process, the mapping dropped.
+        values = np.char.decode(arrays[column["values"]], "utf-8").astype(object)
+        values[arrays[column["mask"]]] = None
+        return values, 0
+    values = arrays[column["values"]]
+    return pd.Series(values, copy=False), values.nbytes
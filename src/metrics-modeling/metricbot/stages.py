@@ -0,0 +1,266 @@
+"""A small stage-DAG executor for the pipeline's run paths.
+
+run_week and the backtests are a handful of stages — detect week →
+{training, slate, scores} → fit → predict → DTOs → publish/dump — where
+the extractions are independent I/O and the fit needs only the training
+corpus. StageGraph declares each stage with the stages it consumes and
+runs them on a thread pool: a stage starts the moment its last input
+lands, so the slate and score queries overlap the training query and
+the fit overlaps whatever is still extracting.
+
+Each stage receives its inputs' results positionally, in the order its
+`after` names them. The first failure stops scheduling, lets running
+stages finish, and re-raises that stage's own exception — the
+pipeline's ExtractionError / ModelError / SystemExit surface unchanged.
+
+Every stage is profiled: its start/end (seconds since the graph
+started), rows in (the frames and lists it consumed) and out, the
+queries it ran (rows and bytes read from Postgres) and the corpus-cache
+partitions it read. With trace_memory the graph also reports each
+stage's tracemalloc peak — the most memory it held above what was
+allocated when it started — and runs the stages one at a time, since
+tracemalloc's peak is process-wide and overlapping stages would be
+charged for each other's allocations. For the same reason traced graphs
+run one at a time across the process: a second profiled request waits
+for the first rather than resetting its peak or stopping its trace. An
+untraced run alongside still shows in the peaks.
+
+A caller watching a run in progress (the service's job mode) wraps it
+in reporting_stages(listener): every graph run on that thread reports
+each stage as it starts and its StageTiming as it finishes.
+
+The critical path is the chain of stages, each gated by the
+latest-finishing of its inputs, that ends at the last stage to finish
+— the path that sets the wall time, and the one to optimize.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from .extract import QueryStats, recording_queries
+
+logger = logging.getLogger("metricbot.stages")
+
+# Held for the whole of a trace_memory run: tracemalloc is process-global.
+_tracing_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class StageTiming:
+    name: str
+    after: tuple[str, ...]
+    started: float      # seconds since the graph started
+    ended: float
+    rows_in: int | None = None      # rows of the frames/lists it consumed
+    rows_out: int | None = None
+    query_stats: tuple[QueryStats, ...] = ()    # extraction queries it ran
+    cache_hits: int = 0             # corpus-cache partitions read / re-extracted
+    cache_misses: int = 0
+    peak_bytes: int | None = None   # tracemalloc peak; only with trace_memory
+
+    @property
+    def seconds(self) -> float:
+        return self.ended - self.started
+
+    @property
+    def queries(self) -> int:
+        return len(self.query_stats)
+
+    @property
+    def query_rows(self) -> int:
+        return sum(query.rows for query in self.query_stats)
+
+    @property
+    def query_bytes(self) -> int:
+        """Payload read from Postgres (QueryStats.payload_bytes)."""
+        return sum(query.payload_bytes for query in self.query_stats)
+
+
+@dataclass(frozen=True)
+class StageTimeline:
+    """Every stage that ran, in start order, plus the critical path."""
+    stages: list[StageTiming]
+    critical_path: list[str]
+
+    def to_dict(self) -> dict:
+        return {
+            "stages": [{"name": stage.name, "after": list(stage.after),
+                        "started": round(stage.started, 4), "ended": round(stage.ended, 4),
+                        "seconds": round(stage.seconds, 4),
+                        "rows_in": stage.rows_in, "rows_out": stage.rows_out,
+                        "queries": stage.queries, "query_rows": stage.query_rows,
+                        "query_bytes": stage.query_bytes, "cache_hits": stage.cache_hits,
+                        "cache_misses": stage.cache_misses, "peak_bytes": stage.peak_bytes}
+                       for stage in self.stages],
+            "critical_path": self.critical_path,
+        }
+
+    def format(self) -> str:
+        lines = [f"  {'stage':<14}{'start s':>9}{'end s':>9}{'secs':>8}{'rows in':>10}"
+                 f"{'rows out':>10}{'psql MB':>9}{'peak MB':>9}"]
+        for stage in self.stages:
+            marker = "  *" if stage.name in self.critical_path else ""
+            lines.append(f"  {stage.name:<14}{stage.started:>9.2f}{stage.ended:>9.2f}"
+                         f"{stage.seconds:>8.2f}{_count(stage.rows_in):>10}{_count(stage.rows_out):>10}"
+                         f"{_megabytes(stage.query_bytes if stage.queries else None):>9}"
+                         f"{_megabytes(stage.peak_bytes):>9}{marker}")
+        lines.append("  critical path (*): " + " → ".join(self.critical_path))
+        return "\n".join(lines)
+
+
+def _count(value: int | None) -> str:
+    return "-" if value is None else str(value)
+
+
+def _megabytes(value: int | None) -> str:
+    return "-" if value is None else f"{value / 2**20:.1f}"
+
+
+def _rows(value: Any) -> int | None:
+    # Frames and DTO lists have rows; a model result reports its
+    # predictions frame's. Anything else (a fit, a (season, week) pair,
+    # a grade report) has no row count.
+    for candidate in (value, getattr(value, "predictions", None)):
+        if hasattr(candidate, "__len__") and not isinstance(candidate, (str, tuple, dict)):
+            return len(candidate)
+    return None
+
+
+# Called with (name, None) when a stage starts and (name, timing) when it
+# finishes; from the stage's worker thread and the graph's thread.
+StageListener = Callable[[str, "StageTiming | None"], None]
+
+_listening = threading.local()
+
+
+@contextmanager
+def reporting_stages(listener: StageListener) -> Iterator[None]:
+    """Report every stage of the graphs run on this thread inside the
+    block to `listener`."""
+    previous = getattr(_listening, "listener", None)
+    _listening.listener = listener
+    try:
+        yield
+    finally:
+        _listening.listener = previous
+
+
+def critical_path(stages: list[StageTiming]) -> list[str]:
+    """The chain that ends at the last stage to finish, walking back
+    through the latest-finishing input of each stage."""
+    if not stages:
+        return []
+    by_name = {stage.name: stage for stage in stages}
+    stage = max(stages, key=lambda s: s.ended)
+    path = [stage.name]
+    while stage.after:
+        stage = max((by_name[name] for name in stage.after), key=lambda s: s.ended)
+        path.append(stage.name)
+    return path[::-1]
+
+
+class StageGraph:
+    """Stages declared in dependency order (a stage may only name stages
+    added before it, so the graph is acyclic by construction)."""
+
+    def __init__(self) -> None:
+        self._stages: dict[str, tuple[Callable[..., Any], tuple[str, ...]]] = {}
+
+    def add(self, name: str, run: Callable[..., Any], after: tuple[str, ...] = ()) -> None:
+        if name in self._stages:
+            raise ValueError(f"Stage {name!r} is already defined.")
+        unknown = [dep for dep in after if dep not in self._stages]
+        if unknown:
+            raise ValueError(f"Stage {name!r} runs after undefined stages {unknown}.")
+        self._stages[name] = (run, tuple(after))
+
+    def run(self, workers: int, trace_memory: bool = False) -> tuple[dict[str, Any], StageTimeline]:
+        """Run every stage; returns each stage's result by name and the
+        timeline. trace_memory runs the stages serially under
+        tracemalloc, once any other traced run has finished."""
+        if trace_memory:
+            with _tracing_lock:
+                return self._run(workers, trace_memory=True)
+        return self._run(workers, trace_memory=False)
+
+    def _run(self, workers: int, trace_memory: bool) -> tuple[dict[str, Any], StageTimeline]:
+        origin = time.perf_counter()
+        results: dict[str, Any] = {}
+        timings: dict[str, StageTiming] = {}
+        waiting = dict(self._stages)
+        running: dict[Future, str] = {}
+        failure: BaseException | None = None
+        listener: StageListener | None = getattr(_listening, "listener", None)
+
+        def timed(name: str, run: Callable[..., Any], args: list[Any]) -> tuple[Any, StageTiming]:
+            peak = None
+            if listener is not None:
+                listener(name, None)
+            with recording_queries() as log:
+                started = time.perf_counter() - origin
+                if trace_memory:
+                    tracemalloc.reset_peak()
+                    baseline = tracemalloc.get_traced_memory()[0]
+                value = run(*args)
+                if trace_memory:
+                    peak = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+                ended = time.perf_counter() - origin
+            counts = [rows for rows in map(_rows, args) if rows is not None]
+            return value, StageTiming(
+                name=name,
+                after=self._stages[name][1],
+                started=started,
+                ended=ended,
+                rows_in=sum(counts) if counts else None,
+                rows_out=_rows(value),
+                query_stats=tuple(log.queries),
+                cache_hits=log.cache_hits,
+                cache_misses=log.cache_misses,
+                peak_bytes=peak,
+            )
+
+        tracing = trace_memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        try:
+            with ThreadPoolExecutor(max_workers=1 if trace_memory else workers,
+                                    thread_name_prefix="metricbot-stage") as pool:
+                while waiting or running:
+                    if failure is None:
+                        for name, (run, after) in list(waiting.items()):
+                            if all(dep in results for dep in after):
+                                del waiting[name]
+                                future = pool.submit(timed, name, run, [results[dep] for dep in after])
+                                running[future] = name
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        try:
+                            results[name], timings[name] = future.result()
+                        except BaseException as ex:  # noqa: BLE001 — re-raised below
+                            if failure is None:
+                                failure = ex
+                            logger.debug("stage %s failed: %s", name, ex)
+                            continue
+                        logger.debug("stage %s: %.2fs → %.2fs", name,
+                                     timings[name].started, timings[name].ended)
+                        if listener is not None:
+                            listener(name, timings[name])
+        finally:
+            if tracing:
+                tracemalloc.stop()
+
+        if failure is not None:
+            raise failure
+        stages = sorted(timings.values(), key=lambda stage: (stage.started, stage.name))
+        return results, StageTimeline(stages=stages, critical_path=critical_path(stages))
@@ -0,0 +1,326 @@
+"""Entering-window engine: the as-of frames from one team-game extraction.
+
+competition_metrics_asof_training.sql computes each game's 12 Pts/Margin
+columns as ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING windows, and
+competition_metrics_asof_week.sql re-aggregates every slate team's games
+and re-ranks its prior season (ROW_NUMBER) for the tail top-up — all of
+it redone by Postgres for every as-of request. With
+METRICBOT_ASOF_ENGINE=python a run instead extracts asof_team_games.sql
+ONCE — one narrow row per (team, contest) in the seasons up to the
+run's — and TeamGames computes the training corpus and any number of
+slates from it in NumPy:
+
+- the rows a window may see are sorted into groups (a franchise
+  season's games by kickoff; a franchise's prior season newest first)
+  and scattered into a (groups × longest group × values) array at their
+  offset within the group;
+- cumulative sums, non-null counts and running min/max along the group
+  axis then hold, at [g, l], the aggregate of group g's first l rows;
+- an entering-game window is [g, the game's offset]; an entering-week
+  window is [g, the team's games before the week] plus the prior-season
+  prefix the tail admits. Each frame is one fancy-indexed gather — no
+  per-team or per-week loop.
+
+The frames have the SQL files' columns, order and dtypes (schema.py),
+and the same rows. Scores, mins and maxes are exact; an average is a
+float64 quotient where Postgres divides exact numerics and prints ~16
+significant digits, so the two agree to the last place or two (the
+parity tests allow 1e-12 relative).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .config import Config
+from .extract import ASOF_TRAINING_SQL, ASOF_WEEK_SQL, ExtractionError
+from .schema import schema_for
+
+# The CompetitionMetric columns, in the as-of queries' order.
+WINDOW_METRICS = ("Ypp", "SuccessRate", "ExplosiveRate", "PointsPerDrive", "ThirdFourthRate",
+                  "RzTdRate", "RzScoreRate", "TimePossRatio", "OppYpp", "OppSuccessRate",
+                  "OppExplosiveRate", "OppPointsPerDrive", "OppThirdFourthRate", "OppRzTdRate",
+                  "OppScoreTdRate", "FgPctShrunk", "FieldPosDiff", "TurnoverMarginPerDrive")
+
+# ComputeFranchiseSeasonMetric's SafeAvg quirk: 0, not NULL, when every
+# game in the window has no value.
+SAFE_AVG_METRICS = ("RzTdRate", "RzScoreRate", "OppRzTdRate", "OppScoreTdRate", "FgPctShrunk")
+
+# The score windows, each with an Avg, Min and Max column — the first
+# values of every row, ahead of the metrics.
+SCORE_WINDOWS = ("PtsScored", "PtsAllowed", "MarginWin", "MarginLoss")
+
+
+@dataclass(frozen=True)
+class _Window:
+    """Per-row aggregates of a window: sums and non-null counts of every
+    value, min/max of the score values."""
+    sums: np.ndarray
+    counts: np.ndarray
+    mins: np.ndarray
+    maxs: np.ndarray
+
+    @property
+    def games(self) -> np.ndarray:
+        # The own score is never NULL in a window: its count is the rows'.
+        return self.counts[:, 0]
+
+    def __add__(self, other: _Window) -> _Window:
+        return _Window(self.sums + other.sums, self.counts + other.counts,
+                       np.fmin(self.mins, other.mins), np.fmax(self.maxs, other.maxs))
+
+    def columns(self, prefix: str, metrics: bool) -> dict[str, np.ndarray]:
+        """The window's columns as the SQL names them; with `metrics`,
+        the entering-week metric averages first."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averages = np.where(self.counts > 0, self.sums / self.counts, np.nan)
+        columns = {}
+        if metrics:
+            for i, name in enumerate(WINDOW_METRICS, start=len(SCORE_WINDOWS)):
+                column = averages[:, i]
+                columns[f"{prefix}{name}"] = (np.nan_to_num(column, nan=0.0)
+                                              if name in SAFE_AVG_METRICS else column)
+        for i, stem in enumerate(SCORE_WINDOWS):
+            columns[f"{prefix}{stem}Avg"] = averages[:, i]
+            columns[f"{prefix}{stem}Min"] = self.mins[:, i]
+            columns[f"{prefix}{stem}Max"] = self.maxs[:, i]
+        return columns
+
+
+@dataclass(frozen=True)
+class _Prefixes:
+    """Running aggregates of grouped rows: [g, l] aggregates group g's
+    first l rows, so [g, 0] is the empty window."""
+    sums: np.ndarray        # (groups, longest + 1, values)
+    counts: np.ndarray
+    mins: np.ndarray        # (groups, longest + 1, score values)
+    maxs: np.ndarray
+    offsets: np.ndarray     # each input row's position within its group
+    lengths: np.ndarray     # rows per group
+
+    @staticmethod
+    def of(groups: np.ndarray, values: np.ndarray, n_groups: int) -> _Prefixes:
+        """`groups`: each row's group (0 .. n_groups - 1), the rows
+        already sorted by group and, within it, in window order."""
+        lengths = np.bincount(groups, minlength=n_groups)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        offsets = np.arange(len(groups)) - starts[groups]
+        longest = int(lengths.max(initial=0))
+
+        shape = (n_groups, longest + 1, values.shape[1])
+        present = ~np.isnan(values)
+        sums, counts = np.zeros(shape), np.zeros(shape, dtype=np.int64)
+        sums[groups, offsets + 1] = np.where(present, values, 0.0)
+        counts[groups, offsets + 1] = present
+        scores = np.full((n_groups, longest + 1, len(SCORE_WINDOWS)), np.nan)
+        scores[groups, offsets + 1] = values[:, :len(SCORE_WINDOWS)]
+        # fmin/fmax skip NaN: a NULL margin never becomes a window's min.
+        return _Prefixes(np.cumsum(sums, axis=1), np.cumsum(counts, axis=1),
+                         np.fmin.accumulate(scores, axis=1), np.fmax.accumulate(scores, axis=1),
+                         offsets, lengths)
+
+    def window(self, groups: np.ndarray, lengths: np.ndarray) -> _Window:
+        """The window of each (group, first `length` rows) pair."""
+        return _Window(self.sums[groups, lengths], self.counts[groups, lengths],
+                       self.mins[groups, lengths], self.maxs[groups, lengths])
+
+
+class TeamGames:
+    """One asof_team_games.sql extraction (extract.extract_team_games)
+    and the as-of frames it answers, for its season and the ones before
+    it. Equal, row for row, to extract_asof_training, extract_asof_week
+    and extract_asof_season_slates for the same arguments."""
+
+    def __init__(self, frame: pd.DataFrame, config: Config):
+        self.rows = len(frame)
+        self.fbs_scope = config.fbs_scope
+        self.feature_dtype = config.feature_dtype
+
+        self._contest = frame["ContestId"].to_numpy(dtype=object)
+        self._competition = frame["CompetitionId"].to_numpy(dtype=object)
+        self._season = frame["SeasonYear"].to_numpy(dtype=np.int64)
+        self._week = frame["WeekNumber"].to_numpy(dtype=np.int64)
+        self._start = frame["StartEpochUs"].to_numpy(dtype=np.int64)
+        self._franchise_season = frame["FranchiseSeasonId"].to_numpy(dtype=object)
+        self._franchise_season_code = frame["FranchiseSeasonId"].cat.codes.to_numpy(dtype=np.int64)
+        self._franchise_season_groups = len(frame["FranchiseSeasonId"].cat.categories)
+        self._franchise_code = frame["FranchiseId"].cat.codes.to_numpy(dtype=np.int64)
+        self._franchise_groups = len(frame["FranchiseId"].cat.categories)
+        self._franchise_season_year = frame["FranchiseSeasonYear"].to_numpy(dtype=np.int64)
+        self._home = frame["IsHome"].to_numpy(dtype=bool, na_value=False)
+        self._fbs = frame["Fbs"].array
+        self._has_metric = frame["HasMetric"].to_numpy(dtype=bool, na_value=False)
+        self._spread = frame["Spread"].to_numpy(dtype=np.float64)
+
+        own = frame["OwnScore"].to_numpy(dtype=np.float64, na_value=np.nan)
+        opp = frame["OppScore"].to_numpy(dtype=np.float64, na_value=np.nan)
+        self._played = ~np.isnan(own) & ~np.isnan(opp)
+        # A row's window values: the score windows' inputs (a margin is
+        # NULL unless the game was won / lost), then the metrics.
+        self._values = np.column_stack(
+            [own, opp, np.where(own > opp, own - opp, np.nan), np.where(own < opp, opp - own, np.nan)]
+            + [frame[name].to_numpy(dtype=np.float64) for name in WINDOW_METRICS])
+        self._metrics = self._values[:, len(SCORE_WINDOWS):]
+        self._scores = (own, opp)
+
+    def asof_training(self, season_year: int, week: int) -> pd.DataFrame:
+        """competition_metrics_asof_training.sql: completed games strictly
+        before (season_year, week), each with its own per-game metrics and
+        its teams' entering-game score windows."""
+        rows = np.flatnonzero(self._played & ((self._season < season_year)
+                                              | ((self._season == season_year) & (self._week < week))))
+        # Each franchise season's games by kickoff; a game's window is
+        # the rows ahead of it in its group.
+        rows = rows[np.lexsort((self._start[rows], self._franchise_season_code[rows]))]
+        prefixes = _Prefixes.of(self._franchise_season_code[rows], self._values[rows],
+                                self._franchise_season_groups)
+        windows = prefixes.window(self._franchise_season_code[rows], prefixes.offsets)
+
+        modeled = self._has_metric[rows] & pd.notna(self._competition[rows])
+        home, away = self._pairs(rows, modeled)
+        if len(home) == 0:
+            raise ExtractionError(
+                f"No completed games with metrics before {season_year} wk{week} in the team-game "
+                f"extraction — are metrics generated for this database?")
+        order = np.lexsort((self._start[rows[home]], self._week[rows[home]],
+                            self._season[rows[home]]))
+        home, away = home[order], away[order]
+        home_rows, away_rows = rows[home], rows[away]
+
+        own, opp = (score[home_rows] for score in self._scores)
+        frame = self._frame(
+            home_rows, away_rows,
+            {"SeasonYear": self._season[home_rows], "WeekNumber": self._week[home_rows]},
+            self._side("Home", home_rows, _take(windows, home), per_game=True),
+            self._side("Away", away_rows, _take(windows, away), per_game=True),
+            {"HomeScore": own, "AwayScore": opp,
+             "Winner": np.where(own > opp, "HOME", np.where(opp > own, "AWAY", "TIE")).astype(object),
+             "Spread": self._spread[home_rows],
+             "FbsParticipant": self._fbs.take(home_rows) | self._fbs.take(away_rows)})
+        return self._typed(frame, ASOF_TRAINING_SQL)
+
+    def asof_week(self, season_year: int, week: int, prior_tail: int) -> pd.DataFrame:
+        """competition_metrics_asof_week.sql: the week's slate with
+        entering-week features, topped up to prior_tail games from the
+        prior season."""
+        return self.asof_season_slates(season_year, [week], prior_tail)[week]
+
+    def asof_season_slates(self, season_year: int, weeks: list[int],
+                           prior_tail: int) -> dict[int, pd.DataFrame]:
+        """asof_week for every week in `weeks`, from the same two prefix
+        arrays: the season's games, and each franchise's prior season."""
+        weeks = sorted(set(weeks))
+        if not weeks:
+            raise ExtractionError("Season slates need at least one week.")
+
+        # Current season: each franchise season's games by (week, kickoff),
+        # so "games before week w" is a prefix.
+        current = np.flatnonzero(self._played & self._has_metric & (self._season == season_year))
+        current = current[np.lexsort((self._start[current], self._week[current],
+                                      self._franchise_season_code[current]))]
+        current_prefixes = _Prefixes.of(self._franchise_season_code[current], self._values[current],
+                                        self._franchise_season_groups)
+        # The season's week per row, keyed by group: a searchsorted finds
+        # how many of a team's games precede any week.
+        current_keys = self._franchise_season_code[current] * (1 << 16) + self._week[current]
+
+        # Prior season: each franchise's games, newest first.
+        prior = np.flatnonzero(self._played & self._has_metric
+                               & (self._franchise_season_year == season_year - 1))
+        prior = prior[np.lexsort((-self._start[prior], self._franchise_code[prior]))]
+        prior_prefixes = _Prefixes.of(self._franchise_code[prior], self._values[prior],
+                                      self._franchise_groups)
+
+        slates = {}
+        for week in weeks:
+            rows = np.flatnonzero((self._season == season_year) & (self._week == week)
+                                  & pd.notna(self._competition))
+            home, away = self._pairs(rows, np.ones(len(rows), dtype=bool))
+            home_rows, away_rows = rows[home], rows[away]
+            if self.fbs_scope:
+                fbs = (self._fbs.take(home_rows).fillna(False).to_numpy(dtype=bool)
+                       | self._fbs.take(away_rows).fillna(False).to_numpy(dtype=bool))
+                home_rows, away_rows = home_rows[fbs], away_rows[fbs]
+
+            sides = {}
+            for side, team_rows in (("Home", home_rows), ("Away", away_rows)):
+                groups = self._franchise_season_code[team_rows]
+                played = (np.searchsorted(current_keys, groups * (1 << 16) + week)
+                          - np.searchsorted(current_keys, groups * (1 << 16)))
+                window = current_prefixes.window(groups, played)
+                if prior_tail > 0:
+                    franchises = self._franchise_code[team_rows]
+                    # Top-up: prior games up to (prior_tail - current
+                    # games), for a team in this season's franchise year.
+                    admitted = np.where(self._franchise_season_year[team_rows] == season_year,
+                                        np.minimum(np.maximum(prior_tail - played, 0),
+                                                   prior_prefixes.lengths[franchises]), 0)
+                    window = window + prior_prefixes.window(franchises, admitted)
+                sides[side] = window
+
+            # A team with no games in its window has no as-of row: the
+            # SQL's inner join drops its contest.
+            kept = (sides["Home"].games > 0) & (sides["Away"].games > 0)
+            if not kept.any():
+                raise ExtractionError(
+                    f"The team-game extraction has no slate for {season_year} week {week} — "
+                    f"is the season week window open and are metrics generated for this database?")
+            home_rows, away_rows = home_rows[kept], away_rows[kept]
+            order = np.argsort(self._start[home_rows], kind="stable")
+            home_rows, away_rows = home_rows[order], away_rows[order]
+            home_window, away_window = (_take(sides[side], np.flatnonzero(kept)[order])
+                                        for side in ("Home", "Away"))
+
+            unplayed = np.full(len(home_rows), None, dtype=object)
+            frame = self._frame(
+                home_rows, away_rows, {"WeekNumber": self._week[home_rows]},
+                self._side("Home", home_rows, home_window, per_game=False),
+                self._side("Away", away_rows, away_window, per_game=False),
+                # Scores stay NULL, as in the SQL: the slate is predicted
+                # before it is graded.
+                {"HomeScore": unplayed, "AwayScore": unplayed, "Winner": unplayed,
+                 "Spread": self._spread[home_rows]})
+            slates[week] = self._typed(frame, ASOF_WEEK_SQL)
+        return slates
+
+    def _pairs(self, rows: np.ndarray, eligible: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        # Positions in `rows` of each contest's home and away team rows,
+        # for contests where both are present and eligible.
+        teams = pd.DataFrame({"ContestId": self._contest[rows], "position": np.arange(len(rows))})
+        teams = teams[eligible]
+        pairs = teams[self._home[rows][eligible]].merge(
+            teams[~self._home[rows][eligible]], on="ContestId", suffixes=("Home", "Away"))
+        return (pairs["positionHome"].to_numpy(dtype=np.int64),
+                pairs["positionAway"].to_numpy(dtype=np.int64))
+
+    def _side(self, side: str, rows: np.ndarray, window: _Window, per_game: bool) -> dict:
+        columns = {f"{side}FranchiseSeasonId": self._franchise_season[rows]}
+        if per_game:
+            columns.update((f"{side}{name}", self._metrics[rows, i])
+                           for i, name in enumerate(WINDOW_METRICS))
+        columns.update(window.columns(side, metrics=not per_game))
+        return columns
+
+    def _frame(self, home_rows: np.ndarray, away_rows: np.ndarray, ids: dict,
+               home: dict, away: dict, trailing: dict) -> pd.DataFrame:
+        return pd.DataFrame({
+            "ContestId": self._contest[home_rows],
+            "CompetitionId": self._competition[home_rows],
+            **ids,
+            "HomeTeamFranchiseSeasonId": self._franchise_season[home_rows],
+            "AwayTeamFranchiseSeasonId": self._franchise_season[away_rows],
+            **home, **away, **trailing})
+
+    def _typed(self, frame: pd.DataFrame, sql_file) -> pd.DataFrame:
+        schema = schema_for(sql_file)
+        frame = schema.apply(frame, self.feature_dtype)
+        schema.validate(frame)
+        return frame
+
+
+def _take(window: _Window, positions: np.ndarray) -> _Window:
+    return _Window(window.sums[positions], window.counts[positions],
+                   window.mins[positions], window.maxs[positions])
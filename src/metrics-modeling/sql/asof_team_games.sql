@@ -0,0 +1,63 @@
+-- Team-game extraction for the Python entering-window engine
+-- (windows.py; METRICBOT_ASOF_ENGINE=python): ONE narrow row per
+-- (team, contest) in seasons <= :season_year, preseason excluded
+-- (policy 2026-08-08) — the team's own/opponent score, its per-game
+-- CompetitionMetric row, and the contest fields the as-of frames carry.
+-- No windows, no ranking: the entering-game and entering-week
+-- aggregates of competition_metrics_asof_training.sql and
+-- _asof_week.sql are computed from these rows in NumPy, so one
+-- extraction serves a run's training corpus and every slate of it.
+--
+-- Unplayed contests are included (the slate is predicted before kickoff)
+-- and so are games without a Competition or CompetitionMetric row
+-- (they still count toward the training windows' scores); HasMetric
+-- says which rows the metric windows may use. Every contest is expected
+-- to carry a SeasonWeek, as the producer assigns one on creation.
+--
+-- psql -v season_year=2025
+WITH params AS (
+    SELECT :season_year::int AS season_year
+)
+
+SELECT
+    con."Id" AS "ContestId",
+    comp."Id" AS "CompetitionId",
+    s."Year" AS "SeasonYear",
+    sw."Number" AS "WeekNumber",
+    -- Microseconds since the epoch: an exact, timezone-free sort key.
+    (EXTRACT(EPOCH FROM con."StartDateUtc") * 1000000)::bigint AS "StartEpochUs",
+    fs."Id" AS "FranchiseSeasonId",
+    fs."FranchiseId",
+    fs."SeasonYear" AS "FranchiseSeasonYear",
+    con."HomeTeamFranchiseSeasonId" = fs."Id" AS "IsHome",
+    split_part(fs."GroupSeasonMap", '|', 3) = 'fbs' AS "Fbs",
+    CASE WHEN con."HomeTeamFranchiseSeasonId" = fs."Id" THEN con."HomeScore" ELSE con."AwayScore" END AS "OwnScore",
+    CASE WHEN con."HomeTeamFranchiseSeasonId" = fs."Id" THEN con."AwayScore" ELSE con."HomeScore" END AS "OppScore",
+    cm."CompetitionId" IS NOT NULL AS "HasMetric",
+    cm."Ypp", cm."SuccessRate", cm."ExplosiveRate", cm."PointsPerDrive",
+    cm."ThirdFourthRate", cm."RzTdRate", cm."RzScoreRate", cm."TimePossRatio",
+    cm."OppYpp", cm."OppSuccessRate", cm."OppExplosiveRate", cm."OppPointsPerDrive",
+    cm."OppThirdFourthRate", cm."OppRzTdRate", cm."OppScoreTdRate",
+    cm."FgPctShrunk", cm."FieldPosDiff", cm."TurnoverMarginPerDrive",
+    odds."Spread"
+
+FROM params p
+JOIN public."Season" s         ON s."Year" <= p.season_year
+JOIN public."SeasonWeek" sw    ON sw."SeasonId" = s."Id"
+JOIN public."Contest" con      ON con."SeasonWeekId" = sw."Id"
+LEFT JOIN public."SeasonPhase" sp ON sp."Id" = con."SeasonPhaseId"
+JOIN public."FranchiseSeason" fs
+    ON fs."Id" IN (con."HomeTeamFranchiseSeasonId", con."AwayTeamFranchiseSeasonId")
+LEFT JOIN public."Competition" comp ON comp."ContestId" = con."Id"
+LEFT JOIN public."CompetitionMetric" cm
+    ON cm."CompetitionId" = comp."Id" AND cm."FranchiseSeasonId" = fs."Id"
+LEFT JOIN LATERAL (
+  SELECT *
+  FROM public."CompetitionOdds"
+  WHERE "CompetitionId" = comp."Id"
+    AND "ProviderId" IN ('58', '100')
+  ORDER BY CASE WHEN "ProviderId" = '58' THEN 1 ELSE 2 END
+  LIMIT 1
+) odds ON TRUE
+WHERE con."CancelledUtc" IS NULL
+  AND (sp."TypeCode" IS NULL OR sp."TypeCode" <> 1);
@@ -0,0 +1,324 @@
+-- AS-OF slates for a season sweep, in ONE pass: the slate of every week
+-- in :week_mask (bit n set = week n) of season :season_year, each with
+-- features computed ENTERING its week — row for row what
+-- competition_metrics_asof_week.sql returns for that week, plus nothing.
+--
+-- The per-week query re-filters the season's team-games to
+-- sw."Number" < :week and re-aggregates them for every week swept. Here
+-- each team's games are summed once per week played (step_sums), the
+-- sums run cumulatively over the season (cumulative), and a slate week
+-- reads each team's running totals as of the last week before it. AVG
+-- is SUM / COUNT on the same numeric values, so every average is the
+-- one the per-week query computes, digit for digit; MIN/MAX combine
+-- with LEAST/GREATEST (which skip NULLs, as the aggregates do).
+--
+-- :prior_tail (0 = off): the per-week top-up — a team with fewer than
+-- :prior_tail current-season games before the week has its window
+-- supplemented with its most recent prior-season (regular/post) games
+-- up to a floor of :prior_tail total. Prior games run cumulatively by
+-- recency, so the top-up is the running total at rank
+-- :prior_tail - (current games), per week.
+--
+-- :fbs_scope (0/1): as the per-week query — slates restricted to games
+-- with at least one FBS participant; aggregation windows never are.
+--
+-- psql -v season_year=2025 -v week_mask=112 -v prior_tail=5 -v fbs_scope=1   (weeks 4-6)
+WITH params AS (
+    SELECT :season_year::int    AS season_year,
+           :week_mask::bigint   AS week_mask,
+           :prior_tail::int     AS prior_tail
+),
+
+-- Every requested week's slate contests (the per-week query's FROM/WHERE).
+slate AS (
+    SELECT
+        sw."Number" AS week,
+        con."Id" AS contest_id,
+        comp."Id" AS competition_id,
+        con."StartDateUtc" AS start_date_utc,
+        con."HomeTeamFranchiseSeasonId" AS home_id,
+        con."AwayTeamFranchiseSeasonId" AS away_id
+    FROM params p
+    JOIN public."Season" s         ON s."Year" = p.season_year
+    JOIN public."SeasonWeek" sw    ON sw."SeasonId" = s."Id"
+                                  AND sw."Number" BETWEEN 0 AND 62
+                                  AND (p.week_mask >> sw."Number") & 1 = 1
+    JOIN public."Contest" con      ON con."SeasonWeekId" = sw."Id"
+    JOIN public."Competition" comp ON comp."ContestId" = con."Id"
+    LEFT JOIN public."SeasonPhase" sp ON sp."Id" = con."SeasonPhaseId"
+    JOIN public."FranchiseSeason" fs_h ON fs_h."Id" = con."HomeTeamFranchiseSeasonId"
+    JOIN public."FranchiseSeason" fs_a ON fs_a."Id" = con."AwayTeamFranchiseSeasonId"
+    WHERE con."CancelledUtc" IS NULL
+      AND (sp."TypeCode" IS NULL OR sp."TypeCode" <> 1)
+      AND (:fbs_scope::int = 0
+           OR split_part(fs_h."GroupSeasonMap", '|', 3) = 'fbs'
+           OR split_part(fs_a."GroupSeasonMap", '|', 3) = 'fbs')
+),
+
+-- One row per (team-perspective, completed game), current season before
+-- the last requested week (step = its week), plus — with a prior tail —
+-- the same franchises' prior-season games keyed to the CURRENT
+-- FranchiseSeasonId, newest first (step = recency rank).
+team_games AS (
+    SELECT
+        fs."Id"     AS franchise_season_id,
+        'current'   AS source,
+        sw."Number" AS step,
+        cm."Ypp", cm."SuccessRate", cm."ExplosiveRate", cm."PointsPerDrive", cm."ThirdFourthRate",
+        cm."RzTdRate", cm."RzScoreRate", cm."TimePossRatio",
+        cm."OppYpp", cm."OppSuccessRate", cm."OppExplosiveRate", cm."OppPointsPerDrive",
+        cm."OppThirdFourthRate", cm."OppRzTdRate", cm."OppScoreTdRate",
+        cm."FgPctShrunk", cm."FieldPosDiff", cm."TurnoverMarginPerDrive",
+        CASE WHEN con."HomeTeamFranchiseSeasonId" = fs."Id" THEN con."HomeScore" ELSE con."AwayScore" END AS own_score,
+        CASE WHEN con."HomeTeamFranchiseSeasonId" = fs."Id" THEN con."AwayScore" ELSE con."HomeScore" END AS opp_score
+    FROM params p
+    JOIN public."Season" s          ON s."Year" = p.season_year
+    JOIN public."SeasonWeek" sw     ON sw."SeasonId" = s."Id"
+                                   AND sw."Number" < (SELECT MAX(week) FROM slate)
+    JOIN public."Contest" con       ON con."SeasonWeekId" = sw."Id"
+    JOIN public."Competition" comp  ON comp."ContestId" = con."Id"
+    LEFT JOIN public."SeasonPhase" sp ON sp."Id" = con."SeasonPhaseId"
+    JOIN public."FranchiseSeason" fs
+        ON fs."Id" IN (con."HomeTeamFranchiseSeasonId", con."AwayTeamFranchiseSeasonId")
+    JOIN public."CompetitionMetric" cm
+        ON cm."CompetitionId" = comp."Id" AND cm."FranchiseSeasonId" = fs."Id"
+    WHERE con."HomeScore" IS NOT NULL AND con."AwayScore" IS NOT NULL
+      AND con."CancelledUtc" IS NULL
+      AND (sp."TypeCode" IS NULL OR sp."TypeCode" <> 1)  -- preseason excluded (policy 2026-08-08)
+
+    UNION ALL
+
+    SELECT *
+    FROM (
+        SELECT
+            fs_now."Id" AS franchise_season_id,
+            'prior'     AS source,
+            ROW_NUMBER() OVER (PARTITION BY fs_now."Id" ORDER BY con."StartDateUtc" DESC) AS step,
+            cm."Ypp", cm."SuccessRate", cm."ExplosiveRate", cm."PointsPerDrive", cm."ThirdFourthRate",
+            cm."RzTdRate", cm."RzScoreRate", cm."TimePossRatio",
+            cm."OppYpp", cm."OppSuccessRate", cm."OppExplosiveRate", cm."OppPointsPerDrive",
+            cm."OppThirdFourthRate", cm."OppRzTdRate", cm."OppScoreTdRate",
+            cm."FgPctShrunk", cm."FieldPosDiff", cm."TurnoverMarginPerDrive",
+            CASE WHEN con."HomeTeamFranchiseSeasonId" = fs_prev."Id" THEN con."HomeScore" ELSE con."AwayScore" END AS own_score,
+            CASE WHEN con."HomeTeamFranchiseSeasonId" = fs_prev."Id" THEN con."AwayScore" ELSE con."HomeScore" END AS opp_score
+        FROM params p
+        JOIN public."FranchiseSeason" fs_now  ON fs_now."SeasonYear" = p.season_year
+        JOIN public."FranchiseSeason" fs_prev ON fs_prev."FranchiseId" = fs_now."FranchiseId"
+                                             AND fs_prev."SeasonYear" = p.season_year - 1
+        JOIN public."Contest" con
+            ON fs_prev."Id" IN (con."HomeTeamFranchiseSeasonId", con."AwayTeamFranchiseSeasonId")
+        JOIN public."Competition" comp  ON comp."ContestId" = con."Id"
+        LEFT JOIN public."SeasonPhase" sp ON sp."Id" = con."SeasonPhaseId"
+        JOIN public."CompetitionMetric" cm
+            ON cm."CompetitionId" = comp."Id" AND cm."FranchiseSeasonId" = fs_prev."Id"
+        WHERE p.prior_tail > 0
+          AND con."HomeScore" IS NOT NULL AND con."AwayScore" IS NOT NULL
+          AND con."CancelledUtc" IS NULL
+          AND (sp."TypeCode" IS NULL OR sp."TypeCode" <> 1)
+    ) prior_ranked
+    WHERE step <= (SELECT prior_tail FROM params)
+),
+
+-- Per (team, source, step) sums. The metric columns CompetitionMetric
+-- declares NOT NULL count as games; the nullable ones (the SafeAvg
+-- fields) carry their own counts, as AVG skips their NULLs.
+step_sums AS (
+    SELECT
+        franchise_season_id, source, step,
+        COUNT(*)                       AS games,
+        SUM("Ypp")                     AS "Ypp",
+        SUM("SuccessRate")             AS "SuccessRate",
+        SUM("ExplosiveRate")           AS "ExplosiveRate",
+        SUM("PointsPerDrive")          AS "PointsPerDrive",
+        SUM("ThirdFourthRate")         AS "ThirdFourthRate",
+        SUM("RzTdRate")                AS "RzTdRate",       COUNT("RzTdRate")       AS rz_td_n,
+        SUM("RzScoreRate")             AS "RzScoreRate",    COUNT("RzScoreRate")    AS rz_score_n,
+        SUM("TimePossRatio")           AS "TimePossRatio",
+        SUM("OppYpp")                  AS "OppYpp",
+        SUM("OppSuccessRate")          AS "OppSuccessRate",
+        SUM("OppExplosiveRate")        AS "OppExplosiveRate",
+        SUM("OppPointsPerDrive")       AS "OppPointsPerDrive",
+        SUM("OppThirdFourthRate")      AS "OppThirdFourthRate",
+        SUM("OppRzTdRate")             AS "OppRzTdRate",    COUNT("OppRzTdRate")    AS opp_rz_td_n,
+        SUM("OppScoreTdRate")          AS "OppScoreTdRate", COUNT("OppScoreTdRate") AS opp_score_td_n,
+        SUM("FgPctShrunk")             AS "FgPctShrunk",    COUNT("FgPctShrunk")    AS fg_pct_n,
+        SUM("FieldPosDiff")            AS "FieldPosDiff",
+        SUM("TurnoverMarginPerDrive")  AS "TurnoverMarginPerDrive",
+        SUM(own_score) AS pts_scored,  MIN(own_score) AS pts_scored_min,  MAX(own_score) AS pts_scored_max,
+        SUM(opp_score) AS pts_allowed, MIN(opp_score) AS pts_allowed_min, MAX(opp_score) AS pts_allowed_max,
+        SUM(CASE WHEN own_score > opp_score THEN own_score - opp_score END)   AS margin_win,
+        COUNT(CASE WHEN own_score > opp_score THEN own_score - opp_score END) AS wins,
+        MIN(CASE WHEN own_score > opp_score THEN own_score - opp_score END)   AS margin_win_min,
+        MAX(CASE WHEN own_score > opp_score THEN own_score - opp_score END)   AS margin_win_max,
+        SUM(CASE WHEN own_score < opp_score THEN opp_score - own_score END)   AS margin_loss,
+        COUNT(CASE WHEN own_score < opp_score THEN opp_score - own_score END) AS losses,
+        MIN(CASE WHEN own_score < opp_score THEN opp_score - own_score END)   AS margin_loss_min,
+        MAX(CASE WHEN own_score < opp_score THEN opp_score - own_score END)   AS margin_loss_max
+    FROM team_games
+    GROUP BY franchise_season_id, source, step
+),
+
+-- Running totals through each step: the team's window as of the end of
+-- that week (current) or through its n most recent games (prior).
+cumulative AS (
+    SELECT
+        franchise_season_id, source, step,
+        SUM(games) OVER w AS games,
+        SUM("Ypp") OVER w AS "Ypp", SUM("SuccessRate") OVER w AS "SuccessRate",
+        SUM("ExplosiveRate") OVER w AS "ExplosiveRate", SUM("PointsPerDrive") OVER w AS "PointsPerDrive",
+        SUM("ThirdFourthRate") OVER w AS "ThirdFourthRate",
+        SUM("RzTdRate") OVER w AS "RzTdRate", SUM(rz_td_n) OVER w AS rz_td_n,
+        SUM("RzScoreRate") OVER w AS "RzScoreRate", SUM(rz_score_n) OVER w AS rz_score_n,
+        SUM("TimePossRatio") OVER w AS "TimePossRatio",
+        SUM("OppYpp") OVER w AS "OppYpp", SUM("OppSuccessRate") OVER w AS "OppSuccessRate",
+        SUM("OppExplosiveRate") OVER w AS "OppExplosiveRate",
+        SUM("OppPointsPerDrive") OVER w AS "OppPointsPerDrive",
+        SUM("OppThirdFourthRate") OVER w AS "OppThirdFourthRate",
+        SUM("OppRzTdRate") OVER w AS "OppRzTdRate", SUM(opp_rz_td_n) OVER w AS opp_rz_td_n,
+        SUM("OppScoreTdRate") OVER w AS "OppScoreTdRate", SUM(opp_score_td_n) OVER w AS opp_score_td_n,
+        SUM("FgPctShrunk") OVER w AS "FgPctShrunk", SUM(fg_pct_n) OVER w AS fg_pct_n,
+        SUM("FieldPosDiff") OVER w AS "FieldPosDiff",
+        SUM("TurnoverMarginPerDrive") OVER w AS "TurnoverMarginPerDrive",
+        SUM(pts_scored) OVER w AS pts_scored,
+        MIN(pts_scored_min) OVER w AS pts_scored_min, MAX(pts_scored_max) OVER w AS pts_scored_max,
+        SUM(pts_allowed) OVER w AS pts_allowed,
+        MIN(pts_allowed_min) OVER w AS pts_allowed_min, MAX(pts_allowed_max) OVER w AS pts_allowed_max,
+        SUM(margin_win) OVER w AS margin_win, SUM(wins) OVER w AS wins,
+        MIN(margin_win_min) OVER w AS margin_win_min, MAX(margin_win_max) OVER w AS margin_win_max,
+        SUM(margin_loss) OVER w AS margin_loss, SUM(losses) OVER w AS losses,
+        MIN(margin_loss_min) OVER w AS margin_loss_min, MAX(margin_loss_max) OVER w AS margin_loss_max
+    FROM step_sums
+    WINDOW w AS (PARTITION BY franchise_season_id, source ORDER BY step)
+),
+
+slate_teams AS (
+    SELECT DISTINCT week, team AS franchise_season_id
+    FROM slate, LATERAL (VALUES (home_id), (away_id)) AS teams(team)
+),
+
+-- Entering-week aggregates, formula-parity with ComputeFranchiseSeasonMetric
+-- (and competition_metrics_asof_week.sql's asof CTE). Each slate team's
+-- window entering each slate week is its current-season totals through
+-- the last week before, plus its prior-season totals through the
+-- top-up's rank.
+asof AS (
+    SELECT
+        w.week,
+        w.franchise_season_id,
+        (COALESCE(cur."Ypp", 0) + COALESCE(pri."Ypp", 0)) / n.games                     AS "Ypp",
+        (COALESCE(cur."SuccessRate", 0) + COALESCE(pri."SuccessRate", 0)) / n.games     AS "SuccessRate",
+        (COALESCE(cur."ExplosiveRate", 0) + COALESCE(pri."ExplosiveRate", 0)) / n.games AS "ExplosiveRate",
+        (COALESCE(cur."PointsPerDrive", 0) + COALESCE(pri."PointsPerDrive", 0)) / n.games AS "PointsPerDrive",
+        (COALESCE(cur."ThirdFourthRate", 0) + COALESCE(pri."ThirdFourthRate", 0)) / n.games AS "ThirdFourthRate",
+        COALESCE((COALESCE(cur."RzTdRate", 0) + COALESCE(pri."RzTdRate", 0))
+                 / NULLIF(COALESCE(cur.rz_td_n, 0) + COALESCE(pri.rz_td_n, 0), 0), 0)      AS "RzTdRate",       -- SafeAvg quirk
+        COALESCE((COALESCE(cur."RzScoreRate", 0) + COALESCE(pri."RzScoreRate", 0))
+                 / NULLIF(COALESCE(cur.rz_score_n, 0) + COALESCE(pri.rz_score_n, 0), 0), 0) AS "RzScoreRate",   -- SafeAvg quirk
+        (COALESCE(cur."TimePossRatio", 0) + COALESCE(pri."TimePossRatio", 0)) / n.games AS "TimePossRatio",
+        (COALESCE(cur."OppYpp", 0) + COALESCE(pri."OppYpp", 0)) / n.games               AS "OppYpp",
+        (COALESCE(cur."OppSuccessRate", 0) + COALESCE(pri."OppSuccessRate", 0)) / n.games AS "OppSuccessRate",
+        (COALESCE(cur."OppExplosiveRate", 0) + COALESCE(pri."OppExplosiveRate", 0)) / n.games AS "OppExplosiveRate",
+        (COALESCE(cur."OppPointsPerDrive", 0) + COALESCE(pri."OppPointsPerDrive", 0)) / n.games AS "OppPointsPerDrive",
+        (COALESCE(cur."OppThirdFourthRate", 0) + COALESCE(pri."OppThirdFourthRate", 0)) / n.games AS "OppThirdFourthRate",
+        COALESCE((COALESCE(cur."OppRzTdRate", 0) + COALESCE(pri."OppRzTdRate", 0))
+                 / NULLIF(COALESCE(cur.opp_rz_td_n, 0) + COALESCE(pri.opp_rz_td_n, 0), 0), 0) AS "OppRzTdRate",    -- SafeAvg quirk
+        COALESCE((COALESCE(cur."OppScoreTdRate", 0) + COALESCE(pri."OppScoreTdRate", 0))
+                 / NULLIF(COALESCE(cur.opp_score_td_n, 0) + COALESCE(pri.opp_score_td_n, 0), 0), 0) AS "OppScoreTdRate", -- SafeAvg quirk
+        COALESCE((COALESCE(cur."FgPctShrunk", 0) + COALESCE(pri."FgPctShrunk", 0))
+                 / NULLIF(COALESCE(cur.fg_pct_n, 0) + COALESCE(pri.fg_pct_n, 0), 0), 0)    AS "FgPctShrunk",    -- SafeAvg quirk (M3)
+        (COALESCE(cur."FieldPosDiff", 0) + COALESCE(pri."FieldPosDiff", 0)) / n.games   AS "FieldPosDiff",
+        (COALESCE(cur."TurnoverMarginPerDrive", 0) + COALESCE(pri."TurnoverMarginPerDrive", 0)) / n.games AS "TurnoverMarginPerDrive",
+        (COALESCE(cur.pts_scored, 0) + COALESCE(pri.pts_scored, 0)) / n.games           AS "PtsScoredAvg",
+        LEAST(cur.pts_scored_min, pri.pts_scored_min)                                     AS "PtsScoredMin",
+        GREATEST(cur.pts_scored_max, pri.pts_scored_max)                                  AS "PtsScoredMax",
+        (COALESCE(cur.pts_allowed, 0) + COALESCE(pri.pts_allowed, 0)) / n.games         AS "PtsAllowedAvg",
+        LEAST(cur.pts_allowed_min, pri.pts_allowed_min)                                   AS "PtsAllowedMin",
+        GREATEST(cur.pts_allowed_max, pri.pts_allowed_max)                                AS "PtsAllowedMax",
+        (COALESCE(cur.margin_win, 0) + COALESCE(pri.margin_win, 0))
+            / NULLIF(COALESCE(cur.wins, 0) + COALESCE(pri.wins, 0), 0)                    AS "MarginWinAvg",
+        LEAST(cur.margin_win_min, pri.margin_win_min)                                     AS "MarginWinMin",
+        GREATEST(cur.margin_win_max, pri.margin_win_max)                                  AS "MarginWinMax",
+        (COALESCE(cur.margin_loss, 0) + COALESCE(pri.margin_loss, 0))
+            / NULLIF(COALESCE(cur.losses, 0) + COALESCE(pri.losses, 0), 0)                AS "MarginLossAvg",
+        LEAST(cur.margin_loss_min, pri.margin_loss_min)                                   AS "MarginLossMin",
+        GREATEST(cur.margin_loss_max, pri.margin_loss_max)                                AS "MarginLossMax"
+    FROM slate_teams w
+    CROSS JOIN params p
+    LEFT JOIN LATERAL (
+        SELECT c.*
+        FROM cumulative c
+        WHERE c.franchise_season_id = w.franchise_season_id
+          AND c.source = 'current' AND c.step < w.week
+        ORDER BY c.step DESC
+        LIMIT 1
+    ) cur ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT c.*
+        FROM cumulative c
+        WHERE c.franchise_season_id = w.franchise_season_id
+          AND c.source = 'prior'
+          AND c.step <= GREATEST(p.prior_tail - COALESCE(cur.games, 0), 0)
+        ORDER BY c.step DESC
+        LIMIT 1
+    ) pri ON TRUE
+    -- No games in the window, no row: the per-week query's inner join.
+    CROSS JOIN LATERAL (
+        SELECT NULLIF(COALESCE(cur.games, 0) + COALESCE(pri.games, 0), 0) AS games
+    ) n
+    WHERE n.games IS NOT NULL
+)
+
+SELECT
+    sl.contest_id AS "ContestId",
+    sl.competition_id AS "CompetitionId",
+    sl.week AS "WeekNumber",
+    sl.home_id AS "HomeTeamFranchiseSeasonId",
+    sl.away_id AS "AwayTeamFranchiseSeasonId",
+
+    sl.home_id AS "HomeFranchiseSeasonId",
+    h."Ypp" AS "HomeYpp", h."SuccessRate" AS "HomeSuccessRate", h."ExplosiveRate" AS "HomeExplosiveRate",
+    h."PointsPerDrive" AS "HomePointsPerDrive", h."ThirdFourthRate" AS "HomeThirdFourthRate",
+    h."RzTdRate" AS "HomeRzTdRate", h."RzScoreRate" AS "HomeRzScoreRate", h."TimePossRatio" AS "HomeTimePossRatio",
+    h."OppYpp" AS "HomeOppYpp", h."OppSuccessRate" AS "HomeOppSuccessRate", h."OppExplosiveRate" AS "HomeOppExplosiveRate",
+    h."OppPointsPerDrive" AS "HomeOppPointsPerDrive", h."OppThirdFourthRate" AS "HomeOppThirdFourthRate",
+    h."OppRzTdRate" AS "HomeOppRzTdRate", h."OppScoreTdRate" AS "HomeOppScoreTdRate",
+    h."FgPctShrunk" AS "HomeFgPctShrunk", h."FieldPosDiff" AS "HomeFieldPosDiff",
+    h."TurnoverMarginPerDrive" AS "HomeTurnoverMarginPerDrive",
+    h."PtsScoredAvg" AS "HomePtsScoredAvg", h."PtsScoredMin" AS "HomePtsScoredMin", h."PtsScoredMax" AS "HomePtsScoredMax",
+    h."PtsAllowedAvg" AS "HomePtsAllowedAvg", h."PtsAllowedMin" AS "HomePtsAllowedMin", h."PtsAllowedMax" AS "HomePtsAllowedMax",
+    h."MarginWinAvg" AS "HomeMarginWinAvg", h."MarginWinMin" AS "HomeMarginWinMin", h."MarginWinMax" AS "HomeMarginWinMax",
+    h."MarginLossAvg" AS "HomeMarginLossAvg", h."MarginLossMin" AS "HomeMarginLossMin", h."MarginLossMax" AS "HomeMarginLossMax",
+
+    sl.away_id AS "AwayFranchiseSeasonId",
+    a."Ypp" AS "AwayYpp", a."SuccessRate" AS "AwaySuccessRate", a."ExplosiveRate" AS "AwayExplosiveRate",
+    a."PointsPerDrive" AS "AwayPointsPerDrive", a."ThirdFourthRate" AS "AwayThirdFourthRate",
+    a."RzTdRate" AS "AwayRzTdRate", a."RzScoreRate" AS "AwayRzScoreRate", a."TimePossRatio" AS "AwayTimePossRatio",
+    a."OppYpp" AS "AwayOppYpp", a."OppSuccessRate" AS "AwayOppSuccessRate", a."OppExplosiveRate" AS "AwayOppExplosiveRate",
+    a."OppPointsPerDrive" AS "AwayOppPointsPerDrive", a."OppThirdFourthRate" AS "AwayOppThirdFourthRate",
+    a."OppRzTdRate" AS "AwayOppRzTdRate", a."OppScoreTdRate" AS "AwayOppScoreTdRate",
+    a."FgPctShrunk" AS "AwayFgPctShrunk", a."FieldPosDiff" AS "AwayFieldPosDiff",
+    a."TurnoverMarginPerDrive" AS "AwayTurnoverMarginPerDrive",
+    a."PtsScoredAvg" AS "AwayPtsScoredAvg", a."PtsScoredMin" AS "AwayPtsScoredMin", a."PtsScoredMax" AS "AwayPtsScoredMax",
+    a."PtsAllowedAvg" AS "AwayPtsAllowedAvg", a."PtsAllowedMin" AS "AwayPtsAllowedMin", a."PtsAllowedMax" AS "AwayPtsAllowedMax",
+    a."MarginWinAvg" AS "AwayMarginWinAvg", a."MarginWinMin" AS "AwayMarginWinMin", a."MarginWinMax" AS "AwayMarginWinMax",
+    a."MarginLossAvg" AS "AwayMarginLossAvg", a."MarginLossMin" AS "AwayMarginLossMin", a."MarginLossMax" AS "AwayMarginLossMax",
+
+    -- Scores stay NULL, as in the per-week query.
+    NULL AS "HomeScore",
+    NULL AS "AwayScore",
+    NULL AS "Winner",
+
+    odds."Spread"
+
+FROM slate sl
+JOIN asof h ON h.week = sl.week AND h.franchise_season_id = sl.home_id
+JOIN asof a ON a.week = sl.week AND a.franchise_season_id = sl.away_id
+LEFT JOIN LATERAL (
+  SELECT *
+  FROM public."CompetitionOdds"
+  WHERE "CompetitionId" = sl.competition_id
+    AND "ProviderId" IN ('58', '100')
+  ORDER BY CASE WHEN "ProviderId" = '58' THEN 1 ELSE 2 END
+  LIMIT 1
+) odds ON TRUE
+ORDER BY sl.week, sl.start_date_utc;
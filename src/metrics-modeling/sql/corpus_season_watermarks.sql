@@ -0,0 +1,31 @@
+-- Per-season freshness watermark for the corpus cache (metricbot/cache.py):
+-- how many completed training games a season has, how many of their
+-- CompetitionMetric rows exist, and the newest ComputedUtc among them.
+-- Metrics are immutable once computed, so a cached season partition is
+-- current exactly while all three are unchanged — a late-finalized or
+-- cancelled game moves Games, a recompute moves MaxComputedUtc.
+--
+-- Same game filters as competition_metrics_asof_training.sql. Aggregates
+-- only — cheap next to the training extraction it lets us skip.
+-- MaxComputedUtc is rendered as text in UTC so it compares equal
+-- whichever extraction backend read it.
+SELECT
+    s."Year" AS "SeasonYear",
+    COUNT(DISTINCT con."Id") AS "Games",
+    COUNT(cm."CompetitionId") AS "MetricRows",
+    to_char(MAX(cm."ComputedUtc") AT TIME ZONE 'UTC',
+            'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') AS "MaxComputedUtc"
+FROM public."Contest" con
+JOIN public."SeasonWeek" sw    ON sw."Id" = con."SeasonWeekId"
+JOIN public."Season" s         ON s."Id" = sw."SeasonId"
+LEFT JOIN public."SeasonPhase" sp ON sp."Id" = con."SeasonPhaseId"
+LEFT JOIN public."Competition" comp ON comp."ContestId" = con."Id"
+LEFT JOIN public."CompetitionMetric" cm
+    ON cm."CompetitionId" = comp."Id"
+   AND cm."FranchiseSeasonId" IN (con."HomeTeamFranchiseSeasonId", con."AwayTeamFranchiseSeasonId")
+WHERE con."HomeScore" IS NOT NULL
+  AND con."AwayScore" IS NOT NULL
+  AND con."CancelledUtc" IS NULL
+  AND (sp."TypeCode" IS NULL OR sp."TypeCode" <> 1)
+GROUP BY s."Year"
+ORDER BY s."Year";
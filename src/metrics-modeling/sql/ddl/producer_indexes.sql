@@ -0,0 +1,28 @@
+-- Indexes for MetricBot's extraction access paths on the producer
+-- databases (sdProducer.FootballNcaa, sdProducer.FootballNfl). Not part
+-- of the producer's EF model: apply by hand, once per database, and
+-- compare `python -m metricbot explain` before and after.
+--
+--     psql -h <host> -U <user> -d sdProducer.FootballNcaa -f sql/ddl/producer_indexes.sql
+--
+-- CONCURRENTLY builds without blocking the producer's writes, so run the
+-- file outside a transaction (plain -f, never -1 / --single-transaction);
+-- IF NOT EXISTS makes a re-run a no-op.
+--
+-- Access paths the EF migrations already index, relied on as they are:
+--   CompetitionMetric PK ("CompetitionId", "FranchiseSeasonId") — both
+--     per-team metric joins of every query;
+--   Competition ("ContestId"); Contest ("SeasonWeekId"),
+--     ("HomeTeamFranchiseSeasonId"), ("AwayTeamFranchiseSeasonId");
+--   FranchiseSeason ("FranchiseId") — the prior-season tail's lookup;
+--   CompetitionOdds ("CompetitionId", "ProviderId") UNIQUE — what makes
+--     sql/ranked's DISTINCT ON keep the spec LATERAL's row.
+
+-- The spread lookup. Every query reads providers 58 and 100 only, and
+-- only their Spread: this partial covering index makes the spec files'
+-- per-competition LATERAL an index-only probe, and feeds sql/ranked's
+-- DISTINCT ON in CompetitionId order without reading the heap or any
+-- other provider's rows.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS "IX_CompetitionOdds_MetricBot_Spread"
+    ON public."CompetitionOdds" ("CompetitionId") INCLUDE ("ProviderId", "Spread")
+    WHERE "ProviderId" IN ('58', '100');
@@ -0,0 +1,22 @@
+-- Final scores for grading a whole backtested SEASON in one query: the
+-- same filters as grading_scores.sql (finalized, not cancelled, no
+-- preseason) plus the week number, so a season sweep slices each week's
+-- ground truth in memory instead of issuing one scores query per week.
+--
+-- psql -v season_year=2025
+SELECT
+    con."Id" AS "ContestId",
+    sw."Number" AS "WeekNumber",
+    con."HomeScore",
+    con."AwayScore"
+FROM public."Season" s
+JOIN public."SeasonWeek" sw ON sw."SeasonId" = s."Id"
+JOIN public."Contest" con   ON con."SeasonWeekId" = sw."Id"
+LEFT JOIN public."SeasonPhase" sp ON sp."Id" = con."SeasonPhaseId"
+WHERE s."Year" = :season_year::int
+  AND con."HomeScore" IS NOT NULL
+  AND con."AwayScore" IS NOT NULL
+  AND con."FinalizedUtc" IS NOT NULL
+  AND con."CancelledUtc" IS NULL
+  AND (sp."TypeCode" IS NULL OR sp."TypeCode" <> 1)
+ORDER BY sw."Number";
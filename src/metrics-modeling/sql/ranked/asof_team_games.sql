@@ -0,0 +1,62 @@
+-- RANKED variant of sql/asof_team_games.sql
+-- (METRICBOT_SQL_VARIANT=ranked): the same rows, planned for a
+-- multi-season corpus — each competition's spread is ranked once
+-- (DISTINCT ON) instead of probed per row by a LATERAL, and each
+-- contest splits into its home and away sides with VALUES instead of
+-- an OR join on FranchiseSeason. The spec file documents the
+-- semantics; change both together (tests/test_ranked_sql.py holds
+-- them row-identical).
+--
+-- psql -v season_year=2025
+WITH params AS (
+    SELECT :season_year::int AS season_year
+),
+
+-- Each competition's spread, ESPN (58) over DraftKings (100), ranked
+-- once for the whole query. (CompetitionId, ProviderId) is unique, so
+-- this keeps the row the spec file's per-competition LATERAL picks.
+odds AS (
+    SELECT DISTINCT ON ("CompetitionId") "CompetitionId", "Spread"
+    FROM public."CompetitionOdds"
+    WHERE "ProviderId" IN ('58', '100')
+    ORDER BY "CompetitionId", CASE WHEN "ProviderId" = '58' THEN 1 ELSE 2 END
+)
+
+SELECT
+    con."Id" AS "ContestId",
+    comp."Id" AS "CompetitionId",
+    s."Year" AS "SeasonYear",
+    sw."Number" AS "WeekNumber",
+    -- Microseconds since the epoch: an exact, timezone-free sort key.
+    (EXTRACT(EPOCH FROM con."StartDateUtc") * 1000000)::bigint AS "StartEpochUs",
+    fs."Id" AS "FranchiseSeasonId",
+    fs."FranchiseId",
+    fs."SeasonYear" AS "FranchiseSeasonYear",
+    side.is_home AS "IsHome",
+    split_part(fs."GroupSeasonMap", '|', 3) = 'fbs' AS "Fbs",
+    CASE WHEN side.is_home THEN con."HomeScore" ELSE con."AwayScore" END AS "OwnScore",
+    CASE WHEN side.is_home THEN con."AwayScore" ELSE con."HomeScore" END AS "OppScore",
+    cm."CompetitionId" IS NOT NULL AS "HasMetric",
+    cm."Ypp", cm."SuccessRate", cm."ExplosiveRate", cm."PointsPerDrive",
+    cm."ThirdFourthRate", cm."RzTdRate", cm."RzScoreRate", cm."TimePossRatio",
+    cm."OppYpp", cm."OppSuccessRate", cm."OppExplosiveRate", cm."OppPointsPerDrive",
+    cm."OppThirdFourthRate", cm."OppRzTdRate", cm."OppScoreTdRate",
+    cm."FgPctShrunk", cm."FieldPosDiff", cm."TurnoverMarginPerDrive",
+    odds."Spread"
+
+FROM params p
+JOIN public."Season" s         ON s."Year" <= p.season_year
+JOIN public."SeasonWeek" sw    ON sw."SeasonId" = s."Id"
+JOIN public."Contest" con      ON con."SeasonWeekId" = sw."Id"
+LEFT JOIN public."SeasonPhase" sp ON sp."Id" = con."SeasonPhaseId"
+-- Each contest's two sides, hash-joinable (the spec's OR join on
+-- FranchiseSeason probes Contest once per franchise season).
+CROSS JOIN LATERAL (VALUES (true, con."HomeTeamFranchiseSeasonId"),
+                           (false, con."AwayTeamFranchiseSeasonId")) side (is_home, franchise_season_id)
+JOIN public."FranchiseSeason" fs ON fs."Id" = side.franchise_season_id
+LEFT JOIN public."Competition" comp ON comp."ContestId" = con."Id"
+LEFT JOIN public."CompetitionMetric" cm
+    ON cm."CompetitionId" = comp."Id" AND cm."FranchiseSeasonId" = fs."Id"
+LEFT JOIN odds ON odds."CompetitionId" = comp."Id"
+WHERE con."CancelledUtc" IS NULL
+  AND (sp."TypeCode" IS NULL OR sp."TypeCode" <> 1);
@@ -0,0 +1,92 @@
+-- Freshness watermark for run-week (metricbot/freshness.py): what a
+-- publishing run for :season_year week :week reads, reduced to counts
+-- and newest timestamps. A run whose watermark equals the one recorded
+-- behind the last successful publish of the same week would rebuild
+-- the same predictions, so it is skipped.
+--
+--   Games / FinalGames / MaxFinalizedUtc — the contests of every season
+--     up to :season_year (the as-of corpus and the prior-season tail):
+--     a game finalized or cancelled;
+--   MetricRows / MaxComputedUtc — their CompetitionMetric rows: a metric
+--     computed or recomputed;
+--   OddsRows / MaxOddsUtc / OddsDigest — their lines from the providers
+--     the queries read (58, 100), and which provider quoted which spread:
+--     a spread posted, moved or pulled, even by an edit that leaves
+--     ModifiedUtc alone;
+--   GroupDigest — the conference/division membership (GroupSeasonMap)
+--     of every team in those games: the FBS flag the fit and the slate
+--     scope read;
+--   SlateGames / SlateDigest — the week's contests and kickoffs: a game
+--     added, moved or rescheduled.
+--
+-- Same game filters as the as-of queries. Aggregates only; timestamps
+-- are rendered as UTC text, as in corpus_season_watermarks.sql, so they
+-- compare equal whichever extraction backend read them.
+--
+-- psql -v season_year=2025 -v week=6
+WITH params AS (
+    SELECT :season_year::int AS season_year,
+           :week::int        AS week
+),
+games AS (
+    SELECT con."Id", con."HomeTeamFranchiseSeasonId", con."AwayTeamFranchiseSeasonId",
+           con."StartDateUtc", con."FinalizedUtc",
+           con."HomeScore" IS NOT NULL AND con."AwayScore" IS NOT NULL AS is_final,
+           s."Year" = p.season_year AND sw."Number" = p.week AS on_slate
+    FROM params p
+    JOIN public."Season" s         ON s."Year" <= p.season_year
+    JOIN public."SeasonWeek" sw    ON sw."SeasonId" = s."Id"
+    JOIN public."Contest" con      ON con."SeasonWeekId" = sw."Id"
+    LEFT JOIN public."SeasonPhase" sp ON sp."Id" = con."SeasonPhaseId"
+    WHERE con."CancelledUtc" IS NULL
+      AND (sp."TypeCode" IS NULL OR sp."TypeCode" <> 1)
+)
+SELECT
+    g.games AS "Games",
+    g.final_games AS "FinalGames",
+    to_char(g.max_finalized AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') AS "MaxFinalizedUtc",
+    m.metric_rows AS "MetricRows",
+    to_char(m.max_computed AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') AS "MaxComputedUtc",
+    o.odds_rows AS "OddsRows",
+    to_char(o.max_odds AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS.US"Z"') AS "MaxOddsUtc",
+    o.odds_digest AS "OddsDigest",
+    t.group_digest AS "GroupDigest",
+    g.slate_games AS "SlateGames",
+    g.slate_digest AS "SlateDigest"
+FROM (
+    SELECT COUNT(*) AS games,
+           COUNT(*) FILTER (WHERE is_final) AS final_games,
+           MAX("FinalizedUtc") AS max_finalized,
+           COUNT(*) FILTER (WHERE on_slate) AS slate_games,
+           md5(string_agg("Id"::text || '@' || extract(epoch FROM "StartDateUtc")::text, ','
+                          ORDER BY "Id") FILTER (WHERE on_slate)) AS slate_digest
+    FROM games
+) g
+CROSS JOIN (
+    SELECT COUNT(cm."CompetitionId") AS metric_rows, MAX(cm."ComputedUtc") AS max_computed
+    FROM games
+    JOIN public."Competition" comp ON comp."ContestId" = games."Id"
+    JOIN public."CompetitionMetric" cm
+        ON cm."CompetitionId" = comp."Id"
+       AND cm."FranchiseSeasonId" IN (games."HomeTeamFranchiseSeasonId",
+                                      games."AwayTeamFranchiseSeasonId")
+) m
+CROSS JOIN (
+    -- CreatedUtc for a line first posted, ModifiedUtc for one moved.
+    SELECT COUNT(odds."Id") AS odds_rows,
+           MAX(GREATEST(odds."CreatedUtc", odds."ModifiedUtc")) AS max_odds,
+           md5(string_agg(odds."CompetitionId"::text || ':' || odds."ProviderId" || '='
+                          || COALESCE(odds."Spread"::text, ''), ','
+                          ORDER BY odds."CompetitionId", odds."ProviderId")) AS odds_digest
+    FROM games
+    JOIN public."Competition" comp      ON comp."ContestId" = games."Id"
+    JOIN public."CompetitionOdds" odds  ON odds."CompetitionId" = comp."Id"
+                                       AND odds."ProviderId" IN ('58', '100')
+) o
+CROSS JOIN (
+    SELECT md5(string_agg(fs."Id"::text || '=' || COALESCE(fs."GroupSeasonMap", ''), ','
+                          ORDER BY fs."Id")) AS group_digest
+    FROM public."FranchiseSeason" fs
+    WHERE fs."Id" IN (SELECT "HomeTeamFranchiseSeasonId" FROM games
+                      UNION SELECT "AwayTeamFranchiseSeasonId" FROM games)
+) t;
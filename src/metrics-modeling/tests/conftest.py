@@ -0,0 +1,67 @@
+"""Shared fixtures. Unit tests stay offline; the `producer_db` fixture is
+for the few integration tests that need a real Postgres.
+
+producer_db loads tests/fixtures/producer_fixture.sql into a throwaway
+database and yields a Config pointing at it. It SKIPS unless
+METRICBOT_TEST_PG_HOST is set (plus optional _PORT/_USER/_PASSWORD) and
+psql is on PATH — CI and laptops without a local Postgres run the offline
+suite unchanged.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import uuid
+from pathlib import Path
+
+import pytest
+
+from metricbot.config import Config
+
+FIXTURE_SQL = Path(__file__).resolve().parent / "fixtures" / "producer_fixture.sql"
+
+
+def _psql(database: str, *args: str) -> None:
+    env = os.environ.copy()
+    env["PGPASSWORD"] = os.environ.get("METRICBOT_TEST_PG_PASSWORD", "")
+    subprocess.run(
+        ["psql",
+         "-h", os.environ["METRICBOT_TEST_PG_HOST"],
+         "-p", os.environ.get("METRICBOT_TEST_PG_PORT", "5432"),
+         "-U", os.environ.get("METRICBOT_TEST_PG_USER", "postgres"),
+         "-d", database, "-q", "-v", "ON_ERROR_STOP=1", *args],
+        env=env, check=True, capture_output=True, timeout=120)
+
+
+@pytest.fixture(scope="session")
+def producer_db():
+    if not os.environ.get("METRICBOT_TEST_PG_HOST"):
+        pytest.skip("METRICBOT_TEST_PG_HOST not set — no local Postgres for integration tests")
+    if shutil.which("psql") is None:
+        pytest.skip("psql not on PATH")
+
+    database = f"metricbot_fixture_{uuid.uuid4().hex[:8]}"
+    _psql("postgres", "-c", f'CREATE DATABASE "{database}"')
+    try:
+        _psql(database, "-f", str(FIXTURE_SQL))
+        yield Config(
+            pg_host=os.environ["METRICBOT_TEST_PG_HOST"],
+            pg_user=os.environ.get("METRICBOT_TEST_PG_USER", "postgres"),
+            pg_password=os.environ.get("METRICBOT_TEST_PG_PASSWORD", ""),
+            pg_database=database,
+            pg_port=os.environ.get("METRICBOT_TEST_PG_PORT", "5432"),
+            api_base_url="http://api.example.invalid",
+            admin_token="t",
+            metricbot_user_id="00000000-0000-0000-0000-000000000000",
+        )
+    finally:
+        _psql("postgres", "-c", f'DROP DATABASE IF EXISTS "{database}"')
+
+
+@pytest.fixture
+def producer_sql(producer_db):
+    """Runs one SQL command against the fixture database — for a test
+    that changes rows and puts them back."""
+    return lambda sql: _psql(producer_db.pg_database, "-c", sql)
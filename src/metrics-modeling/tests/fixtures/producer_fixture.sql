@@ -0,0 +1,276 @@
+-- Producer-database stand-in for the integration tests: the subset of
+-- the sdProducer schema the extraction SQL touches (same table/column
+-- names and types as the EF model), filled with DETERMINISTIC synthetic
+-- data — ids are md5-derived, metric values hash-derived — so every
+-- load of this file yields byte-identical rows.
+--
+-- Shape: seasons 2022-2025, 12 franchises (8 FBS, 4 FCS), a preseason
+-- week plus 10 regular weeks per season, six games a week. 2025 weeks
+-- 9-10 are unplayed; odds exist for most games (provider 58 preferred,
+-- 100 as fallback); a cancelled game, an unfinalized score and a
+-- preseason game exercise the filters.
+
+CREATE TABLE public."Season" (
+    "Id"   uuid PRIMARY KEY,
+    "Year" integer NOT NULL
+);
+
+CREATE TABLE public."SeasonPhase" (
+    "Id"       uuid PRIMARY KEY,
+    "SeasonId" uuid NOT NULL,
+    "TypeCode" integer NOT NULL,
+    "Year"     integer NOT NULL
+);
+
+CREATE TABLE public."SeasonWeek" (
+    "Id"            uuid PRIMARY KEY,
+    "SeasonId"      uuid NOT NULL,
+    "SeasonPhaseId" uuid NOT NULL,
+    "Number"        integer NOT NULL,
+    "StartDate"     timestamp with time zone NOT NULL,
+    "EndDate"       timestamp with time zone NOT NULL
+);
+
+CREATE TABLE public."FranchiseSeason" (
+    "Id"             uuid PRIMARY KEY,
+    "FranchiseId"    uuid NOT NULL,
+    "SeasonYear"     integer NOT NULL,
+    "GroupSeasonMap" varchar(100),
+    -- The live season rows the prototype's training SQL reads.
+    "PtsAllowedMin"  integer,
+    "PtsAllowedMax"  integer,
+    "PtsAllowedAvg"  numeric,
+    "PtsScoredMin"   integer,
+    "PtsScoredMax"   integer,
+    "PtsScoredAvg"   numeric,
+    "MarginWinMin"   integer,
+    "MarginWinMax"   integer,
+    "MarginWinAvg"   numeric,
+    "MarginLossMin"  integer,
+    "MarginLossMax"  integer,
+    "MarginLossAvg"  numeric
+);
+
+CREATE TABLE public."Contest" (
+    "Id"                        uuid PRIMARY KEY,
+    "SeasonWeekId"              uuid,
+    "SeasonPhaseId"             uuid NOT NULL,
+    "SeasonYear"                integer NOT NULL,
+    "HomeTeamFranchiseSeasonId" uuid NOT NULL,
+    "AwayTeamFranchiseSeasonId" uuid NOT NULL,
+    "StartDateUtc"              timestamp with time zone NOT NULL,
+    "HomeScore"                 integer,
+    "AwayScore"                 integer,
+    "FinalizedUtc"              timestamp with time zone,
+    "CancelledUtc"              timestamp with time zone
+);
+
+CREATE TABLE public."Competition" (
+    "Id"        uuid PRIMARY KEY,
+    "ContestId" uuid NOT NULL
+);
+
+CREATE TABLE public."CompetitionMetric" (
+    "CompetitionId"          uuid NOT NULL,
+    "FranchiseSeasonId"      uuid NOT NULL,
+    "Season"                 integer NOT NULL,
+    "Ypp"                    numeric(5,2) NOT NULL,
+    "SuccessRate"            numeric(5,4) NOT NULL,
+    "ExplosiveRate"          numeric(5,4) NOT NULL,
+    "PointsPerDrive"         numeric(5,2) NOT NULL,
+    "ThirdFourthRate"        numeric(5,4) NOT NULL,
+    "RzTdRate"               numeric(5,4),
+    "RzScoreRate"            numeric(5,4),
+    "TimePossRatio"          numeric(5,2) NOT NULL,
+    "OppYpp"                 numeric(5,2) NOT NULL,
+    "OppSuccessRate"         numeric(5,4) NOT NULL,
+    "OppExplosiveRate"       numeric(5,4) NOT NULL,
+    "OppPointsPerDrive"      numeric(5,2) NOT NULL,
+    "OppThirdFourthRate"     numeric(5,4) NOT NULL,
+    "OppRzTdRate"            numeric(5,4),
+    "OppScoreTdRate"         numeric(5,4),
+    "NetPunt"                numeric(6,2),
+    "FgPctShrunk"            numeric(5,4),
+    "FieldPosDiff"           numeric(6,2) NOT NULL,
+    "TurnoverMarginPerDrive" numeric(6,3) NOT NULL,
+    "PenaltyYardsPerPlay"    numeric(5,2),
+    "ComputedUtc"            timestamp with time zone NOT NULL,
+    "InputsHash"             varchar(64),
+    PRIMARY KEY ("CompetitionId", "FranchiseSeasonId")
+);
+
+-- The live season metrics the prototype's current-week SQL joins. Left
+-- empty: no fixture week is open, so that query has no slate anyway.
+CREATE TABLE public."FranchiseSeasonMetric" (
+    "Id"                     uuid PRIMARY KEY,
+    "FranchiseSeasonId"      uuid NOT NULL,
+    "Season"                 integer NOT NULL,
+    "GamesPlayed"            integer NOT NULL,
+    "Ypp"                    numeric NOT NULL,
+    "SuccessRate"            numeric NOT NULL,
+    "ExplosiveRate"          numeric NOT NULL,
+    "PointsPerDrive"         numeric NOT NULL,
+    "ThirdFourthRate"        numeric NOT NULL,
+    "RzTdRate"               numeric,
+    "RzScoreRate"            numeric,
+    "TimePossRatio"          numeric NOT NULL,
+    "OppYpp"                 numeric NOT NULL,
+    "OppSuccessRate"         numeric NOT NULL,
+    "OppExplosiveRate"       numeric NOT NULL,
+    "OppPointsPerDrive"      numeric NOT NULL,
+    "OppThirdFourthRate"     numeric NOT NULL,
+    "OppRzTdRate"            numeric,
+    "OppScoreTdRate"         numeric,
+    "NetPunt"                numeric,
+    "FgPctShrunk"            numeric,
+    "FieldPosDiff"           numeric NOT NULL,
+    "TurnoverMarginPerDrive" numeric NOT NULL,
+    "PenaltyYardsPerPlay"    numeric,
+    "ComputedUtc"            timestamp with time zone NOT NULL
+);
+
+CREATE TABLE public."CompetitionOdds" (
+    "Id"            uuid PRIMARY KEY,
+    "CompetitionId" uuid NOT NULL,
+    "ProviderId"    text NOT NULL,
+    "Spread"        numeric(18,6),
+    "OverUnder"     numeric(18,6),
+    "CreatedUtc"    timestamp with time zone NOT NULL,
+    "ModifiedUtc"   timestamp with time zone
+);
+-- As in the EF model: at most one line per provider per competition.
+CREATE UNIQUE INDEX "IX_CompetitionOdds_CompetitionId_ProviderId"
+    ON public."CompetitionOdds" ("CompetitionId", "ProviderId");
+
+-- Deterministic [0, 1) from a seed string.
+CREATE FUNCTION pg_temp.u(seed text) RETURNS numeric
+    LANGUAGE sql IMMUTABLE AS
+$$ SELECT (('x' || substr(md5(seed), 1, 8))::bit(32)::bigint % 100000) / 100000.0 $$;
+
+INSERT INTO public."Season" ("Id", "Year")
+SELECT md5('season-' || y)::uuid, y FROM generate_series(2022, 2025) y;
+
+INSERT INTO public."SeasonPhase" ("Id", "SeasonId", "TypeCode", "Year")
+SELECT md5('phase-' || y || '-' || t)::uuid, md5('season-' || y)::uuid, t, y
+FROM generate_series(2022, 2025) y, generate_series(1, 2) t;
+
+-- Preseason week 1 (TypeCode 1) shares its Number with regular week 1.
+INSERT INTO public."SeasonWeek" ("Id", "SeasonId", "SeasonPhaseId", "Number", "StartDate", "EndDate")
+SELECT md5('week-' || y || '-' || t || '-' || n)::uuid,
+       md5('season-' || y)::uuid,
+       md5('phase-' || y || '-' || t)::uuid,
+       n,
+       make_timestamptz(y, 8, 20, 0, 0, 0, 'UTC') + ((CASE WHEN t = 1 THEN -1 ELSE n - 1 END) * 7) * interval '1 day',
+       make_timestamptz(y, 8, 27, 0, 0, 0, 'UTC') + ((CASE WHEN t = 1 THEN -1 ELSE n - 1 END) * 7) * interval '1 day'
+FROM generate_series(2022, 2025) y,
+     LATERAL (SELECT 1 AS t, 1 AS n UNION ALL SELECT 2, g FROM generate_series(1, 10) g) w;
+
+INSERT INTO public."FranchiseSeason" ("Id", "FranchiseId", "SeasonYear", "GroupSeasonMap")
+SELECT md5('fs-' || f || '-' || y)::uuid, md5('franchise-' || f)::uuid, y,
+       CASE WHEN f <= 8 THEN 'NCAAF|NCAA|fbs|conf' || (f % 2) ELSE 'NCAAF|NCAA|fcs|conf9' END
+FROM generate_series(1, 12) f, generate_series(2022, 2025) y;
+
+-- Round-robin pairing: in week n, slot k pairs franchises a/b by circle rotation.
+WITH slots AS (
+    SELECT y, n, k,
+           1 + ((k + n) % 11) AS a,
+           CASE WHEN k = 0 THEN 12 ELSE 1 + ((11 - k + n) % 11) END AS b
+    FROM generate_series(2022, 2025) y, generate_series(1, 10) n, generate_series(0, 5) k
+)
+INSERT INTO public."Contest" ("Id", "SeasonWeekId", "SeasonPhaseId", "SeasonYear",
+                              "HomeTeamFranchiseSeasonId", "AwayTeamFranchiseSeasonId",
+                              "StartDateUtc", "HomeScore", "AwayScore", "FinalizedUtc", "CancelledUtc")
+SELECT md5('contest-' || y || '-' || n || '-' || k)::uuid,
+       md5('week-' || y || '-2-' || n)::uuid,
+       md5('phase-' || y || '-2')::uuid,
+       y,
+       md5('fs-' || CASE WHEN (n + k) % 2 = 0 THEN a ELSE b END || '-' || y)::uuid,
+       md5('fs-' || CASE WHEN (n + k) % 2 = 0 THEN b ELSE a END || '-' || y)::uuid,
+       make_timestamptz(y, 8, 23, 16, 0, 0, 'UTC') + ((n - 1) * 7) * interval '1 day' + k * interval '3 hours',
+       CASE WHEN played THEN (pg_temp.u('hs-' || y || n || k) * 45)::int END,
+       CASE WHEN played THEN (pg_temp.u('as-' || y || n || k) * 45)::int END,
+       CASE WHEN played AND NOT (y = 2025 AND n = 8 AND k = 5) THEN
+            make_timestamptz(y, 8, 23, 20, 0, 0, 'UTC') + ((n - 1) * 7) * interval '1 day' + k * interval '3 hours' END,
+       CASE WHEN y = 2024 AND n = 5 AND k = 4 THEN make_timestamptz(y, 9, 1, 0, 0, 0, 'UTC') END
+FROM (SELECT *, NOT (y = 2025 AND n >= 9) AS played FROM slots) s;
+
+-- One preseason game per season (must never reach any extraction).
+INSERT INTO public."Contest" ("Id", "SeasonWeekId", "SeasonPhaseId", "SeasonYear",
+                              "HomeTeamFranchiseSeasonId", "AwayTeamFranchiseSeasonId",
+                              "StartDateUtc", "HomeScore", "AwayScore", "FinalizedUtc", "CancelledUtc")
+SELECT md5('contest-pre-' || y)::uuid, md5('week-' || y || '-1-1')::uuid, md5('phase-' || y || '-1')::uuid, y,
+       md5('fs-1-' || y)::uuid, md5('fs-2-' || y)::uuid,
+       make_timestamptz(y, 8, 16, 16, 0, 0, 'UTC'), 70, 0, make_timestamptz(y, 8, 16, 20, 0, 0, 'UTC'), NULL
+FROM generate_series(2022, 2025) y;
+
+INSERT INTO public."Competition" ("Id", "ContestId")
+SELECT md5('competition-' || "Id")::uuid, "Id" FROM public."Contest";
+
+INSERT INTO public."CompetitionMetric"
+SELECT comp."Id", t.fs, con."SeasonYear",
+       round(3 + 5 * pg_temp.u(m || 'ypp'), 2),
+       round(0.3 + 0.2 * pg_temp.u(m || 'sr'), 4),
+       round(0.05 + 0.1 * pg_temp.u(m || 'er'), 4),
+       round(1 + 2.5 * pg_temp.u(m || 'ppd'), 2),
+       round(0.25 + 0.3 * pg_temp.u(m || 'tfr'), 4),
+       CASE WHEN pg_temp.u(m || 'rzn') < 0.1 THEN NULL ELSE round(0.3 + 0.5 * pg_temp.u(m || 'rzt'), 4) END,
+       CASE WHEN pg_temp.u(m || 'rzn') < 0.1 THEN NULL ELSE round(0.6 + 0.4 * pg_temp.u(m || 'rzs'), 4) END,
+       round(0.4 + 0.2 * pg_temp.u(m || 'tp'), 2),
+       round(3 + 5 * pg_temp.u(m || 'oypp'), 2),
+       round(0.3 + 0.2 * pg_temp.u(m || 'osr'), 4),
+       round(0.05 + 0.1 * pg_temp.u(m || 'oer'), 4),
+       round(1 + 2.5 * pg_temp.u(m || 'oppd'), 2),
+       round(0.25 + 0.3 * pg_temp.u(m || 'otfr'), 4),
+       CASE WHEN pg_temp.u(m || 'orzn') < 0.1 THEN NULL ELSE round(0.3 + 0.5 * pg_temp.u(m || 'orzt'), 4) END,
+       CASE WHEN pg_temp.u(m || 'orzn') < 0.1 THEN NULL ELSE round(0.2 + 0.4 * pg_temp.u(m || 'ostd'), 4) END,
+       NULL,
+       CASE WHEN pg_temp.u(m || 'fgn') < 0.15 THEN NULL ELSE round(0.5 + 0.4 * pg_temp.u(m || 'fg'), 4) END,
+       round(-10 + 20 * pg_temp.u(m || 'fpd'), 2),
+       round(-0.3 + 0.6 * pg_temp.u(m || 'tmpd'), 3),
+       NULL,
+       COALESCE(con."FinalizedUtc", con."StartDateUtc") + interval '2 hours',
+       md5(m)
+FROM public."Contest" con
+JOIN public."Competition" comp ON comp."ContestId" = con."Id"
+CROSS JOIN LATERAL (VALUES (con."HomeTeamFranchiseSeasonId"), (con."AwayTeamFranchiseSeasonId")) t(fs)
+CROSS JOIN LATERAL (SELECT comp."Id"::text || t.fs::text AS m) seed
+WHERE con."HomeScore" IS NOT NULL;
+
+-- Odds: provider 58 on ~80% of games, provider 100 on ~50% (the
+-- fallback when 58 is missing); some games have neither.
+INSERT INTO public."CompetitionOdds" ("Id", "CompetitionId", "ProviderId", "Spread", "OverUnder",
+                                      "CreatedUtc", "ModifiedUtc")
+SELECT md5('odds-' || p || comp."Id")::uuid, comp."Id", p,
+       round(-21 + 42 * pg_temp.u('sp' || p || comp."Id"::text)) / 2.0,
+       round(40 + 20 * pg_temp.u('ou' || p || comp."Id"::text)),
+       con."StartDateUtc" - interval '6 days',
+       con."StartDateUtc" - interval '1 day'
+FROM public."Competition" comp
+JOIN public."Contest" con ON con."Id" = comp."ContestId"
+CROSS JOIN (VALUES ('58', 0.8), ('100', 0.5)) providers(p, coverage)
+WHERE pg_temp.u('has' || p || comp."Id"::text) < providers.coverage;
+
+-- Live season rows: each team's whole-season score windows (what the
+-- prototype's training SQL leaks into every game of the season).
+UPDATE public."FranchiseSeason" fs
+SET "PtsScoredMin" = w.scored_min, "PtsScoredMax" = w.scored_max, "PtsScoredAvg" = w.scored_avg,
+    "PtsAllowedMin" = w.allowed_min, "PtsAllowedMax" = w.allowed_max, "PtsAllowedAvg" = w.allowed_avg,
+    "MarginWinMin" = w.win_min, "MarginWinMax" = w.win_max, "MarginWinAvg" = w.win_avg,
+    "MarginLossMin" = w.loss_min, "MarginLossMax" = w.loss_max, "MarginLossAvg" = w.loss_avg
+FROM (
+    SELECT fs_id,
+           min(own) AS scored_min, max(own) AS scored_max, round(avg(own), 2) AS scored_avg,
+           min(opp) AS allowed_min, max(opp) AS allowed_max, round(avg(opp), 2) AS allowed_avg,
+           min(own - opp) FILTER (WHERE own > opp) AS win_min,
+           max(own - opp) FILTER (WHERE own > opp) AS win_max,
+           round(avg(own - opp) FILTER (WHERE own > opp), 2) AS win_avg,
+           min(opp - own) FILTER (WHERE own < opp) AS loss_min,
+           max(opp - own) FILTER (WHERE own < opp) AS loss_max,
+           round(avg(opp - own) FILTER (WHERE own < opp), 2) AS loss_avg
+    FROM public."Contest" con
+    CROSS JOIN LATERAL (VALUES (con."HomeTeamFranchiseSeasonId", con."HomeScore", con."AwayScore"),
+                               (con."AwayTeamFranchiseSeasonId", con."AwayScore", con."HomeScore")) t(fs_id, own, opp)
+    WHERE con."HomeScore" IS NOT NULL
+    GROUP BY fs_id
+) w
+WHERE fs."Id" = w.fs_id;
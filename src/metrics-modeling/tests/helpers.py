@@ -0,0 +1,16 @@
+"""Helpers the offline tests import (`from helpers import ...`) — plain
+functions, not fixtures, so module-level constants can use them too."""
+
+from __future__ import annotations
+
+from metricbot.config import Config
+
+
+def make_config(**overrides) -> Config:
+    """A Config for a database nothing connects to; the fields a test
+    cares about are passed as overrides."""
+    fields = dict(pg_host="db.example.invalid", pg_user="u", pg_password="p",
+                  pg_database="sdProducer.FootballNcaa", pg_port="5432",
+                  api_base_url="http://api.example.invalid", admin_token="t",
+                  metricbot_user_id="00000000-0000-0000-0000-000000000000")
+    return Config(**{**fields, **overrides})
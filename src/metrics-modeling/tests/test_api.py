@@ -0,0 +1,151 @@
+"""Publishing against a local stand-in for the API's ingestion route:
+chunks keep contests whole and share one connection, retries resend the
+same chunk under the same idempotency key, and what cannot succeed fails
+fast or names what was already accepted."""
+
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from helpers import make_config
+from metricbot import api
+from metricbot.api import PublishError, chunk_by_contest, post_predictions
+from metricbot.config import Config
+
+USER_ID = "00000000-0000-0000-0000-000000000000"
+
+
+class StandIn(ThreadingHTTPServer):
+    """Answers each POST with the next scripted reply — a status code, or
+    a number of seconds to stall before a 201 — then 201 forever."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.script: list[int | float] = []
+        self.received: list[dict] = []
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # keep-alive
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        self.server.received.append({"path": self.path, "client": self.client_address,
+                                     "headers": dict(self.headers), "dtos": json.loads(body)})
+        reply = self.server.script.pop(0) if self.server.script else 201
+        if isinstance(reply, float):
+            time.sleep(reply)
+            reply = 201
+        self.send_response(reply)
+        self.send_header("Content-Length", "0")
+        if reply == 503:
+            self.send_header("Retry-After", "2")
+        self.end_headers()
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    slept = []
+    monkeypatch.setattr(api, "_sleep", slept.append)
+    monkeypatch.setattr(api, "_jitter", lambda low, high: high)
+    return slept
+
+
+def _config(server: StandIn, **overrides) -> Config:
+    return make_config(api_base_url=f"http://127.0.0.1:{server.server_address[1]}",
+                       metricbot_user_id=USER_ID, **overrides)
+
+
+def _dtos(contests: int) -> list[dict]:
+    # SU for every contest, ATS for every other one — as a priced slate.
+    dtos = []
+    for n in range(contests):
+        dtos.append({"ContestId": f"c{n}", "PredictionType": 1})
+        if n % 2 == 0:
+            dtos.append({"ContestId": f"c{n}", "PredictionType": 2})
+    return dtos
+
+
+def test_chunks_keep_contests_whole():
+    chunks = chunk_by_contest(_dtos(6), 4)
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3]
+    assert [dto for chunk in chunks for dto in chunk] == _dtos(6)
+    assert [len(chunk) for chunk in chunk_by_contest(_dtos(6), 1)] == [2, 1, 2, 1, 2, 1]
+
+
+def test_chunks_share_one_connection_gzip_and_a_run_key(stand_in, sleeps):
+    config = _config(stand_in, publish_chunk_dtos=4, publish_gzip=True)
+
+    report = post_predictions(config, _dtos(6))
+
+    received = stand_in.received
+    assert [request["dtos"] for request in received] == chunk_by_contest(_dtos(6), 4)
+    assert {request["path"] for request in received} == {f"/admin/ai-predictions/{USER_ID}"}
+    assert len({request["client"] for request in received}) == 1
+    assert all(request["headers"]["Content-Encoding"] == "gzip" for request in received)
+    assert [request["headers"]["Idempotency-Key"] for request in received] \
+        == [f"{report.idempotency_key}-{n}of3" for n in (1, 2, 3)]
+    assert [(c.index, c.dtos, c.contests, c.attempts, c.status) for c in report.chunks] \
+        == [(1, 3, 2, 1, 201), (2, 3, 2, 1, 201), (3, 3, 2, 1, 201)]
+    assert all(c.body_bytes < len(json.dumps(_dtos(2))) for c in report.chunks)
+    assert sleeps == []
+    # The same predictions carry the same key on a re-run.
+    assert post_predictions(config, _dtos(6)).idempotency_key == report.idempotency_key
+
+
+def test_retryable_failures_resend_the_same_chunk(stand_in, sleeps, monkeypatch):
+    monkeypatch.setattr(api, "BACKOFF_BASE_SECONDS", 0.5)
+    stand_in.script = [503, 502, 0.5]
+    config = _config(stand_in)
+
+    report = post_predictions(config, _dtos(4), timeout_seconds=0.2)
+
+    # 503 → Retry-After 2s; 502 → backoff 1s; stall → timeout, backoff 2s.
+    assert sleeps == [2.0, 1.0, 2.0]
+    assert (report.chunks[0].attempts, report.chunks[0].status) == (4, 201)
+    keys = {request["headers"]["Idempotency-Key"] for request in stand_in.received}
+    assert keys == {f"{report.idempotency_key}-1of1"}
+    assert all(request["dtos"] == _dtos(4) for request in stand_in.received)
+    # gzip is off unless configured: the API does not decompress requests.
+    assert not report.gzip
+    assert all("Content-Encoding" not in request["headers"] for request in stand_in.received)
+
+
+def test_client_errors_fail_fast_and_exhausted_retries_name_the_accepted_chunks(stand_in, sleeps):
+    stand_in.script = [400]
+    with pytest.raises(PublishError, match="API returned 400 for chunk 1.*nothing was accepted"):
+        post_predictions(_config(stand_in), _dtos(2))
+    assert len(stand_in.received) == 1 and sleeps == []
+
+    stand_in.script = [201] + [500] * api.PUBLISH_ATTEMPTS
+    with pytest.raises(PublishError, match="gave up after 4 attempts.*chunks 1-1 of 2 were accepted"):
+        post_predictions(_config(stand_in, publish_chunk_dtos=3), _dtos(4))
+    assert len(sleeps) == api.PUBLISH_ATTEMPTS - 1
+
+
+def test_base_url_scheme_is_restricted():
+    config = make_config(api_base_url="file:///etc", metricbot_user_id=USER_ID)
+    with pytest.raises(PublishError, match="must use https"):
+        post_predictions(config, _dtos(1))
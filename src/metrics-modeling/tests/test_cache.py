@@ -0,0 +1,219 @@
+"""Corpus cache — partition round trip, watermark/fingerprint checks and
+the warm corpus's budget offline; against the fixture database, the claim
+that a cached corpus is the one-query corpus, that a recompute
+invalidates its season, and that a warm service reads only the open
+season."""
+
+from __future__ import annotations
+
+import dataclasses
+import time
+
+import pandas as pd
+import pytest
+
+from helpers import make_config
+from metricbot import cache, extract
+
+WATERMARK = {"Games": 60, "MetricRows": 120, "MaxComputedUtc": "2024-10-26T13:00:00.000000Z"}
+
+
+def _season_frame() -> pd.DataFrame:
+    return pd.DataFrame({"ContestId": ["a", "b"], "SeasonYear": [2024, 2024],
+                         "HomeScore": [21, 17], "Spread": [-3.5, float("nan")],
+                         "FbsParticipant": ["t", "f"]})
+
+
+def test_partition_round_trips_while_the_watermark_holds(tmp_path):
+    pytest.importorskip("pyarrow")
+    corpus = cache.CorpusCache(make_config(cache_dir=tmp_path))
+    corpus.write(2024, _season_frame(), WATERMARK, payload_bytes=1234)
+
+    frame, meta = corpus.read(2024, dict(WATERMARK))
+    pd.testing.assert_frame_equal(frame, _season_frame())
+    assert meta["payload_bytes"] == 1234
+
+    assert corpus.read(2024, {**WATERMARK, "MaxComputedUtc": "2026-01-01T00:00:00.000000Z"}) is None
+    assert corpus.read(2023, WATERMARK) is None
+
+
+def test_verify_classifies_and_evict_removes(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    config = make_config(cache_dir=tmp_path)
+    corpus = cache.CorpusCache(config)
+    corpus.write(2022, _season_frame(), WATERMARK, payload_bytes=1)
+    corpus.write(2023, _season_frame(), WATERMARK, payload_bytes=1)
+    corpus.write(2024, _season_frame(), WATERMARK, payload_bytes=1)
+    # A model version bump strands every partition written before it.
+    monkeypatch.setattr(cache, "MODEL_VERSION", "MetricBot-v9")
+    bumped = cache.CorpusCache(config)
+    bumped.write(2024, _season_frame(), WATERMARK, payload_bytes=1)
+
+    checks = bumped.verify({2023: {**WATERMARK, "Games": 61}, 2024: WATERMARK})
+    statuses = {(c.season_year, c.path.stem == bumped.fingerprint): c.status for c in checks}
+
+    assert statuses == {(2022, False): "superseded", (2023, False): "superseded",
+                        (2024, False): "superseded", (2024, True): "fresh"}
+
+    for check in checks:
+        if check.status != "fresh":
+            bumped.evict(check)
+    assert [p.parent.name for p in (tmp_path / config.pg_database).glob("*/*.parquet")] == ["season=2024"]
+
+
+def test_fingerprint_follows_the_season_sql_the_variant_runs(tmp_path, monkeypatch):
+    spec = cache.fingerprint(make_config(cache_dir=tmp_path))
+    ranked = dataclasses.replace(make_config(cache_dir=tmp_path), sql_variant="ranked")
+    assert cache.fingerprint(ranked) != spec
+
+    # A ranked twin of the season query, once there is one, is what gets hashed.
+    (tmp_path / "ranked").mkdir()
+    twin = tmp_path / "ranked" / extract.ASOF_SEASON_SQL.name
+    twin.write_text("SELECT 1;\n", encoding="utf-8")
+    monkeypatch.setattr(extract, "RANKED_SQL_DIR", tmp_path / "ranked")
+    first = cache.fingerprint(ranked)
+    twin.write_text("SELECT 2;\n", encoding="utf-8")
+    assert cache.fingerprint(ranked) != first and cache.fingerprint(make_config(cache_dir=tmp_path)) == spec
+
+
+def test_moved_watermark_is_stale_and_missing_season_orphaned(tmp_path):
+    pytest.importorskip("pyarrow")
+    corpus = cache.CorpusCache(make_config(cache_dir=tmp_path))
+    corpus.write(2023, _season_frame(), WATERMARK, payload_bytes=1)
+    corpus.write(2024, _season_frame(), WATERMARK, payload_bytes=1)
+
+    checks = corpus.verify({2024: {**WATERMARK, "MetricRows": 118}})
+
+    assert [(c.season_year, c.status) for c in checks] == [(2023, "orphaned"), (2024, "stale")]
+    assert "MetricRows 120 -> 118" in checks[1].detail
+
+
+def _sorted(frame: pd.DataFrame) -> pd.DataFrame:
+    return frame.sort_values(["SeasonYear", "WeekNumber", "ContestId"]).reset_index(drop=True)
+
+
+def test_warm_corpus_drops_the_oldest_seasons_past_its_budget():
+    frame = _season_frame()
+    size = int(frame.memory_usage(deep=True).sum())
+    warm = cache.WarmCorpus(max_bytes=2 * size)
+    for year in (2022, 2023, 2024):
+        warm.put(year, frame, WATERMARK)
+    warm.put(2021, frame, WATERMARK)    # older than all it holds: not kept
+
+    summary = warm.summary()
+    assert (summary["seasons"], summary["bytes"]) == ([2023, 2024], 2 * size)
+    assert summary["over_budget"] == [2021, 2022]
+    assert warm.get(2024, dict(WATERMARK)) is frame
+    assert warm.get(2024, {**WATERMARK, "Games": 61}) is None
+    assert warm.get(2022, WATERMARK) is None
+
+    cache.WarmCorpus(max_bytes=size - 1).put(2024, frame, WATERMARK)
+
+
+@pytest.mark.parametrize("season_year, week", [(2025, 6), (2025, 1), (2024, 3)])
+def test_cached_corpus_matches_one_query_extraction(producer_db, tmp_path, season_year, week):
+    pytest.importorskip("pyarrow")
+    cached_config = dataclasses.replace(producer_db, cache_dir=tmp_path)
+
+    expected = extract.extract_asof_training(producer_db, season_year, week)
+    cold = extract.extract_asof_training(cached_config, season_year, week)
+    warm = extract.extract_asof_training(cached_config, season_year, week)
+
+    pd.testing.assert_frame_equal(_sorted(cold), _sorted(expected), check_exact=True)
+    pd.testing.assert_frame_equal(_sorted(warm), _sorted(expected), check_exact=True)
+
+
+def test_warm_run_queries_only_the_open_season_until_a_recompute(producer_db, producer_sql, tmp_path,
+                                                                  monkeypatch):
+    pytest.importorskip("pyarrow")
+    config = dataclasses.replace(producer_db, cache_dir=tmp_path)
+    extract.extract_asof_training(config, 2025, 6)
+
+    queried = []
+    run_query = cache._run_query
+
+    def recording_run_query(config, sql_file, variables=None, allow_empty=False):
+        queried.append((sql_file.name, (variables or {}).get("season_year")))
+        return run_query(config, sql_file, variables, allow_empty)
+
+    monkeypatch.setattr(cache, "_run_query", recording_run_query)
+
+    extract.extract_asof_training(config, 2025, 6)
+    assert queried == [("corpus_season_watermarks.sql", None),
+                       ("competition_metrics_asof_season.sql", 2025)]
+
+    recompute = ('UPDATE public."CompetitionMetric" SET "ComputedUtc" = "ComputedUtc" + interval '
+                 "'1 day' WHERE \"Season\" = 2023")
+    restore = recompute.replace("+", "-")
+    producer_sql(recompute)
+    try:
+        assert [c.status for c in cache.CorpusCache(config).verify(cache.season_watermarks(config))] \
+            == ["fresh", "stale", "fresh"]
+        queried.clear()
+        extract.extract_asof_training(config, 2025, 6)
+        assert ("competition_metrics_asof_season.sql", 2023) in queried
+        assert ("competition_metrics_asof_season.sql", 2022) not in queried
+    finally:
+        producer_sql(restore)
+
+
+def _recording_queries(monkeypatch) -> list[tuple[str, int | None]]:
+    queried = []
+    run_query = cache._run_query
+
+    def recording_run_query(config, sql_file, variables=None, allow_empty=False):
+        queried.append((sql_file.name, (variables or {}).get("season_year")))
+        return run_query(config, sql_file, variables, allow_empty)
+
+    monkeypatch.setattr(cache, "_run_query", recording_run_query)
+    return queried
+
+
+def test_preloaded_warm_corpus_serves_closed_seasons_without_a_cache_dir(producer_db, monkeypatch):
+    monkeypatch.setattr(cache, "_WARM", {})
+    config = dataclasses.replace(producer_db, warm_corpus_mb=64)
+    expected = extract.extract_asof_training(producer_db, 2025, 6)
+
+    cache.preload_closed_seasons(config)
+    queried = _recording_queries(monkeypatch)
+    warm = extract.extract_asof_training(config, 2025, 6)
+
+    pd.testing.assert_frame_equal(_sorted(warm), _sorted(expected), check_exact=True)
+    assert queried == [("corpus_season_watermarks.sql", None),
+                       ("competition_metrics_asof_season.sql", 2025)]
+    summary = cache.warm_corpus(config).summary()
+    assert (summary["state"], summary["seasons"]) == ("warm", [2022, 2023, 2024])
+
+
+def test_service_reports_the_warm_corpus_once_loaded(producer_db, monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from metricbot import service
+
+    config = dataclasses.replace(producer_db, warm_corpus_mb=64)
+    monkeypatch.setattr(cache, "_WARM", {})
+    monkeypatch.setattr(service, "warm_sports", {})
+    # The lifespan keeps sessions for the process; restored afterwards.
+    monkeypatch.setattr(extract, "_KEEP_SESSIONS", False)
+    def load(sport):
+        if sport != "FootballNcaa":
+            raise SystemExit("METRICBOT_PG_HOST is not set.")
+        return config
+
+    monkeypatch.setattr(service.Config, "load", staticmethod(load))
+    with TestClient(service.app) as client:
+        deadline = time.monotonic() + 60
+        while (ready := client.get("/ready")).status_code == 503:
+            assert ready.json()["warmCorpus"]["FootballNcaa"] == "warming"
+            assert time.monotonic() < deadline
+            time.sleep(0.05)
+        health = client.get("/health").json()
+        exposition = client.get("/metrics").text
+
+    assert ready.json() == {"ready": True, "warmCorpus": {"FootballNcaa": "warm"}}
+    assert health["warmCorpus"]["FootballNcaa"]["seasons"] == [2022, 2023, 2024]
+    assert health["warmCorpus"]["FootballNcaa"]["bytes"] <= 64 * 2**20
+    assert "metricbot_warm_corpus_seasons{" in exposition
+    assert service.metrics.WARM_CORPUS_SEASONS.value("FootballNcaa") == 3
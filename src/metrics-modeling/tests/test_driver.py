@@ -0,0 +1,66 @@
+"""psycopg extraction backend — variable binding and dtype rules offline,
+frame parity with the psql path against the fixture database."""
+
+from __future__ import annotations
+
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metricbot import extract
+from metricbot.driver import _convert_chunk, _finish_column, bind_variables
+from metricbot.schema import FrameSchema
+
+
+def test_bind_variables_substitutes_psql_style_names_but_not_casts():
+    sql = ("-- psql -v season_year=2025\n"
+           "SELECT :season_year::int AS y, x::text FROM t WHERE w < :week;\n")
+
+    bound = bind_variables(sql, {"season_year": 2025, "week": "6"})
+
+    assert bound == "SELECT 2025::int AS y, x::text FROM t WHERE w < 6"
+
+
+def test_bind_variables_rejects_unbound_names():
+    with pytest.raises(extract.ExtractionError, match=":week"):
+        bind_variables("SELECT :week::int", {})
+
+
+def test_columns_take_the_dtypes_read_csv_would_infer():
+    ints = _finish_column(23, [_convert_chunk(23, (1, 2)), _convert_chunk(23, (3,))])
+    nullable_ints = _finish_column(23, [_convert_chunk(23, (1, None))])
+    flags = _finish_column(16, [_convert_chunk(16, (True, False, None))])
+    all_null = _finish_column(25, [_convert_chunk(25, (None, None))])
+    text = _finish_column(25, [_convert_chunk(25, (b"HOME", "AWAY", None))])
+
+    assert ints.dtype == np.int64 and list(ints) == [1, 2, 3]
+    assert nullable_ints.dtype == np.float64 and np.isnan(nullable_ints[1])
+    assert flags.dtype == object and list(flags[:2]) == [True, False] and pd.isna(flags[2])
+    assert all_null.dtype == np.float64 and np.isnan(all_null).all()
+    assert list(text[:2]) == ["HOME", "AWAY"] and pd.isna(text[2])
+
+    typed = FrameSchema("q.sql", {"Flag": "flag"}).apply(pd.DataFrame({"Flag": flags}))
+    assert typed["Flag"].dtype == "boolean" and list(typed["Flag"][:2]) == [True, False]
+    assert typed["Flag"][2] is pd.NA
+
+
+@pytest.mark.parametrize("sql_file, variables", [
+    (extract.ASOF_TRAINING_SQL, {"season_year": 2025, "week": 6}),
+    (extract.ASOF_WEEK_SQL, {"season_year": 2025, "week": 6, "prior_tail": 5, "fbs_scope": 1}),
+    (extract.ASOF_WEEK_SQL, {"season_year": 2024, "week": 1, "prior_tail": 0, "fbs_scope": 0}),
+    (extract.GRADING_SCORES_SEASON_SQL, {"season_year": 2025}),
+    (extract.GRADING_SCORES_SQL, {"season_year": 2025, "week": 9}),
+])
+def test_driver_frames_match_psql_frames(producer_db, sql_file, variables):
+    pytest.importorskip("psycopg")
+    driver_config = dataclasses.replace(producer_db, extract_backend="psycopg")
+
+    expected = extract._run_query(producer_db, sql_file, variables, allow_empty=True)
+    actual = extract._run_query(driver_config, sql_file, variables, allow_empty=True)
+
+    assert list(actual.columns) == list(expected.columns)
+    assert list(actual.dtypes) == list(expected.dtypes)
+    # Within an ulp: read_csv's float parser vs correctly rounded numeric.
+    pd.testing.assert_frame_equal(actual, expected, rtol=1e-12)
@@ -0,0 +1,159 @@
+"""Incremental training engine — the claim that fits assembled from
+per-week moment blocks are sklearn's LinearRegression fits to 1e-8, for
+both v1.1 targets and at every as-of cutoff; and that the incremental
+walk-forward std is the per-fold-refit std."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from metricbot.engine import Moments, TrainingEngine, fold_starts, week_fold_starts
+from metricbot.model import (FEATURE_COLS, WALK_FORWARD_FOLDS, ModelError, PreparedCorpus,
+                             _walk_forward_residual_std, predict_market_prior)
+from metricbot.pipeline import asof_training_slice
+
+
+def _games(season: int, week: int, rows: int, seed: int, completed: bool = True) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    # Production-like scales and offsets: per-game rates near 0.4, score
+    # windows near 28 — the regime where uncentered sums would cancel.
+    data = {col: rng.normal(loc=28 if "Pts" in col or "Margin" in col else 0.4,
+                            scale=6 if "Pts" in col or "Margin" in col else 0.05, size=rows)
+            for col in FEATURE_COLS}
+    data["ContestId"] = [f"{season}-{week}-{i}" for i in range(rows)]
+    data["SeasonYear"] = season
+    data["WeekNumber"] = week
+    data["HomeFranchiseSeasonId"] = [f"h{i}" for i in range(rows)]
+    data["AwayFranchiseSeasonId"] = [f"a{i}" for i in range(rows)]
+    spread = rng.normal(scale=7, size=rows).round(1)
+    spread[rng.random(rows) < 0.2] = np.nan
+    data["Spread"] = spread
+    data["FbsParticipant"] = np.where(rng.random(rows) < 0.8, "t", "f")
+    home = rng.integers(0, 50, rows).astype(float) if completed else np.full(rows, np.nan)
+    away = rng.integers(0, 50, rows).astype(float) if completed else np.full(rows, np.nan)
+    data["HomeScore"], data["AwayScore"] = home, away
+    data["Winner"] = (["HOME" if h > a else "AWAY" if a > h else "TIE" for h, a in zip(home, away)]
+                      if completed else [None] * rows)
+    frame = pd.DataFrame(data)
+    # Week-1 entering windows are NULL in the extraction (fillna(0)).
+    if week == 1:
+        frame.loc[:, [c for c in FEATURE_COLS if "Pts" in c or "Margin" in c]] = np.nan
+    return frame
+
+
+def _corpus() -> pd.DataFrame:
+    return pd.concat([_games(season, week, 40, seed=season * 100 + week)
+                      for season in (2023, 2024, 2025) for week in range(1, 9)],
+                     ignore_index=True)
+
+
+def _decided(training: pd.DataFrame) -> tuple[pd.DataFrame, pd.Series]:
+    decided = training[training["Winner"].isin(["HOME", "AWAY"])]
+    return decided[FEATURE_COLS].fillna(0), decided["HomeScore"] - decided["AwayScore"]
+
+
+def _residual(training: pd.DataFrame, fbs_scope: bool) -> tuple[np.ndarray, np.ndarray]:
+    corpus = PreparedCorpus.of(training)
+    rows = corpus.residual_rows(fbs_scope)
+    return corpus.features[rows], corpus.residual[rows]
+
+
+def _assert_matches_sklearn(fit, x: pd.DataFrame, y: pd.Series) -> None:
+    model = LinearRegression().fit(x, y)
+    np.testing.assert_allclose(fit.coef, model.coef_, rtol=1e-8, atol=1e-8)
+    assert fit.intercept == pytest.approx(model.intercept_, rel=1e-8, abs=1e-8)
+    assert fit.residual_std == pytest.approx(float(np.std(y - model.predict(x))), rel=1e-8)
+    np.testing.assert_allclose(fit.predict(x), model.predict(x), rtol=1e-8, atol=1e-8)
+
+
+def test_combined_blocks_equal_the_moments_of_the_union():
+    rng = np.random.default_rng(7)
+    x = rng.normal(loc=30, size=(90, 4))
+    y = rng.normal(size=90)
+
+    combined = Moments.of(x[:20], y[:20]) + Moments.of(x[20:55], y[20:55]) + Moments.of(x[55:], y[55:])
+    whole = Moments.of(x, y)
+
+    assert combined.n == whole.n
+    np.testing.assert_allclose(combined.mean_x, whole.mean_x, rtol=1e-13)
+    np.testing.assert_allclose(combined.cxx, whole.cxx, rtol=1e-11)
+    np.testing.assert_allclose(combined.cxy, whole.cxy, rtol=1e-10, atol=1e-10)
+    assert combined.cyy == pytest.approx(whole.cyy, rel=1e-12)
+
+
+@pytest.mark.parametrize("season_year, week", [(2024, 1), (2024, 6), (2025, 2), (2025, 9)])
+def test_asof_fits_match_sklearn_on_the_sliced_corpus(season_year, week):
+    training = _corpus()
+    fits = TrainingEngine(training, fbs_scope=True).fits(season_year, week)
+    sliced = asof_training_slice(training, season_year, week)
+
+    _assert_matches_sklearn(fits.margin, *_decided(sliced))
+    x, y = _residual(sliced, fbs_scope=True)
+    assert fits.residual.rows == len(y)
+    _assert_matches_sklearn(fits.residual, x, y)
+
+
+def test_rank_deficient_corpus_gets_sklearns_minimum_norm_solution():
+    training = _corpus()
+    # A duplicated feature and a constant one: the centered system is
+    # singular, so only the minimum-norm solution is well defined.
+    training["AwayYpp"] = training["HomeYpp"]
+    training["AwayTimePossRatio"] = 0.5
+
+    fits = TrainingEngine(training, fbs_scope=False).fits(2025, 5)
+    _assert_matches_sklearn(fits.margin, *_decided(asof_training_slice(training, 2025, 5)))
+    assert fits.margin.coef[FEATURE_COLS.index("AwayTimePossRatio")] == 0
+
+
+def test_predictions_from_engine_fits_match_refits():
+    training = _corpus()
+    slate = _games(2025, 6, 12, seed=99, completed=False)
+    sliced = asof_training_slice(training, 2025, 6)
+
+    refit = predict_market_prior(sliced, slate, fbs_scope=True)
+    engine = predict_market_prior(sliced, slate, fbs_scope=True,
+                                  fits=TrainingEngine(training, fbs_scope=True).fits(2025, 6))
+
+    assert refit.residual_rows == engine.residual_rows > 0
+    assert engine.residual_std == pytest.approx(refit.residual_std, rel=1e-8)
+    assert engine.mae == pytest.approx(refit.mae, rel=1e-8)
+    pd.testing.assert_frame_equal(engine.predictions, refit.predictions, rtol=1e-8)
+
+
+def _sklearn_walk_forward_std(x: np.ndarray, y: np.ndarray, starts: list[int]) -> float:
+    # The v1.1.1 implementation: a fresh LinearRegression per prefix.
+    bounds = starts[1:] + [len(y)]
+    residuals = [y[begin:end] - LinearRegression().fit(x[:begin], y[:begin]).predict(x[begin:end])
+                 for begin, end in zip(bounds, bounds[1:]) if begin > x.shape[1]]
+    return float(np.std(np.concatenate(residuals)))
+
+
+@pytest.mark.parametrize("folds", [WALK_FORWARD_FOLDS, 3, 8])
+def test_walk_forward_std_matches_per_fold_refits(folds):
+    x, y = _residual(_corpus(), fbs_scope=True)
+
+    expected = _sklearn_walk_forward_std(x, y, fold_starts(len(y), folds))
+
+    assert _walk_forward_residual_std(x, y, folds=folds) == pytest.approx(expected, rel=1e-10)
+
+
+def test_week_aligned_walk_forward_predicts_each_week_from_the_ones_before():
+    corpus = PreparedCorpus.of(_corpus())
+    rows = corpus.residual_rows(fbs_scope=True)
+    x, y, weeks = corpus.features[rows], corpus.residual[rows], corpus.week_number[rows]
+    starts = week_fold_starts(corpus.season_year[rows], weeks)
+
+    assert len(starts) == 24
+    assert all(weeks[start] != weeks[start - 1] for start in starts[1:])
+    assert _walk_forward_residual_std(x, y, starts=starts) == pytest.approx(
+        _sklearn_walk_forward_std(x, y, starts), rel=1e-10)
+
+
+def test_walk_forward_without_a_determined_prefix_is_a_model_error():
+    x, y = _residual(_corpus(), fbs_scope=True)
+
+    with pytest.raises(ModelError, match="no usable folds"):
+        _walk_forward_residual_std(x[:len(FEATURE_COLS) + 5], y[:len(FEATURE_COLS) + 5])
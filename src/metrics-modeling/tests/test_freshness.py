@@ -0,0 +1,227 @@
+"""Run freshness — a publishing run stops when nothing it reads changed
+since the same week's last publish, and says what moved when it runs;
+against the fixture database, that the watermark follows metrics, lines
+and the slate, and that run_week skips, forces and records as it
+should."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import subprocess
+
+import pytest
+
+from helpers import make_config
+from metricbot import MODEL_VERSION, extract, pipeline
+from metricbot.__main__ import main
+from metricbot.config import Config
+from metricbot import freshness
+from metricbot.freshness import WATERMARK_FIELDS, RunRecord, run_fingerprint, run_watermark
+
+WATERMARK = {"Games": 239, "FinalGames": 227, "MaxFinalizedUtc": "2025-10-12T08:00:00.000000Z",
+             "MetricRows": 454, "MaxComputedUtc": "2025-10-12T10:00:00.000000Z",
+             "OddsRows": 300, "MaxOddsUtc": "2025-10-25T07:00:00.000000Z",
+             "OddsDigest": "5b0c1ffd4d2e6a3f1f3c6e0b8b8f7c52",
+             "GroupDigest": "0e6f5d3c1b2a49788a1f5c2e9d7b6a41", "SlateGames": 6,
+             "SlateDigest": "d7e0929841d952947f00bd80c9a7195a"}
+SUMMARY = {"training_rows": 180, "residual_rows": 120, "contests": 6, "mae": 11.5,
+           "residual_std": 13.2}
+
+
+def _config(tmp_path, **overrides) -> Config:
+    return make_config(publish_ledger_dir=tmp_path, **overrides)
+
+
+def test_an_unchanged_week_is_skipped_and_a_moved_one_says_what_moved(tmp_path):
+    record = RunRecord(_config(tmp_path))
+    first = record.check(2025, 6, 5, WATERMARK)
+    assert (first.skipped, first.reason, first.last_run) == (False, "no publish recorded", None)
+
+    record.record(2025, 6, 5, WATERMARK, SUMMARY)
+    again = RunRecord(_config(tmp_path)).check(2025, 6, 5, dict(WATERMARK))
+    assert again.skipped and again.reason.startswith("nothing changed since the publish at ")
+    assert again.last_run["summary"] == SUMMARY and again.last_run["model_version"] == MODEL_VERSION
+
+    moved = record.check(2025, 6, 5, {**WATERMARK, "OddsRows": 301,
+                                      "MaxOddsUtc": "2025-10-26T07:00:00.000000Z"})
+    assert not moved.skipped
+    assert moved.reason == ("moved since the last publish: OddsRows 300 -> 301; MaxOddsUtc "
+                            "'2025-10-25T07:00:00.000000Z' -> '2025-10-26T07:00:00.000000Z'")
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_another_week_tail_or_target_runs_and_force_never_skips(tmp_path):
+    config = _config(tmp_path)
+    RunRecord(config).record(2025, 6, 5, WATERMARK, SUMMARY)
+
+    assert RunRecord(config).check(2025, 7, 5, WATERMARK).reason \
+        == f"the last publish was 2025 wk6 (tail 5, {MODEL_VERSION})"
+    assert not RunRecord(config).check(2025, 6, 0, WATERMARK).skipped
+    staging = RunRecord(dataclasses.replace(config, api_base_url="http://staging"))
+    assert staging.check(2025, 6, 5, WATERMARK).reason == "no publish recorded"
+
+    forced = RunRecord(config).check(2025, 6, 5, WATERMARK, force=True)
+    assert not forced.skipped and forced.reason.startswith("forced; nothing changed")
+
+
+def test_a_code_sql_or_settings_change_reruns_an_unchanged_week(tmp_path, monkeypatch):
+    config = _config(tmp_path)
+    RunRecord(config).record(2025, 6, 5, WATERMARK, SUMMARY)
+    assert RunRecord(config).check(2025, 6, 5, WATERMARK).skipped
+
+    for changed in (dataclasses.replace(config, sql_variant="ranked"),
+                    dataclasses.replace(config, fbs_scope=False),
+                    dataclasses.replace(config, asof_engine="python")):
+        assert run_fingerprint(changed) != run_fingerprint(config)
+        check = RunRecord(changed).check(2025, 6, 5, WATERMARK)
+        assert not check.skipped
+        assert check.reason.startswith("the code, SQL or settings changed since the last publish")
+
+    # An edit to a query the run executes (here the slate's), or to the code.
+    sql_dir = tmp_path / "sql"
+    sql_dir.mkdir()
+    slate = sql_dir / extract.ASOF_WEEK_SQL.name
+    slate.write_bytes(extract.ASOF_WEEK_SQL.read_bytes() + b"\n-- edited\n")
+    monkeypatch.setattr(freshness, "RUN_SQL", tuple(
+        slate if sql_file == extract.ASOF_WEEK_SQL else sql_file for sql_file in freshness.RUN_SQL))
+    assert not RunRecord(config).check(2025, 6, 5, WATERMARK).skipped
+    monkeypatch.undo()
+    package = tmp_path / "metricbot"
+    package.mkdir()
+    for source in freshness.PACKAGE_DIR.glob("*.py"):
+        (package / source.name).write_bytes(source.read_bytes())
+    (package / "model.py").write_bytes((package / "model.py").read_bytes() + b"\n# edited\n")
+    monkeypatch.setattr(freshness, "PACKAGE_DIR", package)
+    assert not RunRecord(config).check(2025, 6, 5, WATERMARK).skipped
+
+    # A record written before the fingerprint existed reruns once.
+    monkeypatch.undo()
+    record = RunRecord(config)
+    last = json.loads(record.path.read_text(encoding="utf-8"))
+    del last["fingerprint"]
+    record.path.write_text(json.dumps(last), encoding="utf-8")
+    assert not record.check(2025, 6, 5, WATERMARK).skipped
+
+
+def test_an_unreadable_record_runs(tmp_path):
+    record = RunRecord(_config(tmp_path))
+    record.record(2025, 6, 5, WATERMARK, SUMMARY)
+    for text in ("{not json", '{"watermark": 1}', "[]"):
+        record.path.write_text(text, encoding="utf-8")
+        assert record.check(2025, 6, 5, WATERMARK).reason == "no publish recorded"
+
+    with pytest.raises(ValueError, match="METRICBOT_PUBLISH_LEDGER_DIR"):
+        RunRecord(dataclasses.replace(_config(tmp_path), publish_ledger_dir=None))
+
+
+def test_profiled_cli_run_skipped_as_unchanged_exits_zero(tmp_path, monkeypatch, capsys):
+    record = RunRecord(_config(tmp_path))
+    record.record(2025, 6, 5, WATERMARK, SUMMARY)
+    freshness = record.check(2025, 6, 5, WATERMARK)
+    skipped = pipeline._skipped_run(freshness, pipeline.datetime.now(pipeline.timezone.utc))
+    monkeypatch.setattr(pipeline, "run_week", lambda **_kwargs: skipped)
+
+    assert main(["run-week", "--season-year", "2025", "--week", "6", "--publish",
+                 "--profile"]) == 0
+    assert f"SKIPPED: {freshness.reason}" in capsys.readouterr().out
+
+
+def _execute(config: Config, sql: str) -> None:
+    args = [arg for arg in extract._psql_args(config) if arg != "--csv"]
+    subprocess.run([*args, "-X", "-q", "-v", "ON_ERROR_STOP=1", "-c", sql],
+                   env=extract._psql_env(config), check=True, capture_output=True, timeout=60)
+
+
+def test_the_watermark_follows_what_a_run_reads(producer_db):
+    watermark = run_watermark(producer_db, 2025, 6)
+    assert list(watermark) == list(WATERMARK_FIELDS)
+    assert watermark["SlateGames"] == 6 and watermark["FinalGames"] <= watermark["Games"]
+    assert watermark["MetricRows"] > 0 and watermark["MaxOddsUtc"].endswith("Z")
+    # A season with no games yet has nothing to take the newest of.
+    assert run_watermark(producer_db, 2021, 1)["MaxComputedUtc"] == ""
+
+    # A line move, then a kickoff move on the slate; each undone after.
+    _execute(producer_db, 'UPDATE public."CompetitionOdds" SET "ModifiedUtc" = \'2030-01-01\' '
+                          'WHERE "Id" = (SELECT min("Id"::text)::uuid FROM public."CompetitionOdds")')
+    try:
+        assert run_watermark(producer_db, 2025, 6)["MaxOddsUtc"] == "2030-01-01T00:00:00.000000Z"
+    finally:
+        _execute(producer_db, 'UPDATE public."CompetitionOdds" odds '
+                              'SET "ModifiedUtc" = con."StartDateUtc" - interval \'1 day\' '
+                              'FROM public."Competition" comp JOIN public."Contest" con '
+                              'ON con."Id" = comp."ContestId" WHERE comp."Id" = odds."CompetitionId"')
+    assert run_watermark(producer_db, 2025, 6) == watermark
+
+    # A spread edited in place (ModifiedUtc untouched), then a team's group.
+    line = ('(SELECT min("Id"::text)::uuid FROM public."CompetitionOdds" '
+            'WHERE "Spread" IS NOT NULL AND "ProviderId" IN (\'58\', \'100\'))')
+    _execute(producer_db, f'UPDATE public."CompetitionOdds" SET "Spread" = "Spread" + 0.5 '
+                          f'WHERE "Id" = {line}')
+    try:
+        edited = run_watermark(producer_db, 2025, 6)
+        assert edited["OddsDigest"] != watermark["OddsDigest"]
+        assert {**edited, "OddsDigest": watermark["OddsDigest"]} == watermark
+    finally:
+        _execute(producer_db, f'UPDATE public."CompetitionOdds" SET "Spread" = "Spread" - 0.5 '
+                              f'WHERE "Id" = {line}')
+    team = ('(SELECT min("HomeTeamFranchiseSeasonId"::text)::uuid FROM public."Contest")')
+    _execute(producer_db, f'UPDATE public."FranchiseSeason" SET "GroupSeasonMap" = '
+                          f'"GroupSeasonMap" || \'-moved\' WHERE "Id" = {team}')
+    try:
+        assert run_watermark(producer_db, 2025, 6)["GroupDigest"] != watermark["GroupDigest"]
+    finally:
+        _execute(producer_db, f'UPDATE public."FranchiseSeason" SET "GroupSeasonMap" = '
+                              f'left("GroupSeasonMap", -6) WHERE "Id" = {team}')
+    assert run_watermark(producer_db, 2025, 6) == watermark
+
+    moved = run_watermark(producer_db, 2025, 7)["SlateDigest"]
+    _execute(producer_db, 'UPDATE public."Contest" SET "StartDateUtc" = "StartDateUtc" + interval '
+                          '\'1 hour\' WHERE "Id" = (SELECT con."Id" FROM public."Contest" con '
+                          'JOIN public."SeasonWeek" sw ON sw."Id" = con."SeasonWeekId" '
+                          'JOIN public."Season" s ON s."Id" = sw."SeasonId" '
+                          'WHERE s."Year" = 2025 AND sw."Number" = 7 ORDER BY con."Id" LIMIT 1)')
+    try:
+        assert run_watermark(producer_db, 2025, 7)["SlateDigest"] != moved
+        assert run_watermark(producer_db, 2025, 6) == watermark
+    finally:
+        _execute(producer_db, 'UPDATE public."Contest" SET "StartDateUtc" = "StartDateUtc" - interval '
+                              '\'1 hour\' WHERE "Id" = (SELECT con."Id" FROM public."Contest" con '
+                              'JOIN public."SeasonWeek" sw ON sw."Id" = con."SeasonWeekId" '
+                              'JOIN public."Season" s ON s."Id" = sw."SeasonId" '
+                              'WHERE s."Year" = 2025 AND sw."Number" = 7 ORDER BY con."Id" LIMIT 1)')
+    assert run_watermark(producer_db, 2025, 7)["SlateDigest"] == moved
+
+
+def test_run_week_skips_an_unchanged_week_until_forced(producer_db, tmp_path, monkeypatch):
+    config = dataclasses.replace(producer_db, publish_ledger_dir=tmp_path)
+    monkeypatch.setattr(pipeline.Config, "load", staticmethod(lambda _sport: config))
+    posted = []
+    monkeypatch.setattr(pipeline, "post_predictions", lambda _config, dtos: posted.append(len(dtos)))
+
+    def run(prior_tail: int = 5, **kwargs) -> pipeline.RunResult:
+        return pipeline.run_week("FootballNcaa", dry_run=False, dump_intermediate=False,
+                                 season_year=2025, week=6, prior_tail=prior_tail, publish=True,
+                                 return_result=True, **kwargs)
+
+    first = run()
+    assert (first.freshness.skipped, first.freshness.reason) == (False, "no publish recorded")
+    assert first.published and posted == [len(first.dtos)]
+
+    second = run()
+    assert second.freshness.skipped and second.timeline is None and not second.published
+    assert len(second.dtos) == 0 and len(posted) == 1
+    assert (second.season_year, second.week, second.training_rows, second.contests) \
+        == (2025, 6, first.training_rows, first.contests)
+    assert second.mae == pytest.approx(first.mae)
+
+    # Forced: the full run, and the publish ledger finds nothing to send.
+    forced = run(force=True)
+    assert not forced.freshness.skipped and forced.freshness.reason.startswith("forced;")
+    assert forced.timeline is not None and len(posted) == 1
+
+    # Another tail is another run; a dry run is never checked.
+    assert not run(prior_tail=0).freshness.skipped
+    assert pipeline.run_week("FootballNcaa", dry_run=True, dump_intermediate=False,
+                             season_year=2025, week=6, publish=True,
+                             return_result=True).freshness is None
@@ -0,0 +1,72 @@
+"""Start-up budget: the CLI's argument parsing and the service's /health
+must not import the numerical stack (pandas, numpy, scipy, sklearn —
+over half a second), and what metricbot's own modules cost to import
+stays under a fixed budget. Measured in a fresh interpreter with
+`python -X importtime`."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("pandas", "numpy", "scipy", "sklearn", "pyarrow", "psycopg")
+
+# Milliseconds, the summed self time of metricbot.* modules — stdlib,
+# fastapi and pydantic are someone else's cost and their jitter is not
+# ours. Several times what they measure on a laptop, best of three runs:
+# the budget catches a module doing real work at import, not a busy agent.
+CLI_BUDGET_MS = 150
+SERVICE_BUDGET_MS = 250
+RUNS = 3
+
+
+def _import_times(script: str) -> dict[str, float]:
+    """Module -> self import milliseconds for `script`."""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", script],
+                               cwd=PACKAGE_ROOT, capture_output=True, text=True, check=True,
+                               timeout=60)
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _cumulative, module = line.removeprefix("import time:").split("|")
+        times[module.strip()] = int(self_us) / 1000
+    return times
+
+
+def _metricbot_ms(times: dict[str, float]) -> float:
+    return sum(ms for module, ms in times.items()
+               if module == "metricbot" or module.startswith("metricbot."))
+
+
+def _best_of(script: str) -> tuple[dict[str, float], float]:
+    """The run with the least metricbot self time, and that time."""
+    runs = [_import_times(script) for _ in range(RUNS)]
+    best = min(runs, key=_metricbot_ms)
+    return best, _metricbot_ms(best)
+
+
+def test_cli_argument_parsing_skips_the_numerical_stack():
+    times, metricbot_ms = _best_of(
+        "from metricbot.__main__ import main\n"
+        "try:\n"
+        "    main(['backtest', '--help'])\n"
+        "except SystemExit:\n"
+        "    pass\n")
+
+    assert [module for module in HEAVY if module in times] == []
+    assert metricbot_ms < CLI_BUDGET_MS
+
+
+def test_service_health_skips_the_numerical_stack():
+    pytest.importorskip("fastapi")
+    times, metricbot_ms = _best_of(
+        "from metricbot import service\n"
+        "assert service.health()['status'] == 'healthy'\n")
+
+    assert [module for module in HEAVY if module in times] == []
+    assert metricbot_ms < SERVICE_BUDGET_MS
@@ -0,0 +1,204 @@
+"""Job mode — the store's bounds, progress and failure mapping offline
+with stand-in runs; against the fixture database, a queued backtest
+returns exactly what POST /backtest does."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from metricbot import pipeline
+from metricbot.extract import ExtractionError
+from metricbot.jobs import JobQueueFull, JobStore
+from metricbot.stages import StageGraph
+
+
+def _wait(store: JobStore, job_id: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while (job := store.get(job_id)).status in ("queued", "running"):
+        assert time.monotonic() < deadline, f"job {job_id} still {job.status}"
+        time.sleep(0.01)
+    return job
+
+
+def test_job_reports_its_stages_while_running_then_its_result():
+    store = JobStore(workers=1)
+    release = threading.Event()
+
+    def run():
+        graph = StageGraph()
+        graph.add("training", lambda: "corpus")
+        graph.add("slate", lambda: release.wait(10) and "slate")
+        graph.add("predict", lambda training, slate: f"{training}+{slate}",
+                  after=("training", "slate"))
+        return graph.run(workers=2)[0]["predict"]
+
+    job = store.submit("backtest", "FootballNcaa", run)
+    assert job.status == "queued" and job.result is None
+    deadline = time.monotonic() + 10
+    while {stage.name: stage.status for stage in store.get(job.id).stages} \
+            != {"training": "done", "slate": "running"}:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    assert store.get(job.id).status == "running"
+
+    release.set()
+    done = _wait(store, job.id)
+    assert (done.status, done.result, done.error) == ("succeeded", "corpus+slate", None)
+    assert [stage.name for stage in done.stages][-1] == "predict"
+    assert all(stage.status == "done" for stage in done.stages)
+    assert done.submitted_utc <= done.started_utc <= done.finished_utc
+    store.close()
+
+
+def test_failures_carry_the_synchronous_status_code():
+    store = JobStore()
+
+    def config_error():
+        raise SystemExit("METRICBOT_PG_HOST is not set.")
+
+    def extraction_error():
+        raise ExtractionError("competition_metrics_asof_week.sql returned zero rows")
+
+    bad_config = _wait(store, store.submit("run-week", "FootballNcaa", config_error).id)
+    failed = _wait(store, store.submit("run-week", "FootballNcaa", extraction_error).id)
+
+    assert (bad_config.status, bad_config.error_status) == ("failed", 400)
+    assert bad_config.error == "METRICBOT_PG_HOST is not set."
+    assert (failed.status, failed.error_status) == ("failed", 500)
+    assert failed.error.startswith("ExtractionError: competition_metrics_asof_week.sql")
+    store.close()
+
+
+def test_a_failed_job_leaves_no_stage_running():
+    store = JobStore(workers=1)
+
+    def run():
+        graph = StageGraph()
+        graph.add("training", lambda: "corpus")
+        graph.add("slate", _raise(ExtractionError("competition_metrics_asof_week.sql timed out")))
+        graph.add("predict", lambda training, slate: "never", after=("training", "slate"))
+        return graph.run(workers=2)[0]["predict"]
+
+    failed = _wait(store, store.submit("backtest", "FootballNcaa", run).id)
+
+    assert failed.status == "failed"
+    assert {stage.name: stage.status for stage in failed.stages} \
+        == {"training": "done", "slate": "failed"}
+    store.close()
+
+
+def test_a_job_failed_in_a_stage_is_served_with_its_failed_stage(monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from metricbot import service
+
+    monkeypatch.setattr(service, "jobs", JobStore(workers=1))
+
+    def run():
+        graph = StageGraph()
+        graph.add("training", lambda: "corpus")
+        graph.add("slate", _raise(ExtractionError("competition_metrics_asof_week.sql timed out")),
+                  after=("training",))
+        return graph.run(workers=1)[0]["slate"]
+
+    job = _wait(service.jobs, service.jobs.submit("backtest", "FootballNcaa", run).id)
+    response = TestClient(service.app).get(f"/jobs/{job.id}")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["status"], body["error_status"]) == ("failed", 500)
+    assert {stage["name"]: stage["status"] for stage in body["stages"]} \
+        == {"training": "done", "slate": "failed"}
+    service.jobs.close()
+
+
+def _raise(ex: Exception):
+    def run(*_inputs):
+        raise ex
+    return run
+
+
+def test_queue_is_bounded_and_finished_jobs_are_evicted_oldest_first():
+    store = JobStore(workers=1, queue_limit=2, retention=2)
+    release = threading.Event()
+    blocked = store.submit("backtest", "FootballNcaa", lambda: release.wait(10))
+    queued = store.submit("backtest", "FootballNcaa", lambda: "second")
+
+    with pytest.raises(JobQueueFull, match="limit 2"):
+        store.submit("backtest", "FootballNcaa", lambda: "third")
+
+    release.set()
+    _wait(store, queued.id)
+    finished = [_wait(store, store.submit("backtest", "FootballNcaa", lambda i=i: i).id)
+                for i in range(2)]
+    # Two retained: the two latest; the first two were evicted.
+    assert store.get(blocked.id) is None and store.get(queued.id) is None
+    assert [store.get(job.id).result for job in finished] == [0, 1]
+    store.close()
+
+
+def test_close_fails_the_queued_jobs():
+    store = JobStore(workers=1)
+    release = threading.Event()
+    running = store.submit("backtest", "FootballNcaa", lambda: release.wait(10))
+    while store.get(running.id).status == "queued":
+        time.sleep(0.01)
+    queued = store.submit("backtest", "FootballNcaa", lambda: "never")
+
+    store.close()
+    release.set()
+
+    assert (store.get(queued.id).status, store.get(queued.id).error_status) == ("failed", 503)
+    assert _wait(store, running.id).status == "succeeded"
+
+
+def test_queued_backtest_returns_the_synchronous_response(producer_db, monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from metricbot import service
+
+    monkeypatch.setattr(pipeline.Config, "load", staticmethod(lambda _sport: producer_db))
+    monkeypatch.setattr(service, "jobs", JobStore())
+    client = TestClient(service.app)
+    body = {"season_year": 2025, "week": 6, "prior_season_tail": 5}
+
+    submitted = client.post("/jobs/backtest", json=body)
+    assert submitted.status_code == 202 and submitted.json()["status"] in ("queued", "running")
+    job = _wait(service.jobs, submitted.json()["id"])
+    polled = client.get(f"/jobs/{job.id}").json()
+    expected = client.post("/backtest", json=body).json()
+
+    assert polled["status"] == "succeeded"
+    assert {stage["name"] for stage in polled["stages"]} \
+        == {"training", "slate", "scores", "fit", "validate", "predict", "grade"}
+    assert polled["result"]["grade"] == expected["grade"]
+    assert polled["result"]["training_rows"] == expected["training_rows"]
+    assert client.get("/jobs/unknown").status_code == 404
+    assert client.post("/jobs/run-week", json={"week": 6}).status_code == 400
+    service.jobs.close()
+
+
+def test_job_endpoints_are_off_behind_several_workers():
+    pytest.importorskip("fastapi")
+    routes = "from metricbot import service\nprint(sorted(route.path for route in service.app.routes))"
+    paths = {}
+    for workers in ("1", "2"):
+        completed = subprocess.run([sys.executable, "-c", routes],
+                                   cwd=Path(__file__).resolve().parent.parent,
+                                   env={**os.environ, "WEB_CONCURRENCY": workers},
+                                   capture_output=True, text=True, check=True, timeout=60)
+        paths[workers] = completed.stdout
+
+    assert "/jobs/{job_id}" in paths["1"] and "/jobs/backtest" in paths["1"]
+    assert "/jobs" not in paths["2"] and "/backtest" in paths["2"]
@@ -0,0 +1,93 @@
+"""Publish ledger — a re-run sends whole contests, and only those with a
+changed, new or removed row; the record follows what the API holds, and
+a ledger for another target or an unreadable one diffs as new."""
+
+from __future__ import annotations
+
+import dataclasses
+
+import pytest
+
+from helpers import make_config
+from metricbot.config import Config
+from metricbot.ledger import PublishLedger
+
+
+def _config(tmp_path, **overrides) -> Config:
+    return make_config(publish_ledger_dir=tmp_path, **overrides)
+
+
+def _dto(contest: str, prediction_type: int, probability: float) -> dict:
+    return {"ContestId": contest, "WinnerFranchiseSeasonId": f"home-{contest}",
+            "WinProbability": probability, "PredictionType": prediction_type,
+            "ModelVersion": "v1.1"}
+
+
+WEEK = [_dto("a", 1, 0.61), _dto("a", 2, 0.52), _dto("b", 1, 0.44), _dto("b", 2, 0.48),
+        _dto("c", 1, 0.70)]
+
+
+def test_first_publish_sends_everything(tmp_path):
+    diff = PublishLedger(_config(tmp_path), 2025, 6).diff(WEEK)
+
+    assert (diff.unchanged, diff.changed, diff.new, diff.removed) == (0, 0, 5, 0)
+    assert list(diff.dtos) == WEEK
+
+
+def test_rerun_sends_only_whole_changed_contests(tmp_path):
+    ledger = PublishLedger(_config(tmp_path), 2025, 6)
+    ledger.record(WEEK)
+    assert len(PublishLedger(_config(tmp_path), 2025, 6).diff(WEEK).dtos) == 0
+
+    # a's ATS moved; b lost its line; d is new.
+    rerun = [_dto("a", 1, 0.61), _dto("a", 2, 0.5301), _dto("b", 1, 0.44), _dto("c", 1, 0.70),
+             _dto("d", 1, 0.55)]
+    diff = ledger.diff(rerun)
+
+    assert (diff.unchanged, diff.changed, diff.new, diff.removed) == (3, 1, 1, 1)
+    # a goes out with its unchanged SU row: the API replaces contests whole.
+    assert list(diff.dtos) == [rerun[0], rerun[1], rerun[2], rerun[4]]
+    assert diff.contests == 3
+
+
+def test_record_replaces_sent_contests_and_keeps_the_rest(tmp_path):
+    ledger = PublishLedger(_config(tmp_path), 2025, 6)
+    ledger.record(WEEK)
+    ledger.record([_dto("b", 1, 0.45)])
+
+    # b's pulled ATS row is gone from the record; a and c are untouched
+    # though this publish did not carry them.
+    diff = ledger.diff(WEEK)
+    assert (diff.unchanged, diff.changed, diff.new, diff.removed) == (3, 1, 1, 0)
+    assert {dto["ContestId"] for dto in diff.dtos} == {"b"}
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_other_weeks_targets_and_unreadable_ledgers_diff_as_new(tmp_path):
+    config = _config(tmp_path)
+    ledger = PublishLedger(config, 2025, 6)
+    ledger.record(WEEK)
+
+    for other in (PublishLedger(config, 2025, 7),
+                  PublishLedger(dataclasses.replace(config, api_base_url="http://staging"), 2025, 6),
+                  PublishLedger(dataclasses.replace(config, metricbot_user_id="someone"), 2025, 6)):
+        assert other.diff(WEEK).new == len(WEEK)
+
+    ledger.path.write_text("{not json", encoding="utf-8")
+    assert ledger.diff(WEEK).new == len(WEEK)
+
+
+def test_ledger_directory_is_opt_in(monkeypatch, tmp_path):
+    for name, value in {"METRICBOT_PG_HOST": "h", "METRICBOT_PG_USER": "u",
+                        "METRICBOT_PG_PASSWORD": "p", "METRICBOT_API_BASE_URL": "http://api",
+                        "METRICBOT_ADMIN_TOKEN": "t"}.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv("METRICBOT_PUBLISH_LEDGER_DIR", raising=False)
+    assert Config.load("FootballNcaa").publish_ledger_dir is None
+
+    monkeypatch.setenv("METRICBOT_PUBLISH_LEDGER_DIR", str(tmp_path))
+    assert Config.load("FootballNcaa").publish_ledger_dir == tmp_path
+    monkeypatch.setenv("METRICBOT_PUBLISH_LEDGER_DIR", "off")
+    assert Config.load("FootballNcaa").publish_ledger_dir is None
+    with pytest.raises(ValueError, match="METRICBOT_PUBLISH_LEDGER_DIR"):
+        PublishLedger(Config.load("FootballNcaa"), 2025, 6)
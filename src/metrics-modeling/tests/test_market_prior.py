@@ -5,11 +5,12 @@ from __future__ import annotations
 
 import numpy as np
 import pandas as pd
+from scipy.stats import norm
 
 from metricbot import MODEL_VERSION
 from metricbot.dtos import PICKTYPE_ATS, PICKTYPE_STRAIGHT_UP, build_prediction_dtos
-from metricbot.model import (FEATURE_COLS, MIN_RESIDUAL_ROWS, is_priced,
-                             predict_market_prior)
+from metricbot.model import (FEATURE_COLS, MIN_RESIDUAL_ROWS, PreparedCorpus,
+                             is_priced, predict_market_prior, score_slate)
 
 
 def _frame(rows: int, completed: bool, seed: int = 42,
@@ -179,3 +180,65 @@ def test_probability_scale_is_out_of_sample_not_fit_std():
     assert result.residual_model_std is not None
     assert result.residual_model_std > fit_std
     assert 2.9 <= result.residual_model_std <= 3.6
+
+
+def test_prepared_corpus_is_chronological_and_asof_is_a_prefix_view():
+    training = _training()
+    training["SeasonYear"] = np.where(np.arange(len(training)) % 3 == 0, 2025, 2024)
+    training["WeekNumber"] = np.arange(len(training)) % 7 + 1
+    training.loc[:5, FEATURE_COLS[:3]] = np.nan
+
+    corpus = PreparedCorpus.of(training)
+    sliced = corpus.asof(2025, 4)
+
+    keys = corpus.season_year * 100 + corpus.week_number
+    assert (np.diff(keys) >= 0).all()
+    assert corpus.features.flags["C_CONTIGUOUS"] and not np.isnan(corpus.features).any()
+    assert np.shares_memory(sliced.features, corpus.features)
+    expected = PreparedCorpus.of(training[(training["SeasonYear"] < 2025)
+                                          | (training["WeekNumber"] < 4)])
+    np.testing.assert_array_equal(sliced.features, expected.features)
+    np.testing.assert_array_equal(sliced.residual_rows(True), expected.residual_rows(True))
+
+
+def test_prepared_corpus_predicts_exactly_like_the_frame():
+    slate = _frame(6, completed=False, seed=15, spread=True)
+    training = _training()
+
+    from_frame = predict_market_prior(training, slate, fbs_scope=True)
+    from_prepared = predict_market_prior(PreparedCorpus.of(training), slate, fbs_scope=True)
+
+    pd.testing.assert_frame_equal(from_prepared.predictions, from_frame.predictions, check_exact=True)
+    assert from_prepared.residual_model_std == from_frame.residual_model_std
+
+
+def test_slate_kernel_is_the_norm_sf_math_bit_for_bit():
+    rng = np.random.default_rng(11)
+    su_margin = np.concatenate([rng.normal(scale=14, size=500), [0.0, -0.0, 80.0, -80.0]])
+    spread = rng.normal(scale=7, size=len(su_margin)).round(1)
+    spread[rng.random(len(spread)) < 0.3] = np.nan
+    spread[:3] = 0.0
+    priced = ~np.isnan(spread)
+    corr = rng.normal(scale=3, size=priced.sum())
+
+    columns = score_slate(su_margin, spread, 15.5, corr, 16.25)
+
+    su_win = norm.sf(0, loc=su_margin, scale=15.5).clip(0.01, 0.99)
+    margin = su_margin.copy()
+    margin[priced] = -spread[priced] + corr
+    win = su_win.copy()
+    win[priced] = norm.sf(0, loc=margin[priced], scale=16.25).clip(0.01, 0.99)
+    home = norm.sf(0, loc=su_margin + spread, scale=15.5).clip(0.01, 0.99)
+    home[priced] = norm.sf(0, loc=corr, scale=16.25).clip(0.01, 0.99)
+    away = norm.sf(0, loc=-(su_margin + spread), scale=15.5).clip(0.01, 0.99)
+    away[priced] = norm.sf(0, loc=-corr, scale=16.25).clip(0.01, 0.99)
+
+    np.testing.assert_array_equal(columns["PredictedMargin"], margin)
+    np.testing.assert_array_equal(columns["WinProbability"], win)
+    np.testing.assert_array_equal(columns["HomeCoverProbability"], home)
+    np.testing.assert_array_equal(columns["AwayCoverProbability"], away)
+    # The label stays the pure model's call even where the residual path
+    # moved the probability.
+    np.testing.assert_array_equal(columns["PredictedLabel"], (su_win > 0.5).astype(int))
+    np.testing.assert_array_equal(columns["AtsPredictedLabel"], (home > away).astype(int))
+    assert list(columns["ModelPath"]) == ["residual" if p else "fallback" for p in priced]
@@ -0,0 +1,196 @@
+"""Prometheus exposition — the service's families, request tracking and
+the per-run stage profile, offline, read back through prometheus_client's
+own text-format parser. The families are process-wide, so each test
+labels its series with its own sport."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+prometheus_client = pytest.importorskip("prometheus_client")
+
+from prometheus_client.parser import text_string_to_metric_families  # noqa: E402
+
+from metricbot import MODEL_VERSION, metrics  # noqa: E402
+from metricbot.api import PublishError  # noqa: E402
+from metricbot.extract import ExtractionError, ExtractionTimeout, QueryStats  # noqa: E402
+from metricbot.stages import StageTimeline, StageTiming  # noqa: E402
+
+PACKAGE_ROOT = Path(__file__).resolve().parent.parent
+
+# One uvicorn worker's share of a request, in its own process.
+WORKER = """
+from metricbot import metrics
+metrics.BACKTEST_CACHE.inc("PodSport", "hit")
+metrics.REQUEST_SECONDS.observe("PodSport", "/backtest", "ok", value=1.5)
+metrics.TRAINING_ROWS.set("PodSport", "/backtest", value={rows})
+metrics.IN_FLIGHT.inc("PodSport", "/backtest")
+if {retire}:
+    metrics.retire_process()
+"""
+
+
+def _samples(text: str) -> dict[str, list]:
+    """Parsed exposition: family name -> its samples."""
+    return {family.name: family.samples for family in text_string_to_metric_families(text)}
+
+
+def _series(name: str, sport: str) -> dict[str, float]:
+    """The samples named `name` for one sport, keyed by the labels
+    beyond sport and model_version ("k=v,..." — "" when there are none)."""
+    series = {}
+    for samples in _samples(metrics.render()).values():
+        for sample in samples:
+            labels = dict(sample.labels)
+            if sample.name != name or labels.pop("sport", None) != sport:
+                continue
+            assert labels.pop("model_version") == MODEL_VERSION
+            series[",".join(f"{key}={value}" for key, value in sorted(labels.items()))] \
+                = sample.value
+    return series
+
+
+def test_histogram_exposes_cumulative_buckets_sum_and_count():
+    registry = prometheus_client.CollectorRegistry()
+    histogram = metrics.Histogram("test_seconds", "A test histogram.", ("stage",), (0.1, 1),
+                                  registry=registry)
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe("Curling", "fit", value=value)
+
+    [family] = text_string_to_metric_families(prometheus_client.generate_latest(registry)
+                                              .decode("utf-8"))
+    assert (family.name, family.type, family.documentation) \
+        == ("test_seconds", "histogram", "A test histogram.")
+    labels = {"sport": "Curling", "model_version": MODEL_VERSION, "stage": "fit"}
+    assert [(sample.name, sample.labels, sample.value) for sample in family.samples] == [
+        ("test_seconds_bucket", {**labels, "le": "0.1"}, 2),
+        ("test_seconds_bucket", {**labels, "le": "1.0"}, 3),
+        ("test_seconds_bucket", {**labels, "le": "+Inf"}, 4),
+        ("test_seconds_count", labels, 4),
+        ("test_seconds_sum", labels, pytest.approx(3.65)),
+    ]
+
+
+def test_label_values_round_trip_and_label_counts_are_checked():
+    registry = prometheus_client.CollectorRegistry()
+    counter = metrics.Counter("test_total", "A test counter.", ("sql_file",), registry=registry)
+    odd = 'odd "name"\\\n'
+    counter.inc("Curling", odd)
+    counter.inc("Curling", odd, amount=2)
+
+    [family] = text_string_to_metric_families(prometheus_client.generate_latest(registry)
+                                              .decode("utf-8"))
+    assert family.type == "counter"
+    assert [(sample.name, sample.labels["sql_file"], sample.value) for sample in family.samples] \
+        == [("test_total", odd, 3)]
+    assert counter.value("Curling", odd) == 3 and counter.value("Curling", "other") == 0
+    with pytest.raises(ValueError, match="takes labels"):
+        counter.inc("Curling")
+
+
+def test_every_family_parses_with_its_declared_type():
+    for family in metrics.FAMILIES:
+        labels = ["x"] * (len(family.labels) - 2)
+        if isinstance(family, metrics.Histogram):
+            family.observe("ParseSport", *labels, value=0.2)
+        elif isinstance(family, metrics.Gauge):
+            family.set("ParseSport", *labels, value=1)
+        else:
+            family.inc("ParseSport", *labels)
+
+    parsed = {family.name: family.type
+              for family in text_string_to_metric_families(metrics.render())}
+    # The parser names a counter without its _total suffix.
+    assert parsed == {family.name.removesuffix("_total"): type(family).__name__.lower()
+                      for family in metrics.FAMILIES}
+
+
+def test_tracking_counts_in_flight_latency_and_failures_by_kind():
+    sport = "TrackingSport"
+    with metrics.tracking("/run-week", sport):
+        assert _series("metricbot_runs_in_flight", sport) == {"endpoint=/run-week": 1}
+    for ex in (ExtractionTimeout("timed out"), ExtractionError("zero rows"),
+               ExtractionError("psql failed"), PublishError("502")):
+        with pytest.raises(type(ex)), metrics.tracking("/run-week", sport):
+            raise ex
+
+    assert _series("metricbot_runs_in_flight", sport) == {"endpoint=/run-week": 0}
+    assert _series("metricbot_request_seconds_count", sport) \
+        == {"endpoint=/run-week,outcome=ok": 1, "endpoint=/run-week,outcome=error": 4}
+    assert metrics.PSQL_TIMEOUTS.value(sport) == 1
+    assert metrics.PSQL_FAILURES.value(sport) == 2
+    assert metrics.PUBLISH_ERRORS.value(sport) == 1
+
+
+def test_record_run_observes_stages_queries_and_the_cache_hit_ratio():
+    sport = "RecordSport"
+    training = QueryStats("competition_metrics_asof_training.sql", "psql", 900, 4096, 0.8)
+    slate = QueryStats("competition_metrics_asof_week.sql", "psql", 40, 512, 0.2)
+    timeline = StageTimeline(stages=[
+        StageTiming("training", (), 0.0, 0.9, rows_out=900, query_stats=(training,),
+                    cache_hits=3, cache_misses=1),
+        StageTiming("slate wk4", (), 0.0, 0.3, rows_out=40, query_stats=(slate,)),
+        StageTiming("slate wk5", (), 0.3, 0.6, rows_out=45, query_stats=(slate,)),
+        StageTiming("sweep", ("training", "slate wk4", "slate wk5"), 0.9, 1.5),
+    ], critical_path=["training", "sweep"])
+
+    metrics.record_run("/backtest/season", sport, 900, 120, None, timeline)
+
+    assert _series("metricbot_stage_seconds_count", sport) \
+        == {"stage=training": 1, "stage=slate": 2, "stage=sweep": 1}
+    assert _series("metricbot_extract_seconds_count", sport) \
+        == {"sql_file=competition_metrics_asof_training.sql": 1,
+            "sql_file=competition_metrics_asof_week.sql": 2}
+    assert _series("metricbot_slate_contests", sport) == {"endpoint=/backtest/season": 85}
+    assert _series("metricbot_residual_rows", sport) == {"endpoint=/backtest/season": 120}
+    assert _series("metricbot_cache_hit_ratio", sport) == {"": 0.75}
+
+    # The ratio is cumulative across runs.
+    metrics.record_run("/backtest", sport, 900, 120, 40, StageTimeline(
+        stages=[StageTiming("training", (), 0.0, 0.1, cache_misses=4)], critical_path=["training"]))
+    assert _series("metricbot_cache_hit_ratio", sport) == {"": 0.375}
+
+
+def test_metrics_endpoint_serves_the_text_format():
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from metricbot.service import app
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == metrics.CONTENT_TYPE
+    assert "metricbot_request_seconds" in _samples(response.text)
+
+
+def test_workers_are_scraped_as_one_pod(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+
+    def run(script: str) -> str:
+        return subprocess.run([sys.executable, "-c", script], cwd=PACKAGE_ROOT, env=env,
+                              capture_output=True, text=True, check=True, timeout=60).stdout
+
+    run(WORKER.format(rows=100, retire=False))
+    run(WORKER.format(rows=200, retire=True))
+    scraped = _samples(run("from metricbot import metrics\nprint(metrics.render())"))
+
+    def value(name: str) -> float:
+        [sample] = [sample for samples in scraped.values() for sample in samples
+                    if sample.name == name and sample.labels.get("sport") == "PodSport"
+                    and sample.labels.get("le") is None]
+        return sample.value
+
+    # Counters and histograms sum over the workers; the last-run gauge is
+    # the latest write; in-flight counts only workers that did not retire.
+    assert value("metricbot_backtest_cache_total") == 2
+    assert value("metricbot_request_seconds_count") == 2
+    assert value("metricbot_request_seconds_sum") == 3.0
+    assert value("metricbot_training_rows") == 200
+    assert value("metricbot_runs_in_flight") == 1
@@ -8,11 +8,13 @@ real database; that's integration territory).
 
 from __future__ import annotations
 
+import json
+
 import numpy as np
 import pandas as pd
 import pytest
 
-from metricbot import MODEL_VERSION
+from metricbot import MODEL_VERSION, api
 from metricbot.config import Config, normalize_sport
 from metricbot.dtos import PICKTYPE_ATS, PICKTYPE_STRAIGHT_UP, build_prediction_dtos
 from metricbot.model import FEATURE_COLS, ModelError, predict_ats, predict_straight_up
@@ -92,6 +94,33 @@ def test_dtos_match_the_ingestion_contract():
         assert dto["WinnerFranchiseSeasonId"].startswith("home-")
 
 
+def test_dtos_encode_once_to_the_same_bytes_with_or_without_orjson(monkeypatch):
+    from metricbot.service import RunWeekResponse, _response_with_dtos
+
+    predictions = predict_ats(predict_straight_up(_frame(200, completed=True),
+                                                  _frame(9, completed=False)))
+    predictions.loc[predictions.index[::3], "Spread"] = np.nan
+    dtos = build_prediction_dtos(predictions)
+
+    # The per-row builder's records, in its order: SU, then priced ATS.
+    expected = [(row.ContestId, round(float(row.WinProbability), 4), PICKTYPE_STRAIGHT_UP)
+                for row in predictions.itertuples()]
+    expected += [(row.ContestId, round(float(row.HomeCoverProbability), 4), PICKTYPE_ATS)
+                 for row in predictions.itertuples() if not np.isnan(row.Spread)]
+    assert [(d["ContestId"], d["WinProbability"], d["PredictionType"]) for d in dtos] == expected
+
+    assert json.loads(dtos.encoded) == list(dtos)
+    assert dtos.encoded is dtos.encoded
+    monkeypatch.setattr(api, "orjson", None)
+    assert api.encode_dtos(list(dtos)) == dtos.encoded
+
+    response = RunWeekResponse(model_version=MODEL_VERSION, sport="FootballNcaa", season_year=2025,
+                               week=6, prior_season_tail=0, training_rows=200, contests=9, mae=1.0,
+                               residual_std=2.0, published=False, elapsed_seconds=0.5)
+    body = json.loads(_response_with_dtos(response, dtos).body)
+    assert body == {**response.model_dump(), "dtos": list(dtos)}
+
+
 def test_config_rejects_unknown_sport():
     with pytest.raises(SystemExit):
         Config.load("cricket")
@@ -0,0 +1,125 @@
+"""Ranked extraction SQL (sql/ranked, METRICBOT_SQL_VARIANT=ranked) —
+which file each variant runs, offline; and against the fixture database,
+that every ranked twin returns its spec file's rows exactly, that the
+producer index DDL applies (and re-applies), and that `metricbot explain`
+captures a plan for every query."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import subprocess
+
+import pandas as pd
+import pytest
+
+from helpers import make_config
+from metricbot import extract
+from metricbot.config import Config
+from metricbot.explain import explain_queries, query_variables
+from metricbot.schema import schema_for
+
+RANKED = sorted(extract.RANKED_SQL_DIR.glob("*.sql"))
+PRODUCER_INDEXES_SQL = extract.SQL_DIR / "ddl" / "producer_indexes.sql"
+
+
+def test_ranked_files_are_twins_of_spec_files():
+    assert RANKED
+    for ranked in RANKED:
+        spec = extract.SQL_DIR / ranked.name
+        assert spec.is_file(), ranked.name
+        assert schema_for(ranked) is schema_for(spec)
+        assert f"sql/{ranked.name}" in ranked.read_text(encoding="utf-8")
+
+
+def test_sql_variant_picks_the_ranked_twin_or_falls_back():
+    spec, ranked = make_config(), make_config(sql_variant="ranked")
+    for sql_file in query_variables(2025, 6, 5, True):
+        assert extract.sql_file_for(spec, sql_file) == sql_file
+        twin = extract.RANKED_SQL_DIR / sql_file.name
+        assert extract.sql_file_for(ranked, sql_file) == (twin if twin in RANKED else sql_file)
+    # Single-week and single-season files have no twin: the spec plan wins there.
+    assert extract.sql_file_for(ranked, extract.ASOF_WEEK_SQL) == extract.ASOF_WEEK_SQL
+
+
+def test_sql_variant_setting(monkeypatch):
+    for name, value in {"METRICBOT_PG_HOST": "h", "METRICBOT_PG_USER": "u",
+                        "METRICBOT_PG_PASSWORD": "p", "METRICBOT_API_BASE_URL": "http://api",
+                        "METRICBOT_ADMIN_TOKEN": "t"}.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv("METRICBOT_SQL_VARIANT", raising=False)
+    assert Config.load("FootballNcaa").sql_variant == "spec"
+
+    monkeypatch.setenv("METRICBOT_SQL_VARIANT", "Ranked")
+    assert Config.load("FootballNcaa").sql_variant == "ranked"
+    monkeypatch.setenv("METRICBOT_SQL_VARIANT", "fast")
+    with pytest.raises(SystemExit, match="METRICBOT_SQL_VARIANT"):
+        Config.load("FootballNcaa")
+
+
+@pytest.mark.parametrize("sql_file, variables", [
+    (extract.TRAINING_SQL, {}),
+    (extract.ASOF_TRAINING_SQL, {"season_year": 2025, "week": 1}),
+    (extract.ASOF_TRAINING_SQL, {"season_year": 2025, "week": 6}),
+    (extract.ASOF_TRAINING_SQL, {"season_year": 2024, "week": 11}),
+    (extract.TEAM_GAMES_SQL, {"season_year": 2025}),
+    (extract.TEAM_GAMES_SQL, {"season_year": 2024}),
+])
+def test_ranked_sql_returns_the_spec_rows(producer_db, sql_file, variables):
+    expected = extract._run_query(producer_db, sql_file, variables)
+    frame = extract._run_query(dataclasses.replace(producer_db, sql_variant="ranked"),
+                               sql_file, variables)
+
+    assert len(expected) and list(frame.columns) == list(expected.columns)
+    if sql_file != extract.TEAM_GAMES_SQL:  # unordered; windows.py sorts its games
+        # Both honour the file's ORDER BY; ties within a week are Postgres's to order.
+        order = ["SeasonYear", "WeekNumber"] if "SeasonYear" in frame else ["WeekNumber"]
+        assert frame[order].equals(expected[order])
+    keys = [key for key in ("ContestId", "FranchiseSeasonId") if key in frame]
+    pd.testing.assert_frame_equal(frame.sort_values(keys).reset_index(drop=True),
+                                  expected.sort_values(keys).reset_index(drop=True))
+
+
+def test_producer_index_ddl_applies_and_reapplies(producer_db):
+    variables = {"season_year": 2025}
+    before = extract._run_query(producer_db, extract.TEAM_GAMES_SQL, variables)
+    args = [arg for arg in extract._psql_args(producer_db) if arg != "--csv"]
+    for _ in range(2):
+        result = subprocess.run([*args, "-X", "-q", "-v", "ON_ERROR_STOP=1",
+                                 "-f", str(PRODUCER_INDEXES_SQL)],
+                                env=extract._psql_env(producer_db), capture_output=True,
+                                text=True, timeout=60, check=False)
+        assert result.returncode == 0, result.stderr
+
+    # The index changes plans, never rows.
+    keys = ["ContestId", "FranchiseSeasonId"]
+    for config in (producer_db, dataclasses.replace(producer_db, sql_variant="ranked")):
+        after = extract._run_query(config, extract.TEAM_GAMES_SQL, variables)
+        pd.testing.assert_frame_equal(after.sort_values(keys).reset_index(drop=True),
+                                      before.sort_values(keys).reset_index(drop=True))
+
+
+def test_explain_captures_a_plan_per_query(producer_db, tmp_path):
+    summaries = explain_queries(producer_db, 2025, 6, 5, ("spec", "ranked"), tmp_path)
+
+    assert [s.format() for s in summaries if s.error] == []
+    spec = {s.sql_file: s for s in summaries if s.variant == "spec"}
+    ranked = {s.sql_file: s for s in summaries if s.variant == "ranked"}
+    assert set(spec) == {sql_file.name for sql_file in query_variables(2025, 6, 5, True)}
+    assert set(ranked) == {sql_file.name for sql_file in RANKED}
+    for name, summary in ranked.items():
+        assert summary.rows == spec[name].rows
+    assert spec[extract.ASOF_TRAINING_SQL.name].rows \
+        == len(extract.extract_asof_training(producer_db, 2025, 6))
+
+    plan_path = spec[extract.TEAM_GAMES_SQL.name].plan_path
+    assert plan_path == tmp_path / "spec" / "asof_team_games.json"
+    assert "Node Type" in json.loads(plan_path.read_text(encoding="utf-8"))["Plan"]
+
+
+def test_explain_reports_a_failing_query_and_runs_the_rest(producer_db, tmp_path):
+    missing = dataclasses.replace(producer_db, pg_database=producer_db.pg_database + "_missing")
+    summaries = explain_queries(missing, 2025, 6, 0, ("spec",), tmp_path)
+
+    assert len(summaries) == len(query_variables(2025, 6, 0, True))
+    assert all("FAILED:" in s.format() and "\n" not in s.error for s in summaries)
@@ -0,0 +1,206 @@
+"""Backtest result cache — coalescing, LRU eviction, persistence, what
+is kept and the fingerprint offline; against the fixture database, that
+/backtest serves a repeated week from the cache unchanged."""
+
+from __future__ import annotations
+
+import dataclasses
+import shutil
+import threading
+import time
+
+import pytest
+
+from helpers import make_config
+from metricbot import extract, freshness, pipeline, results
+from metricbot.config import Config
+from metricbot.extract import ExtractionError
+from metricbot.results import BacktestCache, BacktestKey, result_fingerprint, result_path
+
+CONFIG = make_config()
+WATERMARK = {"Games": 60, "FinalGames": 60, "MaxComputedUtc": "2025-10-05T13:00:00.000000Z"}
+
+
+def _key(week: int, config: Config = CONFIG, watermark: dict = WATERMARK) -> BacktestKey:
+    return BacktestKey.of(config, 2025, week, 5, watermark)
+
+
+def _result(week: int, ungradeable: int = 0) -> dict:
+    return {"week": week, "grade": {"ungradeable": ungradeable}}
+
+
+def test_concurrent_requests_share_one_computation():
+    cache, calls, release = BacktestCache(), [], threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(10)
+        return _result(6)
+
+    found = []
+    threads = [threading.Thread(target=lambda: found.append(cache.get_or_compute(_key(6), compute)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 10
+    while not calls:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    time.sleep(0.05)    # let the others reach the wait
+    release.set()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(calls) == 1
+    assert sorted(outcome for _, outcome in found) == ["coalesced", "coalesced", "coalesced", "miss"]
+    assert all(result == _result(6) for result, _ in found)
+    assert cache.get_or_compute(_key(6), compute) == (_result(6), "hit")
+    assert cache.counts == {"hit": 1, "disk": 0, "coalesced": 3, "miss": 1}
+
+
+def test_failures_reach_every_waiter_and_are_not_cached():
+    cache, release = BacktestCache(), threading.Event()
+
+    def fail():
+        release.wait(10)
+        raise ExtractionError("competition_metrics_asof_week.sql returned zero rows")
+
+    errors = []
+
+    def request():
+        try:
+            cache.get_or_compute(_key(6), fail)
+        except ExtractionError as ex:
+            errors.append(ex)
+
+    threads = [threading.Thread(target=request) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(errors) == 2
+    assert cache.get_or_compute(_key(6), lambda: _result(6)) == (_result(6), "miss")
+
+
+def test_least_recently_used_result_is_evicted():
+    cache = BacktestCache(capacity=2)
+    for week in (4, 5):
+        cache.get_or_compute(_key(week), lambda week=week: _result(week))
+    cache.get_or_compute(_key(4), lambda: pytest.fail("week 4 is cached"))
+    cache.get_or_compute(_key(6), lambda: _result(6))
+
+    assert cache.get_or_compute(_key(4), lambda: _result(4))[1] == "hit"
+    assert cache.get_or_compute(_key(5), lambda: _result(5))[1] == "miss"
+
+
+def test_results_persist_for_the_next_process(tmp_path):
+    config = dataclasses.replace(CONFIG, result_cache_dir=tmp_path)
+    path = result_path(config, _key(6, config))
+    assert result_path(CONFIG, _key(6)) is None
+
+    BacktestCache().get_or_compute(_key(6, config), lambda: _result(6), path)
+
+    assert path.parent.parent == tmp_path / CONFIG.pg_database
+    assert list(path.parent.iterdir()) == [path]
+    fresh = BacktestCache()
+    assert fresh.get_or_compute(_key(6, config), lambda: pytest.fail("on disk"), path) \
+        == (_result(6), "disk")
+    assert fresh.get_or_compute(_key(6, config), lambda: _result(6), path)[1] == "hit"
+
+    # A moved watermark (a game finalized, a metric recomputed) is a new
+    # key, and the file written at the old one is not served for it.
+    moved = _key(6, config, {**WATERMARK, "FinalGames": 59})
+    assert result_path(config, moved) == path
+    assert BacktestCache().lookup(moved, path) is None
+    assert BacktestCache().get_or_compute(moved, lambda: _result(6), path)[1] == "miss"
+
+
+def test_weeks_with_ungraded_games_are_never_kept(tmp_path):
+    config = dataclasses.replace(CONFIG, result_cache_dir=tmp_path)
+    path = result_path(config, _key(9, config))
+    cache = BacktestCache()
+
+    assert cache.get_or_compute(_key(9, config), lambda: _result(9, ungradeable=2), path) \
+        == (_result(9, ungradeable=2), "miss")
+    cache.store(_key(10, config), _result(10, ungradeable=6), result_path(config, _key(10, config)))
+
+    assert cache.get_or_compute(_key(9, config), lambda: _result(9), path)[1] == "miss"
+    assert cache.lookup(_key(10, config)) is None
+    assert [p.name for p in path.parent.iterdir()] == [path.name]
+
+
+def test_result_directory_needs_no_pyarrow(monkeypatch, tmp_path):
+    for name, value in {"METRICBOT_PG_HOST": "h", "METRICBOT_PG_USER": "u",
+                        "METRICBOT_PG_PASSWORD": "p", "METRICBOT_API_BASE_URL": "http://api",
+                        "METRICBOT_ADMIN_TOKEN": "t"}.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv("METRICBOT_CACHE_DIR", raising=False)
+    monkeypatch.setenv("METRICBOT_RESULT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr("importlib.util.find_spec", lambda name, *args: None)
+
+    config = Config.load("FootballNcaa")
+    assert (config.result_cache_dir, config.cache_dir) == (tmp_path, None)
+
+
+def test_fingerprint_tracks_the_model_version_and_row_settings(monkeypatch):
+    base = result_fingerprint(CONFIG)
+
+    assert result_fingerprint(dataclasses.replace(CONFIG, feature_dtype="float32")) != base
+    assert result_fingerprint(dataclasses.replace(CONFIG, fbs_scope=False)) != base
+    assert result_fingerprint(dataclasses.replace(CONFIG, pg_password="rotated")) == base
+    monkeypatch.setattr(results, "MODEL_VERSION", "MetricBot-v9")
+    assert result_fingerprint(CONFIG) != base
+
+
+def test_fingerprint_hashes_the_package_source(tmp_path, monkeypatch):
+    base = result_fingerprint(CONFIG)
+    package = tmp_path / "metricbot"
+    package.mkdir()
+    for source in freshness.PACKAGE_DIR.glob("*.py"):
+        (package / source.name).write_bytes(source.read_bytes())
+    monkeypatch.setattr(freshness, "PACKAGE_DIR", package)
+    assert result_fingerprint(CONFIG) == base
+
+    (package / "engine.py").write_bytes((package / "engine.py").read_bytes() + b"\n# edited\n")
+    assert result_fingerprint(CONFIG) != base
+
+
+def test_fingerprint_hashes_the_sql_variant_that_runs(tmp_path, monkeypatch):
+    ranked = dataclasses.replace(CONFIG, sql_variant="ranked")
+    base, before = result_fingerprint(CONFIG), result_fingerprint(ranked)
+    assert before != base
+
+    # An edit to a ranked twin strands the ranked results, not the spec ones.
+    shutil.copytree(extract.RANKED_SQL_DIR, tmp_path / "ranked")
+    monkeypatch.setattr(extract, "RANKED_SQL_DIR", tmp_path / "ranked")
+    assert result_fingerprint(ranked) == before
+    twin = tmp_path / "ranked" / extract.ASOF_TRAINING_SQL.name
+    twin.write_text(twin.read_text(encoding="utf-8") + "\n-- edited\n", encoding="utf-8")
+    assert result_fingerprint(ranked) != before and result_fingerprint(CONFIG) == base
+
+
+def test_repeated_backtest_is_served_from_the_cache(producer_db, monkeypatch):
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+
+    from metricbot import service
+
+    monkeypatch.setattr(pipeline.Config, "load", staticmethod(lambda _sport: producer_db))
+    monkeypatch.setattr(service, "backtests", BacktestCache())
+    client = TestClient(service.app)
+    body = {"season_year": 2025, "week": 6, "prior_season_tail": 5}
+
+    first = client.post("/backtest", json=body).json()
+    second = client.post("/backtest", json=body).json()
+    profiled = client.post("/backtest", json={**body, "profile": True}).json()
+
+    assert (first["cached"], second["cached"], profiled["cached"]) == (False, True, False)
+    assert second == {**first, "cached": True}
+    assert profiled["grade"] == first["grade"]
+    assert service.backtests.counts["miss"] == 1 and service.backtests.counts["hit"] == 1
+    assert "metricbot_backtest_cache_total{" in client.get("/metrics").text
+    assert service.metrics.BACKTEST_CACHE.value("FootballNcaa", "hit") >= 1
@@ -0,0 +1,122 @@
+"""Extraction schemas — typed parsing, drift detection and the driver-path
+cast offline; against the fixture database, the claim that typed frames
+hold exactly the values the inferred ones did."""
+
+from __future__ import annotations
+
+import dataclasses
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metricbot import extract
+from metricbot.model import FEATURE_COLS, PreparedCorpus
+from metricbot.schema import schema_for
+
+ASOF = schema_for(extract.ASOF_TRAINING_SQL)
+
+
+def _csv(rows: int = 3) -> str:
+    # What psql --csv emits for the as-of training query: GUIDs, t/f
+    # booleans, empty fields for NULL.
+    frame = pd.DataFrame({name: [f"{name}-{i % 2}" for i in range(rows)]
+                          for name, kind in ASOF.columns.items() if kind in ("key", "ref")})
+    for name, kind in ASOF.columns.items():
+        if kind == "feature":
+            frame[name] = [0.1 * i if i else None for i in range(rows)]
+    frame["SeasonYear"], frame["WeekNumber"] = 2024, [i + 1 for i in range(rows)]
+    frame["HomeScore"], frame["AwayScore"] = [21] * rows, [17] * rows
+    frame["Winner"], frame["Spread"] = "HOME", [-3.5] + [None] * (rows - 1)
+    frame["FbsParticipant"] = ["t", "f", ""][:rows]
+    return frame.to_csv(index=False)
+
+
+def test_every_feature_bearing_schema_selects_the_model_features():
+    for sql_file in sorted(extract.SQL_DIR.glob("competition_metrics_*.sql")):
+        columns = schema_for(sql_file).columns
+        assert all(columns.get(name) == "feature" for name in FEATURE_COLS), sql_file.name
+
+
+def test_csv_parses_straight_into_compact_dtypes():
+    frame = ASOF.parse_csv(_csv())
+
+    assert frame["HomeFranchiseSeasonId"].dtype == "category"
+    assert frame["ContestId"].dtype == object
+    assert frame["FbsParticipant"].tolist()[:2] == [True, False]
+    assert frame["FbsParticipant"].dtype == "boolean" and pd.isna(frame["FbsParticipant"][2])
+    assert frame["HomeScore"].dtype == "Int16" and frame["SeasonYear"].dtype == np.int16
+    assert frame["HomeYpp"].dtype == np.float64 and np.isnan(frame["HomeYpp"][0])
+    assert ASOF.parse_csv(_csv(), "float32")["HomeYpp"].dtype == np.float32
+    assert ASOF.parse_csv(_csv(), "float32")["Spread"].dtype == np.float64
+
+
+def test_driver_frames_cast_to_the_parsed_dtypes():
+    inferred = pd.read_csv(io.StringIO(_csv()))
+    # The driver reports booleans as 't'/'f' text, as read_csv would.
+    inferred["FbsParticipant"] = ["t", "f", np.nan]
+
+    cast = ASOF.apply(inferred)
+
+    pd.testing.assert_frame_equal(cast, ASOF.parse_csv(_csv()))
+
+
+def test_column_drift_is_an_extraction_error():
+    renamed = ASOF.parse_csv(_csv()).rename(columns={"HomeYpp": "HomeYardsPerPlay"})
+
+    with pytest.raises(extract.ExtractionError, match=r"missing: \['HomeYpp'\]; "
+                                                      r"unexpected: \['HomeYardsPerPlay'\]"):
+        ASOF.validate(renamed)
+
+
+def test_prepared_corpus_reads_typed_flags_without_reparsing():
+    frame = ASOF.parse_csv(_csv())
+    frame["Winner"] = pd.Categorical(["HOME", "AWAY", "TIE"])
+
+    corpus = PreparedCorpus.of(frame)
+
+    assert corpus.fbs.tolist() == [True, False, False]
+    assert corpus.decided.tolist() == [True, True, False]
+    assert corpus.margin.tolist() == [4.0, 4.0, 4.0]
+
+
+def _values(column: pd.Series) -> list:
+    # One representation for both frames: NULL -> None, numbers as
+    # float, booleans as psql's t/f.
+    if column.dtype == "boolean":
+        column = column.map({True: "t", False: "f"})
+    elif pd.api.types.is_numeric_dtype(column.dtype):
+        column = pd.Series(column.to_numpy(dtype=np.float64, na_value=np.nan))
+    return [None if pd.isna(value) else value for value in column.astype(object)]
+
+
+@pytest.mark.parametrize("sql_file, variables", [
+    (extract.ASOF_TRAINING_SQL, {"season_year": 2025, "week": 6}),
+    (extract.ASOF_WEEK_SQL, {"season_year": 2025, "week": 6, "prior_tail": 5, "fbs_scope": 1}),
+    (extract.GRADING_SCORES_SEASON_SQL, {"season_year": 2025}),
+])
+def test_typed_frames_hold_the_inferred_values(producer_db, monkeypatch, sql_file, variables):
+    typed = extract._run_query(producer_db, sql_file, variables)
+    monkeypatch.setattr(extract, "_schema_for", lambda _sql_file: None)
+    inferred = extract._run_query(producer_db, sql_file, variables)
+
+    assert list(typed.columns) == list(inferred.columns)
+    for name in typed.columns:
+        assert _values(typed[name]) == _values(inferred[name]), name
+
+
+def test_float32_features_round_the_same_values(producer_db, monkeypatch):
+    config = dataclasses.replace(producer_db, feature_dtype="float32")
+    variables = {"season_year": 2025, "week": 6}
+
+    wide = extract._run_query(producer_db, extract.ASOF_TRAINING_SQL, variables)
+    narrow = extract._run_query(config, extract.ASOF_TRAINING_SQL, variables)
+    monkeypatch.setattr(extract, "_schema_for", lambda _sql_file: None)
+    inferred = extract._run_query(producer_db, extract.ASOF_TRAINING_SQL, variables)
+
+    assert (inferred.memory_usage(deep=True).sum() > wide.memory_usage(deep=True).sum()
+            > narrow.memory_usage(deep=True).sum())
+    assert (narrow[FEATURE_COLS].dtypes == np.float32).all()
+    np.testing.assert_array_equal(narrow[FEATURE_COLS].to_numpy(),
+                                  wide[FEATURE_COLS].to_numpy().astype(np.float32))
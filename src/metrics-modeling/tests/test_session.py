@@ -0,0 +1,185 @@
+"""Persistent psql session — demultiplexing, error isolation, reconnect and
+per-statement timeout, driven offline by a scripted stand-in for psql;
+plus frame parity with one-shot psql against the fixture database."""
+
+from __future__ import annotations
+
+import sys
+import textwrap
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from helpers import make_config
+from metricbot import extract
+
+# Speaks just enough of psql's stdin protocol: \set/\unset, one-line
+# statements, and the \echo lines the session appends. The result set
+# reports the process id (to tell reconnects apart) and :week.
+FAKE_PSQL = textwrap.dedent(r"""
+    import os, sys, time
+    variables, error, message = {}, False, ""
+    for line in sys.stdin:
+        line = line.rstrip("\n")
+        if line.startswith("\\set "):
+            _, name, value = line.split()
+            variables[name] = value
+        elif line.startswith("\\unset "):
+            variables.pop(line.split()[1], None)
+        elif line.startswith("\\echo :LAST_ERROR_MESSAGE"):
+            print(message, flush=True)
+        elif line.startswith("\\echo "):
+            marker = line.split()[1]
+            print(marker, "true" if error else "false", "42703" if error else "00000", flush=True)
+        elif "DIE" in line:
+            sys.exit(2)
+        elif "HANG" in line:
+            time.sleep(30)
+        elif "SLOW" in line:
+            time.sleep(0.3)
+            error = False
+            print("Pid,Week", flush=True)
+            print(f"{os.getpid()},{variables.get('week', '')}", flush=True)
+        elif "FAIL" in line:
+            error, message = True, 'column "nope" does not exist'
+        else:
+            error = False
+            print("Pid,Week", flush=True)
+            print(f"{os.getpid()},{variables.get('week', '')}", flush=True)
+""")
+
+
+@pytest.fixture
+def fake_psql(tmp_path, monkeypatch):
+    script = tmp_path / "fake_psql.py"
+    script.write_text(FAKE_PSQL, encoding="utf-8")
+    monkeypatch.setattr(extract, "_psql_args", lambda _config: [sys.executable, str(script)])
+
+    def sql(name: str, text: str):
+        path = tmp_path / f"{name}.sql"
+        path.write_text(text, encoding="utf-8")
+        return path
+
+    return sql
+
+
+def test_successive_queries_share_one_process(fake_psql):
+    query = fake_psql("q", "SELECT :week;")
+    session = extract.PsqlSession(make_config())
+    try:
+        first, _ = session.query(query, {"week": 6})
+        second, _ = session.query(query, {"week": 7})
+        # A variable the next query doesn't pass must not leak into it.
+        third, _ = session.query(query, {})
+    finally:
+        session.close()
+
+    assert first["Pid"].iloc[0] == second["Pid"].iloc[0] == third["Pid"].iloc[0]
+    assert (first["Week"].iloc[0], second["Week"].iloc[0]) == (6, 7)
+    assert pd.isna(third["Week"].iloc[0])
+
+
+def test_failed_statement_reports_and_keeps_the_session(fake_psql):
+    session = extract.PsqlSession(make_config())
+    try:
+        before, _ = session.query(fake_psql("ok", "SELECT 1;"))
+        with pytest.raises(extract.ExtractionError, match="42703.*nope"):
+            session.query(fake_psql("bad", "SELECT FAIL;"))
+        after, _ = session.query(fake_psql("ok", "SELECT 1;"))
+    finally:
+        session.close()
+
+    assert before["Pid"].iloc[0] == after["Pid"].iloc[0]
+
+
+def test_dead_process_is_restarted_and_the_query_retried(fake_psql):
+    session = extract.PsqlSession(make_config())
+    try:
+        before, _ = session.query(fake_psql("ok", "SELECT 1;"))
+        session._process.kill()
+        session._process.wait()
+        after, _ = session.query(fake_psql("ok", "SELECT 1;"))
+    finally:
+        session.close()
+
+    assert before["Pid"].iloc[0] != after["Pid"].iloc[0]
+
+
+def test_process_that_dies_mid_query_twice_is_an_extraction_error(fake_psql):
+    session = extract.PsqlSession(make_config())
+    try:
+        with pytest.raises(extract.ExtractionError, match="exited"):
+            session.query(fake_psql("die", "SELECT DIE;"))
+    finally:
+        session.close()
+
+
+def test_timeout_is_per_statement_and_the_session_recovers(fake_psql, monkeypatch):
+    monkeypatch.setattr(extract, "PSQL_TIMEOUT_SECONDS", 1)
+    session = extract.PsqlSession(make_config())
+    try:
+        with pytest.raises(extract.ExtractionError, match="exceeded 1s"):
+            session.query(fake_psql("hang", "SELECT HANG;"))
+        recovered, _ = session.query(fake_psql("ok", "SELECT 1;"), {"week": 3})
+    finally:
+        session.close()
+
+    assert recovered["Week"].iloc[0] == 3
+
+
+def test_extraction_session_routes_queries_and_closes_unless_kept(fake_psql, monkeypatch):
+    config = make_config()
+    query = fake_psql("q", "SELECT :week;")
+
+    with extract.extraction_session(config) as session:
+        first = extract._run_query(config, query, {"week": 1})
+        second = extract._run_query(config, query, {"week": 2})
+    assert first["Pid"].iloc[0] == second["Pid"].iloc[0]
+    assert config not in extract._SESSIONS
+    assert session._process is None
+
+    monkeypatch.setattr(extract, "_KEEP_SESSIONS", True)
+    try:
+        with extract.extraction_session(config) as kept:
+            pass
+        with extract.extraction_session(config) as reused:
+            pass
+        assert reused is kept
+    finally:
+        extract.close_sessions()
+    assert not extract._SESSIONS
+
+
+def test_concurrent_queries_fan_out_up_to_the_connection_limit(fake_psql):
+    query = fake_psql("slow", "SELECT SLOW;")
+    session = extract.PsqlSession(make_config(), connections=2)
+    try:
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            frames = [frame for frame, _ in pool.map(lambda week: session.query(query, {"week": week}),
+                                                     [1, 2, 3])]
+        spares = list(session._spares)
+    finally:
+        session.close()
+
+    assert [frame["Week"].iloc[0] for frame in frames] == [1, 2, 3]
+    # Two processes served three queries; the third waited for one.
+    assert len({frame["Pid"].iloc[0] for frame in frames}) == 2
+    assert len(spares) == 1 and spares[0]._process is None and session._process is None
+
+
+def test_session_frames_match_one_shot_psql(producer_db):
+    calls = [
+        (extract.ASOF_TRAINING_SQL, {"season_year": 2025, "week": 6}),
+        (extract.ASOF_WEEK_SQL, {"season_year": 2025, "week": 6, "prior_tail": 5, "fbs_scope": 1}),
+        (extract.GRADING_SCORES_SQL, {"season_year": 2025, "week": 6}),
+        (extract.GRADING_SCORES_SQL, {"season_year": 2025, "week": 9}),
+    ]
+    session = extract.PsqlSession(producer_db)
+    try:
+        for sql_file, variables in calls:
+            expected, _ = extract._run_psql(producer_db, sql_file, variables)
+            actual, _ = session.query(sql_file, variables)
+            pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+    finally:
+        session.close()
@@ -0,0 +1,128 @@
+"""Shared corpus — a published season maps back equal, dtype for dtype,
+with its numeric columns read-only views of the files, a moved
+watermark publishes beside the old season and prunes it after a grace
+period, and a season pruned mid-attach is extracted instead; against the
+fixture database, that a second worker attaches every closed season
+instead of extracting it."""
+
+from __future__ import annotations
+
+import dataclasses
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from helpers import make_config
+from metricbot import cache, extract, shared as shared_module
+from metricbot.config import Config
+from metricbot.schema import schema_for
+from metricbot.shared import SharedCorpus
+
+WATERMARK = {"Games": 60, "MetricRows": 120, "MaxComputedUtc": "2024-10-26T13:00:00.000000Z"}
+
+
+def _config(tmp_path) -> Config:
+    return make_config(warm_corpus_mb=64, shared_corpus_dir=tmp_path)
+
+
+def _season_frame() -> pd.DataFrame:
+    # One column of every kind the as-of training schema declares.
+    frame = pd.DataFrame({"ContestId": ["a", "b", "c"], "SeasonYear": [2024] * 3,
+                          "WeekNumber": [3, 3, 4],
+                          "HomeFranchiseSeasonId": ["h1", "h2", "h1"],
+                          "HomeScore": [21, None, 17], "Winner": ["HOME", None, "AWAY"],
+                          "Spread": [-3.5, float("nan"), 7.0],
+                          "FbsParticipant": ["t", "f", None]})
+    columns = {name: kind for name, kind in schema_for(extract.ASOF_SEASON_SQL).columns.items()
+               if name in frame.columns}
+    return dataclasses.replace(schema_for(extract.ASOF_SEASON_SQL), columns=columns).apply(frame)
+
+
+def test_published_season_maps_back_equal_and_read_only(tmp_path):
+    shared = SharedCorpus(_config(tmp_path))
+    assert shared.attach(2024, WATERMARK) is None
+
+    shared.publish(2024, _season_frame(), WATERMARK)
+    frame, mapped_bytes = shared.attach(2024, dict(WATERMARK))
+
+    pd.testing.assert_frame_equal(frame, _season_frame(), check_exact=True)
+    assert mapped_bytes > 0
+    spread = frame["Spread"].to_numpy()
+    assert not spread.flags.writeable
+    with pytest.raises(ValueError):
+        spread[0] = 0.0
+
+
+def test_moved_watermark_publishes_beside_and_prunes_the_old_season(tmp_path, monkeypatch):
+    shared = SharedCorpus(_config(tmp_path))
+    moved = {**WATERMARK, "MaxComputedUtc": "2026-01-01T00:00:00.000000Z"}
+    shared.publish(2024, _season_frame(), WATERMARK)
+    shared.publish(2024, _season_frame(), WATERMARK)     # already there: untouched
+
+    shared.publish(2024, _season_frame().iloc[:2], moved)
+
+    # Superseded, not yet pruned: a worker that read the old watermark still maps it.
+    assert sorted(path.name for path in shared.season_dir(2024, moved).parent.iterdir()) \
+        == sorted([shared.season_dir(2024, moved).name, shared.season_dir(2024, WATERMARK).name])
+    assert len(shared.attach(2024, WATERMARK)[0]) == 3
+    assert len(shared.attach(2024, moved)[0]) == 2
+
+    monkeypatch.setattr(shared_module, "SUPERSEDED_GRACE_SECONDS", 0)
+    shared.publish(2023, _season_frame(), WATERMARK)     # any later publish prunes
+    assert [path.name for path in shared.season_dir(2024, moved).parent.iterdir()] \
+        == [shared.season_dir(2024, moved).name]
+    assert shared.attach(2024, WATERMARK) is None
+    assert len(shared.attach(2024, moved)[0]) == 2
+
+
+def test_a_season_pruned_or_damaged_mid_attach_is_not_mapped(tmp_path):
+    shared = SharedCorpus(_config(tmp_path))
+    shared.publish(2024, _season_frame(), WATERMARK)
+    directory = shared.season_dir(2024, WATERMARK)
+
+    (directory / "1.npy").unlink()      # as if pruned between meta.json and the arrays
+    assert shared.attach(2024, WATERMARK) is None
+
+    (directory / "meta.json").write_text('{"arrays": 1}', encoding="utf-8")
+    assert shared.attach(2024, WATERMARK) is None
+
+
+def test_shared_directory_needs_the_warm_corpus(monkeypatch, tmp_path):
+    for name, value in {"METRICBOT_PG_HOST": "h", "METRICBOT_PG_USER": "u",
+                        "METRICBOT_PG_PASSWORD": "p", "METRICBOT_API_BASE_URL": "http://api",
+                        "METRICBOT_ADMIN_TOKEN": "t",
+                        "METRICBOT_SHARED_CORPUS_DIR": str(tmp_path)}.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.delenv("METRICBOT_WARM_CORPUS_MB", raising=False)
+    with pytest.raises(SystemExit, match="METRICBOT_WARM_CORPUS_MB"):
+        Config.load("FootballNcaa")
+
+    monkeypatch.setenv("METRICBOT_WARM_CORPUS_MB", "256")
+    assert Config.load("FootballNcaa").shared_corpus_dir == tmp_path
+
+
+def test_second_worker_maps_the_first_workers_seasons(producer_db, tmp_path, monkeypatch):
+    config = dataclasses.replace(producer_db, warm_corpus_mb=64, shared_corpus_dir=tmp_path)
+    expected = extract.extract_asof_training(producer_db, 2025, 6)
+    monkeypatch.setattr(cache, "_WARM", {})
+    cache.preload_closed_seasons(config)
+
+    # A fresh process: nothing in memory, everything published.
+    monkeypatch.setattr(cache, "_WARM", {})
+    queried = []
+    run_query = cache._run_query
+    monkeypatch.setattr(cache, "_run_query", lambda config, sql_file, *args, **kwargs: (
+        queried.append(sql_file.name) or run_query(config, sql_file, *args, **kwargs)))
+    frame = extract.extract_asof_training(config, 2025, 6)
+
+    order = ["SeasonYear", "WeekNumber", "ContestId"]
+    pd.testing.assert_frame_equal(frame.sort_values(order).reset_index(drop=True),
+                                  expected.sort_values(order).reset_index(drop=True),
+                                  check_exact=True)
+    assert queried == ["corpus_season_watermarks.sql", "competition_metrics_asof_season.sql"]
+    summary = cache.warm_corpus(config).summary()
+    assert summary["seasons"] == [2022, 2023, 2024]
+    assert 0 < summary["mapped_bytes"] < summary["bytes"]
+    held = cache.warm_corpus(config).get(2024, cache.season_watermarks(config)[2024])
+    assert not np.asarray(held["Spread"]).flags.writeable
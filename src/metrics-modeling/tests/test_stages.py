@@ -0,0 +1,156 @@
+"""Stage DAG executor — scheduling, failure and critical path offline with
+stand-in stages; against the fixture database, the claim that the staged
+backtest grades exactly as the sequential extract → predict → grade."""
+
+from __future__ import annotations
+
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from metricbot import pipeline
+from metricbot.extract import (ExtractionError, extract_asof_training, extract_asof_week,
+                               extract_final_scores)
+from metricbot.grading import grade_week
+from metricbot.model import predict_market_prior
+from metricbot.stages import StageGraph, StageTiming, critical_path
+
+
+def _sleeper(seconds: float, value):
+    def run(*_inputs):
+        time.sleep(seconds)
+        return value
+    return run
+
+
+def test_independent_stages_overlap_and_each_starts_when_its_inputs_land():
+    graph = StageGraph()
+    graph.add("training", _sleeper(0.05, "corpus"))
+    graph.add("slate", _sleeper(0.3, "slate"))
+    graph.add("fit", lambda training: f"fit({training})", after=("training",))
+    graph.add("predict", lambda fit, slate: f"{fit}+{slate}", after=("fit", "slate"))
+
+    results, timeline = graph.run(workers=3)
+    stages = {stage.name: stage for stage in timeline.stages}
+
+    assert results["predict"] == "fit(corpus)+slate"
+    # The fit ran while the slate was still extracting.
+    assert stages["training"].ended <= stages["fit"].started < stages["slate"].ended
+    assert stages["predict"].started >= max(stages["fit"].ended, stages["slate"].ended)
+    assert timeline.critical_path == ["slate", "predict"]
+
+
+def test_first_failure_is_reraised_and_nothing_downstream_starts():
+    ran, slate_done = [], threading.Event()
+
+    def training():
+        raise ExtractionError("competition_metrics_asof_training.sql returned zero rows")
+
+    graph = StageGraph()
+    graph.add("training", training)
+    graph.add("slate", lambda: slate_done.set())
+    graph.add("fit", lambda _training: ran.append("fit"), after=("training",))
+
+    with pytest.raises(ExtractionError, match="zero rows"):
+        graph.run(workers=2)
+    assert ran == [] and slate_done.is_set()
+
+
+def test_stages_may_only_follow_defined_stages():
+    graph = StageGraph()
+    graph.add("training", lambda: None)
+
+    with pytest.raises(ValueError, match="undefined stages \\['slate'\\]"):
+        graph.add("predict", lambda *_: None, after=("training", "slate"))
+    with pytest.raises(ValueError, match="already defined"):
+        graph.add("training", lambda: None)
+
+
+def test_profile_counts_rows_and_traces_each_stage_peak():
+    graph = StageGraph()
+    graph.add("training", lambda: pd.DataFrame({"x": np.arange(500)}))
+    graph.add("slate", lambda: pd.DataFrame({"x": np.arange(7)}))
+    # 8 MB held at once, released before the stage returns.
+    graph.add("fit", lambda training: float(np.ones((1000, 1000)).sum()), after=("training",))
+    graph.add("dtos", lambda fit, slate: [{"p": fit}] * (2 * len(slate)), after=("fit", "slate"))
+
+    _, timeline = graph.run(workers=3, trace_memory=True)
+    stages = {stage.name: stage for stage in timeline.stages}
+
+    assert (stages["training"].rows_in, stages["training"].rows_out) == (None, 500)
+    assert (stages["dtos"].rows_in, stages["dtos"].rows_out) == (7, 14)
+    assert stages["fit"].peak_bytes >= 8 * 10**6 > stages["dtos"].peak_bytes
+    # Traced stages run one at a time.
+    ordered = timeline.stages
+    assert all(a.ended <= b.started for a, b in zip(ordered, ordered[1:]))
+    assert "peak MB" in timeline.format()
+
+    _, untraced = StageGraph().run(workers=1)
+    assert untraced.stages == [] and untraced.critical_path == []
+
+
+def test_concurrent_traced_runs_take_turns():
+    spans = []
+
+    def fit():
+        started = time.perf_counter()
+        held = np.ones((1000, 1000))  # 8 MB
+        time.sleep(0.1)
+        spans.append((started, time.perf_counter()))
+        return float(held.sum())
+
+    def profiled(peaks: list):
+        graph = StageGraph()
+        graph.add("fit", fit)
+        peaks.append(graph.run(workers=2, trace_memory=True)[1].stages[0].peak_bytes)
+
+    peaks = []
+    threads = [threading.Thread(target=profiled, args=(peaks,)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Neither reset the other's peak nor stopped its trace mid-stage.
+    first, second = sorted(spans)
+    assert first[1] <= second[0]
+    assert len(peaks) == 2 and all(peak >= 8 * 10**6 for peak in peaks)
+    assert not tracemalloc.is_tracing()
+
+
+def test_critical_path_follows_the_latest_finishing_input():
+    stages = [
+        StageTiming("detect", (), 0.0, 0.1),
+        StageTiming("training", ("detect",), 0.1, 2.0),
+        StageTiming("slate", ("detect",), 0.1, 0.9),
+        StageTiming("fit", ("training",), 2.0, 2.4),
+        StageTiming("predict", ("fit", "slate"), 2.4, 2.5),
+        StageTiming("dtos", ("predict",), 2.5, 2.6),
+    ]
+
+    assert critical_path(stages) == ["detect", "training", "fit", "predict", "dtos"]
+    assert critical_path([]) == []
+
+
+def test_staged_backtest_grades_like_the_sequential_path(producer_db, monkeypatch):
+    monkeypatch.setattr(pipeline.Config, "load", staticmethod(lambda _sport: producer_db))
+
+    result = pipeline.run_backtest("FootballNcaa", 2025, 6, prior_tail=5, profile=True)
+
+    training = extract_asof_training(producer_db, 2025, 6)
+    slate = extract_asof_week(producer_db, 2025, 6, 5)
+    expected = predict_market_prior(training, slate, producer_db.fbs_scope)
+    assert result.report == grade_week(expected.predictions, extract_final_scores(producer_db, 2025, 6))
+    assert result.in_sample_mae == expected.mae
+    stages = {stage.name: stage for stage in result.timeline.stages}
+    assert set(stages) == {"training", "slate", "scores", "fit", "validate", "predict", "grade"}
+    assert result.timeline.critical_path[-1] == "grade"
+    # psql reads are charged to the stage that ran the query.
+    assert (stages["training"].queries, stages["training"].query_rows) == (1, len(training))
+    assert stages["training"].query_bytes > 0 and stages["training"].peak_bytes > 0
+    assert stages["fit"].queries == 0 and stages["fit"].rows_in == len(training)
+    assert stages["predict"].rows_out == len(slate)